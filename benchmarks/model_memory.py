@@ -0,0 +1,81 @@
+"""
+Measures the memory used per tracker entry by the slotted data model classes,
+compared to the same classes with an ordinary per-instance __dict__.
+
+Run from the repository root:
+
+    python -m benchmarks.model_memory [entity counts...]
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import MISSING, asdict, field, fields, make_dataclass
+from typing import Callable, List, Tuple
+
+from src.data_models import NPCEntry, CampaignJournalEntry, SettlementEntry
+
+DEFAULT_COUNTS = (10_000, 100_000)
+
+
+def _unslotted(data_class: type) -> type:
+    """Returns a copy of data_class declared without slots, as the models were before."""
+    return make_dataclass(
+        data_class.__name__,
+        [(f.name, f.type, field(default=f.default, default_factory=f.default_factory, metadata=f.metadata))
+         for f in fields(data_class)])
+
+
+def _npc_kwargs(i: int) -> dict:
+    return {"name": f"Villager {i}", "stat_block_source": "Commoner", "personality": "<p>Friendly</p>"}
+
+
+def _journal_kwargs(i: int) -> dict:
+    return {"session_number": i, "session_title": f"Session {i}", "additional_notes": f"<p>Session {i} notes</p>"}
+
+
+def _settlement_kwargs(i: int) -> dict:
+    return {"name": f"Town {i}", "size": "Town", "defining_trait": "<p>A quiet place</p>"}
+
+
+BENCHMARKS: List[Tuple[type, Callable[[int], dict]]] = [
+    (NPCEntry, _npc_kwargs),
+    (CampaignJournalEntry, _journal_kwargs),
+    (SettlementEntry, _settlement_kwargs),
+]
+
+
+def measure(data_class: type, make_kwargs: Callable[[int], dict], count: int) -> float:
+    """
+    Returns the bytes allocated per entity while building count instances.
+    The keyword arguments are built first so that only the instances and
+    their generated defaults (IDs, empty lists) are measured.
+    """
+    all_kwargs = [make_kwargs(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        instances = [data_class(**kwargs) for kwargs in all_kwargs]
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+    return allocated / count
+
+
+def main(counts=DEFAULT_COUNTS) -> None:
+    print(f"{'model':<22}{'entities':>10}{'dict B/entity':>16}{'slots B/entity':>16}{'saved':>14}")
+    for slotted_class, make_kwargs in BENCHMARKS:
+        if not hasattr(slotted_class, "__slots__"):
+            sys.exit(f"{slotted_class.__name__} is not slotted on this Python version.")
+        dict_class = _unslotted(slotted_class)
+        assert asdict(dict_class(**make_kwargs(0))).keys() == asdict(slotted_class(**make_kwargs(0))).keys()
+        for count in counts:
+            with_dict = measure(dict_class, make_kwargs, count)
+            with_slots = measure(slotted_class, make_kwargs, count)
+            saved = with_dict - with_slots
+            print(f"{slotted_class.__name__:<22}{count:>10,}{with_dict:>16.0f}{with_slots:>16.0f}"
+                  f"{saved:>8.0f} ({saved / with_dict:.0%})")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
@@ -1,6 +1,8 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QSplashScreen
+from PySide6.QtGui import QPixmap, QColor
+from PySide6.QtCore import Qt
 from src.main_window import MainWindow, DATA_FILE_NAME
 
 # Determine the application data file path.
@@ -18,7 +20,20 @@ if __name__ == '__main__':
     # if data_dir and not os.path.exists(data_dir):
     #     os.makedirs(data_dir)
 
-    main_win = MainWindow(app_data_path=APP_DATA_PATH) # Pass app_data_path only
+    # Large data files take a moment to read; show how far along loading is.
+    splash_pixmap = QPixmap(420, 120)
+    splash_pixmap.fill(QColor("#2b2b2b"))
+    splash = QSplashScreen(splash_pixmap)
+    splash.show()
+
+    def show_load_progress(bytes_read: int, total_bytes: int):
+        percent = int(bytes_read * 100 / total_bytes) if total_bytes else 100
+        splash.showMessage(f"Loading campaign data... {percent}%",
+                           Qt.AlignmentFlag.AlignCenter, QColor("white"))
+        app.processEvents()
+
+    main_win = MainWindow(app_data_path=APP_DATA_PATH, load_progress_callback=show_load_progress)
     main_win.show()
+    splash.finish(main_win)
 
     sys.exit(app.exec())
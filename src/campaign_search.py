@@ -0,0 +1,94 @@
+from typing import Callable, Dict, Optional
+
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, QTimer, Signal, Slot
+
+from src.search_index import SearchIndex
+
+# Results are looked up this long after the last keystroke, so typing a word
+# runs one query instead of one per letter.
+SEARCH_DELAY_MS = 150
+MAX_RESULTS = 50
+
+
+class CampaignSearchWidget(QWidget):
+    """
+    A search box over every tracker of the current campaign. Matches are
+    listed below the box; activating one emits result_activated with the
+    collection (e.g. "npcs") and the ID of the entry.
+    """
+    result_activated = Signal(str, str)
+
+    def __init__(self, index_provider: Callable[[], Optional[SearchIndex]],
+                 collection_labels: Dict[str, str], parent: Optional[QWidget] = None):
+        """
+        Args:
+            index_provider: Returns the index of the current campaign, or None
+                if no campaign is selected. Called for each query.
+            collection_labels: The name shown with results of each collection,
+                e.g. {"npcs": "NPC Tracker"}.
+        """
+        super().__init__(parent)
+        self._index_provider = index_provider
+        self._collection_labels = collection_labels
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('Search this campaign, e.g. "black tower" or ismar*')
+        self.search_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.search_edit)
+
+        self.results_list = QListWidget()
+        self.results_list.setMaximumHeight(180)
+        self.results_list.setVisible(False)
+        layout.addWidget(self.results_list)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DELAY_MS)
+        self._search_timer.timeout.connect(self.run_search)
+
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        self.search_edit.returnPressed.connect(self._on_return_pressed)
+        self.results_list.itemActivated.connect(self._on_result_activated)
+
+    @Slot()
+    def run_search(self):
+        """Lists the matches of the current query; an empty query hides the list."""
+        self._search_timer.stop()
+        self.results_list.clear()
+        query = self.search_edit.text().strip()
+        index = self._index_provider() if query else None
+        if index is None:
+            self.results_list.setVisible(False)
+            return
+
+        hits = index.search(query, MAX_RESULTS)
+        for hit in hits:
+            label = self._collection_labels.get(hit.collection, hit.collection)
+            item = QListWidgetItem(f"{label}: {hit.title or '(untitled)'}")
+            item.setData(Qt.ItemDataRole.UserRole, (hit.collection, hit.entry_id))
+            self.results_list.addItem(item)
+        if not hits:
+            item = QListWidgetItem("No matches.")
+            item.setFlags(Qt.ItemFlag.NoItemFlags)
+            self.results_list.addItem(item)
+        self.results_list.setVisible(True)
+
+    def clear(self):
+        self.search_edit.clear()
+        self.run_search()
+
+    @Slot()
+    def _on_return_pressed(self):
+        self.run_search()
+        first_item = self.results_list.item(0)
+        if first_item is not None and first_item.flags() & Qt.ItemFlag.ItemIsEnabled:
+            self._on_result_activated(first_item)
+
+    @Slot(QListWidgetItem)
+    def _on_result_activated(self, item: QListWidgetItem):
+        target = item.data(Qt.ItemDataRole.UserRole)
+        if target:
+            self.result_activated.emit(*target)
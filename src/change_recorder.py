@@ -0,0 +1,262 @@
+import threading
+from dataclasses import is_dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from src.data_models import Campaign
+from src.field_specs import FieldKind, FieldSpec, field_specs
+from src.json_data_manager import ChangeSet
+from src.lazy_campaigns import peek_campaign
+from src.model_events import EntityAdded, EntityRemoved, ModelEvent, subscribe, unsubscribe
+from src.search_index import entity_id
+
+# Turns the model events of src.model_events into ChangeSet marks, so that an
+# entry changed in place is saved, reindexed and redisplayed without the code
+# changing it having to say so.
+#
+# An event names the object that changed, e.g. a travel stage, so the
+# recorder keeps an index of which entry (or conflict, or magic item list)
+# each object of a loaded campaign belongs to. The index of a campaign is
+# built the first time one of its objects changes and then kept up to date
+# from the events.
+
+# A change to a loaded campaign: (campaign ID, collection, entry ID), with
+# None for the collection and entry ID if the campaign changed as a whole.
+ChangeKey = Tuple[str, Optional[str], Optional[str]]
+
+# How a change to an indexed object is recorded
+_ENTRY = 0   # As a change to the entry or conflict it is or belongs to
+_LISTS = 1   # As a change to one of its lists, e.g. the "tier.rarity" magic items
+_TRACKER = 2 # As a change to the conflicts or lists in the field before and after
+
+# (the object, its collection, its entry ID or tier name, how changes are recorded)
+_Owner = Tuple[Any, str, Optional[str], int]
+
+# Campaign fields whose replacement makes the index of the campaign stale
+_CAMPAIGN_CONTAINERS = frozenset(spec.name for spec in field_specs(Campaign)
+                                 if spec.kind in (FieldKind.ENTRIES, FieldKind.MODEL))
+
+_NESTED_SPECS: Dict[type, Dict[str, FieldSpec]] = {}
+
+
+def _nested_specs(data_class: type) -> Dict[str, FieldSpec]:
+    """Returns the specs of the fields of data_class holding dataclasses, by field name."""
+    specs = _NESTED_SPECS.get(data_class)
+    if specs is None:
+        specs = _NESTED_SPECS[data_class] = {
+            spec.name: spec for spec in field_specs(data_class)
+            if spec.kind is FieldKind.MODEL or (spec.kind is FieldKind.LIST and is_dataclass(spec.item_type))
+        }
+    return specs
+
+
+def _nested_models(spec: FieldSpec, value: Any) -> Iterable[Any]:
+    if value is None:
+        return ()
+    return value if spec.kind is FieldKind.LIST else (value,)
+
+
+def _tracker_keys(spec: FieldSpec, value: Any) -> List[str]:
+    """Returns the entry IDs of the documents in value, a field of a single tracker (see search_index.tracker_documents)."""
+    if spec.kind is FieldKind.LIST:
+        return [entity_id(entity) for entity in value or ()]
+    if value is None:
+        return []
+    return [f"{spec.name}.{item_spec.name}" for item_spec in field_specs(type(value)) if item_spec.kind is FieldKind.LIST]
+
+
+def _index_model(owners: Dict[int, _Owner], model: Any, collection: str, key: Optional[str], role: int) -> None:
+    owners[id(model)] = (model, collection, key, role)
+    for name, spec in _nested_specs(type(model)).items():
+        _index_field(owners, spec, getattr(model, name), collection, key, role)
+
+
+def _index_field(owners: Dict[int, _Owner], spec: FieldSpec, value: Any,
+                 collection: str, key: Optional[str], role: int) -> None:
+    """Indexes the objects in value, field spec of an object indexed as (collection, key, role)."""
+    for nested in _nested_models(spec, value):
+        if role == _ENTRY:
+            _index_model(owners, nested, collection, key, _ENTRY)
+        elif role == _TRACKER:
+            if spec.kind is FieldKind.LIST:
+                _index_model(owners, nested, collection, entity_id(nested), _ENTRY)
+            else:
+                _index_model(owners, nested, collection, spec.name, _LISTS)
+
+
+def _unindex_model(owners: Dict[int, _Owner], model: Any) -> None:
+    owner = owners.get(id(model))
+    if owner is None or owner[0] is not model:
+        return
+    del owners[id(model)]
+    for name, spec in _nested_specs(type(model)).items():
+        _unindex_field(owners, spec, getattr(model, name))
+
+
+def _unindex_field(owners: Dict[int, _Owner], spec: FieldSpec, value: Any) -> None:
+    for nested in _nested_models(spec, value):
+        _unindex_model(owners, nested)
+
+
+def _index_campaign(campaign: Campaign) -> Dict[int, _Owner]:
+    owners: Dict[int, _Owner] = {}
+    for spec in field_specs(type(campaign)):
+        value = getattr(campaign, spec.name)
+        if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type):
+            for entry_id, entry in value.items():
+                _index_model(owners, entry, spec.name, entry_id, _ENTRY)
+        elif spec.kind is FieldKind.MODEL and value is not None:
+            _index_model(owners, value, spec.name, None, _TRACKER)
+    return owners
+
+
+class ChangeRecorder:
+    """
+    Records the changes model events report for the loaded campaigns of
+    campaigns_func() in a ChangeSet:
+
+    - A field assigned on an entry or on an object nested in it (a travel
+      stage, a bastion facility, ...) marks the entry.
+    - A field assigned on a conflict marks the conflict, on a magic item
+      tier the list, and on a single tracker the conflicts or lists it held
+      before and after.
+    - Entries added to, replaced in or removed from a collection mark
+      themselves.
+    - Other fields of a campaign, or a whole collection replaced, mark the
+      campaign.
+
+    Changes to objects outside those campaigns, such as copies or the entry
+    a dialog has not added yet, are ignored, as are events on threads other
+    than the one that created the recorder (e.g. a save replaying the
+    journal). Changes that publish no event, such as appending to a list,
+    are not recorded; see src.model_events.
+
+    Args:
+        campaigns_func: Returns the campaigns by ID, e.g. ApplicationData.campaigns.
+        changed_func: Called after each event that recorded a change.
+    """
+
+    def __init__(self, campaigns_func: Callable[[], Mapping[str, Campaign]],
+                 changed_func: Optional[Callable[[], None]] = None):
+        self._campaigns_func = campaigns_func
+        self._changed_func = changed_func
+        self._thread_id = threading.get_ident()
+        self._changes = ChangeSet()
+        self._indexes: Dict[str, Tuple[Campaign, Dict[int, _Owner]]] = {} # By campaign ID
+        self._started = False
+
+    def start(self) -> None:
+        """Subscribes to the model events."""
+        if not self._started:
+            self._started = True
+            subscribe(self._on_event)
+
+    def stop(self) -> None:
+        """Unsubscribes from the model events and drops the index."""
+        if self._started:
+            self._started = False
+            unsubscribe(self._on_event)
+        self._indexes.clear()
+
+    def take(self) -> ChangeSet:
+        """Returns the changes recorded since the last call."""
+        changes = self._changes
+        self._changes = ChangeSet()
+        return changes
+
+    def forget(self, campaign_id: str) -> None:
+        """Drops the index of a campaign, e.g. one evicted from memory."""
+        self._indexes.pop(campaign_id, None)
+
+    def resolve(self, event: ModelEvent) -> List[ChangeKey]:
+        """Returns the changes event makes to the loaded campaigns, without recording them."""
+        if threading.get_ident() != self._thread_id:
+            return []
+        if isinstance(event, (EntityAdded, EntityRemoved)):
+            campaign_id = self._live_campaign_id(event.campaign)
+            return [] if campaign_id is None else [(campaign_id, event.collection, event.entry_id)]
+        if isinstance(event.model, Campaign):
+            campaign_id = self._live_campaign_id(event.model)
+            return [] if campaign_id is None else [(campaign_id, None, None)]
+        found = self._find(event.model)
+        if found is None:
+            return []
+        campaign_id, (model, collection, key, role) = found
+        if role == _ENTRY:
+            return [(campaign_id, collection, key)]
+        if role == _LISTS:
+            return [(campaign_id, collection, f"{key}.{event.field_name}")]
+        spec = _nested_specs(type(model)).get(event.field_name)
+        if spec is None:
+            return [(campaign_id, None, None)]
+        keys = dict.fromkeys(_tracker_keys(spec, event.old_value) + _tracker_keys(spec, event.new_value))
+        return [(campaign_id, collection, entry_id) for entry_id in keys]
+
+    def _on_event(self, event: ModelEvent) -> None:
+        keys = self.resolve(event)
+        if not keys:
+            return
+        self._update_index(keys[0][0], event)
+        for campaign_id, collection, entry_id in keys:
+            if collection is None:
+                self._changes.mark_campaign(campaign_id)
+            else:
+                self._changes.mark_entry(campaign_id, collection, entry_id)
+        if self._changed_func is not None:
+            self._changed_func()
+
+    def _live_campaign_id(self, campaign: Any) -> Optional[str]:
+        """Returns the ID of campaign if it is the loaded campaign with that ID."""
+        campaign_id = getattr(campaign, "campaign_id", None)
+        if campaign_id is not None and peek_campaign(self._campaigns_func(), campaign_id) is campaign:
+            return campaign_id
+        return None
+
+    def _find(self, model: Any) -> Optional[Tuple[str, _Owner]]:
+        """Returns (campaign ID, owner) of an object of a loaded campaign, indexing campaigns as needed."""
+        found = self._find_indexed(model)
+        if found is None and self._index_loaded_campaigns():
+            found = self._find_indexed(model)
+        return found
+
+    def _find_indexed(self, model: Any) -> Optional[Tuple[str, _Owner]]:
+        for campaign_id, (campaign, owners) in self._indexes.items():
+            owner = owners.get(id(model))
+            if owner is not None and owner[0] is model:
+                if self._live_campaign_id(campaign) == campaign_id:
+                    return campaign_id, owner
+                del self._indexes[campaign_id] # Deleted or replaced since
+                return None
+        return None
+
+    def _index_loaded_campaigns(self) -> bool:
+        """Indexes the loaded campaigns not indexed yet; returns whether there were any."""
+        campaigns = self._campaigns_func()
+        indexed_any = False
+        for campaign_id in list(self._indexes):
+            if peek_campaign(campaigns, campaign_id) is not self._indexes[campaign_id][0]:
+                del self._indexes[campaign_id]
+        for campaign_id in campaigns:
+            campaign = peek_campaign(campaigns, campaign_id)
+            if campaign is not None and campaign_id not in self._indexes and campaign.campaign_id == campaign_id:
+                self._indexes[campaign_id] = (campaign, _index_campaign(campaign))
+                indexed_any = True
+        return indexed_any
+
+    def _update_index(self, campaign_id: str, event: ModelEvent) -> None:
+        indexed = self._indexes.get(campaign_id)
+        if indexed is None:
+            return # Built from the campaign as it is when next needed
+        owners = indexed[1]
+        if isinstance(event, EntityRemoved):
+            _unindex_model(owners, event.entity)
+        elif isinstance(event, EntityAdded):
+            _index_model(owners, event.entity, event.collection, event.entry_id, _ENTRY)
+        elif isinstance(event.model, Campaign):
+            if event.field_name in _CAMPAIGN_CONTAINERS:
+                del self._indexes[campaign_id]
+        else:
+            owner = owners.get(id(event.model))
+            spec = _nested_specs(type(event.model)).get(event.field_name)
+            if owner is not None and spec is not None:
+                _unindex_field(owners, spec, event.old_value)
+                _index_field(owners, spec, event.new_value, *owner[1:])
@@ -1,5 +1,86 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Any
+import sys
+from dataclasses import dataclass, field, fields
+from typing import List, Dict, Any, Optional, Tuple
+
+from src.entity_ids import id_factory
+from src.field_specs import SNIPPET_LENGTH, FieldKind, describe, field_specs
+from src.model_events import ObservableCampaign, ObservableModel
+from src.rich_text import html_to_text, text_snippet
+
+# The tracker entries exist in the tens of thousands, so they are declared with
+# __slots__ instead of a per-instance __dict__ (see benchmarks/model_memory.py).
+# Campaign and ApplicationData stay plain dataclasses. dataclass(slots=True)
+# needs Python 3.10; older versions get ordinary dataclasses.
+entity_dataclass = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+def rich_text_field() -> Any:
+    """
+    A str field edited in a QTextEdit. It holds HTML in the compact form from
+    src.rich_text, which the data managers also apply to older data files.
+    """
+    return field(default="", metadata=describe(FieldKind.RICH_TEXT))
+
+
+def id_field(prefix: str) -> Any:
+    """The ID of an entity, allocated by src.entity_ids when it is created."""
+    return field(default_factory=id_factory(prefix), metadata=describe(FieldKind.ID))
+
+
+def enum_field(choices: Tuple[str, ...], default: Optional[str] = None) -> Any:
+    return field(default=choices[0] if default is None else default,
+                 metadata=describe(FieldKind.ENUM, choices=choices))
+
+
+def column_field(label: str, column: int, default: Any = "", **options: Any) -> Any:
+    """A field shown as a tracker table column; options are further FieldSpec options."""
+    return field(default=default, metadata=describe(label=label, column=column, **options))
+
+
+class EntityModel(ObservableModel):
+    """
+    Base class of the entry and tracker dataclasses. Besides change events it
+    keeps the plain text of rich text fields, so tables and search do not
+    parse a field's HTML again until the field is assigned a new value.
+    """
+    # {field name: (html, plain text, {length: snippet})}. Not a dataclass
+    # field, so it is left out of comparisons and asdict; __getstate__ leaves
+    # it out of pickles and copies.
+    __slots__ = ("_plain_text_cache",)
+
+    def __getstate__(self) -> tuple:
+        # (instance dict, slot values), as copy and pickle restore them
+        return None, {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def __setstate__(self, state: tuple) -> None:
+        # Restoring a copy is not a change, so it bypasses the event hooks
+        for name, value in state[1].items():
+            object.__setattr__(self, name, value)
+
+    def _plain_text_entry(self, field_name: str) -> tuple:
+        html = getattr(self, field_name)
+        cache = getattr(self, "_plain_text_cache", None)
+        if cache is None:
+            cache = {}
+            object.__setattr__(self, "_plain_text_cache", cache) # Not a field change, so no event
+        cached = cache.get(field_name)
+        # A write stores a different str object, which invalidates the entry
+        if cached is None or cached[0] is not html:
+            cached = cache[field_name] = (html, html_to_text(html), {})
+        return cached
+
+    def plain_text(self, field_name: str) -> str:
+        """Returns the plain text of a rich text field, one line per paragraph."""
+        return self._plain_text_entry(field_name)[1]
+
+    def snippet(self, field_name: str, length: int = SNIPPET_LENGTH) -> str:
+        """Returns the plain text of a rich text field on one line, cut to at most length characters."""
+        _, text, snippets = self._plain_text_entry(field_name)
+        snippet = snippets.get(length)
+        if snippet is None:
+            snippet = snippets[length] = text_snippet(text, length)
+        return snippet
+
 
 # Forward declaration for Campaign to use in tracker dict value type hint
 # This is not strictly necessary for dict values but good practice for complex types.
@@ -7,155 +88,155 @@ from typing import List, Dict, Any
 # For now, we'll use 'Any' for simplicity in the trackers dict,
 # as specific tracker types will be handled by application logic.
 
-@dataclass
-class SensitiveElement:
+@entity_dataclass
+class SensitiveElement(EntityModel):
     name: str = ""
     hard_limit: bool = False
     soft_limit: bool = False
 
-import uuid
 
-@dataclass
-class GameExpectationsEntry:
-    entry_id: str = field(default_factory=lambda: f"ge_{uuid.uuid4().hex[:8]}")
-    dm_name: str = ""
-    player_name: str = ""
-    game_theme_flavor: str = ""
+@entity_dataclass
+class GameExpectationsEntry(EntityModel):
+    entry_id: str = id_field("ge")
+    dm_name: str = column_field("DM Name", 1)
+    player_name: str = column_field("Player Name", 0, sortable=True)
+    game_theme_flavor: str = rich_text_field()
     sensitive_elements: List[SensitiveElement] = field(default_factory=list)
-    player_hopes: str = ""
-    at_table_concerns: str = ""
+    player_hopes: str = rich_text_field()
+    at_table_concerns: str = rich_text_field()
 
-@dataclass
-class TravelStage:
-    stage_id: str = field(default_factory=lambda: f"ts_{uuid.uuid4().hex[:8]}")
+@entity_dataclass
+class TravelStage(EntityModel):
+    stage_id: str = id_field("ts")
     stage_number_id: str = "" # User-defined identifier like "Stage 1"
     start_location: str = ""
     end_location: str = ""
     distance: str = ""
     terrain: str = ""
     weather: str = ""
-    pace: str = "Normal"  # Options: "Fast", "Normal", "Slow"
+    pace: str = enum_field(("Fast", "Normal", "Slow"), default="Normal")
     travel_time_value: int = 0
-    travel_time_unit: str = "days"  # Options: "days", "hrs"
-    narrative_notes: str = ""
-    challenges: str = ""
+    travel_time_unit: str = enum_field(("days", "hrs"))
+    narrative_notes: str = rich_text_field()
+    challenges: str = rich_text_field()
     elapsed_time_total: str = ""
 
-@dataclass
-class TravelPlanEntry:
-    entry_id: str = field(default_factory=lambda: f"tp_{uuid.uuid4().hex[:8]}")
-    journey_name: str = ""
-    origin: str = ""
-    destination: str = ""
-    stages: List[TravelStage] = field(default_factory=list)
+@entity_dataclass
+class TravelPlanEntry(EntityModel):
+    entry_id: str = id_field("tp")
+    journey_name: str = column_field("Journey Name", 0, sortable=True)
+    origin: str = column_field("Origin", 1, width=150)
+    destination: str = column_field("Destination", 2, width=150)
+    stages: List[TravelStage] = field(default_factory=list, metadata=describe(label="No. Stages", column=3, width=90))
 
-@dataclass
-class NPCEntry:
-    entry_id: str = field(default_factory=lambda: f"npc_{uuid.uuid4().hex[:8]}")
-    name: str = ""
-    stat_block_source: str = ""
+@entity_dataclass
+class NPCEntry(EntityModel):
+    entry_id: str = id_field("npc")
+    name: str = column_field("Name", 0, sortable=True, entity_name=True)
+    stat_block_source: str = column_field("Stat Block", 1)
     mm_page: str = ""
-    stat_block_alterations: str = ""
-    alignment: str = ""
-    personality: str = ""
-    appearance: str = ""
-    secret: str = ""
+    stat_block_alterations: str = rich_text_field()
+    alignment: str = column_field("Alignment", 2, width=120)
+    personality: str = rich_text_field()
+    appearance: str = rich_text_field()
+    secret: str = rich_text_field()
 
-@dataclass
-class SettlementEntry:
-    entry_id: str = field(default_factory=lambda: f"set_{uuid.uuid4().hex[:8]}")
-    name: str = ""
-    size: str = "Village"  # Options: "Village", "Town", "City"
-    defining_trait: str = ""
-    claim_to_fame: str = ""
-    current_calamity: str = ""
+@entity_dataclass
+class SettlementEntry(EntityModel):
+    entry_id: str = id_field("set")
+    name: str = column_field("Name", 0, sortable=True, entity_name=True)
+    size: str = field(default="Village", metadata=describe(
+        FieldKind.ENUM, choices=("Village", "Town", "City"), label="Size", column=1, width=90))
+    defining_trait: str = field(default="", metadata=describe(FieldKind.RICH_TEXT, label="Defining Trait", column=2))
+    claim_to_fame: str = rich_text_field()
+    current_calamity: str = rich_text_field()
     local_leader: str = ""
-    noteworthy_people: str = ""
-    noteworthy_places: str = ""
+    noteworthy_people: str = rich_text_field()
+    noteworthy_places: str = rich_text_field()
     gp_value_most_expensive_item: str = ""
 
-@dataclass
-class CampaignJournalEntry:
-    entry_id: str = field(default_factory=lambda: f"cj_{uuid.uuid4().hex[:8]}")
-    session_number: int = 0
-    session_date: str = ""  # Store as ISO date string e.g. "YYYY-MM-DD"
-    session_title: str = ""
-    earlier_events: str = ""
-    planned_summary: str = ""
-    additional_notes: str = ""
+@entity_dataclass
+class CampaignJournalEntry(EntityModel):
+    entry_id: str = id_field("cj")
+    session_number: int = column_field("Session #", 0, default=0, width=80, sortable=True)
+    session_date: str = column_field("Date", 1, width=110)  # Store as ISO date string e.g. "YYYY-MM-DD"
+    session_title: str = column_field("Title", 2)
+    earlier_events: str = rich_text_field()
+    planned_summary: str = rich_text_field()
+    additional_notes: str = rich_text_field()
 
-@dataclass
-class DMCharacterEntry:
-    entry_id: str = field(default_factory=lambda: f"dmc_{uuid.uuid4().hex[:8]}")
-    character_name: str = ""
-    player_name: str = ""
+@entity_dataclass
+class DMCharacterEntry(EntityModel):
+    entry_id: str = id_field("dmc")
+    character_name: str = column_field("Character Name", 0, sortable=True, entity_name=True)
+    player_name: str = column_field("Player Name", 1)
     player_motivations: List[str] = field(default_factory=list)
-    notes_on_player_expectations: str = ""
-    char_class: str = ""
+    notes_on_player_expectations: str = rich_text_field()
+    char_class: str = column_field("Class", 2, width=120)
     subclass: str = ""
-    level: int = 1
+    level: int = column_field("Level", 3, default=1, width=70)
     background: str = ""
     species_race: str = ""
     alignment: str = ""
-    goals_ambitions: str = ""
-    quirks_whims: str = ""
-    magic_items_owned: str = ""
-    character_details: str = ""
-    family_friends_foes: str = ""
-    adventure_ideas: str = ""
+    goals_ambitions: str = rich_text_field()
+    quirks_whims: str = rich_text_field()
+    magic_items_owned: str = rich_text_field()
+    character_details: str = rich_text_field()
+    family_friends_foes: str = rich_text_field()
+    adventure_ideas: str = rich_text_field()
 
-@dataclass
-class Conflict:
-    conflict_id: str = field(default_factory=lambda: f"conf_{uuid.uuid4().hex[:8]}")
-    title_identifier: str = ""
-    antagonist_situation: str = ""
-    notes: str = ""
+@entity_dataclass
+class Conflict(EntityModel):
+    conflict_id: str = id_field("conf")
+    title_identifier: str = column_field("Conflict Title/Identifier", 0)
+    antagonist_situation: str = column_field("Antagonist/Situation", 1)
+    notes: str = rich_text_field()
 
-@dataclass
-class CampaignConflictEntry: # Singular per campaign, but holds multiple conflicts
+@entity_dataclass
+class CampaignConflictEntry(EntityModel): # Singular per campaign, but holds multiple conflicts
     # This entry itself doesn't need a unique ID if it's always singular and known.
     # If there's a possibility of this structure changing, an ID might be added.
     conflicts: List[Conflict] = field(default_factory=list)
 
-@dataclass
-class MagicItemTierData:
-    common_items: List[str] = field(default_factory=list)
-    uncommon_items: List[str] = field(default_factory=list)
-    rare_items: List[str] = field(default_factory=list)
-    very_rare_items: List[str] = field(default_factory=list)
-    legendary_items: List[str] = field(default_factory=list)
+@entity_dataclass
+class MagicItemTierData(EntityModel):
+    common_items: List[str] = field(default_factory=list, metadata=describe(label="Common", entity_name=True))
+    uncommon_items: List[str] = field(default_factory=list, metadata=describe(label="Uncommon", entity_name=True))
+    rare_items: List[str] = field(default_factory=list, metadata=describe(label="Rare", entity_name=True))
+    very_rare_items: List[str] = field(default_factory=list, metadata=describe(label="Very Rare", entity_name=True))
+    legendary_items: List[str] = field(default_factory=list, metadata=describe(label="Legendary", entity_name=True))
 
-@dataclass
-class MagicItemTrackerData: # Singular per campaign
+@entity_dataclass
+class MagicItemTrackerData(EntityModel): # Singular per campaign
     # Similarly, no explicit ID needed if it's always one per campaign.
-    level_tier_1_4: MagicItemTierData = field(default_factory=MagicItemTierData)
-    level_tier_5_10: MagicItemTierData = field(default_factory=MagicItemTierData)
-    level_tier_11_16: MagicItemTierData = field(default_factory=MagicItemTierData)
-    level_tier_17_20: MagicItemTierData = field(default_factory=MagicItemTierData)
+    level_tier_1_4: MagicItemTierData = field(default_factory=MagicItemTierData, metadata=describe(label="Levels 1-4"))
+    level_tier_5_10: MagicItemTierData = field(default_factory=MagicItemTierData, metadata=describe(label="Levels 5-10"))
+    level_tier_11_16: MagicItemTierData = field(default_factory=MagicItemTierData, metadata=describe(label="Levels 11-16"))
+    level_tier_17_20: MagicItemTierData = field(default_factory=MagicItemTierData, metadata=describe(label="Levels 17-20"))
 
-@dataclass
-class BastionFacility:
-    facility_id: str = field(default_factory=lambda: f"bf_{uuid.uuid4().hex[:8]}")
+@entity_dataclass
+class BastionFacility(EntityModel):
+    facility_id: str = id_field("bf")
     facility_type_name: str = ""
     space: str = ""
     order_association: str = ""
-    hirelings: str = ""
-    notes: str = ""
+    hirelings: str = rich_text_field()
+    notes: str = rich_text_field()
 
-@dataclass
-class BastionEntry:
-    entry_id: str = field(default_factory=lambda: f"bas_{uuid.uuid4().hex[:8]}")
-    bastion_name: str = ""
-    character_name: str = ""
-    level: int = 0
+@entity_dataclass
+class BastionEntry(EntityModel):
+    entry_id: str = id_field("bas")
+    bastion_name: str = column_field("Bastion Name", 0, sortable=True, entity_name=True)
+    character_name: str = column_field("Character Name", 1)
+    level: int = column_field("Level", 2, default=0, width=70)
     special_facilities: List[BastionFacility] = field(default_factory=list)
-    basic_facilities_desc: str = ""
-    bastion_defenders_desc: str = ""
+    basic_facilities_desc: str = rich_text_field()
+    bastion_defenders_desc: str = rich_text_field()
 
 # Main Campaign class to hold all data
 @dataclass
-class Campaign:
-    campaign_id: str = "" # Unique ID for the campaign
+class Campaign(ObservableCampaign):
+    campaign_id: str = field(default="", metadata=describe(FieldKind.ID)) # Unique ID for the campaign
     name: str = ""
     # The trackers dict will store lists of entries or single entry instances.
     # Keys will be tracker type names (e.g., "npc_tracker", "travel_planner").
@@ -187,6 +268,9 @@ class Campaign:
         if self.magic_item_tracker is None:
             self.magic_item_tracker = MagicItemTrackerData()
 
+# The dict collections become EntryDicts owned by the campaign (see src.model_events)
+Campaign._entry_collections = frozenset(spec.name for spec in field_specs(Campaign) if spec.kind is FieldKind.ENTRIES)
+
 # Example of how you might store all campaigns in an application
 @dataclass
 class ApplicationData:
@@ -0,0 +1,99 @@
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Container, Dict, Tuple
+
+# New IDs are "<prefix>_" followed by 24 hex digits: a 48-bit millisecond
+# timestamp, a 16-bit sequence number and 32 random bits. The fixed width
+# makes IDs with the same prefix sort in creation order as plain strings.
+# IDs in any other format, such as the 8 random hex digits used by older
+# versions, stay valid; nothing parses an ID apart from its prefix. Order IDs
+# with id_sort_key, which puts those older IDs before the new ones.
+_SEQUENCE_LIMIT = 1 << 16
+_ID_DIGITS = 24
+
+
+class IdAllocator:
+    """
+    Hands out entity IDs that are unique within the process and ordered by
+    creation time. Within one millisecond the sequence number orders IDs;
+    if the clock goes backwards the last timestamp keeps being used, so
+    order is kept. The random part keeps IDs made by separate processes,
+    e.g. on two machines whose campaigns are later merged, apart.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._random = random.Random(os.urandom(16))
+        self._last_millis = 0
+        self._sequence = 0
+
+    def new_id(self, prefix: str) -> str:
+        with self._lock:
+            millis = time.time_ns() // 1_000_000
+            if millis > self._last_millis:
+                self._last_millis = millis
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence == _SEQUENCE_LIMIT:
+                    self._last_millis += 1
+                    self._sequence = 0
+            return f"{prefix}_{self._last_millis:012x}{self._sequence:04x}{self._random.getrandbits(32):08x}"
+
+    def unique_id(self, prefix: str, taken: Container[str]) -> str:
+        """Returns a new ID that is not in taken."""
+        entity_id = self.new_id(prefix)
+        while entity_id in taken:
+            entity_id = self.new_id(prefix)
+        return entity_id
+
+
+_allocator = IdAllocator()
+
+
+def new_id(prefix: str) -> str:
+    """Returns a new ID such as "npc_0192b3c4d5e60000a1b2c3d4"."""
+    return _allocator.new_id(prefix)
+
+
+def unique_id(prefix: str, taken: Container[str]) -> str:
+    return _allocator.unique_id(prefix, taken)
+
+
+def id_factory(prefix: str) -> Callable[[], str]:
+    """Returns a dataclass default_factory making IDs with prefix."""
+    return lambda: _allocator.new_id(prefix)
+
+
+def id_prefix(entity_id: str) -> str:
+    """Returns the prefix of an ID, e.g. "npc" for "npc_1a2b3c4d"."""
+    return entity_id.split("_", 1)[0]
+
+
+def id_sort_key(entity_id: str) -> Tuple[str, str]:
+    """
+    Returns a key ordering IDs by prefix, then by creation. Shorter IDs, such
+    as the 8-digit ones of older versions that would otherwise sort between
+    or after new ones, are padded with leading zeros and so come first.
+    """
+    prefix, _, suffix = entity_id.partition("_")
+    return prefix, suffix.rjust(_ID_DIGITS, "0")
+
+
+def insert_entry(entries: Dict[str, Any], entry: Any, id_field: str = "entry_id") -> str:
+    """
+    Stores entry in entries under its ID. If another entry already has that
+    ID, entry is given a new one with the same prefix instead of replacing it.
+
+    Returns:
+        The ID entry was stored under.
+    """
+    entity_id = getattr(entry, id_field)
+    existing = entries.get(entity_id)
+    if existing is not None and existing is not entry:
+        entity_id = unique_id(id_prefix(entity_id), entries)
+        setattr(entry, id_field, entity_id)
+    entries[entity_id] = entry
+    return entity_id
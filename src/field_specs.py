@@ -0,0 +1,159 @@
+from dataclasses import dataclass, fields, is_dataclass
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple, get_args, get_origin, get_type_hints
+
+from src.rich_text import html_to_text, text_snippet
+
+
+class FieldKind(Enum):
+    ID = "id"                   # An entity ID, e.g. entry_id
+    PLAIN_TEXT = "plain_text"   # A str edited in a QLineEdit
+    RICH_TEXT = "rich_text"     # HTML from a QTextEdit, stored compact (see src.rich_text)
+    ENUM = "enum"               # A str from a fixed set of choices
+    INT = "int"
+    BOOL = "bool"
+    LIST = "list"               # A list of strs or of dataclasses (item_type)
+    ENTRIES = "entries"         # A dict of dataclass entries (item_type) keyed by ID
+    MODEL = "model"             # A single nested dataclass
+
+
+# Kinds whose values are shown and searched as text
+TEXT_KINDS = frozenset({FieldKind.PLAIN_TEXT, FieldKind.RICH_TEXT, FieldKind.ENUM})
+NUMERIC_KINDS = frozenset({FieldKind.INT})
+
+_SPEC_METADATA_KEY = "spec"
+SNIPPET_LENGTH = 75
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    What the app knows about one field of a data model.
+
+    Attributes:
+        name: The field name.
+        kind: How the value is stored and edited.
+        type: The resolved type hint.
+        item_type: The element class of LIST and ENTRIES fields.
+        searchable: Whether the search index includes the field. For LIST,
+            ENTRIES and MODEL fields of dataclasses it means the nested
+            models' searchable fields are included.
+        sortable: Whether tables can order entries by the field.
+        label: The column header when the field is shown in a tracker table.
+        column: The position of that column, or None if it is not shown.
+        width: The column width in pixels; None stretches the column.
+        choices: The allowed values of an ENUM field.
+        entity_name: Whether the field holds the name of its entity, or for a
+            LIST of strs the names of the items, as matched by src.name_matcher.
+    """
+    name: str
+    kind: FieldKind
+    type: Any
+    item_type: Any = None
+    searchable: bool = False
+    sortable: bool = False
+    label: str = ""
+    column: Optional[int] = None
+    width: Optional[int] = None
+    choices: Tuple[str, ...] = ()
+    entity_name: bool = False
+
+
+def describe(kind: Optional[FieldKind] = None, **options: Any) -> Dict[str, Any]:
+    """
+    Returns dataclass field metadata declaring the FieldSpec options of a
+    field, e.g. field(default="", metadata=describe(label="Name", column=0)).
+    The kind is inferred from the type hint when not given.
+    """
+    unknown = set(options) - {"searchable", "sortable", "label", "column", "width", "choices", "entity_name"}
+    if unknown:
+        raise TypeError(f"Unknown field spec options: {', '.join(sorted(unknown))}")
+    return {_SPEC_METADATA_KEY: dict(options, kind=kind)}
+
+
+def _infer_kind(field_type: Any) -> Tuple[FieldKind, Any]:
+    origin_type = get_origin(field_type)
+    args_type = get_args(field_type)
+    if origin_type is list:
+        return FieldKind.LIST, args_type[0] if args_type else None
+    if origin_type is dict:
+        return FieldKind.ENTRIES, args_type[1] if len(args_type) == 2 else None
+    if is_dataclass(field_type):
+        return FieldKind.MODEL, field_type
+    if field_type is bool:
+        return FieldKind.BOOL, None
+    if field_type is int:
+        return FieldKind.INT, None
+    return FieldKind.PLAIN_TEXT, None
+
+
+def _build_field_specs(data_class: type) -> Tuple[FieldSpec, ...]:
+    type_hints = get_type_hints(data_class)
+    specs = []
+    for f in fields(data_class):
+        options = dict(f.metadata.get(_SPEC_METADATA_KEY, {}))
+        field_type = type_hints[f.name]
+        kind, item_type = _infer_kind(field_type)
+        kind = options.pop("kind", None) or kind
+        options.setdefault("searchable", kind in TEXT_KINDS or kind in (FieldKind.LIST, FieldKind.MODEL))
+        specs.append(FieldSpec(name=f.name, kind=kind, type=field_type, item_type=item_type, **options))
+    return tuple(specs)
+
+
+_FIELD_SPECS: Dict[type, Tuple[FieldSpec, ...]] = {}
+_TABLE_COLUMNS: Dict[type, Tuple[FieldSpec, ...]] = {}
+
+
+def field_specs(data_class: type) -> Tuple[FieldSpec, ...]:
+    """Returns the FieldSpecs of data_class in field order. They are built once per class."""
+    specs = _FIELD_SPECS.get(data_class)
+    if specs is None:
+        specs = _FIELD_SPECS[data_class] = _build_field_specs(data_class)
+    return specs
+
+
+def field_spec(data_class: type, name: str) -> FieldSpec:
+    for spec in field_specs(data_class):
+        if spec.name == name:
+            return spec
+    raise KeyError(f"{data_class.__name__} has no field '{name}'")
+
+
+def table_columns(data_class: type) -> Tuple[FieldSpec, ...]:
+    """Returns the specs of the fields shown as tracker table columns, in column order."""
+    columns = _TABLE_COLUMNS.get(data_class)
+    if columns is None:
+        columns = _TABLE_COLUMNS[data_class] = tuple(sorted(
+            (spec for spec in field_specs(data_class) if spec.column is not None), key=lambda spec: spec.column))
+    return columns
+
+
+def search_fields(data_class: type) -> Tuple[FieldSpec, ...]:
+    return tuple(spec for spec in field_specs(data_class) if spec.searchable)
+
+
+def sort_key(data_class: type) -> Optional[Callable[[Any], Any]]:
+    """
+    Returns a key function ordering entries by the first sortable table
+    column (case-insensitively for text), or None if no column is sortable.
+    """
+    spec = next((spec for spec in table_columns(data_class) if spec.sortable), None)
+    if spec is None:
+        return None
+    name = spec.name
+    if spec.kind in TEXT_KINDS:
+        return lambda entry: getattr(entry, name).casefold()
+    return lambda entry: getattr(entry, name)
+
+
+def display_text(spec: FieldSpec, value: Any) -> str:
+    """
+    Returns the text shown for value in a table cell of the column described
+    by spec. Rich text is converted on every call; entries cache it, see
+    EntityModel.snippet in src.data_models.
+    """
+    if spec.kind in (FieldKind.LIST, FieldKind.ENTRIES):
+        return str(len(value))
+    if spec.kind is FieldKind.RICH_TEXT:
+        return text_snippet(html_to_text(value), SNIPPET_LENGTH)
+    return "" if value is None else str(value)
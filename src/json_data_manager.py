@@ -1,25 +1,213 @@
+import codecs
+import copy
+import hashlib
+import io
 import json
 import logging
 import os
-from dataclasses import asdict, is_dataclass
-from typing import TypeVar, Type, Dict, List, Any
+import re
+import shutil
+import tempfile
+import threading
+from dataclasses import MISSING, Field, fields, is_dataclass
+from json.encoder import encode_basestring # The string encoder json.dump uses with ensure_ascii=False
+from typing import (
+    TypeVar, Type, Dict, List, Any, Optional, Set, Tuple, Callable, Iterable, Iterator
+)
 
 from src.data_models import (
-    ApplicationData, Campaign, GameExpectationsEntry, SensitiveElement,
+    ApplicationData, Campaign, EntityModel, GameExpectationsEntry, SensitiveElement,
     TravelPlanEntry, TravelStage, NPCEntry, SettlementEntry,
     CampaignJournalEntry, DMCharacterEntry, CampaignConflictEntry, Conflict,
     MagicItemTrackerData, MagicItemTierData, BastionEntry, BastionFacility
 )
+from src.field_specs import FieldKind, FieldSpec, field_spec, field_specs
+from src.lazy_campaigns import LazyCampaigns, campaign_name, peek_campaign
+from src.load_cache import (
+    Fingerprint, cache_path, file_fingerprint, read_load_cache, remove_load_cache, write_load_cache
+)
+from src.rich_text import compact_rich_text
 
 # Setup basic logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 T = TypeVar('T')
 
+# Layout of the per-campaign ("sharded") storage format: a directory holding a
+# small index file plus one JSON file per campaign.
+SHARD_INDEX_FILE_NAME = "index.json"
+SHARD_CAMPAIGNS_DIR_NAME = "campaigns"
+SHARD_FORMAT_VERSION = 1
+
+_SAFE_SHARD_NAME_RE = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# File extensions that select the SQLite storage format (see sqlite_data_manager).
+SQLITE_FILE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Saves of a JSON file that come with a ChangeSet append the changes to a
+# journal next to it (see append_journal). Once the journal reaches the
+# threshold, the next save rewrites the JSON file and removes the journal.
+JOURNAL_FILE_SUFFIX = ".journal"
+JOURNAL_COMPACTION_THRESHOLD_BYTES = 1 << 20
+
+
+class ChangeSet:
+    """
+    Records what changed since the last save.
+
+    Changes are tracked per campaign and, where the caller knows it, per entry
+    (collection name such as "npcs" plus entry ID). Storage layouts that can
+    write campaigns or rows independently use it to skip unchanged data; the
+    single-file layout ignores it.
+    """
+
+    def __init__(self):
+        self.campaign_ids: Set[str] = set() # Campaigns changed as a whole
+        self.entries: Dict[str, Set[Tuple[str, str]]] = {} # campaign_id -> {(collection, entry_id)}
+        self.all_campaigns = False
+
+    def mark_campaign(self, campaign_id: Optional[str]) -> None:
+        if campaign_id:
+            self.campaign_ids.add(campaign_id)
+
+    def mark_entry(self, campaign_id: Optional[str], collection: str, entry_id: str) -> None:
+        """Records that one entry of a campaign collection was added, edited or deleted."""
+        if campaign_id:
+            self.entries.setdefault(campaign_id, set()).add((collection, entry_id))
+
+    def mark_all(self) -> None:
+        self.all_campaigns = True
+
+    def is_campaign_dirty(self, campaign_id: str) -> bool:
+        return self.all_campaigns or campaign_id in self.campaign_ids or campaign_id in self.entries
+
+    def get_entry_changes(self, campaign_id: str) -> Optional[Set[Tuple[str, str]]]:
+        """
+        Returns the (collection, entry_id) pairs changed in a campaign, or None
+        if the campaign changed as a whole and must be written completely.
+        """
+        if self.all_campaigns or campaign_id in self.campaign_ids:
+            return None
+        return self.entries.get(campaign_id, set())
+
+    def update(self, other: 'ChangeSet') -> None:
+        """Merges the changes recorded in other into this change set."""
+        self.campaign_ids.update(other.campaign_ids)
+        for campaign_id, entries in other.entries.items():
+            self.entries.setdefault(campaign_id, set()).update(entries)
+        self.all_campaigns = self.all_campaigns or other.all_campaigns
+
+    def clear(self) -> None:
+        self.campaign_ids.clear()
+        self.entries.clear()
+        self.all_campaigns = False
+
+    def __bool__(self) -> bool:
+        return self.all_campaigns or bool(self.campaign_ids) or bool(self.entries)
+
+
+def _resolve_missing_value(f: Field) -> Tuple[bool, Any]:
+    """
+    Returns (is_factory, value) describing what to use when a field is missing
+    or None in the input: the field's default, its default_factory, or None.
+    """
+    if f.default is not MISSING and f.default is not None:
+        return False, f.default
+    if f.default_factory is not MISSING:
+        return True, f.default_factory
+    return False, None
+
+
+def _compile_field_converter(spec: FieldSpec) -> Optional[Callable[[Any], Any]]:
+    """Returns a function converting a JSON value for the field spec describes, or None if it is used as-is."""
+    item_type = spec.item_type
+    if spec.kind is FieldKind.RICH_TEXT:
+        # Older files store the full HTML from QTextEdit.toHtml()
+        return compact_rich_text
+    if spec.kind is FieldKind.LIST and is_dataclass(item_type):
+        # List of dataclasses
+        build_item = _get_from_dict_plan(item_type)
+        return lambda value: [build_item(item) for item in value if isinstance(item, dict)]
+    if spec.kind is FieldKind.ENTRIES and is_dataclass(item_type):
+        # Dict of [str, dataclass]
+        build_value = _get_from_dict_plan(item_type)
+        return lambda value: {k: build_value(v) for k, v in value.items() if isinstance(v, dict)}
+    if spec.kind is FieldKind.MODEL:
+        # Nested dataclass; _from_dict also copes with values that are not dicts
+        return lambda value: _from_dict(item_type, value)
+    # Primitive type or list of primitives
+    return None
+
+
+def _compile_from_dict_plan(data_class: Type[T]) -> Callable[[Dict[str, Any]], T]:
+    """
+    Builds the constructor used by _from_dict for one dataclass.
+
+    Field kinds, nested converters and defaults are resolved once here from
+    the field specs, so rebuilding each instance only loops over a
+    precomputed tuple of steps.
+    """
+    specs = {spec.name: spec for spec in field_specs(data_class)}
+    steps = []
+    for f in fields(data_class):
+        if not f.init:
+            continue
+        is_factory, missing_value = _resolve_missing_value(f)
+        steps.append((f.name, _compile_field_converter(specs[f.name]), is_factory, missing_value))
+    steps = tuple(steps)
+    # Like a copy or unpickled entry, a loaded one is not a change, so its fields are set
+    # past the change event hooks (see src.model_events) when there is no __init__ logic.
+    restore_state = (issubclass(data_class, EntityModel) and not hasattr(data_class, "__post_init__")
+                     and all(f.init for f in fields(data_class)))
+
+    def build(data: Dict[str, Any]) -> T:
+        kwargs = {}
+        for field_name, convert, is_factory, missing_value in steps:
+            field_data = data.get(field_name)
+            if field_data is None:
+                # Rely on the dataclass default or default_factory
+                kwargs[field_name] = missing_value() if is_factory else missing_value
+            elif convert is None:
+                kwargs[field_name] = field_data
+            else:
+                kwargs[field_name] = convert(field_data)
+
+        if restore_state:
+            instance = data_class.__new__(data_class)
+            instance.__setstate__((None, kwargs))
+            return instance
+        try:
+            return data_class(**kwargs) # type: ignore
+        except TypeError as e: # pragma: no cover
+            logging.error(f"TypeError reconstructing {data_class.__name__} with kwargs {kwargs}: {e}")
+            logging.error(f"Original data for {data_class.__name__}: {data}")
+            # Attempt to return a default instance if construction fails
+            try:
+                return data_class() # type: ignore
+            except TypeError:
+                logging.error(f"Could not create a default instance for {data_class.__name__} after TypeError.")
+                return None # type: ignore
+
+    return build
+
+
+# One compiled constructor per dataclass, built the first time it is needed.
+_FROM_DICT_PLANS: Dict[type, Callable[[Dict[str, Any]], Any]] = {}
+
+
+def _get_from_dict_plan(data_class: Type[T]) -> Callable[[Dict[str, Any]], T]:
+    plan = _FROM_DICT_PLANS.get(data_class)
+    if plan is None:
+        plan = _FROM_DICT_PLANS[data_class] = _compile_from_dict_plan(data_class)
+    return plan
+
+
 def _from_dict(data_class: Type[T], data: Dict[str, Any]) -> T:
     """
     Helper function to recursively convert a dictionary to a dataclass instance.
     Handles nested dataclasses and lists of dataclasses.
+
+    Missing or None fields fall back to the dataclass default or default_factory.
     """
     if not isinstance(data, dict):
         # If data is not a dict, it might be a primitive type for a list, or an error
@@ -33,110 +221,1162 @@ def _from_dict(data_class: Type[T], data: Dict[str, Any]) -> T:
             logging.error(f"Could not create a default instance for {data_class.__name__}")
             return None # type: ignore
 
+    return _get_from_dict_plan(data_class)(data)
+
+
+def _is_sharded_path(filepath: str) -> bool:
+    """
+    A directory selects the per-campaign layout. A path that does not exist
+    yet selects it when it ends with a path separator, e.g. "campaigns/".
+    """
+    return os.path.isdir(filepath) or filepath.endswith(("/", os.sep))
+
+
+def _is_sqlite_path(filepath: str) -> bool:
+    return os.path.splitext(filepath)[1].lower() in SQLITE_FILE_EXTENSIONS
+
+
+class _JsonStreamWriter:
+    """
+    Writes dataclasses, dicts, lists and primitives as JSON, walking the
+    objects directly instead of building an asdict() copy first.
+
+    Output is buffered in small chunks and flushed to the file as it grows, so
+    memory use does not depend on the size of the data. With an indent the
+    output matches json.dump(..., indent=indent, ensure_ascii=False).
+    """
+
+    _FLUSH_THRESHOLD = 4096 # Buffered parts before writing them out
 
-    kwargs = {}
-    for field_name, field_type in data_class.__annotations__.items():
-        field_data = data.get(field_name)
-        if field_data is None:
-            # If field_data is None, rely on dataclass default_factory or default value
-            # Check if field has a default value or factory in the dataclass
-            if hasattr(data_class, field_name) and getattr(data_class, field_name) is not None:
-                 kwargs[field_name] = getattr(data_class, field_name)
-            elif hasattr(data_class.__dataclass_fields__[field_name], 'default_factory') \
-                    and data_class.__dataclass_fields__[field_name].default_factory is not None:
-                kwargs[field_name] = data_class.__dataclass_fields__[field_name].default_factory()
+    # Field names (with their encoded JSON keys) for each dataclass, computed once.
+    _field_keys: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+    def __init__(self, fp, indent: Optional[int] = 4):
+        self._fp = fp
+        self._parts: List[str] = []
+        self._indent = indent
+        self._key_separator = ': ' if indent is not None else ':'
+        self._newlines: List[str] = []
+
+    def write(self, value: Any) -> None:
+        self._write_value(value, 0)
+        self._flush()
+
+    def _flush(self):
+        if self._parts:
+            self._fp.write(''.join(self._parts))
+            self._parts.clear()
+
+    def _newline(self, level: int) -> str:
+        # '\n' plus indentation for the given nesting level ('' when compact)
+        if self._indent is None:
+            return ''
+        while len(self._newlines) <= level:
+            self._newlines.append('\n' + ' ' * (self._indent * len(self._newlines)))
+        return self._newlines[level]
+
+    @classmethod
+    def _get_field_keys(cls, data_class: type) -> Tuple[Tuple[str, str], ...]:
+        keys = cls._field_keys.get(data_class)
+        if keys is None:
+            keys = cls._field_keys[data_class] = tuple(
+                (spec.name, encode_basestring(spec.name)) for spec in field_specs(data_class)
+            )
+        return keys
+
+    def _write_value(self, value: Any, level: int):
+        append = self._parts.append
+        if isinstance(value, str):
+            append(encode_basestring(value))
+        elif value is None:
+            append('null')
+        elif value is True:
+            append('true')
+        elif value is False:
+            append('false')
+        elif isinstance(value, int):
+            append(int.__repr__(value))
+        elif isinstance(value, float):
+            append(json.dumps(value))
+        elif is_dataclass(value) and not isinstance(value, type):
+            self._write_object(
+                [(key, getattr(value, name)) for name, key in self._get_field_keys(type(value))], level)
+        elif isinstance(value, dict):
+            self._write_object([(_encode_json_key(k), v) for k, v in value.items()], level)
+        elif isinstance(value, LazyCampaigns):
+            # Generator, so unloaded campaigns are loaded (and released) one at a time
+            self._write_object(((encode_basestring(k), v) for k, v in value.iter_serializable()), level)
+        elif isinstance(value, (list, tuple)):
+            self._write_array(value, level)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+        if len(self._parts) >= self._FLUSH_THRESHOLD:
+            self._flush()
+
+    def _write_object(self, items: Iterable[Tuple[str, Any]], level: int):
+        append = self._parts.append
+        inner_newline = self._newline(level + 1)
+        empty = True
+        for key, item_value in items:
+            append('{' + inner_newline if empty else ',' + inner_newline)
+            empty = False
+            append(key)
+            append(self._key_separator)
+            self._write_value(item_value, level + 1)
+        if empty:
+            append('{}')
+            return
+        append(self._newline(level))
+        append('}')
+
+    def _write_array(self, values: List[Any], level: int):
+        append = self._parts.append
+        if not values:
+            append('[]')
+            return
+        inner_newline = self._newline(level + 1)
+        append('[')
+        for i, item_value in enumerate(values):
+            append(inner_newline if i == 0 else ',' + inner_newline)
+            self._write_value(item_value, level + 1)
+        append(self._newline(level))
+        append(']')
+
+
+def _encode_json_key(key: Any) -> str:
+    """Encodes a dict key the way json.dump does: numbers, booleans and None become their JSON text."""
+    if isinstance(key, str):
+        return encode_basestring(key)
+    if key is True or key is False or key is None or isinstance(key, float):
+        return '"' + json.dumps(key) + '"'
+    if isinstance(key, int):
+        return '"' + int.__repr__(key) + '"'
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+def write_json(value: Any, fp, compact: bool = False) -> None:
+    """
+    Streams value (a dataclass instance, dict, list or primitive) to fp as JSON.
+
+    Args:
+        value: The object to write.
+        fp: A text file object opened for writing.
+        compact: If True, omit indentation and whitespace.
+    """
+    _JsonStreamWriter(fp, indent=None if compact else 4).write(value)
+
+
+class _JsonStreamReader:
+    """
+    Pull parser that walks a JSON document from a binary file in chunks.
+
+    Containers whose children should be handled one at a time are entered with
+    iter_object(); everything else is decoded whole with read_value(). Only the
+    unread part of the current chunk is kept, so the raw text of the file is
+    never held in memory all at once.
+
+    Args:
+        fp: A file object opened in binary mode.
+        progress_callback: Called as progress_callback(bytes_read, total_bytes)
+            each time another chunk is read.
+        total_bytes: Size of the file, passed on to progress_callback.
+    """
+
+    _CHUNK_SIZE = 1 << 16
+    _WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, fp, progress_callback: Optional[Callable[[int, int], None]] = None,
+                 total_bytes: int = 0):
+        self._fp = fp
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self._bytes_read = 0
+        self._buffer_offset = fp.tell() # Position of the start of the buffer in the file, in bytes
+        self._total_bytes = total_bytes
+        self._progress_callback = progress_callback
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the unread text. Returns False at the end of the file."""
+        if self._eof:
+            return False
+        # Read at least as much as is buffered, so retries on one large value stay linear
+        data = self._fp.read(max(self._CHUNK_SIZE, len(self._buffer) - self._pos))
+        if self._bytes_read == 0 and data.startswith(codecs.BOM_UTF8):
+            self._buffer_offset += len(codecs.BOM_UTF8) # Dropped by the decoder
+        self._bytes_read += len(data)
+        self._buffer_offset += len(self._buffer[:self._pos].encode('utf-8'))
+        self._buffer = self._buffer[self._pos:] + self._decoder.decode(data, final=not data)
+        self._pos = 0
+        self._eof = not data
+        if self._progress_callback:
+            self._progress_callback(self._bytes_read, max(self._total_bytes, self._bytes_read))
+        return True
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._pos)
+
+    def peek(self) -> str:
+        """Skips whitespace and returns the next character ('' at the end of the file)."""
+        while True:
+            self._pos = self._WHITESPACE_RE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def byte_offset(self) -> int:
+        """Returns the position of the next unread character in the file, in bytes."""
+        return self._buffer_offset + len(self._buffer[:self._pos].encode('utf-8'))
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Enters a JSON object and yields its keys. The caller must consume each
+        key's value (with read_value() or iter_object()) before resuming.
+        """
+        self._expect('{')
+        if self.peek() == '}':
+            self._pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise self._error("Expecting property name enclosed in double quotes")
+            key = self.read_value()
+            self._expect(':')
+            yield key
+            next_char = self.peek()
+            self._pos += 1
+            if next_char == '}':
+                return
+            if next_char != ',':
+                self._pos -= 1
+                raise self._error("Expecting ',' delimiter")
+
+    def expect_end(self):
+        if self.peek() != '':
+            raise self._error("Extra data")
+
+
+def _get_streamed_fields(data_class: type) -> Dict[str, type]:
+    """Returns {field name: value class} for the Dict[str, dataclass] fields of data_class."""
+    streamed = _STREAMED_FIELDS.get(data_class)
+    if streamed is None:
+        streamed = _STREAMED_FIELDS[data_class] = {
+            spec.name: spec.item_type for spec in field_specs(data_class)
+            if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type)
+        }
+    return streamed
+
+
+_STREAMED_FIELDS: Dict[type, Dict[str, type]] = {}
+
+
+def _stream_from_dict(reader: _JsonStreamReader, data_class: Type[T]) -> T:
+    """
+    Reads the next JSON value as data_class, like _from_dict(data_class, value).
+
+    Dict[str, dataclass] fields are read one entry at a time. Entries that hold
+    such fields themselves (campaigns) are streamed the same way; all others
+    (NPCs, journal entries, ...) are decoded and converted one by one, so only
+    a single entity is ever held as plain dicts.
+    """
+    if reader.peek() != '{':
+        return _from_dict(data_class, reader.read_value())
+
+    streamed_fields = _get_streamed_fields(data_class)
+    data: Dict[str, Any] = {}
+    built: Dict[str, Dict[str, Any]] = {}
+    for key in reader.iter_object():
+        value_class = streamed_fields.get(key)
+        if value_class is None or reader.peek() != '{':
+            data[key] = reader.read_value()
+            built.pop(key, None)
+            continue
+        data.pop(key, None)
+        entries = built[key] = {}
+        stream_entries = bool(_get_streamed_fields(value_class))
+        build_entry = _get_from_dict_plan(value_class)
+        for entry_key in reader.iter_object():
+            if stream_entries:
+                if reader.peek() == '{':
+                    entries[entry_key] = _stream_from_dict(reader, value_class)
+                else:
+                    reader.read_value() # Not an object; skipped as in _from_dict
             else:
-                kwargs[field_name] = None # Or some other sensible default if None is not appropriate
+                entry = reader.read_value()
+                if isinstance(entry, dict):
+                    entries[entry_key] = build_entry(entry)
+
+    instance = _from_dict(data_class, data)
+    for field_name, entries in built.items():
+        setattr(instance, field_name, entries)
+    return instance
+
+
+def _scan_campaigns(reader: _JsonStreamReader) -> Iterator[Tuple[str, Any, int]]:
+    """
+    Reads the "campaigns" object of a JSON data file and yields (campaign_id,
+    name, byte offset) for each campaign. The other fields are decoded one at
+    a time and dropped, which is faster than scanning over them in Python.
+    """
+    for campaign_id in reader.iter_object():
+        if reader.peek() != '{':
+            reader.read_value() # Not an object; skipped as in _from_dict
             continue
+        offset = reader.byte_offset()
+        name = ""
+        for key in reader.iter_object():
+            value = reader.read_value()
+            if key == "name":
+                name = value or ""
+        yield campaign_id, name, offset
+
+
+class _JsonCampaignReader:
+    """
+    Builds single campaigns of a JSON data file, streaming just that campaign
+    from where it starts in the file. Should the file have been rewritten
+    since its campaigns were found (see save_data), it is scanned again; the
+    campaigns not loaded yet were not changed, so they read the same.
+
+    Used from the GUI thread and the saving thread alike, so lookups are locked.
+    """
+
+    def __init__(self, filepath: str, file_stat: os.stat_result, offsets: Dict[str, int]):
+        self._filepath = filepath
+        self._file_key = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+        self._offsets = offsets
+        self._lock = threading.Lock()
+
+    def load(self, campaign_id: str, source: Any = None) -> Campaign:
+        with self._lock, open(self._filepath, 'rb') as f:
+            file_stat = os.fstat(f.fileno())
+            if (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns) != self._file_key:
+                reader = _JsonStreamReader(f)
+                offsets = None
+                for key in reader.iter_object():
+                    if key == "campaigns" and reader.peek() == '{':
+                        offsets = {found_id: offset for found_id, _, offset in _scan_campaigns(reader)}
+                    else:
+                        reader.read_value()
+                self._offsets = offsets or {}
+                self._file_key = (file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns)
+            f.seek(self._offsets[campaign_id])
+            return _stream_from_dict(_JsonStreamReader(f), Campaign)
+
+
+def _stream_lazy_application_data(reader: _JsonStreamReader, filepath: str,
+                                  file_stat: os.stat_result) -> ApplicationData:
+    """
+    Reads ApplicationData with only the IDs, names and positions of its
+    campaigns; each campaign is streamed from the file when it is first
+    accessed (see LazyCampaigns and _JsonCampaignReader).
+    """
+    if reader.peek() != '{':
+        return _from_dict(ApplicationData, reader.read_value())
+
+    data: Dict[str, Any] = {}
+    headers: Optional[List[Tuple[str, Any, int]]] = None
+    for key in reader.iter_object():
+        if key == "campaigns" and reader.peek() == '{':
+            headers = list(_scan_campaigns(reader))
+        else:
+            data[key] = reader.read_value()
+            if key == "campaigns":
+                headers = None
+
+    application_data = _from_dict(ApplicationData, data)
+    if headers is not None:
+        campaign_reader = _JsonCampaignReader(filepath, file_stat,
+                                              {campaign_id: offset for campaign_id, _, offset in headers})
+        application_data.campaigns = LazyCampaigns(
+            [(campaign_id, name, None) for campaign_id, name, _ in headers], campaign_reader.load, reloadable=False)
+    return application_data
+
+
+def read_json_data(filepath: str, lazy: bool = False,
+                   progress_callback: Optional[Callable[[int, int], None]] = None) -> ApplicationData:
+    """
+    Reads ApplicationData from a JSON file with the streaming reader.
+
+    Args:
+        filepath: The JSON file to read.
+        lazy: If True, only the IDs and names of the campaigns are read;
+            each campaign is read from the file on first access (see
+            LazyCampaigns).
+        progress_callback: Called as progress_callback(bytes_read, total_bytes)
+            while the file is read.
+
+    Returns:
+        The ApplicationData object.
 
-        origin_type = getattr(field_type, '__origin__', None)
-        args_type = getattr(field_type, '__args__', ())
-
-        if origin_type is list and args_type and is_dataclass(args_type[0]):
-            # List of dataclasses
-            kwargs[field_name] = [_from_dict(args_type[0], item) for item in field_data if isinstance(item, dict)]
-        elif origin_type is dict and args_type and len(args_type) == 2 and is_dataclass(args_type[1]):
-            # Dict of [str, dataclass]
-            kwargs[field_name] = {k: _from_dict(args_type[1], v) for k, v in field_data.items() if isinstance(v, dict)}
-        elif is_dataclass(field_type):
-            # Nested dataclass
-            kwargs[field_name] = _from_dict(field_type, field_data)
+    Raises:
+        IOError: If the file cannot be read.
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    with open(filepath, 'rb') as f:
+        reader = _JsonStreamReader(f, progress_callback, os.fstat(f.fileno()).st_size)
+        if lazy:
+            application_data = _stream_lazy_application_data(reader, filepath, os.fstat(f.fileno()))
         else:
-            # Primitive type or list of primitives
-            kwargs[field_name] = field_data
+            application_data = _stream_from_dict(reader, ApplicationData)
+        reader.expect_end()
+    return application_data
+
+
+def _atomic_write_json(data: Any, filepath: str, compact: bool = False) -> None:
+    """Writes JSON to a temporary file next to filepath and moves it into place."""
+    directory = os.path.dirname(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp_", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write_json(data, f, compact)
+        if os.path.exists(filepath):
+            shutil.copymode(filepath, temp_path)
+        os.replace(temp_path, filepath)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def _shard_file_name(campaign_id: str) -> str:
+    """Returns the file name (relative to the campaigns directory) for a campaign shard."""
+    if _SAFE_SHARD_NAME_RE.match(campaign_id):
+        return f"{campaign_id}.json"
+    # Campaign IDs from imported data may contain characters that are not safe in file names.
+    return f"{hashlib.sha1(campaign_id.encode('utf-8')).hexdigest()}.json"
+
+
+def save_sharded_data(application_data: ApplicationData, dirpath: str,
+                      changes: Optional[ChangeSet] = None, compact: bool = False) -> bool:
+    """
+    Saves ApplicationData as one JSON file per campaign plus a small index file.
 
+    Args:
+        application_data: The ApplicationData object to save.
+        dirpath: The directory holding the index and the campaign files.
+        changes: Campaigns changed since the last save. Only these campaigns
+            (and campaigns with no file on disk yet) are rewritten. If None,
+            every campaign is written.
+        compact: If True, write JSON without indentation.
+
+    Returns:
+        True if saving was successful, False otherwise.
+    """
     try:
-        return data_class(**kwargs) # type: ignore
+        campaigns_dir = os.path.join(dirpath, SHARD_CAMPAIGNS_DIR_NAME)
+        os.makedirs(campaigns_dir, exist_ok=True)
+
+        index_entries = []
+        referenced_files = set()
+        written = 0
+        campaigns = application_data.campaigns
+        for campaign_id in campaigns:
+            file_name = _shard_file_name(campaign_id)
+            shard_path = os.path.join(campaigns_dir, file_name)
+            if changes is None or changes.is_campaign_dirty(campaign_id) or not os.path.exists(shard_path):
+                try:
+                    campaign = campaigns[campaign_id]
+                except KeyError:
+                    # Never loaded, and its file is gone. Keep it in the index, so the campaign
+                    # comes back if the file is restored, and save the others.
+                    logging.error(f"Campaign '{campaign_id}' not saved: its file {shard_path} is missing.")
+                else:
+                    _atomic_write_json(campaign, shard_path, compact)
+                    written += 1
+            referenced_files.add(file_name)
+            index_entries.append({
+                "campaign_id": campaign_id,
+                "name": campaign_name(campaigns, campaign_id),
+                "file": f"{SHARD_CAMPAIGNS_DIR_NAME}/{file_name}",
+            })
+
+        index = {
+            "format_version": SHARD_FORMAT_VERSION,
+            "active_campaign_id": application_data.active_campaign_id,
+            "campaigns": index_entries,
+        }
+        _atomic_write_json(index, os.path.join(dirpath, SHARD_INDEX_FILE_NAME), compact)
+
+        # Remove files of campaigns that no longer exist. This happens after the
+        # index is written so a crash never leaves the index pointing at nothing.
+        for file_name in os.listdir(campaigns_dir):
+            if file_name.endswith(".json") and file_name not in referenced_files:
+                os.remove(os.path.join(campaigns_dir, file_name))
+
+        logging.info(f"Data successfully saved to {dirpath} ({written} of {len(index_entries)} campaign files written)")
+        return True
+    except (IOError, OSError) as e: # pragma: no cover
+        logging.error(f"Error saving data to {dirpath}: {e}")
     except TypeError as e: # pragma: no cover
-        logging.error(f"TypeError reconstructing {data_class.__name__} with kwargs {kwargs}: {e}")
-        logging.error(f"Original data for {data_class.__name__}: {data}")
-        # Attempt to return a default instance if construction fails
+        logging.error(f"TypeError during serialization: {e}. Check data_models for non-serializable types.")
+    except Exception as e: # pragma: no cover
+        logging.error(f"An unexpected error occurred while saving data to {dirpath}: {e}")
+    return False
+
+
+def load_sharded_data(dirpath: str, lazy: bool = False) -> ApplicationData:
+    """
+    Loads ApplicationData from the per-campaign layout written by save_sharded_data.
+
+    Args:
+        dirpath: The directory holding the index and the campaign files.
+        lazy: If True, only the index is read; each campaign file is read the
+            first time its campaign is accessed (see LazyCampaigns).
+
+    Returns:
+        An ApplicationData object. If the index is missing or corrupted, a new
+        ApplicationData instance is returned. Campaign files that cannot be read
+        are skipped and logged.
+    """
+    index_path = os.path.join(dirpath, SHARD_INDEX_FILE_NAME)
+    if not os.path.exists(index_path):
+        logging.info(f"Index {index_path} not found. Returning new ApplicationData instance.")
+        return ApplicationData()
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (IOError, json.JSONDecodeError) as e:
+        logging.error(f"Error loading index {index_path}: {e}. Returning new ApplicationData.")
+        return ApplicationData()
+
+    def load_shard(campaign_id: str, shard_path: Optional[str]) -> Campaign:
+        # Campaigns created after loading have no source; their file name follows from the ID.
+        if shard_path is None:
+            shard_path = os.path.join(dirpath, SHARD_CAMPAIGNS_DIR_NAME, _shard_file_name(campaign_id))
+        with open(shard_path, 'r', encoding='utf-8') as f:
+            return _from_dict(Campaign, json.load(f))
+
+    application_data = ApplicationData(active_campaign_id=index.get("active_campaign_id") or "")
+    headers = [
+        (entry.get("campaign_id"), entry.get("name") or "", os.path.join(dirpath, entry.get("file", "")))
+        for entry in index.get("campaigns", [])
+    ]
+    if lazy:
+        application_data.campaigns = LazyCampaigns(headers, load_shard)
+        return application_data
+
+    for campaign_id, _, shard_path in headers:
         try:
-            return data_class() # type: ignore
-        except TypeError:
-            logging.error(f"Could not create a default instance for {data_class.__name__} after TypeError.")
-            return None # type: ignore
+            application_data.campaigns[campaign_id] = load_shard(campaign_id, shard_path)
+        except (IOError, json.JSONDecodeError) as e:
+            logging.error(f"Error loading campaign '{campaign_id}' from {shard_path}: {e}. Skipping it.")
+    return application_data
+
+
+def _journal_path(filepath: str) -> str:
+    return filepath + JOURNAL_FILE_SUFFIX
+
+
+def storage_files(filepath: str, campaign_id: str) -> List[str]:
+    """
+    Returns the files that save_data writes a campaign's data to: its shard
+    in the per-campaign layout, else the database or the JSON file and its
+    journal. Files that do not exist yet are included.
+    """
+    if _is_sqlite_path(filepath):
+        return [filepath]
+    if _is_sharded_path(filepath):
+        return [os.path.join(filepath, SHARD_CAMPAIGNS_DIR_NAME, _shard_file_name(campaign_id))]
+    return [filepath, _journal_path(filepath)]
+
+
+# The file_fingerprint of each JSON data file as last hashed, by absolute path. load_data
+# records the one it computes, so later lookups while the file keeps its size and
+# modification time (saves only append to the journal) do not hash it again.
+_known_fingerprints: Dict[str, Fingerprint] = {}
+
+
+def _remember_fingerprint(filepath: str, fingerprint: Optional[Fingerprint]) -> None:
+    if fingerprint is not None:
+        _known_fingerprints[os.path.abspath(filepath)] = fingerprint
+
+
+def _current_fingerprint(filepath: str) -> Optional[Fingerprint]:
+    """Returns the file_fingerprint of filepath, hashing it only if it changed since it was last hashed."""
+    known = _known_fingerprints.get(os.path.abspath(filepath))
+    try:
+        stat = os.stat(filepath)
+    except OSError:
+        return None
+    if known is not None and known[:2] == (stat.st_size, stat.st_mtime_ns):
+        return known
+    fingerprint = file_fingerprint(filepath)
+    _remember_fingerprint(filepath, fingerprint)
+    return fingerprint
+
+
+def campaign_fingerprint(filepath: str, campaign_id: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Returns what identifies the saved version of one campaign, or None if
+    nothing is saved at filepath. It changes whenever a save changes the
+    campaign, e.g. to tie a stored search index to it.
+
+    For a JSON file it is the SHA-256 of the file plus a digest of the
+    journal lines about the campaign. Saves of other campaigns only append
+    lines about those, so they leave it unchanged; rewriting the file (see
+    compact_journal) changes it for every campaign. For the per-campaign
+    layout and SQLite it is the fingerprint of the files in storage_files.
+    """
+    if _is_sqlite_path(filepath) or _is_sharded_path(filepath):
+        fingerprint = tuple(file_fingerprint(path) for path in storage_files(filepath, campaign_id))
+        return fingerprint if any(fingerprint) else None
+
+    file_sha256 = _file_sha256(filepath, _current_fingerprint(filepath))
+    digest = hashlib.sha256()
+    # Operations are written with "op" and "campaign_id" first, see _journal_operations
+    marker = f'"campaign_id":{encode_basestring(campaign_id)}'.encode('utf-8')
+    try:
+        with open(_journal_path(filepath), 'rb') as f:
+            base = f.readline()
+            if base.strip() and _journal_base_sha256(base) == file_sha256: # Else replay_journal ignores it
+                for line in f:
+                    if marker not in line:
+                        continue
+                    try:
+                        operation = json.loads(line)
+                    except ValueError:
+                        continue # Torn by a crash
+                    if operation.get("campaign_id") == campaign_id and operation.get("op") != "active":
+                        digest.update(line.rstrip(b"\r\n"))
+                        digest.update(b"\n")
+    except FileNotFoundError:
+        pass
+    if file_sha256 is None:
+        return None
+    return file_sha256, digest.hexdigest()
+
+
+def _journal_base_sha256(line: bytes) -> Optional[str]:
+    try:
+        operation = json.loads(line)
+    except ValueError:
+        return None
+    return operation.get("sha256") if isinstance(operation, dict) and operation.get("op") == "base" else None
+
+
+def _file_sha256(filepath: str, fingerprint: Optional[Fingerprint] = None) -> Optional[str]:
+    """Returns the SHA-256 of a file's contents, or None if it does not exist."""
+    if fingerprint is None:
+        fingerprint = file_fingerprint(filepath)
+    return fingerprint[2] if fingerprint is not None else None
+
+
+def _needs_full_rewrite(changes: Optional[ChangeSet]) -> bool:
+    """True if a save of a JSON file must write the whole file from the data rather than append to its journal."""
+    return changes is None or changes.all_campaigns
+
+
+def _journal_should_compact(filepath: str) -> bool:
+    """True once the journal of a JSON file is large enough to be folded into the file, see compact_journal."""
+    try:
+        return os.path.getsize(_journal_path(filepath)) >= JOURNAL_COMPACTION_THRESHOLD_BYTES
+    except OSError:
+        return False # No journal yet
+
+
+def _journal_operations(application_data: ApplicationData, changes: ChangeSet) -> List[Dict[str, Any]]:
+    """Turns the changes recorded in changes into journal operations, see append_journal."""
+    campaigns = application_data.campaigns
+    dict_collections = _get_streamed_fields(Campaign)
+    operations: List[Dict[str, Any]] = []
+    for campaign_id in sorted(changes.campaign_ids):
+        if campaign_id in campaigns:
+            operations.append({"op": "campaign", "campaign_id": campaign_id, "data": campaigns[campaign_id]})
+        else:
+            operations.append({"op": "delete_campaign", "campaign_id": campaign_id})
+
+    for campaign_id, entries in sorted(changes.entries.items()):
+        if campaign_id in changes.campaign_ids or campaign_id not in campaigns:
+            continue # Already written (or deleted) as a whole
+        campaign = campaigns[campaign_id]
+        for collection, entry_id in sorted(entries):
+            base = {"campaign_id": campaign_id, "collection": collection}
+            if collection in dict_collections:
+                entry = getattr(campaign, collection).get(entry_id)
+                if entry is None:
+                    operations.append({"op": "delete", **base, "entry_id": entry_id})
+                else:
+                    operations.append({"op": "upsert", **base, "entry_id": entry_id, "data": entry})
+            else:
+                # Single objects: set just the changed list (e.g. "level_tier_1_4.common_items") when
+                # the entry ID names one, otherwise the whole object.
+                path = [collection]
+                value = getattr(campaign, collection)
+                for attribute in entry_id.split("."):
+                    if not is_dataclass(value) or not hasattr(value, attribute):
+                        path, value = [collection], getattr(campaign, collection)
+                        break
+                    path.append(attribute)
+                    value = getattr(value, attribute)
+                operations.append({"op": "set", "campaign_id": campaign_id, "path": path, "data": value})
+
+    operations.append({"op": "active", "campaign_id": application_data.active_campaign_id})
+    return operations
+
+
+def append_journal(application_data: ApplicationData, filepath: str, changes: ChangeSet) -> None:
+    """
+    Appends the changes recorded in changes to the journal of a JSON file.
+
+    Every operation is one line of compact JSON. All lines of a save are
+    written with a single append and flushed to disk with fsync, so a crash can
+    at most cut off the last line, which replay_journal then ignores.
+
+    A new journal starts with a "base" line holding the SHA-256 of the data
+    file it applies to. Once the data file is rewritten the hash no longer
+    matches, so a journal left behind by a crash during compaction is ignored
+    instead of replayed over newer data.
+
+    Args:
+        application_data: Data holding at least the changed campaigns and entries.
+        filepath: The path of the JSON data file.
+        changes: What changed since the last save.
+    """
+    journal_path = _journal_path(filepath)
+    buffer = io.StringIO()
+    operations = _journal_operations(application_data, changes)
+    journal_size = os.path.getsize(journal_path) if os.path.exists(journal_path) else 0
+    if journal_size == 0:
+        operations.insert(0, {"op": "base", "sha256": _file_sha256(filepath)})
+    else:
+        with open(journal_path, 'rb') as f:
+            f.seek(journal_size - 1)
+            if f.read(1) != b'\n':
+                buffer.write('\n') # Keep a line torn by an earlier crash separate from ours
+    for operation in operations:
+        write_json(operation, buffer, compact=True)
+        buffer.write('\n')
+    data = buffer.getvalue().encode('utf-8')
+    with open(journal_path, 'ab') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _set_path(campaign: Campaign, path: List[str], value: Any):
+    target = campaign
+    for attribute in path[:-1]:
+        target = getattr(target, attribute)
+    spec = field_spec(type(target), path[-1])
+    setattr(target, path[-1], _from_dict(spec.item_type, value) if spec.kind is FieldKind.MODEL else value)
+
+
+def _apply_journal_operation(application_data: ApplicationData, operation: Dict[str, Any]):
+    kind = operation.get("op")
+    campaign_id = operation.get("campaign_id")
+    campaigns = application_data.campaigns
+    if kind == "base":
+        pass # Checked by replay_journal
+    elif kind == "active":
+        application_data.active_campaign_id = campaign_id or ""
+    elif kind == "campaign":
+        campaigns[campaign_id] = _from_dict(Campaign, operation["data"])
+    elif kind == "delete_campaign":
+        if campaign_id in campaigns:
+            del campaigns[campaign_id]
+    elif kind in ("upsert", "delete", "set"):
+        campaign = campaigns.get(campaign_id)
+        if campaign is None:
+            logging.warning(f"Journal operation for unknown campaign '{campaign_id}' skipped.")
+        elif kind == "set":
+            _set_path(campaign, operation["path"], operation["data"])
+        else:
+            collection = operation["collection"]
+            entries = getattr(campaign, collection)
+            if kind == "delete":
+                entries.pop(operation["entry_id"], None)
+            else:
+                entry_class = _get_streamed_fields(Campaign)[collection]
+                entries[operation["entry_id"]] = _from_dict(entry_class, operation["data"])
+    else:
+        logging.warning(f"Unknown journal operation '{kind}' skipped.")
+
+
+def replay_journal(application_data: ApplicationData, filepath: str,
+                   fingerprint: Optional[Fingerprint] = None) -> int:
+    """
+    Applies the journal of a JSON data file, if there is one, to the data
+    loaded from that file. A journal written for a different version of the
+    data file (see append_journal) is ignored.
+
+    Args:
+        application_data: The data loaded from filepath; updated in place.
+        filepath: The path of the JSON data file.
+        fingerprint: The file_fingerprint of filepath, if the caller already
+            has it; saves reading the file again.
+
+    Returns:
+        The number of operations applied.
+    """
+    journal_path = _journal_path(filepath)
+    if not os.path.exists(journal_path):
+        return 0
+    applied = 0
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            try:
+                operation = json.loads(line)
+            except json.JSONDecodeError:
+                operation = None
+            if line_number == 1:
+                if not isinstance(operation, dict) or operation.get("op") != "base" \
+                        or operation.get("sha256") != _file_sha256(filepath, fingerprint):
+                    break
+                continue
+            if not isinstance(operation, dict):
+                # A line torn by a crash during an append
+                logging.warning(f"Ignoring unreadable journal line {line_number} in {journal_path}.")
+                continue
+            try:
+                _apply_journal_operation(application_data, operation)
+                applied += 1
+            except (KeyError, AttributeError, TypeError) as e:
+                logging.warning(f"Ignoring invalid journal line {line_number} in {journal_path}: {e}")
+        else:
+            if applied:
+                logging.info(f"Replayed {applied} journal operations from {journal_path}")
+            return applied
+
+    # Move the journal aside, so later saves start a new one instead of appending to it.
+    logging.warning(f"Ignoring journal {journal_path}: it does not belong to the current {filepath}.")
+    os.replace(journal_path, journal_path + ".stale")
+    return 0
+
+
+def snapshot_application_data(application_data: ApplicationData, filepath: str,
+                              changes: Optional[ChangeSet] = None) -> ApplicationData:
+    """
+    Returns a copy of application_data that can be saved to filepath on another
+    thread while the original keeps being edited.
+
+    Only what the save will read is copied, and only campaigns in changes are
+    deep-copied. A JSON file or SQLite database whose changes are known per
+    entry gets shallow copies of the changed campaigns holding copies of just
+    the changed entries; its journal is compacted from the file on disk (see
+    compact_journal), not from the snapshot. The per-campaign layout gets the
+    changed campaigns; the others are left unloaded in the snapshot with their
+    names as of now, so no live campaign is shared with the saving thread.
+    Only a save without changes, or one that changes all campaigns, copies
+    every loaded campaign. Campaigns of a LazyCampaigns mapping that have not
+    been loaded are not loaded or copied.
+
+    Args:
+        application_data: The live ApplicationData object.
+        filepath: The path the snapshot will be saved to.
+        changes: The changes the snapshot will be saved with.
+
+    Returns:
+        A new ApplicationData object.
+    """
+    live_campaigns = application_data.campaigns
+    sharded = _is_sharded_path(filepath)
+    copy_all = _needs_full_rewrite(changes)
+    campaigns = {}
+    for campaign_id in live_campaigns:
+        # Campaigns that were never loaded are unchanged and read from storage when needed.
+        campaign = peek_campaign(live_campaigns, campaign_id)
+        if campaign is None:
+            continue
+        if copy_all or (sharded and changes.is_campaign_dirty(campaign_id)):
+            campaigns[campaign_id] = copy.deepcopy(campaign)
+        elif not sharded:
+            entry_changes = changes.get_entry_changes(campaign_id)
+            campaigns[campaign_id] = (copy.deepcopy(campaign) if entry_changes is None
+                                      else _copy_changed_entries(campaign, entry_changes))
+
+    if isinstance(live_campaigns, LazyCampaigns):
+        campaigns = live_campaigns.snapshot(campaigns)
+    elif sharded and not copy_all:
+        # Unchanged campaigns keep their files; only their names are needed
+        copied, campaigns = campaigns, LazyCampaigns(
+            ((campaign_id, live_campaigns[campaign_id].name, None) for campaign_id in live_campaigns),
+            _campaign_not_in_snapshot)
+        for campaign_id, campaign in copied.items():
+            campaigns[campaign_id] = campaign
+    return ApplicationData(campaigns=campaigns, active_campaign_id=application_data.active_campaign_id)
+
+
+def _campaign_not_in_snapshot(campaign_id: str, source: Any) -> Campaign:
+    raise LookupError(f"campaign '{campaign_id}' is unchanged and was not copied for saving")
+
+
+def _copy_changed_entries(campaign: Campaign, entry_changes: Set[Tuple[str, str]]) -> Campaign:
+    """
+    Returns a shallow copy of campaign in which each changed collection holds
+    deep copies of just its changed entries (deleted entries are left out).
+    Collections that are a single object rather than a dict are copied whole.
+    """
+    partial = copy.copy(campaign)
+    changed_collections: Dict[str, Set[str]] = {}
+    for collection, entry_id in entry_changes:
+        changed_collections.setdefault(collection, set()).add(entry_id)
+    for collection, entry_ids in changed_collections.items():
+        value = getattr(campaign, collection)
+        if isinstance(value, dict):
+            value = {entry_id: copy.deepcopy(value[entry_id]) for entry_id in entry_ids if entry_id in value}
+        else:
+            value = copy.deepcopy(value)
+        setattr(partial, collection, value)
+    return partial
+
+
+def _cacheable_application_data(application_data: ApplicationData) -> ApplicationData:
+    """
+    Returns application_data with every campaign built, for the load cache.
+    Campaigns a LazyCampaigns mapping has not loaded are loaded without being
+    cached in the mapping.
+    """
+    campaigns = application_data.campaigns
+    if not isinstance(campaigns, LazyCampaigns):
+        return application_data
+    cacheable = copy.copy(application_data)
+    cacheable.campaigns = {
+        campaign_id: campaign for campaign_id, campaign in campaigns.iter_serializable()
+    }
+    return cacheable
+
+
+def _write_json_file(application_data: ApplicationData, filepath: str, compact: bool,
+                     write_cache: bool = True) -> None:
+    """Rewrites a JSON data file with application_data, dropping its journal and, if asked to, rebuilding its load cache."""
+    _atomic_write_json(application_data, filepath, compact)
+    # The file now holds everything the journal recorded. Should removing it
+    # fail, replaying it on top of the new file is harmless.
+    if os.path.exists(_journal_path(filepath)):
+        os.remove(_journal_path(filepath))
+    if write_cache:
+        write_load_cache(_cacheable_application_data(application_data), filepath, file_fingerprint(filepath))
+    else:
+        remove_load_cache(filepath) # Written for the file it replaced
+
+
+def needs_load_cache(filepath: str) -> bool:
+    """True if filepath is a JSON data file that exists but has no load cache, e.g. after a lazy load."""
+    return (not _is_sqlite_path(filepath) and not _is_sharded_path(filepath)
+            and os.path.isfile(filepath) and not os.path.exists(cache_path(filepath)))
+
+
+def write_missing_load_cache(filepath: str) -> bool:
+    """
+    Writes the load cache of a JSON data file that has none (see
+    needs_load_cache). A lazy load does not build the campaigns a cache
+    holds, so the cache is built from the file as it is on disk; only the
+    file is read, so this can run on a saving thread.
+
+    Returns:
+        True if a cache was written.
+    """
+    if not needs_load_cache(filepath):
+        return False
+    fingerprint = file_fingerprint(filepath)
+    if fingerprint is None:
+        return False
+    try:
+        application_data = read_json_data(filepath)
+        file_stat = os.stat(filepath)
+    except (IOError, ValueError) as e:
+        logging.warning(f"Could not read {filepath} to cache it: {e}")
+        return False
+    if (file_stat.st_size, file_stat.st_mtime_ns) != fingerprint[:2]:
+        return False # Changed while it was read; the cache might not match the fingerprint
+    return write_load_cache(application_data, filepath, fingerprint)
 
 
-def save_data(application_data: ApplicationData, filepath: str) -> bool:
+def compact_journal(filepath: str, compact: bool = False) -> None:
+    """
+    Folds the journal of a JSON data file into the file: the file is read,
+    the journal replayed on top of it and the result written back. Only what
+    is on disk is read, so this can run on a saving thread without touching
+    the data being edited.
+    """
+    application_data = read_json_data(filepath) if os.path.exists(filepath) else ApplicationData()
+    replay_journal(application_data, filepath)
+    _write_json_file(application_data, filepath, compact)
+    logging.info(f"Journal {_journal_path(filepath)} compacted into {filepath}")
+
+
+def save_data(application_data: ApplicationData, filepath: str,
+              changes: Optional[ChangeSet] = None, compact: bool = False, write_cache: bool = True) -> bool:
     """
     Saves the ApplicationData object to a JSON file.
 
+    The data is streamed to a temporary file straight from the dataclasses
+    (no intermediate dict copy) and then moved over filepath, so a failed save
+    never leaves a half-written file behind. When changes is given, only the
+    changes are appended to the file's journal instead (see append_journal);
+    once the journal is large enough it is folded into the file (see
+    compact_journal). A full rewrite also rebuilds the file's load cache
+    (see load_data), unless write_cache is False.
+
+    If filepath is a directory (or ends with a path separator) the per-campaign
+    layout is used instead, see save_sharded_data; a .db, .sqlite or .sqlite3
+    path selects the SQLite database, see sqlite_data_manager.
+
     Args:
         application_data: The ApplicationData object to save.
         filepath: The path to the file where data should be saved.
+        changes: Optional record of what changed since the last save. If
+            None, everything is written.
+        compact: If True, write JSON without indentation (smaller and faster).
+        write_cache: If False, no load cache is written next to a JSON file,
+            e.g. for exports; every campaign must be built to write one.
 
     Returns:
         True if saving was successful, False otherwise.
     """
+    if _is_sqlite_path(filepath):
+        from src.sqlite_data_manager import save_sqlite_data
+        return save_sqlite_data(application_data, filepath, changes)
+    if _is_sharded_path(filepath):
+        return save_sharded_data(application_data, filepath, changes, compact)
+
     try:
-        data_dict = asdict(application_data)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, indent=4, ensure_ascii=False)
+        if not _needs_full_rewrite(changes):
+            append_journal(application_data, filepath, changes)
+            logging.info(f"Changes successfully appended to {_journal_path(filepath)}")
+            if _journal_should_compact(filepath):
+                compact_journal(filepath, compact)
+            return True
+
+        _write_json_file(application_data, filepath, compact, write_cache)
         logging.info(f"Data successfully saved to {filepath}")
         return True
-    except IOError as e: # pragma: no cover
-        logging.error(f"IOError saving data to {filepath}: {e}")
     except PermissionError as e: # pragma: no cover
         logging.error(f"PermissionError saving data to {filepath}: {e}")
+    except IOError as e: # pragma: no cover
+        logging.error(f"IOError saving data to {filepath}: {e}")
     except TypeError as e: # pragma: no cover
-        # This can happen if asdict encounters non-serializable data not caught by dataclass structure
+        # This can happen if the data contains values that are not JSON serializable
         logging.error(f"TypeError during serialization: {e}. Check data_models for non-serializable types.")
     except Exception as e: # pragma: no cover
         logging.error(f"An unexpected error occurred while saving data to {filepath}: {e}")
     return False
 
-def load_data(filepath: str) -> ApplicationData:
+def load_data(filepath: str, lazy: bool = False,
+              progress_callback: Optional[Callable[[int, int], None]] = None,
+              use_cache: bool = True, raise_errors: bool = False) -> ApplicationData:
     """
-    Loads ApplicationData from a JSON file.
+    Loads ApplicationData from a JSON file, a per-campaign directory written
+    by save_sharded_data or an SQLite database, depending on filepath.
+
+    JSON files are read with a streaming parser that converts each entity to
+    its dataclass as soon as it is parsed (see read_json_data), so neither the
+    file text nor a full dict tree is held in memory. The result is cached in
+    a binary sidecar file (see load_cache), which later loads use instead as
+    long as the JSON file is unchanged.
 
     Args:
         filepath: The path to the file from which to load data.
+        lazy: If True, ApplicationData.campaigns is a LazyCampaigns mapping:
+            only campaign IDs and names are read up front and each campaign is
+            built when first accessed. The per-campaign layout and SQLite then
+            read nothing else from disk; a JSON file is only scanned for them,
+            and each campaign is streamed from the file when needed.
+        progress_callback: Called as progress_callback(bytes_read, total_bytes)
+            while a JSON file is read, e.g. to update a splash screen.
+        use_cache: If False, the load cache is neither read nor written, e.g.
+            for files from elsewhere that are imported.
+        raise_errors: If True, a JSON file that is missing or cannot be read
+            raises instead of loading as empty data, e.g. so an import can
+            report the failure.
 
     Returns:
         An ApplicationData object. If the file doesn't exist or is corrupted,
         a new ApplicationData instance with default values is returned.
+
+    Raises:
+        OSError, ValueError: Only with raise_errors, if the JSON file cannot be
+            read or parsed.
     """
-    if not os.path.exists(filepath):
+    if _is_sqlite_path(filepath):
+        from src.sqlite_data_manager import load_sqlite_data
+        return load_sqlite_data(filepath, lazy)
+    if _is_sharded_path(filepath):
+        return load_sharded_data(filepath, lazy)
+
+    if raise_errors and not os.path.isfile(filepath):
+        raise FileNotFoundError(f"No data file {filepath}")
+    if not os.path.exists(filepath) and not os.path.exists(_journal_path(filepath)):
         logging.info(f"File {filepath} not found. Returning new ApplicationData instance.")
         return ApplicationData()
 
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data_dict = json.load(f)
-
-        # Start reconstruction from the top-level ApplicationData
-        return _from_dict(ApplicationData, data_dict)
+        fingerprint = file_fingerprint(filepath)
+        _remember_fingerprint(filepath, fingerprint)
+        application_data = read_load_cache(filepath, fingerprint, lazy) if use_cache else None
+        if application_data is not None:
+            if progress_callback is not None:
+                progress_callback(fingerprint[0], fingerprint[0])
+        elif fingerprint is not None or raise_errors:
+            application_data = read_json_data(filepath, lazy, progress_callback)
+            if use_cache and not lazy:
+                # Cache the file as read, before the journal is replayed on top of it. A lazy
+                # load would have to build every campaign for it; see write_missing_load_cache.
+                write_load_cache(application_data, filepath, fingerprint)
+        else:
+            application_data = ApplicationData()
+        replay_journal(application_data, filepath, fingerprint)
+        return application_data
 
     except IOError as e: # pragma: no cover
+        if raise_errors:
+            raise
         logging.error(f"IOError loading data from {filepath}: {e}. Returning new ApplicationData.")
     except json.JSONDecodeError as e: # pragma: no cover
+        if raise_errors:
+            raise
         logging.error(f"JSONDecodeError loading data from {filepath}: {e}. File might be corrupted. Returning new ApplicationData.")
     except Exception as e: # pragma: no cover
+        if raise_errors:
+            raise
         logging.error(f"An unexpected error occurred while loading data from {filepath}: {e}. Returning new ApplicationData.")
 
     return ApplicationData()
 
+
+def convert_data(source_path: str, destination_path: str) -> bool:
+    """
+    Copies all data from one storage format to another, e.g. from a JSON file
+    to an SQLite database. The formats are chosen from the paths as in
+    load_data and save_data.
+
+    Args:
+        source_path: The path to read the data from. Must exist.
+        destination_path: The path to write the data to.
+
+    Returns:
+        True if the data was converted, False otherwise.
+    """
+    if not os.path.exists(source_path):
+        logging.error(f"Cannot convert {source_path}: file not found.")
+        return False
+    return save_data(load_data(source_path), destination_path)
+
 # Example Usage (for testing purposes, can be removed or commented out)
 if __name__ == '__main__': # pragma: no cover
     # Create sample data
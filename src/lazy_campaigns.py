@@ -0,0 +1,135 @@
+import logging
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+from src.data_models import Campaign
+
+
+class LazyCampaigns(MutableMapping):
+    """
+    A campaign_id -> Campaign mapping that knows every campaign's ID and name up
+    front but builds each Campaign only when it is first accessed.
+
+    Loaded campaigns are cached. Iterating, len() and `in` never load anything;
+    use campaign_name() for display names. Campaigns assigned with
+    mapping[campaign_id] = campaign are simply stored.
+
+    Args:
+        headers: (campaign_id, name, source) for every campaign, in display order.
+            source is whatever loader needs to build the campaign, e.g. a file
+            path; campaigns added later get None.
+        loader: Builds the Campaign from its ID and source. May raise if the
+            stored data is unreadable.
+        reloadable: True if the sources point at storage that save_data keeps
+            up to date (per-campaign files, SQLite), so unchanged campaigns can
+            be evicted and loaded again later. When False the sources (e.g. the
+            pickled campaigns of a load cache) are dropped once loaded.
+    """
+
+    def __init__(self, headers: Iterable[Tuple[str, str, Any]],
+                 loader: Callable[[str, Any], Campaign], reloadable: bool = True):
+        self._names: Dict[str, str] = {}
+        self._sources: Dict[str, Any] = {}
+        for campaign_id, name, source in headers:
+            self._names[campaign_id] = name
+            self._sources[campaign_id] = source
+        self._loaded: Dict[str, Campaign] = {}
+        self._loader = loader
+        self.reloadable = reloadable
+
+    def __getitem__(self, campaign_id: str) -> Campaign:
+        campaign = self._loaded.get(campaign_id)
+        if campaign is not None:
+            return campaign
+        if campaign_id not in self._names:
+            raise KeyError(campaign_id)
+        try:
+            campaign = self._loader(campaign_id, self._sources[campaign_id])
+        except Exception as e:
+            logging.error(f"Error loading campaign '{campaign_id}': {e}")
+            raise KeyError(campaign_id) from e
+        self._loaded[campaign_id] = campaign
+        if not self.reloadable:
+            self._sources[campaign_id] = None
+        return campaign
+
+    def __setitem__(self, campaign_id: str, campaign: Campaign) -> None:
+        self._names[campaign_id] = campaign.name
+        self._sources.setdefault(campaign_id, None)
+        self._loaded[campaign_id] = campaign
+
+    def __delitem__(self, campaign_id: str) -> None:
+        del self._names[campaign_id]
+        del self._sources[campaign_id]
+        self._loaded.pop(campaign_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, campaign_id: object) -> bool:
+        return campaign_id in self._names
+
+    def __repr__(self) -> str:
+        return f"LazyCampaigns({len(self._loaded)} of {len(self._names)} loaded)"
+
+    def campaign_name(self, campaign_id: str) -> str:
+        campaign = self._loaded.get(campaign_id)
+        return campaign.name if campaign is not None else self._names[campaign_id]
+
+    def peek(self, campaign_id: str) -> Optional[Campaign]:
+        """Returns the campaign if it has been loaded, without loading it."""
+        return self._loaded.get(campaign_id)
+
+    def is_loaded(self, campaign_id: str) -> bool:
+        return campaign_id in self._loaded
+
+    def evict(self, campaign_id: str) -> bool:
+        """
+        Drops a loaded campaign so it is read from storage again on next access.
+        The caller must make sure it has no unsaved changes.
+
+        Returns:
+            True if the campaign was evicted.
+        """
+        if not self.reloadable:
+            return False
+        return self._loaded.pop(campaign_id, None) is not None
+
+    def iter_serializable(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Yields (campaign_id, campaign) for writing all campaigns out. Unloaded
+        campaigns are loaded one at a time without being cached.
+        """
+        for campaign_id in self._names:
+            campaign = self._loaded.get(campaign_id)
+            if campaign is None:
+                campaign = self._loader(campaign_id, self._sources[campaign_id])
+            yield campaign_id, campaign
+
+    def snapshot(self, loaded: Mapping[str, Campaign]) -> 'LazyCampaigns':
+        """
+        Returns a mapping with the same campaigns and names whose loaded
+        campaigns are exactly `loaded`; the rest load from the same sources.
+        """
+        copy = LazyCampaigns(
+            ((campaign_id, self.campaign_name(campaign_id), self._sources[campaign_id]) for campaign_id in self._names),
+            self._loader, self.reloadable)
+        copy._loaded.update(loaded)
+        return copy
+
+
+def campaign_name(campaigns: Mapping[str, Campaign], campaign_id: str) -> str:
+    """Returns a campaign's name without loading it."""
+    if isinstance(campaigns, LazyCampaigns):
+        return campaigns.campaign_name(campaign_id)
+    return campaigns[campaign_id].name
+
+
+def peek_campaign(campaigns: Mapping[str, Campaign], campaign_id: str) -> Optional[Campaign]:
+    """Returns a campaign if it is already in memory, without loading it."""
+    if isinstance(campaigns, LazyCampaigns):
+        return campaigns.peek(campaign_id)
+    return campaigns.get(campaign_id)
@@ -0,0 +1,225 @@
+import hashlib
+import hmac
+import json
+import logging
+import os
+import pickle
+import secrets
+import tempfile
+from dataclasses import fields, is_dataclass, replace
+from typing import Any, Optional, Tuple, get_args, get_type_hints
+
+from src.data_models import ApplicationData, Campaign
+from src.lazy_campaigns import LazyCampaigns
+
+CACHE_FILE_SUFFIX = ".cache"
+CACHE_FORMAT_VERSION = 6
+_CACHE_MAGIC = "campaign-manager-load-cache"
+
+# Caches are pickled, and unpickling can run any code the file names. So that a
+# cache planted next to a data file (e.g. one that came with a backup) is never
+# unpickled, caches are signed with a key only this user's app knows, and the
+# signature is checked before anything is unpickled. Without a key nothing is cached.
+CACHE_KEY_FILE = os.path.join(os.path.expanduser("~"), ".ttrpg_campaign_tracker", "cache.key")
+_CACHE_KEY_BYTES = 32
+
+# (size, mtime in nanoseconds, SHA-256 of the contents)
+Fingerprint = Tuple[int, int, str]
+
+
+def _model_signature(data_class: type = ApplicationData) -> Tuple[Any, ...]:
+    """
+    Describes the fields of data_class and of every dataclass it contains. A
+    cache pickled by a version of the app with different models is not used.
+    """
+    signature = []
+    pending = [data_class]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        signature.append((current.__qualname__, tuple(f.name for f in fields(current))))
+        for field_type in get_type_hints(current).values():
+            for candidate in (field_type, *get_args(field_type)):
+                if is_dataclass(candidate):
+                    pending.append(candidate)
+    return tuple(sorted(signature))
+
+
+_MODEL_SIGNATURE = _model_signature()
+
+
+def cache_path(filepath: str) -> str:
+    return filepath + CACHE_FILE_SUFFIX
+
+
+def file_fingerprint(filepath: str) -> Optional[Fingerprint]:
+    """Returns the fingerprint of a data file, or None if it cannot be read."""
+    try:
+        stat = os.stat(filepath)
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns, digest.hexdigest()
+
+
+def _cache_key() -> Optional[bytes]:
+    """Returns the key caches are signed with, creating it on first use; None if that fails."""
+    try:
+        with open(CACHE_KEY_FILE, 'rb') as f:
+            key = f.read()
+        if len(key) == _CACHE_KEY_BYTES:
+            return key
+        logging.warning(f"Ignoring invalid cache key {CACHE_KEY_FILE}.")
+        os.remove(CACHE_KEY_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Cannot read cache key {CACHE_KEY_FILE}: {e}")
+        return None
+    try:
+        os.makedirs(os.path.dirname(CACHE_KEY_FILE), exist_ok=True)
+        key = secrets.token_bytes(_CACHE_KEY_BYTES)
+        # Only readable by the user; fails if another process created the key meanwhile
+        fd = os.open(CACHE_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(key)
+        return key
+    except FileExistsError:
+        return _cache_key()
+    except OSError as e:
+        logging.warning(f"Cannot create cache key {CACHE_KEY_FILE}: {e}")
+        return None
+
+
+def sign_cache(header: Any, payload: bytes) -> Optional[bytes]:
+    """
+    Returns the contents of a signed cache file holding header (anything
+    json.dumps accepts) and payload, or None if there is no cache key.
+    """
+    key = _cache_key()
+    if key is None:
+        return None
+    signed = json.dumps(header).encode('utf-8') + b"\n" + payload
+    return hmac.new(key, signed, hashlib.sha256).hexdigest().encode('ascii') + b"\n" + signed
+
+
+def verify_cache(contents: bytes) -> Tuple[Any, bytes]:
+    """
+    Checks the signature of a cache file written with sign_cache and returns
+    its header and payload. Nothing in the file is decoded before that.
+
+    Raises:
+        ValueError: If the file was not signed with this user's cache key.
+    """
+    key = _cache_key()
+    if key is None:
+        raise ValueError("no cache key")
+    signature, _, signed = contents.partition(b"\n")
+    if not hmac.compare_digest(hmac.new(key, signed, hashlib.sha256).hexdigest().encode('ascii'), signature):
+        raise ValueError("signature mismatch")
+    header, _, payload = signed.partition(b"\n")
+    return json.loads(header), payload
+
+
+def _load_campaign(campaign_id: str, pickled_campaign: bytes) -> Campaign:
+    campaign = pickle.loads(pickled_campaign)
+    if not isinstance(campaign, Campaign):
+        raise ValueError(f"cached campaign '{campaign_id}' is not a Campaign")
+    return campaign
+
+
+def _cache_header(fingerprint: Fingerprint) -> Any:
+    # As it reads back from JSON, so headers compare equal
+    return json.loads(json.dumps([_CACHE_MAGIC, CACHE_FORMAT_VERSION, _MODEL_SIGNATURE, fingerprint]))
+
+
+def read_load_cache(filepath: str, fingerprint: Optional[Fingerprint],
+                    lazy: bool = False) -> Optional[ApplicationData]:
+    """
+    Returns the ApplicationData cached for a data file, if the cache was
+    written for exactly this version of the file (see file_fingerprint).
+
+    A cache that is stale, corrupt, from another version of the app or not
+    signed with this user's key (see sign_cache) is deleted and None is
+    returned, so the caller parses the file instead.
+
+    Args:
+        filepath: The path of the data file, not of the cache.
+        fingerprint: The data file's current fingerprint.
+        lazy: If True, campaigns are returned in a LazyCampaigns mapping and
+            each one is unpickled on first access.
+    """
+    path = cache_path(filepath)
+    if fingerprint is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            header, payload = verify_cache(f.read())
+        if header != _cache_header(fingerprint):
+            raise ValueError("written for a different data file or app version")
+        application_data, campaign_headers = pickle.loads(payload)
+        if not isinstance(application_data, ApplicationData):
+            raise ValueError("does not hold ApplicationData")
+        if lazy:
+            application_data.campaigns = LazyCampaigns(campaign_headers, _load_campaign, reloadable=False)
+        else:
+            application_data.campaigns = {
+                campaign_id: _load_campaign(campaign_id, pickled_campaign)
+                for campaign_id, _, pickled_campaign in campaign_headers
+            }
+        return application_data
+    except Exception as e: # Unpickling a corrupt file can raise almost anything
+        logging.info(f"Not using load cache {path}: {e}")
+        remove_load_cache(filepath)
+        return None
+
+
+def write_load_cache(application_data: ApplicationData, filepath: str,
+                     fingerprint: Optional[Fingerprint]) -> bool:
+    """
+    Writes application_data, which must be exactly what filepath holds and
+    have every campaign built, as the cache for that version of the file.
+    Each campaign is pickled on its own so lazy loads can unpickle them one
+    by one. The cache is written to a temporary file and moved into place.
+
+    Returns:
+        True if the cache was written.
+    """
+    if fingerprint is None:
+        return False
+    path = cache_path(filepath)
+    temp_path = None
+    try:
+        campaign_headers = [
+            (campaign_id, campaign.name, pickle.dumps(campaign, pickle.HIGHEST_PROTOCOL))
+            for campaign_id, campaign in application_data.campaigns.items()
+        ]
+        payload = pickle.dumps((replace(application_data, campaigns={}), campaign_headers), pickle.HIGHEST_PROTOCOL)
+        contents = sign_cache(_cache_header(fingerprint), payload)
+        if contents is None:
+            return False
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=".tmp_", suffix=CACHE_FILE_SUFFIX)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contents)
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        logging.warning(f"Could not write load cache {path}: {e}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
+def remove_load_cache(filepath: str) -> None:
+    try:
+        os.remove(cache_path(filepath))
+    except OSError:
+        pass
@@ -1,6 +1,8 @@
+import logging
 import sys
 import os
-from typing import Optional
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
@@ -8,7 +10,7 @@ from PySide6.QtWidgets import (
     QStackedWidget, QMenuBar, QStatusBar, QFileDialog, QMessageBox,
     QSplitter
 )
-from PySide6.QtCore import Qt, Slot
+from PySide6.QtCore import Qt, QTimer, Slot
 from PySide6.QtGui import QAction, QCloseEvent
 
 from PySide6.QtGui import QAction, QCloseEvent
@@ -19,53 +21,126 @@ from src.data_models import ApplicationData, Campaign, NPCEntry # NPCEntry might
 from PySide6.QtGui import QAction, QCloseEvent
 
 from src.data_models import ApplicationData, Campaign, NPCEntry # NPCEntry might be useful
-from src.json_data_manager import load_data, save_data
+from src.json_data_manager import load_data, save_data, ChangeSet
 from PySide6.QtGui import QAction, QCloseEvent
 
 from src.data_models import ApplicationData, Campaign, NPCEntry # NPCEntry might be useful
-from src.json_data_manager import load_data, save_data
+from src.json_data_manager import load_data, save_data, ChangeSet
 from src.trackers.npc_tracker_ui import NPCTrackerWidget
 from src.trackers.campaign_journal_ui import CampaignJournalWidget
 from PySide6.QtGui import QAction, QCloseEvent
 
 from src.data_models import ApplicationData, Campaign, NPCEntry # NPCEntry might be useful
-from src.json_data_manager import load_data, save_data
-from src.trackers.npc_tracker_ui import NPCTrackerWidget
-from src.trackers.campaign_journal_ui import CampaignJournalWidget
-from src.trackers.settlement_tracker_ui import SettlementTrackerWidget
-from src.trackers.game_expectations_ui import GameExpectationsWidget
-from src.trackers.travel_planner_ui import TravelPlannerWidget
-from src.trackers.dm_character_tracker_ui import DMCharacterWidget
-from src.trackers.campaign_conflicts_ui import CampaignConflictsWidget
-from src.trackers.magic_item_tracker_ui import MagicItemTrackerWidget
-from src.trackers.bastion_tracker_ui import BastionTrackerWidget
-
-# Define tracker names as they appear in the UI - matches PRD for consistency
-TRACKER_NAMES = [
-    "Game Expectations", "Travel Planner", "NPC Tracker", "Settlement Tracker",
-    "Campaign Journal", "DM's Character Tracker", "Campaign Conflicts",
-    "Magic Item Tracker", "Bastion Tracker"
-]
+from src.json_data_manager import (
+    load_data, needs_load_cache, save_data, snapshot_application_data, write_missing_load_cache, ChangeSet
+)
+from src.campaign_search import CampaignSearchWidget
+from src.change_recorder import ChangeRecorder
+from src.lazy_campaigns import LazyCampaigns, campaign_name
+from src.name_matcher import NameMatcher
+from src.quick_open import QuickOpenDialog
+from src.save_scheduler import SaveScheduler
+from src.search_index import ConsistencyCheck, IndexBuilder, SearchIndex
+from src.search_index_cache import read_search_index, remove_search_index, storage_fingerprint, write_search_index
+from src.transactions import CampaignTransaction, TransactionError, merge_application_data
+from src.trackers.registry import TrackerRegistry, default_registry
 
 DATA_FILE_NAME = "ttrpg_campaign_data.json"
+# Drop campaigns other than the selected one from memory once they are saved.
+# Only has an effect for storage that can reload a single campaign (per-campaign directory, SQLite).
+EVICT_INACTIVE_CAMPAIGNS = False
+# Adding a name at least this similar to an existing one (see NameMatcher.match) asks for confirmation.
+SIMILAR_NAME_SCORE = 0.6
+# Build the tracker widgets not opened yet in the background once the window is idle,
+# so that opening them later is instant. Otherwise each is built when first selected.
+PREWARM_TRACKER_WIDGETS = False
+# Write the data file without indentation: smaller and faster to save and load. Exports stay indented.
+COMPACT_DATA_FILES = True
+
+
+def _save_and_store_search_indexes(application_data: ApplicationData, filepath: str, changes: ChangeSet,
+                                   compact: bool, search_indexes: Dict[str, SearchIndex]) -> bool:
+    """
+    The save run on the SaveScheduler worker: saves the data, then stores the
+    search indexes handed over by MainWindow._store_search_index, which hold
+    their campaigns as this save writes them. A data file left without a
+    load cache by the app's lazy load gets one from the file on disk.
+    """
+    if not save_data(application_data, filepath, changes, compact):
+        return False
+    for campaign_id, index in search_indexes.items():
+        if campaign_id in application_data.campaigns: # Not deleted meanwhile
+            write_search_index(index, filepath, campaign_id, storage_fingerprint(filepath, campaign_id))
+    write_missing_load_cache(filepath)
+    return True
+
 
 class MainWindow(QMainWindow):
-    def __init__(self, app_data_path: Optional[str] = None):
+    def __init__(self, app_data_path: Optional[str] = None,
+                 load_progress_callback: Optional[Callable[[int, int], None]] = None):
         super().__init__()
         self.setWindowTitle("TTRPG Campaign Tracker")
         self.setGeometry(100, 100, 1200, 800)
 
         self.data_file_path = app_data_path if app_data_path else DATA_FILE_NAME
+        self._load_progress_callback = load_progress_callback # Only used for the initial load
         self.application_data: ApplicationData = ApplicationData()
         self.current_campaign_id: Optional[str] = None
         self.current_tracker_name: Optional[str] = None
-
-        self.tracker_widgets: dict[str, QWidget] = {} # To store instances of tracker widgets
+        self.pending_changes = ChangeSet() # Campaigns modified since the last successful save
+        # Saves are debounced and written on a worker thread; see _save_app_data.
+        self.save_scheduler = SaveScheduler(self._take_save_snapshot, _save_and_store_search_indexes,
+                                            restore_func=self._restore_failed_save, parent=self)
+        self.save_scheduler.save_succeeded.connect(self._on_background_save_succeeded)
+        self.save_scheduler.save_failed.connect(self._on_background_save_failed)
+        self._transaction: Optional[CampaignTransaction] = None # The open transaction(), if any
+        # Changes to the loaded campaigns reported by the model events (see src.model_events). They
+        # are applied with the next _save_app_data or transaction, or else once control returns to
+        # the event loop; see _apply_model_changes.
+        self._model_changes_timer = QTimer(self)
+        self._model_changes_timer.setSingleShot(True)
+        self._model_changes_timer.setInterval(0)
+        self._model_changes_timer.timeout.connect(self._apply_model_changes)
+        self._model_changes = ChangeRecorder(lambda: self.application_data.campaigns, self._model_changes_timer.start)
+        self._model_changes.start()
+        # Full-text index of the current campaign. It is read from disk, or built if the stored
+        # one is missing or stale, while the app is idle after the campaign is selected, and then
+        # kept up to date with every change; see _open_search_index and _update_search_index.
+        self._search_index: Optional[SearchIndex] = None
+        self._search_index_campaign_id: Optional[str] = None
+        self._search_index_ready = False # False until the index is read or completely built
+        self._search_index_stored = False # Whether the file on disk holds the index as it is
+        # Indexes of campaigns no longer selected that the next save stores, by campaign ID
+        self._search_indexes_to_store: Dict[str, SearchIndex] = {}
+        self._search_index_updates = 0 # Incremental updates since the index was last checked
+        self._search_index_job: Optional[Iterator[None]] = None # Opening, pre-warming or checking the index
+        self._search_index_job_timer = QTimer(self) # Runs the job a step at a time when idle
+        self._search_index_job_timer.setInterval(0)
+        self._search_index_job_timer.timeout.connect(self._continue_search_index_job)
+        # Fuzzy lookup of the names in the current campaign, built on first use; see _current_name_matcher.
+        self._name_matcher: Optional[NameMatcher] = None
+        self._name_matcher_campaign_id: Optional[str] = None
+
+        self.evict_inactive_campaigns = EVICT_INACTIVE_CAMPAIGNS
+
+        # The trackers offered, and the version of the data each collection has; see src.trackers.registry
+        self.trackers: TrackerRegistry = default_registry()
+        self.tracker_widgets: dict[str, QWidget] = {} # The tracker widgets built so far, by tracker name
+        # The (campaign ID, version) each built tracker widget last showed
+        self._shown_tracker_versions: dict[str, tuple[Optional[str], int]] = {}
+        self._collection_trackers = self.trackers.collection_trackers() # Tracker name by the Campaign field it shows
+        self.prewarm_tracker_widgets = PREWARM_TRACKER_WIDGETS
+        self._prewarm_timer = QTimer(self) # Builds the remaining tracker widgets one at a time when idle
+        self._prewarm_timer.setInterval(0)
+        self._prewarm_timer.timeout.connect(self._prewarm_next_tracker)
 
         self._init_ui()
         self._load_app_data() # Load data and populate campaign selector
+        self._load_progress_callback = None
         self._connect_signals()
         self._update_tracker_nav_status() # Initial status update
+        if self.prewarm_tracker_widgets:
+            self._prewarm_timer.start() # Runs once the event loop has shown the window
 
     def _init_ui(self):
         # Central Widget and Main Layout
@@ -90,12 +165,15 @@ class MainWindow(QMainWindow):
 
         main_layout.addLayout(campaign_management_layout)
 
+        # The search box is added once the tracker widgets exist; results name their tracker
+        search_layout_index = main_layout.count()
+
         # Main Content Area (Splitter)
         main_content_splitter = QSplitter(Qt.Orientation.Horizontal)
 
         # Tracker Navigation
         self.tracker_nav_list = QListWidget()
-        for name in TRACKER_NAMES:
+        for name in self.trackers.names():
             self.tracker_nav_list.addItem(QListWidgetItem(name))
         main_content_splitter.addWidget(self.tracker_nav_list)
 
@@ -105,69 +183,11 @@ class MainWindow(QMainWindow):
         # Default placeholder if no tracker is selected or no campaign
         self.no_tracker_placeholder = QLabel("Select a campaign and then a tracker to view details.")
         self.no_tracker_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        # self.tracker_display_area.addWidget(self.no_tracker_placeholder) # Will be added as default if no other widgets
-
-        # Initialize actual tracker widgets and add them to the QStackedWidget
-        self.npc_tracker_widget = NPCTrackerWidget(self)
-        self.tracker_display_area.addWidget(self.npc_tracker_widget)
-        self.tracker_widgets["NPC Tracker"] = self.npc_tracker_widget
-
-        self.campaign_journal_widget = CampaignJournalWidget(self)
-        self.tracker_display_area.addWidget(self.campaign_journal_widget)
-        self.tracker_widgets["Campaign Journal"] = self.campaign_journal_widget
-
-        self.settlement_tracker_widget = SettlementTrackerWidget(self)
-        self.tracker_display_area.addWidget(self.settlement_tracker_widget)
-        self.tracker_widgets["Settlement Tracker"] = self.settlement_tracker_widget
-
-        self.game_expectations_widget = GameExpectationsWidget(self)
-        self.tracker_display_area.addWidget(self.game_expectations_widget)
-        self.tracker_widgets["Game Expectations"] = self.game_expectations_widget
-
-        self.travel_planner_widget = TravelPlannerWidget(self)
-        self.tracker_display_area.addWidget(self.travel_planner_widget)
-        self.tracker_widgets["Travel Planner"] = self.travel_planner_widget
-
-        self.dm_character_widget = DMCharacterWidget(self)
-        self.tracker_display_area.addWidget(self.dm_character_widget)
-        self.tracker_widgets["DM's Character Tracker"] = self.dm_character_widget
-
-        self.campaign_conflicts_widget = CampaignConflictsWidget(self)
-        self.tracker_display_area.addWidget(self.campaign_conflicts_widget)
-        self.tracker_widgets["Campaign Conflicts"] = self.campaign_conflicts_widget
-
-        self.magic_item_tracker_widget = MagicItemTrackerWidget(self)
-        self.tracker_display_area.addWidget(self.magic_item_tracker_widget)
-        self.tracker_widgets["Magic Item Tracker"] = self.magic_item_tracker_widget
-
-        self.bastion_tracker_widget = BastionTrackerWidget(self)
-        self.tracker_display_area.addWidget(self.bastion_tracker_widget)
-        self.tracker_widgets["Bastion Tracker"] = self.bastion_tracker_widget
-
-        # Add placeholder widgets for other trackers
-        for name in TRACKER_NAMES:
-            if name not in self.tracker_widgets: # If not already specifically added
-                placeholder_widget = QLabel(f"Content for {name} will appear here.")
-                placeholder_widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.tracker_display_area.addWidget(placeholder_widget)
-                self.tracker_widgets[name] = placeholder_widget
-
-        # Set initial widget (placeholder or specific if needed)
-        if self.tracker_display_area.count() > 0:
-             # Check if no_tracker_placeholder needs to be the default visible one
-            current_widget_to_set = self.tracker_widgets.get("NPC Tracker") # Default to NPC for now or a generic one
-            if not current_widget_to_set: # Should not happen if NPC tracker is there
-                current_widget_to_set = self.no_tracker_placeholder
-                if self.no_tracker_placeholder not in [self.tracker_display_area.widget(i) for i in range(self.tracker_display_area.count())]:
-                    self.tracker_display_area.addWidget(self.no_tracker_placeholder)
-
-            self.tracker_display_area.setCurrentWidget(self.no_tracker_placeholder \
-                if self.no_tracker_placeholder in [self.tracker_display_area.widget(i) for i in range(self.tracker_display_area.count())] \
-                else self.tracker_display_area.widget(0) )
-        else: # Fallback if somehow no widgets were added (e.g. TRACKER_NAMES is empty)
-            self.tracker_display_area.addWidget(self.no_tracker_placeholder)
-            self.tracker_display_area.setCurrentWidget(self.no_tracker_placeholder)
 
+        self.tracker_display_area.addWidget(self.no_tracker_placeholder)
+        self.tracker_display_area.setCurrentWidget(self.no_tracker_placeholder)
+
+        # Tracker widgets are built when first shown; see tracker_widget
 
         main_content_splitter.addWidget(self.tracker_display_area)
         main_content_splitter.setStretchFactor(0, 1) # Tracker nav proportion
@@ -175,6 +195,9 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(main_content_splitter, 1) # Stretch splitter
 
+        self.search_widget = CampaignSearchWidget(self._current_search_index, self._collection_trackers)
+        main_layout.insertWidget(search_layout_index, self.search_widget)
+
         # Menu Bar
         menu_bar = self.menuBar()
         file_menu = menu_bar.addMenu("&File")
@@ -189,6 +212,11 @@ class MainWindow(QMainWindow):
         self.exit_action = QAction("Exit", self)
         file_menu.addAction(self.exit_action)
 
+        go_menu = menu_bar.addMenu("&Go")
+        self.quick_open_action = QAction("Quick Open...", self)
+        self.quick_open_action.setShortcut("Ctrl+P")
+        go_menu.addAction(self.quick_open_action)
+
         # Status Bar
         self.setStatusBar(QStatusBar(self))
         self.statusBar().showMessage("Ready.")
@@ -206,6 +234,9 @@ class MainWindow(QMainWindow):
         self.import_all_action.triggered.connect(self._on_import_all_data)
         self.export_all_action.triggered.connect(self._on_export_all_data)
         self.exit_action.triggered.connect(self.close)
+        self.quick_open_action.triggered.connect(self._on_quick_open)
+
+        self.search_widget.result_activated.connect(self._on_search_result_activated)
 
 
     def _populate_campaign_selector(self):
@@ -216,8 +247,9 @@ class MainWindow(QMainWindow):
             self.current_campaign_id = None
         else:
             self.campaign_selector.setPlaceholderText("Select a campaign")
-            for campaign_id, campaign in self.application_data.campaigns.items():
-                self.campaign_selector.addItem(campaign.name, userData=campaign_id)
+            for campaign_id in self.application_data.campaigns:
+                # Names only, so campaigns that have not been opened stay unloaded
+                self.campaign_selector.addItem(campaign_name(self.application_data.campaigns, campaign_id), userData=campaign_id)
 
             if self.current_campaign_id and self.current_campaign_id in self.application_data.campaigns:
                 for i in range(self.campaign_selector.count()):
@@ -263,9 +295,17 @@ class MainWindow(QMainWindow):
         name, ok = QInputDialog.getText(self, "New Campaign", "Enter campaign name:")
         if ok and name:
             # Check for duplicate names
-            if any(c.name == name for c in self.application_data.campaigns.values()):
+            campaigns = self.application_data.campaigns
+            if any(name == campaign_name(campaigns, campaign_id) for campaign_id in campaigns):
                 QMessageBox.warning(self, "Duplicate Name", "A campaign with this name already exists.")
                 return
+            # Only warns; the trigram match cannot decide what counts as the same name
+            matcher = NameMatcher()
+            for campaign_id in campaigns:
+                matcher.set_names(("campaigns", campaign_id), [campaign_name(campaigns, campaign_id)])
+            similar = matcher.match(name, min_score=SIMILAR_NAME_SCORE)
+            if similar and not self._confirm_similar_names(name, similar):
+                return
 
             import uuid
             campaign_id = str(uuid.uuid4())
@@ -293,8 +333,9 @@ class MainWindow(QMainWindow):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             del self.application_data.campaigns[self.current_campaign_id]
+            self._save_app_data() # Records the deletion of the current campaign
+            remove_search_index(self.data_file_path, self.current_campaign_id)
             self.current_campaign_id = None # Reset current campaign
-            self._save_app_data()
             self._populate_campaign_selector() # Repopulate and select default if any
             self.statusBar().showMessage(f"Campaign '{campaign_to_delete.name}' deleted.")
         self._update_tracker_nav_status()
@@ -304,21 +345,31 @@ class MainWindow(QMainWindow):
     def _on_import_all_data(self):
         filepath, _ = QFileDialog.getOpenFileName(self, "Import Data File", "", "JSON files (*.json)")
         if filepath:
-            original_data_path = self.data_file_path
-            self.data_file_path = filepath # Temporarily change path for loading
-            self._load_app_data() # This calls populate_campaign_selector and update_tracker_nav
-            self.data_file_path = original_data_path # Revert to original if it's different (or decide to adopt new path)
-            # To make the change permanent, one might uncomment:
-            # self.data_file_path = filepath
-            self._save_app_data() # Save the newly imported data to the standard/new location
-            self.statusBar().showMessage(f"Data imported from {filepath}.")
+            try:
+                imported_data = load_data(filepath, progress_callback=self._load_progress_callback,
+                                          use_cache=False, raise_errors=True)
+            except Exception as e:
+                logging.error(f"Failed to import data from {filepath}: {e}")
+                QMessageBox.critical(self, "Import Error", f"Failed to import data from {filepath}:\n{e}")
+                return
+            # Imported campaigns are added, and entries of campaigns that exist here are merged
+            # into them; an entry with the ID of one already here replaces it.
+            changes = ChangeSet()
+            updated = merge_application_data(self.application_data, imported_data, changes)
+            self._apply_changes(changes, shown_tracker_updated=False)
+            self._populate_campaign_selector()
+            message = f"Data imported from {filepath}."
+            if updated:
+                message += f" {len(updated)} existing entries were updated."
+            self.statusBar().showMessage(message)
 
 
     @Slot()
     def _on_export_all_data(self):
         filepath, _ = QFileDialog.getSaveFileName(self, "Export All Data", "", "JSON files (*.json)")
         if filepath:
-            if save_data(self.application_data, filepath):
+            # Exports leave no load cache behind, and stream campaigns not loaded yet one at a time
+            if save_data(self.application_data, filepath, write_cache=False):
                 self.statusBar().showMessage(f"All data exported to {filepath}.")
             else:
                 QMessageBox.critical(self, "Export Error", f"Failed to export data to {filepath}.")
@@ -331,6 +382,17 @@ class MainWindow(QMainWindow):
         else:
             self.current_campaign_id = self.campaign_selector.itemData(index)
 
+        self.search_widget.clear() # Results belong to the previous campaign
+        if self._name_matcher_campaign_id != self.current_campaign_id:
+            self._name_matcher = None
+            self._name_matcher_campaign_id = None
+        if self._search_index_campaign_id != self.current_campaign_id:
+            # Only the index of the current campaign is kept up to date
+            self._store_search_index()
+            self._drop_search_index()
+            if self.current_campaign_id:
+                self._search_index_campaign_id = self.current_campaign_id
+                self._start_search_index_job(self._open_search_index(self.current_campaign_id))
         # When campaign changes, reset current tracker selection logic
         self.current_tracker_name = None # Reset tracker name
         self.tracker_nav_list.clearSelection() # Clear visual selection
@@ -343,6 +405,7 @@ class MainWindow(QMainWindow):
                  self.statusBar().showMessage(f"Campaign '{campaign.name}' selected.")
         else:
             self.statusBar().showMessage("No campaign selected.")
+        self._evict_inactive_campaigns()
 
 
     @Slot(QListWidgetItem, QListWidgetItem)
@@ -351,30 +414,14 @@ class MainWindow(QMainWindow):
             self.current_tracker_name = current_item.text()
 
             # Switch to the correct widget in QStackedWidget
-            widget_to_display = self.tracker_widgets.get(self.current_tracker_name)
+            widget_to_display = self.tracker_widget(self.current_tracker_name)
             if widget_to_display:
                 self.tracker_display_area.setCurrentWidget(widget_to_display)
-                if self.current_tracker_name == "NPC Tracker":
-                    self.npc_tracker_widget.refresh_display()
-                elif self.current_tracker_name == "Campaign Journal":
-                    self.campaign_journal_widget.refresh_display()
-                elif self.current_tracker_name == "Settlement Tracker":
-                    self.settlement_tracker_widget.refresh_display()
-                elif self.current_tracker_name == "Game Expectations":
-                    self.game_expectations_widget.refresh_display()
-                elif self.current_tracker_name == "Travel Planner":
-                    self.travel_planner_widget.refresh_display()
-                elif self.current_tracker_name == "DM's Character Tracker":
-                    self.dm_character_widget.refresh_display()
-                elif self.current_tracker_name == "Campaign Conflicts":
-                    self.campaign_conflicts_widget.refresh_display()
-                elif self.current_tracker_name == "Magic Item Tracker":
-                    self.magic_item_tracker_widget.refresh_display()
-                elif self.current_tracker_name == "Bastion Tracker":
-                    self.bastion_tracker_widget.refresh_display()
-                # Add elif for other actual tracker widgets and their refresh methods
+                if not self._is_tracker_up_to_date(self.current_tracker_name):
+                    widget_to_display.refresh_display()
+                    self._mark_tracker_up_to_date(self.current_tracker_name)
                 self.statusBar().showMessage(f"Tracker '{self.current_tracker_name}' selected.")
-            else: # Should not happen if TRACKER_NAMES and tracker_widgets are in sync
+            else: # Should not happen, the list holds the registered trackers
                 self.tracker_display_area.setCurrentWidget(self.no_tracker_placeholder)
                 self.statusBar().showMessage(f"Tracker '{self.current_tracker_name}' not found.", 3000)
         else:
@@ -383,16 +430,415 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("No tracker selected.")
 
 
-    def _save_app_data(self):
-        if save_data(self.application_data, self.data_file_path):
-            self.statusBar().showMessage(f"Data saved to {self.data_file_path}.")
+    def tracker_widget(self, name: str) -> Optional[QWidget]:
+        """Returns the widget of the tracker called name, building it on first use; None for unknown trackers."""
+        widget = self.tracker_widgets.get(name)
+        registration = self.trackers.get(name)
+        if widget is None and registration is not None:
+            widget = registration.factory(self) # Shows the current campaign
+            self.tracker_display_area.addWidget(widget)
+            self.tracker_widgets[name] = widget
+            self._mark_tracker_up_to_date(name)
+            logging.debug(f"Built the {name} widget.")
+        return widget
+
+    def _tracker_version(self, name: str) -> tuple[Optional[str], int]:
+        return self.current_campaign_id, self.trackers.version(self.current_campaign_id, self.trackers.get(name).collection)
+
+    def _is_tracker_up_to_date(self, name: str) -> bool:
+        """Whether the widget of tracker name shows the current version of its data."""
+        return self._shown_tracker_versions.get(name) == self._tracker_version(name)
+
+    def _mark_tracker_up_to_date(self, name: str):
+        self._shown_tracker_versions[name] = self._tracker_version(name)
+
+    def _update_tracker_versions(self, changes: ChangeSet, shown_tracker_updated: bool = True):
+        """
+        Raises the versions of the collections in changes, so their trackers
+        refresh when next shown.
+
+        Args:
+            shown_tracker_updated: The tracker being shown made the changes and
+                has updated its display itself (see BaseTrackerWidget._refresh_item).
+        """
+        name = self.current_tracker_name
+        shown_up_to_date = (shown_tracker_updated and name in self.tracker_widgets
+                            and self.tracker_display_area.currentWidget() is self.tracker_widgets[name]
+                            and self._is_tracker_up_to_date(name))
+        self.trackers.mark_changed(changes)
+        if shown_up_to_date:
+            self._mark_tracker_up_to_date(name)
+
+    @Slot()
+    def _prewarm_next_tracker(self):
+        name = next((name for name in self.trackers.names() if name not in self.tracker_widgets), None)
+        if name is None:
+            self._prewarm_timer.stop()
+            return
+        self.tracker_widget(name)
+
+    def _current_search_index(self) -> Optional[SearchIndex]:
+        """Returns the search index of the current campaign, finishing reading or building it if needed."""
+        if not self.current_campaign_id or self.current_campaign_id not in self.application_data.campaigns:
+            return None
+        if self._search_index_campaign_id != self.current_campaign_id:
+            self._drop_search_index()
+            self._search_index_campaign_id = self.current_campaign_id
+            self._start_search_index_job(self._open_search_index(self.current_campaign_id))
+        if not self._search_index_ready:
+            self.statusBar().showMessage("Indexing campaign...")
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                while self._search_index_job is not None and not self._search_index_ready:
+                    self._continue_search_index_job()
+            finally:
+                QApplication.restoreOverrideCursor()
+            self.statusBar().clearMessage()
+        return self._search_index
+
+    def _open_search_index(self, campaign_id: str) -> Iterator[None]:
+        """
+        The job making the index of campaign_id: reads the stored index if it
+        matches the saved campaign and decodes it ahead of the first
+        searches; otherwise builds it a few entries per step and encodes it
+        for _store_search_index.
+        """
+        yield # Let the campaign be shown first
+        index = self._search_indexes_to_store.pop(campaign_id, None) # Selected again before it was stored
+        if index is not None:
+            self._search_index = index
+            self._search_index_ready = True
+            return
+        # Unless every change is saved, the files do not hold the campaign as it is now
+        if self.save_scheduler.is_idle and not self.pending_changes.is_campaign_dirty(campaign_id):
+            index = read_search_index(self.data_file_path, campaign_id,
+                                      storage_fingerprint(self.data_file_path, campaign_id))
+        if index is not None:
+            self._search_index = index
+            self._search_index_ready = True
+            self._search_index_stored = True
+            while not index.warm_step():
+                yield
+            return
+
+        campaign = self.application_data.campaigns.get(campaign_id)
+        if campaign is None:
+            return
+        builder = IndexBuilder(campaign)
+        self._search_index = builder.index # Updated along with the campaign while it is built
+        while not builder.step():
+            yield
+        self._search_index_ready = True
+        while not builder.index.encode_step(): # Most of the work of storing it on exit
+            yield
+
+    def _store_search_index(self):
+        """
+        Has the next background save write the index to disk for the next
+        start, if it changed since it was read. The index must not be used
+        afterwards; call _drop_search_index next.
+        """
+        campaign_id = self._search_index_campaign_id
+        if not self._search_index_ready or self._search_index_stored \
+                or campaign_id not in self.application_data.campaigns:
+            return
+        self._search_indexes_to_store[campaign_id] = self._search_index
+        self.save_scheduler.request_save()
+
+    def _drop_search_index(self):
+        self._search_index = None
+        self._search_index_campaign_id = None
+        self._search_index_ready = False
+        self._search_index_stored = False
+        self._search_index_updates = 0
+        self._search_index_job = None
+        self._search_index_job_timer.stop()
+
+    def _start_search_index_job(self, job: Iterator[None]):
+        self._search_index_job = job
+        self._search_index_job_timer.start()
+
+    @Slot()
+    def _continue_search_index_job(self):
+        job = self._search_index_job
+        if job is None:
+            self._search_index_job_timer.stop()
+            return
+        try:
+            next(job)
+        except StopIteration:
+            if self._search_index_job is job:
+                self._search_index_job = None
+                self._search_index_job_timer.stop()
+
+    def _update_search_index(self, changes: ChangeSet):
+        """
+        Applies changes to the search index, if one is built: changed entries
+        are reindexed (only their changed fields are tokenized again) and
+        deleted ones removed. A campaign changed as a whole is compared with
+        the index entry by entry.
+        """
+        for stored_campaign_id in list(self._search_indexes_to_store):
+            if changes.is_campaign_dirty(stored_campaign_id): # E.g. by an import; the index misses the change
+                del self._search_indexes_to_store[stored_campaign_id]
+        campaign_id = self._search_index_campaign_id
+        if self._search_index is None or not changes.is_campaign_dirty(campaign_id):
+            return
+        campaign = self.application_data.campaigns.get(campaign_id)
+        if campaign is None: # Deleted
+            self._drop_search_index()
+            return
+        entry_changes = changes.get_entry_changes(campaign_id)
+        if entry_changes is None:
+            self._search_index.refresh(campaign)
+        else:
+            for collection, entry_id in entry_changes:
+                self._search_index.update_entry(campaign, collection, entry_id)
+        self._search_index_updates += 1
+        self._search_index_stored = False
+
+    def _start_search_index_check(self):
+        """
+        Compares the incrementally updated index with a rebuild from the
+        campaign while the app is idle, and repairs any difference.
+        """
+        if not self._search_index_ready or self._search_index_job is not None or not self._search_index_updates:
+            return
+        campaign = self.application_data.campaigns.get(self._search_index_campaign_id)
+        if campaign is None:
+            return
+        self._search_index_updates = 0
+        self._start_search_index_job(self._check_search_index(ConsistencyCheck(self._search_index, campaign)))
+
+    def _check_search_index(self, check: ConsistencyCheck) -> Iterator[None]:
+        while not check.step():
+            yield
+        if check.mismatches:
+            logging.warning(f"Search index differed from the campaign for {len(check.mismatches)} entries "
+                            f"(e.g. {check.mismatches[0]}); reindexing them.")
+            check.repair()
+            self._search_index_stored = False
+
+    def _current_name_matcher(self) -> Optional[NameMatcher]:
+        """Returns the name matcher of the current campaign, building it if needed."""
+        campaign = self.application_data.campaigns.get(self.current_campaign_id) if self.current_campaign_id else None
+        if campaign is None:
+            return None
+        if self._name_matcher_campaign_id != self.current_campaign_id:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            try:
+                self._name_matcher = NameMatcher.for_campaign(campaign)
+            finally:
+                QApplication.restoreOverrideCursor()
+            self._name_matcher_campaign_id = self.current_campaign_id
+        return self._name_matcher
+
+    def _update_name_matcher(self, changes: ChangeSet):
+        """Applies changes to the name matcher, if one is built, like _update_search_index."""
+        campaign_id = self._name_matcher_campaign_id
+        if self._name_matcher is None or not changes.is_campaign_dirty(campaign_id):
+            return
+        campaign = self.application_data.campaigns.get(campaign_id)
+        if campaign is None: # Deleted
+            self._name_matcher = None
+            self._name_matcher_campaign_id = None
+            return
+        entry_changes = changes.get_entry_changes(campaign_id)
+        if entry_changes is None:
+            self._name_matcher.refresh(campaign)
+        else:
+            for collection, entry_id in entry_changes:
+                self._name_matcher.update_entry(campaign, collection, entry_id)
+
+    def confirm_new_name(self, collection: str, name: str, parent: Optional[QWidget] = None) -> bool:
+        """
+        Checks a name about to be added to collection of the current campaign
+        (e.g. "npcs") against the names already there. If any is similar, the
+        user is asked whether to add it anyway.
+
+        Returns:
+            True if the name should be added.
+        """
+        matcher = self._current_name_matcher()
+        similar = matcher.match(name, min_score=SIMILAR_NAME_SCORE, collections=[collection]) if matcher else []
+        return not similar or self._confirm_similar_names(name, similar, parent)
+
+    def _confirm_similar_names(self, name: str, similar: list, parent: Optional[QWidget] = None) -> bool:
+        names = "\n".join(f"  {match.name}" for match in similar[:5])
+        reply = QMessageBox.question(parent or self, "Similar Name",
+                                     f"Similar names already exist:\n{names}\n\nAdd '{name}' anyway?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        return reply == QMessageBox.StandardButton.Yes
+
+    @Slot()
+    def _on_quick_open(self):
+        if self._current_name_matcher() is None:
+            self.statusBar().showMessage("No campaign selected.", 3000)
+            return
+        dialog = QuickOpenDialog(self._current_name_matcher, self._collection_trackers, self)
+        if dialog.exec() and dialog.selected_key:
+            self._on_search_result_activated(*dialog.selected_key)
+
+    @Slot(str, str)
+    def _on_search_result_activated(self, collection: str, entry_id: str):
+        tracker_name = self._collection_trackers.get(collection)
+        items = self.tracker_nav_list.findItems(tracker_name, Qt.MatchFlag.MatchExactly) if tracker_name else []
+        if not items:
+            return
+        self.tracker_nav_list.setCurrentItem(items[0]) # Shows and refreshes the tracker
+        if not self.tracker_widget(tracker_name).select_item(entry_id):
+            self.statusBar().showMessage("The search result no longer exists.", 3000)
+
+
+    def _save_app_data(self, collection: Optional[str] = None, entry_id: Optional[str] = None):
+        """
+        Schedules a save of the application data.
+
+        Bursts of calls (e.g. a dialog saving and then its tracker widget saving
+        again) are merged into a single write that runs in the background.
+
+        Args:
+            collection: The Campaign field that changed (e.g. "npcs"), if known.
+            entry_id: The ID of the changed entry in that collection. Together
+                with collection this lets storage formats that support it
+                write just that entry instead of the whole campaign.
+        """
+        if self._transaction is not None and not self._transaction.closed:
+            # Saved with the rest of the transaction when it commits
+            self._transaction.mark(collection, entry_id)
+            return
+        # Tracker widgets and dialogs only ever modify the current campaign.
+        changes = ChangeSet()
+        if collection and entry_id:
+            changes.mark_entry(self.current_campaign_id, collection, entry_id)
         else:
-            QMessageBox.critical(self, "Save Error", f"Failed to save data to {self.data_file_path}.")
-            self.statusBar().showMessage(f"Error saving data to {self.data_file_path}.")
+            changes.mark_campaign(self.current_campaign_id)
+        self._apply_changes(changes)
+
+    def _apply_changes(self, changes: ChangeSet, shown_tracker_updated: bool = True):
+        """
+        Schedules the save of changes, together with those the model events
+        reported meanwhile, and applies them to the search index, the name
+        matcher and the tracker versions.
+
+        Args:
+            shown_tracker_updated: See _update_tracker_versions.
+        """
+        changes.update(self._model_changes.take())
+        self.pending_changes.update(changes)
+        self._update_search_index(changes)
+        self._update_name_matcher(changes)
+        self._update_tracker_versions(changes, shown_tracker_updated)
+        self.save_scheduler.request_save()
 
+    @Slot()
+    def _apply_model_changes(self):
+        """
+        Applies the changes the model events reported that no _save_app_data
+        call or transaction took along, e.g. an entry edited in place by code
+        that does not save it itself, and refreshes the shown tracker if they
+        touched its collection.
+        """
+        if self._transaction is not None:
+            return # Taken along by its commit, or restarted once it ends
+        changes = self._model_changes.take()
+        if not changes:
+            return
+        self._apply_changes(changes, shown_tracker_updated=False)
+        name = self.current_tracker_name
+        widget = self.tracker_widgets.get(name)
+        if widget is not None and self.tracker_display_area.currentWidget() is widget \
+                and not self._is_tracker_up_to_date(name):
+            widget.refresh_display()
+            self._mark_tracker_up_to_date(name)
+
+    @contextmanager
+    def transaction(self) -> Iterator[CampaignTransaction]:
+        """
+        Opens a transaction over the current campaign, or joins the one that
+        is already open:
+
+            with main_window.transaction() as transaction:
+                for npc in imported_npcs:
+                    transaction.add("npcs", npc)
+
+        Everything the transaction records, including _save_app_data calls
+        made meanwhile, is saved by a single write once the outermost block
+        ends. If an exception escapes, tracked changes are undone instead.
+        Background saves wait while a transaction is open, so a write never
+        captures half of one.
+
+        Raises:
+            TransactionError: If no campaign is selected.
+        """
+        if self._transaction is not None:
+            with self._transaction as transaction:
+                yield transaction
+            return
+
+        campaign = self.application_data.campaigns.get(self.current_campaign_id) if self.current_campaign_id else None
+        if campaign is None:
+            raise TransactionError("No campaign is selected.")
+        self._transaction = CampaignTransaction(campaign, self.current_campaign_id, self._commit_transaction,
+                                                recorder=self._model_changes)
+        self.save_scheduler.hold()
+        try:
+            with self._transaction as transaction:
+                yield transaction
+        finally:
+            self._transaction = None
+            self.save_scheduler.release()
+            self._model_changes_timer.start() # E.g. the restores of a rollback
+
+    def _commit_transaction(self, changes: ChangeSet):
+        self._apply_changes(changes)
+
+    def _take_save_snapshot(self) -> tuple:
+        # Runs on the GUI thread right before a write; hands the pending changes to that write.
+        changes = self.pending_changes
+        self.pending_changes = ChangeSet()
+        snapshot = snapshot_application_data(self.application_data, self.data_file_path, changes)
+        search_indexes = self._search_indexes_to_store
+        self._search_indexes_to_store = {}
+        return snapshot, self.data_file_path, changes, COMPACT_DATA_FILES, search_indexes
+
+    def _restore_failed_save(self, snapshot: tuple):
+        # Keep the changes of a failed write so the next save retries them. Its search
+        # indexes may have missed changes made since; they are rebuilt when next needed.
+        _, _, changes, _, _ = snapshot
+        self.pending_changes.update(changes)
+
+    @Slot()
+    def _on_background_save_succeeded(self):
+        self.statusBar().showMessage(f"Data saved to {self.data_file_path}.", 3000)
+        self._evict_inactive_campaigns()
+        self._start_search_index_check()
+
+    @Slot()
+    def _on_background_save_failed(self):
+        retry_seconds = self.save_scheduler.next_retry_delay_ms() // 1000
+        self.statusBar().showMessage(f"Error saving data to {self.data_file_path}. Retrying in {retry_seconds} s.")
+
+
+    def _evict_inactive_campaigns(self):
+        """Frees loaded campaigns other than the current one whose changes are all saved."""
+        campaigns = self.application_data.campaigns
+        if not self.evict_inactive_campaigns or not isinstance(campaigns, LazyCampaigns):
+            return
+        if not self.save_scheduler.is_idle:
+            return # Storage may not hold the latest version of the campaigns yet
+        for campaign_id in campaigns:
+            if campaign_id != self.current_campaign_id and not self.pending_changes.is_campaign_dirty(campaign_id):
+                campaigns.evict(campaign_id)
+                self._model_changes.forget(campaign_id)
+                self.trackers.mark_campaign_changed(campaign_id) # Reloaded as new objects when next used
 
     def _load_app_data(self):
-        self.application_data = load_data(self.data_file_path)
+        # Only campaign names are read here; each campaign is loaded when first selected.
+        self.application_data = load_data(self.data_file_path, lazy=True,
+                                          progress_callback=self._load_progress_callback)
+        if needs_load_cache(self.data_file_path):
+            self.save_scheduler.request_save() # Writes the cache the lazy load could not
         # Ensure current_campaign_id is valid after loading
         if self.application_data.active_campaign_id and \
            self.application_data.active_campaign_id in self.application_data.campaigns:
@@ -416,7 +862,13 @@ class MainWindow(QMainWindow):
         else:
             self.application_data.active_campaign_id = ""
 
-        self._save_app_data()
+        self._apply_model_changes()
+        self._model_changes.stop()
+        # The active campaign ID is written with every save; no campaign needs rewriting.
+        self._store_search_index()
+        self.save_scheduler.request_save()
+        if not self.save_scheduler.flush():
+            QMessageBox.critical(self, "Save Error", f"Failed to save data to {self.data_file_path}.")
         super().closeEvent(event)
 
 if __name__ == '__main__': # Basic test
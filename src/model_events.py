@@ -0,0 +1,228 @@
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, FrozenSet, Iterator, List, Union
+
+# Change notifications for the data models.
+#
+# Entries (NPCs, journal entries, ...) and the single trackers derive from
+# ObservableModel, and the dict collections of a Campaign are EntryDicts that
+# know their campaign. While at least one callback is subscribed, assigning a
+# field of an entry or campaign publishes a FieldChanged event, and adding,
+# replacing or removing an entry of a collection publishes EntityAdded and
+# EntityRemoved events. In-place changes of list fields (e.g. appending to
+# the conflicts or magic item lists) are not seen.
+#
+# The notifying methods are only installed on the classes while someone is
+# subscribed. Without subscribers, setting a field and changing a collection
+# run the plain object and dict implementations and cost nothing extra.
+#
+# Events are published synchronously on the thread making the change, which
+# for the app is the GUI thread.
+
+_UNSET = object()
+
+
+@dataclass(frozen=True)
+class FieldChanged:
+    """A field of an entry, tracker or campaign was assigned a different value."""
+    model: Any
+    field_name: str
+    old_value: Any
+    new_value: Any
+
+
+@dataclass(frozen=True)
+class EntityAdded:
+    """An entry was stored in a collection of a campaign (e.g. campaign.npcs)."""
+    campaign: Any
+    collection: str
+    entry_id: str
+    entity: Any
+
+
+@dataclass(frozen=True)
+class EntityRemoved:
+    """An entry was removed from, or replaced in, a collection of a campaign."""
+    campaign: Any
+    collection: str
+    entry_id: str
+    entity: Any
+
+
+ModelEvent = Union[FieldChanged, EntityAdded, EntityRemoved]
+
+_subscribers: List[Callable[[ModelEvent], None]] = []
+
+
+def _publish(event: ModelEvent) -> None:
+    for callback in tuple(_subscribers):
+        try:
+            callback(event)
+        except Exception: # A broken listener must not interrupt the change itself
+            logging.exception(f"Model change listener {callback!r} failed")
+
+
+class ObservableModel:
+    """Base class of the entry and tracker dataclasses."""
+    __slots__ = ()
+
+
+def _rebuild_entry_dict(campaign: Any, collection: str, entries: dict) -> 'EntryDict':
+    entry_dict = EntryDict(entries)
+    entry_dict.campaign = campaign
+    entry_dict.collection = collection
+    return entry_dict
+
+
+class EntryDict(dict):
+    """
+    The dict holding one collection of a campaign, keyed by entry ID. It is a
+    plain dict apart from knowing which campaign and collection it is, so the
+    events it publishes can say so. Copies made by pickle and copy keep that;
+    other copies (e.g. dict(entries) or asdict()) do not publish events.
+    """
+    __slots__ = ("campaign", "collection")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.campaign = None
+        self.collection = ""
+
+    def __reduce__(self):
+        return _rebuild_entry_dict, (self.campaign, self.collection, dict(self))
+
+
+class ObservableCampaign:
+    """
+    Base class of Campaign. Keeps the dict fields named in _entry_collections
+    EntryDicts owned by the campaign, and publishes FieldChanged for its
+    fields. Assigning a whole collection publishes one FieldChanged with the
+    old and new dicts rather than an event per entry.
+    """
+    _entry_collections: FrozenSet[str] = frozenset()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._entry_collections:
+            if not (isinstance(value, EntryDict) and value.campaign is self and value.collection == name):
+                value = _rebuild_entry_dict(self, name, value)
+            old_value = self.__dict__.get(name, _UNSET) if _subscribers else _UNSET
+            object.__setattr__(self, name, value)
+            # Not compared with ==, which would compare every entry
+            if old_value is not _UNSET and old_value is not value:
+                _publish(FieldChanged(self, name, old_value, value))
+        elif _subscribers:
+            _notifying_setattr(self, name, value)
+        else:
+            object.__setattr__(self, name, value)
+
+
+def _notifying_setattr(self, name: str, value: Any) -> None:
+    # Read the instance's own value; a dataclass default on the class does not count
+    instance_dict = getattr(self, "__dict__", None)
+    old_value = getattr(self, name, _UNSET) if instance_dict is None else instance_dict.get(name, _UNSET)
+    object.__setattr__(self, name, value)
+    # Fields set while the object is being constructed had no value yet
+    if old_value is not _UNSET and old_value is not value and old_value != value:
+        _publish(FieldChanged(self, name, old_value, value))
+
+
+def _entry_replaced(entry_dict: EntryDict, entry_id: str, old_entry: Any, new_entry: Any) -> None:
+    if old_entry is new_entry or entry_dict.campaign is None:
+        return
+    if old_entry is not _UNSET:
+        _publish(EntityRemoved(entry_dict.campaign, entry_dict.collection, entry_id, old_entry))
+    if new_entry is not _UNSET:
+        _publish(EntityAdded(entry_dict.campaign, entry_dict.collection, entry_id, new_entry))
+
+
+def _notifying_setitem(self, entry_id, entry):
+    old_entry = dict.get(self, entry_id, _UNSET)
+    dict.__setitem__(self, entry_id, entry)
+    _entry_replaced(self, entry_id, old_entry, entry)
+
+
+def _notifying_delitem(self, entry_id):
+    old_entry = dict.__getitem__(self, entry_id)
+    dict.__delitem__(self, entry_id)
+    _entry_replaced(self, entry_id, old_entry, _UNSET)
+
+
+def _notifying_pop(self, entry_id, *default):
+    old_entry = dict.get(self, entry_id, _UNSET)
+    value = dict.pop(self, entry_id, *default)
+    _entry_replaced(self, entry_id, old_entry, _UNSET)
+    return value
+
+
+def _notifying_popitem(self):
+    entry_id, old_entry = dict.popitem(self)
+    _entry_replaced(self, entry_id, old_entry, _UNSET)
+    return entry_id, old_entry
+
+
+def _notifying_setdefault(self, entry_id, default=None):
+    if entry_id not in self:
+        _notifying_setitem(self, entry_id, default)
+    return dict.__getitem__(self, entry_id)
+
+
+def _notifying_update(self, *args, **kwargs):
+    for entry_id, entry in dict(*args, **kwargs).items():
+        _notifying_setitem(self, entry_id, entry)
+
+
+def _notifying_clear(self):
+    old_entries = list(self.items())
+    dict.clear(self)
+    for entry_id, old_entry in old_entries:
+        _entry_replaced(self, entry_id, old_entry, _UNSET)
+
+
+_ENTRY_DICT_HOOKS = {
+    "__setitem__": _notifying_setitem,
+    "__delitem__": _notifying_delitem,
+    "pop": _notifying_pop,
+    "popitem": _notifying_popitem,
+    "setdefault": _notifying_setdefault,
+    "update": _notifying_update,
+    "clear": _notifying_clear,
+}
+
+
+def _install_hooks() -> None:
+    ObservableModel.__setattr__ = _notifying_setattr
+    for name, hook in _ENTRY_DICT_HOOKS.items():
+        setattr(EntryDict, name, hook)
+
+
+def _remove_hooks() -> None:
+    del ObservableModel.__setattr__
+    for name in _ENTRY_DICT_HOOKS:
+        delattr(EntryDict, name)
+
+
+def subscribe(callback: Callable[[ModelEvent], None]) -> None:
+    """Calls callback with every FieldChanged, EntityAdded and EntityRemoved event from now on."""
+    if not _subscribers:
+        _install_hooks()
+    _subscribers.append(callback)
+
+
+def unsubscribe(callback: Callable[[ModelEvent], None]) -> None:
+    """Stops calling callback. Does nothing if it was not subscribed."""
+    if callback not in _subscribers:
+        return
+    _subscribers.remove(callback)
+    if not _subscribers:
+        _remove_hooks()
+
+
+@contextmanager
+def subscribed(callback: Callable[[ModelEvent], None]) -> Iterator[None]:
+    """Subscribes callback for the duration of a with block."""
+    subscribe(callback)
+    try:
+        yield
+    finally:
+        unsubscribe(callback)
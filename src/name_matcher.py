@@ -0,0 +1,215 @@
+import heapq
+import math
+from collections import Counter
+from dataclasses import dataclass, is_dataclass
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from src.field_specs import FieldKind, field_spec, field_specs
+from src.search_index import DocKey, entity_id, tokenize
+
+# Fuzzy matching of entity names: NPCs, settlements, DM characters,
+# bastions and magic items, i.e. the fields declared with entity_name (see
+# FieldSpec). It tolerates misspellings ("Ismarck" finds "Ismark
+# Kolyanovich") and powers quick-open and the duplicate warnings on add.
+#
+# Names are compared by their trigrams, the way PostgreSQL's pg_trgm does:
+# each word is padded with two spaces in front and one behind, and the
+# similarity of two names is the number of distinct trigrams they share
+# divided by the number of distinct trigrams in either. An inverted index
+# from trigram to names means a query only looks at the names sharing at
+# least one trigram with it.
+#
+# Names are keyed like search results: (collection, entry_id), where the
+# magic items of a tier and rarity share the key (collection, "tier.rarity").
+
+
+def name_trigrams(name: str) -> FrozenSet[str]:
+    """Returns the distinct trigrams of the words of name, lower-cased."""
+    trigrams = set()
+    for word in tokenize(name):
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(trigrams)
+
+
+@dataclass(frozen=True)
+class NameMatch:
+    """A name similar to a query. entry_id is an entry or "tier.rarity" key of collection."""
+    collection: str
+    entry_id: str
+    name: str
+    score: float # Between 0 and 1; 1 for the same words
+
+
+def _names_of(entity: Any) -> List[str]:
+    names = []
+    for spec in field_specs(type(entity)):
+        if spec.entity_name:
+            value = getattr(entity, spec.name)
+            if spec.kind is FieldKind.LIST:
+                names.extend(item for item in value if item)
+            elif value:
+                names.append(value)
+    return names
+
+
+def entity_names(campaign: Any, collection: str, entry_id: str) -> List[str]:
+    """
+    Returns the names of one entry, conflict or magic item list of
+    campaign; none if it has no name fields or no longer exists.
+    """
+    spec = field_spec(type(campaign), collection)
+    value = getattr(campaign, collection)
+    if spec.kind is FieldKind.ENTRIES:
+        entry = value.get(entry_id)
+        return _names_of(entry) if entry is not None else []
+    tracker_field, _, list_field = entry_id.partition(".")
+    if list_field: # The items of one list of a nested model, e.g. "level_tier_1_4.rare_items"
+        nested = getattr(value, tracker_field, None)
+        if nested is None or not any(spec.name == list_field and spec.entity_name for spec in field_specs(type(nested))):
+            return []
+        return [item for item in getattr(nested, list_field) if item]
+    for tracker_spec in field_specs(type(value)):
+        if tracker_spec.kind is FieldKind.LIST and is_dataclass(tracker_spec.item_type):
+            for entity in getattr(value, tracker_spec.name):
+                if entity_id(entity) == entry_id:
+                    return _names_of(entity)
+    return []
+
+
+def campaign_names(campaign: Any) -> Iterator[Tuple[DocKey, List[str]]]:
+    """Returns (key, names) for every entry, conflict and magic item list of campaign that has names."""
+    for spec in field_specs(type(campaign)):
+        value = getattr(campaign, spec.name)
+        if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type):
+            for entry_id, entry in value.items():
+                names = _names_of(entry)
+                if names:
+                    yield (spec.name, entry_id), names
+        elif spec.kind is FieldKind.MODEL:
+            for tracker_spec in field_specs(type(value)):
+                tracker_value = getattr(value, tracker_spec.name)
+                if tracker_spec.kind is FieldKind.LIST and is_dataclass(tracker_spec.item_type):
+                    for entity in tracker_value:
+                        names = _names_of(entity)
+                        if names:
+                            yield (spec.name, entity_id(entity)), names
+                elif tracker_spec.kind is FieldKind.MODEL:
+                    for item_spec in field_specs(type(tracker_value)):
+                        names = getattr(tracker_value, item_spec.name)
+                        if item_spec.entity_name and any(names):
+                            yield (spec.name, f"{tracker_spec.name}.{item_spec.name}"), [name for name in names if name]
+
+
+class NameMatcher:
+    """
+    A trigram index over names, answering similarity-ranked queries. Each
+    name gets a number; postings map each trigram to the numbers of the
+    names containing it.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[int]] = {}
+        self._names: Dict[int, Tuple[DocKey, str]] = {}
+        self._sizes: Dict[int, int] = {} # Distinct trigrams of each name
+        self._name_numbers: Dict[DocKey, List[int]] = {}
+        self._next_number = 0
+
+    @classmethod
+    def for_campaign(cls, campaign: Any) -> 'NameMatcher':
+        matcher = cls()
+        for key, names in campaign_names(campaign):
+            matcher.set_names(key, names)
+        return matcher
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def set_names(self, key: DocKey, names: Iterable[str]) -> None:
+        """Makes names the names of key, replacing those it had; no names removes key."""
+        names = list(names)
+        numbers = self._name_numbers.pop(key, [])
+        if [self._names[number][1] for number in numbers] == names:
+            if numbers:
+                self._name_numbers[key] = numbers
+            return
+        for number in numbers:
+            self._remove_name(number)
+        numbers = [self._add_name(key, name) for name in names]
+        if numbers:
+            self._name_numbers[key] = numbers
+
+    def update_entry(self, campaign: Any, collection: str, entry_id: str) -> None:
+        """Brings the names of one entry, conflict or magic item list up to date with campaign."""
+        self.set_names((collection, entry_id), entity_names(campaign, collection, entry_id))
+
+    def refresh(self, campaign: Any) -> None:
+        """Brings all names up to date with campaign."""
+        current = set()
+        for key, names in campaign_names(campaign):
+            current.add(key)
+            self.set_names(key, names)
+        for key in [key for key in self._name_numbers if key not in current]:
+            self.set_names(key, ())
+
+    def _add_name(self, key: DocKey, name: str) -> int:
+        number = self._next_number
+        self._next_number += 1
+        trigrams = name_trigrams(name)
+        self._names[number] = (key, name)
+        self._sizes[number] = len(trigrams)
+        postings = self._postings
+        for trigram in trigrams:
+            trigram_postings = postings.get(trigram)
+            if trigram_postings is None:
+                postings[trigram] = [number]
+            else:
+                trigram_postings.append(number)
+        return number
+
+    def _remove_name(self, number: int) -> None:
+        _, name = self._names.pop(number)
+        del self._sizes[number]
+        for trigram in name_trigrams(name):
+            trigram_postings = self._postings[trigram]
+            trigram_postings.remove(number)
+            if not trigram_postings:
+                del self._postings[trigram]
+
+    def match(self, query: str, limit: int = 10, min_score: float = 0.3, partial: bool = False,
+              collections: Optional[Iterable[str]] = None) -> List[NameMatch]:
+        """
+        Returns up to limit names similar to query, most similar first.
+
+        Args:
+            query: The name, or with partial the start of or words from one.
+            limit: The maximum number of matches.
+            min_score: Names scoring less are left out.
+            partial: Score names by the share of the query's trigrams they
+                contain, ignoring the rest of the name, as for a query being
+                typed. Ties are ordered by the whole-name similarity.
+            collections: Only match names from these collections.
+        """
+        query_trigrams = name_trigrams(query)
+        if not query_trigrams or limit <= 0:
+            return []
+        counts = Counter()
+        for trigram in query_trigrams:
+            counts.update(self._postings.get(trigram, ()))
+        # Either score is at most shared / len(query_trigrams)
+        query_size = len(query_trigrams)
+        min_shared = max(1, math.ceil(min_score * query_size - 1e-9))
+        sizes = self._sizes
+        scored = []
+        for number, shared in counts.items():
+            if shared < min_shared:
+                continue
+            similarity = shared / (query_size + sizes[number] - shared)
+            score = shared / query_size if partial else similarity
+            if score >= min_score:
+                scored.append((score, similarity, number))
+        if collections is not None:
+            collections = set(collections)
+            scored = [candidate for candidate in scored if self._names[candidate[2]][0][0] in collections]
+        best = heapq.nlargest(limit, scored)
+        return [NameMatch(*self._names[number][0], self._names[number][1], score) for score, _, number in best]
@@ -0,0 +1,70 @@
+from typing import Callable, Dict, Optional, Tuple
+
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QListWidget, QListWidgetItem
+from PySide6.QtCore import Qt, Slot
+
+from src.name_matcher import NameMatcher
+
+MAX_MATCHES = 20
+
+
+class QuickOpenDialog(QDialog):
+    """
+    Jumps to an NPC, settlement, character, bastion or magic item by name.
+    Matches are listed as the name is typed and tolerate misspellings; after
+    the dialog is accepted, selected_key is the (collection, entry_id) chosen.
+    """
+
+    def __init__(self, matcher_provider: Callable[[], Optional[NameMatcher]],
+                 collection_labels: Dict[str, str], parent=None):
+        """
+        Args:
+            matcher_provider: Returns the name matcher of the current campaign,
+                or None if no campaign is selected.
+            collection_labels: The name shown with matches of each collection,
+                e.g. {"npcs": "NPC Tracker"}.
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Quick Open")
+        self.setMinimumWidth(420)
+        self._matcher_provider = matcher_provider
+        self._collection_labels = collection_labels
+        self.selected_key: Optional[Tuple[str, str]] = None
+
+        layout = QVBoxLayout(self)
+        self.name_edit = QLineEdit()
+        self.name_edit.setPlaceholderText("Name of an NPC, settlement, character, bastion or item")
+        layout.addWidget(self.name_edit)
+        self.matches_list = QListWidget()
+        layout.addWidget(self.matches_list)
+
+        # Matching is fast enough to run on every keystroke, unlike full-text search
+        self.name_edit.textChanged.connect(self.update_matches)
+        self.name_edit.returnPressed.connect(self._on_return_pressed)
+        self.matches_list.itemActivated.connect(self._on_match_activated)
+
+    @Slot()
+    def update_matches(self):
+        self.matches_list.clear()
+        query = self.name_edit.text().strip()
+        matcher = self._matcher_provider() if query else None
+        if matcher is None:
+            return
+        for match in matcher.match(query, MAX_MATCHES, partial=True):
+            label = self._collection_labels.get(match.collection, match.collection)
+            item = QListWidgetItem(f"{match.name}  ({label})")
+            item.setData(Qt.ItemDataRole.UserRole, (match.collection, match.entry_id))
+            self.matches_list.addItem(item)
+        if self.matches_list.count():
+            self.matches_list.setCurrentRow(0)
+
+    @Slot()
+    def _on_return_pressed(self):
+        item = self.matches_list.currentItem()
+        if item is not None:
+            self._on_match_activated(item)
+
+    @Slot(QListWidgetItem)
+    def _on_match_activated(self, item: QListWidgetItem):
+        self.selected_key = item.data(Qt.ItemDataRole.UserRole)
+        self.accept()
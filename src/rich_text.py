@@ -0,0 +1,109 @@
+import re
+from html import unescape
+from typing import Any
+
+# Everything QTextEdit.toHtml() writes before the document body. It is the
+# same for every field, so it is dropped when storing rich text and put back
+# when the text is loaded into an editor.
+RICH_TEXT_PREAMBLE = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+    '<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">\n'
+    'p, li { white-space: pre-wrap; }\n'
+    'hr { height: 1px; border-width: 0; }\n'
+    'li.unchecked::marker { content: "\\2610"; }\n'
+    'li.checked::marker { content: "\\2612"; }\n'
+    '</style></head><body>\n'
+)
+RICH_TEXT_POSTAMBLE = '</body></html>'
+
+# Qt writes this style on every plain paragraph; it is stored as a bare <p>.
+_DEFAULT_PARAGRAPH_STYLE = (' margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;'
+                            ' -qt-block-indent:0; text-indent:0px;')
+_DEFAULT_PARAGRAPH_TAG = f'<p style="{_DEFAULT_PARAGRAPH_STYLE}">'
+_COMPACT_PARAGRAPH_TAG = '<p>'
+
+# A Qt rich text document: the qrichtext head, the body and nothing after it.
+_QT_DOCUMENT_RE = re.compile(
+    r'\A\s*(?:<!DOCTYPE[^>]*>\s*)?<html><head><meta name="qrichtext" content="1" />.*?</head>'
+    r'<body[^>]*>\n?(.*)</body></html>\s*\Z', re.DOTALL)
+# The body of a document with no text: a single empty paragraph.
+_EMPTY_BODY_RE = re.compile(r'\A<p style="-qt-paragraph-type:empty;[^"]*"><br /></p>\Z')
+
+
+def compact_rich_text(html: Any) -> Any:
+    """
+    Returns the compact stored form of an HTML document from QTextEdit.toHtml().
+
+    The preamble (DOCTYPE, head and style sheet) is dropped, as are the body's
+    font attributes, which only repeat the editor's default font. Plain
+    paragraphs are stored as bare <p> tags and an empty document becomes "".
+    Anything that is not a Qt rich text document, including text that is
+    already compact, is returned unchanged.
+    """
+    if not isinstance(html, str) or '<meta name="qrichtext"' not in html:
+        return html
+    match = _QT_DOCUMENT_RE.match(html)
+    if match is None:
+        return html
+    body = match.group(1)
+    if _EMPTY_BODY_RE.match(body):
+        return ""
+    return body.replace(_DEFAULT_PARAGRAPH_TAG, _COMPACT_PARAGRAPH_TAG)
+
+
+def expand_rich_text(text: str) -> str:
+    """
+    Rebuilds the HTML document for QTextEdit.setHtml() from stored rich text.
+
+    Full HTML documents and text that does not start with a tag are returned
+    unchanged, so plain text and data saved before compaction load as before.
+    """
+    if not text or not text.startswith('<') or text.startswith(('<!DOCTYPE', '<html')):
+        return text
+    return RICH_TEXT_PREAMBLE + text.replace(_COMPACT_PARAGRAPH_TAG, _DEFAULT_PARAGRAPH_TAG) + RICH_TEXT_POSTAMBLE
+
+
+def get_rich_text(text_edit) -> str:
+    """Returns the contents of a QTextEdit in the compact stored form."""
+    return compact_rich_text(text_edit.toHtml().strip())
+
+
+def set_rich_text(text_edit, text: str) -> None:
+    """Loads stored rich text into a QTextEdit."""
+    text_edit.setHtml(expand_rich_text(text))
+
+
+# For html_to_text: markup with no text content, line breaks in the source
+# (Qt writes a <br /> for each one in the text), tags that end a line (nested blocks
+# end just one), any other tag. Every pattern starts with a literal character, so
+# the scan for a match stays fast; a stored field is converted for each entry.
+_INVISIBLE_RE = re.compile(r'<!DOCTYPE[^>]*>|<head>.*?</head>|<style[^>]*>.*?</style>|<!--.*?-->',
+                           re.DOTALL | re.IGNORECASE)
+_SOURCE_LINE_BREAK_RE = re.compile(r'>\s*\n\s*<|\n')
+_LINE_BREAK_RE = re.compile(
+    r'<(?:br\s*/?>\s*<)?/(?:p|div|li|h[1-6]|td|th|pre|blockquote)>(?:\s*</(?:p|div|li|h[1-6]|td|th|pre|blockquote)>)*'
+    r'|<br\s*/?>', re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]*>')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(html: str) -> str:
+    """
+    Returns the plain text of stored rich text (compact or a full Qt
+    document), one line per paragraph, without needing a QApplication or
+    QTextDocument. Text that contains no markup is returned unchanged.
+    """
+    if not html or ('<' not in html and '&' not in html):
+        return html or ""
+    text = _INVISIBLE_RE.sub('', html) if '<!' in html or '<head' in html or '<style' in html else html
+    if '\n' in text:
+        text = _SOURCE_LINE_BREAK_RE.sub(lambda match: '><' if match.group(0) != '\n' else ' ', text)
+    text = _LINE_BREAK_RE.sub('\n', text)
+    text = unescape(_TAG_RE.sub('', text))
+    return '\n'.join(line.rstrip() for line in text.strip('\n').split('\n')).strip()
+
+
+def text_snippet(text: str, length: int) -> str:
+    """Returns plain text on a single line, cut to at most length characters."""
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    return text if len(text) <= length else text[:length - 3].rstrip() + "..."
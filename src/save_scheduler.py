@@ -0,0 +1,163 @@
+import logging
+import threading
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Signal, Slot
+
+
+class SaveScheduler(QObject):
+    """
+    Coalesces bursts of save requests into a single write on a worker thread.
+
+    Every call to request_save() restarts a short debounce timer. When the timer
+    fires (on the GUI thread) snapshot_func is called to capture the data to
+    save, and save_func is run with that snapshot on a background thread, so
+    serialization and disk I/O never block the window. Requests that arrive
+    while a write is in progress are folded into one follow-up write. A
+    failed write is retried on its own, waiting longer after each failure.
+
+    Args:
+        snapshot_func: Called on the GUI thread; returns a tuple of arguments
+            for save_func that must not share mutable state with the live data.
+        save_func: Called with the snapshot on a worker thread; returns True
+            if the data was saved.
+        restore_func: Called on the GUI thread with the snapshot of a failed
+            write, so its changes can be queued again.
+        delay_ms: Quiet period after the last request before saving.
+        max_delay_ms: Upper bound on how long continuous requests can
+            postpone a save.
+        retry_delay_ms: Wait before retrying a failed write; doubled after
+            each further failure, up to max_retry_delay_ms.
+    """
+
+    save_succeeded = Signal()
+    save_failed = Signal()
+    _worker_finished = Signal(bool, object)
+
+    def __init__(self, snapshot_func: Callable[[], tuple], save_func: Callable[..., bool],
+                 restore_func: Optional[Callable[[tuple], None]] = None,
+                 delay_ms: int = 750, max_delay_ms: int = 5000, retry_delay_ms: int = 2000,
+                 max_retry_delay_ms: int = 60000, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._snapshot_func = snapshot_func
+        self._save_func = save_func
+        self._restore_func = restore_func
+        self._delay_ms = delay_ms
+        self._max_delay_ms = max_delay_ms
+        self._retry_delay_ms = retry_delay_ms
+        self._max_retry_delay_ms = max_retry_delay_ms
+        self._failures = 0 # Failed writes in a row
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start_background_save)
+        self._first_request_timer = QElapsedTimer()
+
+        self._pending = False # A save was requested and has not been started yet
+        self._holds = 0 # While > 0, scheduled saves wait; see hold()
+        self._worker: Optional[threading.Thread] = None
+        self._in_flight_snapshot: Optional[tuple] = None
+        self._last_worker_result = False
+        self._worker_finished.connect(self._on_worker_finished)
+
+    @property
+    def failed(self) -> bool:
+        """True if the last write failed; a retry is scheduled."""
+        return self._failures > 0
+
+    def next_retry_delay_ms(self) -> int:
+        """How long after a failed write the retry starts."""
+        return min(self._retry_delay_ms << max(0, self._failures - 1), self._max_retry_delay_ms)
+
+    @property
+    def is_idle(self) -> bool:
+        """True if no save is waiting or running."""
+        return not self._pending and self._worker is None
+
+    def request_save(self) -> None:
+        """Schedules a save; repeated calls within the delay are merged into one write."""
+        if not self._pending:
+            self._pending = True
+            self._first_request_timer.start()
+        remaining_budget = self._max_delay_ms - self._first_request_timer.elapsed()
+        self._timer.start(max(0, min(self._delay_ms, remaining_budget)))
+
+    def hold(self) -> None:
+        """
+        Keeps scheduled saves from starting, e.g. while a transaction leaves
+        the data half changed. Calls nest; each must be matched by release().
+        flush() still saves.
+        """
+        self._holds += 1
+
+    def release(self) -> None:
+        """Ends a hold(); a save requested meanwhile starts after the usual delay."""
+        self._holds -= 1
+        if self._holds == 0 and self._pending and not self._timer.isActive():
+            self._timer.start(self._delay_ms)
+
+    def flush(self) -> bool:
+        """
+        Synchronously waits for any running write and saves pending changes on
+        the calling thread. Intended for shutdown.
+
+        Returns:
+            True if everything requested so far has been saved.
+        """
+        self._timer.stop()
+        success = True
+        if self._worker is not None:
+            self._worker.join()
+            # The finished signal is queued; handle it here instead of waiting for the event loop.
+            success = self._last_worker_result
+            self._on_worker_finished(self._last_worker_result, self._in_flight_snapshot)
+            self._timer.stop()
+        if self._pending:
+            self._pending = False
+            snapshot = self._snapshot_func()
+            success = bool(self._save_func(*snapshot))
+            if not success and self._restore_func:
+                self._restore_func(snapshot)
+        return success
+
+    @Slot()
+    def _start_background_save(self):
+        if self._worker is not None:
+            # A write is running; _on_worker_finished reschedules once it is done.
+            return
+        if self._holds:
+            return # release() reschedules
+        self._pending = False
+        snapshot = self._snapshot_func()
+        self._in_flight_snapshot = snapshot
+        self._worker = threading.Thread(target=self._run_save, args=(snapshot,),
+                                        name="SaveSchedulerWorker", daemon=True)
+        self._worker.start()
+
+    def _run_save(self, snapshot: tuple):
+        try:
+            result = bool(self._save_func(*snapshot))
+        except Exception as e: # pragma: no cover
+            logging.error(f"Unexpected error in background save: {e}")
+            result = False
+        self._last_worker_result = result
+        self._worker_finished.emit(result, snapshot)
+
+    @Slot(bool, object)
+    def _on_worker_finished(self, success: bool, snapshot: Any):
+        if self._worker is None or snapshot is not self._in_flight_snapshot:
+            return # Already handled synchronously by flush()
+        self._worker.join()
+        self._worker = None
+        self._in_flight_snapshot = None
+        if success:
+            self._failures = 0
+            self.save_succeeded.emit()
+        else:
+            self._failures += 1
+            if self._restore_func:
+                self._restore_func(snapshot)
+            self._pending = True # Retried even if nothing else changes
+            self.save_failed.emit()
+        if self._pending:
+            self._timer.start(self.next_retry_delay_ms() if self._failures else self._delay_ms)
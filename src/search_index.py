@@ -0,0 +1,722 @@
+import gc
+import hashlib
+import heapq
+import math
+import pickle
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from contextlib import contextmanager
+from operator import itemgetter
+from dataclasses import dataclass, is_dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+from src.field_specs import FieldKind, display_text, field_spec, field_specs, search_fields, table_columns
+
+# Full-text search over the trackers of a campaign.
+#
+# Every entry of a dict collection (an NPC, a journal entry, ...) is one
+# document, keyed by (collection, entry_id). The single trackers are split
+# up the way transactions and saves address them: one document per conflict,
+# keyed by its conflict_id, and one per magic item list, keyed "tier.rarity".
+# A document's text is that of the searchable fields of its entity, with
+# nested models (travel stages, bastion facilities, ...) counted as part of
+# the field holding them. Rich text is indexed as plain text.
+#
+# Results are ranked with BM25. A query matches the documents containing all
+# of its terms; "quoted words" must appear next to each other in one field,
+# and a trailing * matches any word starting with the given letters.
+#
+# The app builds the index of a campaign once and then updates it with each
+# saved change (see MainWindow._update_search_index). ConsistencyCheck
+# compares it with the campaign while the app is idle, to catch changes that
+# were not reported.
+#
+# An index can be stored with to_payload and read back with from_payload
+# (see src.search_index_cache). The postings of each term and the field
+# records of each document stay encoded until they are first used, so
+# reading a stored index costs little more than reading the file; warm_step
+# decodes the rest while the app is idle.
+
+DocKey = Tuple[str, str] # (collection, entry_id)
+
+_TOKEN_RE = re.compile(r"\w+")
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+# Positions are field ordinal * _FIELD_SPAN + token offset, so a phrase never
+# matches across two fields.
+_FIELD_SPAN = 1 << 20
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """Returns the lower-cased words of text, as they are indexed and searched."""
+    return _TOKEN_RE.findall(text.casefold())
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Indexing, encoding and decoding allocate millions of small objects, none of them
+    # garbage; cyclic collection passes would make a large index several times slower to build.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _text_hash(text: str) -> int:
+    # Stored with the index, so it must not change between runs like hash(str) does
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A document matching a query. entry_id is an entry, conflict or "tier.rarity" key of collection."""
+    collection: str
+    entry_id: str
+    title: str
+    score: float
+
+
+@dataclass(frozen=True)
+class Document:
+    """The text of one entity as it is indexed: {field name: plain text}."""
+    key: DocKey
+    title: str
+    fields: Mapping[str, str]
+
+
+def _value_text(spec: Any, value: Any, owner: Any) -> Iterator[str]:
+    if spec.kind is FieldKind.RICH_TEXT:
+        yield owner.plain_text(spec.name)
+    elif spec.kind in (FieldKind.LIST, FieldKind.ENTRIES):
+        items = value.values() if spec.kind is FieldKind.ENTRIES else value
+        for item in items:
+            if is_dataclass(item):
+                yield from _entity_text(item)
+            elif item:
+                yield str(item)
+    elif spec.kind is FieldKind.MODEL:
+        yield from _entity_text(value)
+    elif value:
+        yield str(value)
+
+
+def _entity_text(entity: Any) -> Iterator[str]:
+    for spec in search_fields(type(entity)):
+        yield from _value_text(spec, getattr(entity, spec.name), entity)
+
+
+def entity_fields(entity: Any) -> Dict[str, str]:
+    """Returns {field name: text} for the searchable fields of entity that have text."""
+    text_fields = {}
+    for spec in search_fields(type(entity)):
+        text = "\n".join(_value_text(spec, getattr(entity, spec.name), entity))
+        if text:
+            text_fields[spec.name] = text
+    return text_fields
+
+
+def entity_title(entity: Any) -> str:
+    """Returns the text a search result shows for entity: its first table column."""
+    columns = table_columns(type(entity))
+    if not columns:
+        return ""
+    return display_text(columns[0], getattr(entity, columns[0].name))
+
+
+def entity_id(entity: Any) -> str:
+    """Returns the value of the ID field of entity, e.g. an NPC's entry_id or a conflict's conflict_id."""
+    return next(getattr(entity, spec.name) for spec in field_specs(type(entity)) if spec.kind is FieldKind.ID)
+
+
+def entity_document(collection: str, entity: Any) -> Document:
+    return Document((collection, entity_id(entity)), entity_title(entity), entity_fields(entity))
+
+
+def tracker_documents(collection: str, tracker: Any) -> Iterator[Document]:
+    """
+    Returns the documents of a single tracker: one per entity in its lists
+    of models (the conflicts), and one per list in its nested models (the
+    magic items of a tier and rarity, keyed "tier.rarity").
+    """
+    for spec in field_specs(type(tracker)):
+        value = getattr(tracker, spec.name)
+        if spec.kind is FieldKind.LIST and is_dataclass(spec.item_type):
+            for entity in value:
+                yield entity_document(collection, entity)
+        elif spec.kind is FieldKind.MODEL:
+            for item_spec in field_specs(type(value)):
+                if item_spec.kind is FieldKind.LIST:
+                    items = getattr(value, item_spec.name)
+                    title = f"{spec.label or spec.name}: {item_spec.label or item_spec.name}"
+                    yield Document((collection, f"{spec.name}.{item_spec.name}"), title,
+                                   {item_spec.name: "\n".join(items)} if items else {})
+
+
+def campaign_documents(campaign: Any) -> Iterator[Document]:
+    """Returns the documents of every tracker of campaign."""
+    for spec in field_specs(type(campaign)):
+        value = getattr(campaign, spec.name)
+        if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type):
+            for entry in value.values():
+                yield entity_document(spec.name, entry)
+        elif spec.kind is FieldKind.MODEL:
+            yield from tracker_documents(spec.name, value)
+
+
+def find_document(campaign: Any, collection: str, entry_id: str) -> Optional[Document]:
+    """
+    Returns the current document of one entry, conflict or magic item list
+    of campaign, or None if it no longer exists. Only that entity is read.
+    """
+    spec = field_spec(type(campaign), collection)
+    value = getattr(campaign, collection)
+    if spec.kind is FieldKind.ENTRIES:
+        entry = value.get(entry_id)
+        return entity_document(collection, entry) if entry is not None else None
+    for tracker_spec in field_specs(type(value)):
+        tracker_value = getattr(value, tracker_spec.name)
+        if tracker_spec.kind is FieldKind.LIST and is_dataclass(tracker_spec.item_type):
+            entity = next((entity for entity in tracker_value if entity_id(entity) == entry_id), None)
+            if entity is not None:
+                return entity_document(collection, entity)
+        elif tracker_spec.kind is FieldKind.MODEL and entry_id.startswith(tracker_spec.name + "."):
+            return next((document for document in tracker_documents(collection, value)
+                         if document.key[1] == entry_id), None)
+    return None
+
+
+def document_keys(campaign: Any) -> Iterator[DocKey]:
+    """Returns the keys of every document of campaign without building the documents."""
+    for spec in field_specs(type(campaign)):
+        value = getattr(campaign, spec.name)
+        if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type):
+            for entry_id in value:
+                yield spec.name, entry_id
+        elif spec.kind is FieldKind.MODEL:
+            for tracker_spec in field_specs(type(value)):
+                tracker_value = getattr(value, tracker_spec.name)
+                if tracker_spec.kind is FieldKind.LIST and is_dataclass(tracker_spec.item_type):
+                    for entity in tracker_value:
+                        yield spec.name, entity_id(entity)
+                elif tracker_spec.kind is FieldKind.MODEL:
+                    for item_spec in field_specs(type(tracker_value)):
+                        if item_spec.kind is FieldKind.LIST:
+                            yield spec.name, f"{tracker_spec.name}.{item_spec.name}"
+
+
+class _FieldRecord(NamedTuple):
+    """What the index holds for one field of a document, to update or remove it later."""
+    text_hash: int
+    terms: Tuple[str, ...] # Distinct terms
+    length: int            # Number of tokens
+
+
+class SearchIndex:
+    """
+    An in-memory inverted index over documents, answering ranked queries.
+    Postings map each term to {document number: positions}.
+
+    Documents are updated one field at a time: update_document tokenizes
+    only the fields whose text changed since the document was indexed, so
+    keeping the index current costs the same however large it is.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, List[int]]] = {} # Decoded; see _get_postings
+        self._doc_numbers: Dict[DocKey, int] = {}
+        self._doc_keys: Dict[int, DocKey] = {}
+        self._doc_titles: Dict[int, str] = {}
+        self._doc_fields: Dict[int, Dict[str, _FieldRecord]] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+        self._next_doc_number = 0
+        self._field_ordinals: Dict[str, int] = {}
+        self._sorted_terms: Optional[List[str]] = None # For prefix queries; kept sorted once built
+        # BM25 length normalization of each document, for the average length it was computed with
+        self._norms: Dict[int, float] = {}
+        self._norms_average_length = 0.0
+        # Pickled postings of each term, as read by from_payload or last written by to_payload.
+        # A term is indexed if it is in _postings or here; changing its postings drops this copy.
+        self._encoded_postings: Dict[str, bytes] = {}
+        # Pickled field records of the documents whose _doc_fields have not been decoded yet. Their
+        # terms are stored as positions in _term_table, which is only appended to so they stay valid.
+        self._encoded_fields: Dict[int, bytes] = {}
+        self._term_table: List[str] = []
+        self._term_table_ordinals: Dict[str, int] = {}
+        self._warm_queue: Optional[List[str]] = None # Terms warm_step has yet to decode, largest last
+        self._encode_queues: Optional[Tuple[List[str], List[int]]] = None # Terms and documents encode_step has left
+
+    @classmethod
+    def for_campaign(cls, campaign: Any) -> 'SearchIndex':
+        index = cls()
+        index.add_documents(campaign_documents(campaign))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def __contains__(self, key: DocKey) -> bool:
+        return key in self._doc_numbers
+
+    def keys(self) -> Iterator[DocKey]:
+        return iter(self._doc_numbers)
+
+    def to_payload(self) -> bytes:
+        """
+        Returns the index serialized for from_payload. Only the terms and
+        documents changed since the index was last encoded are pickled.
+        """
+        self._encode_queues = None # Also encode what changed since encode_step began
+        with _gc_paused():
+            self.encode_step(max_items=len(self._postings) + len(self._doc_fields))
+            terms = self._sorted_terms if self._sorted_terms is not None else sorted(self._encoded_postings)
+            return pickle.dumps({
+                "field_ordinals": self._field_ordinals,
+                "next_doc_number": self._next_doc_number,
+                "documents": [(doc_number, key, self._doc_titles[doc_number], self._doc_lengths[doc_number])
+                              for key, doc_number in self._doc_numbers.items()],
+                "postings": {term: self._encoded_postings[term] for term in terms}, # Sorted, for prefix queries
+                "fields": self._encoded_fields,
+                "term_table": self._term_table,
+            }, pickle.HIGHEST_PROTOCOL)
+
+    def encode_step(self, max_items: int = 2000) -> bool:
+        """
+        Encodes up to max_items more of the terms and documents changed since
+        the index was last encoded, so the app can do most of the work of
+        to_payload while idle. Returns True once all of them are encoded.
+        """
+        if self._encode_queues is None:
+            self._encode_queues = ([term for term in self._postings if term not in self._encoded_postings],
+                                   list(self._doc_fields))
+        terms, doc_numbers = self._encode_queues
+        for _ in range(max_items):
+            if terms:
+                term = terms.pop()
+                postings = self._postings.get(term)
+                if postings is not None and term not in self._encoded_postings:
+                    self._encoded_postings[term] = pickle.dumps(postings, pickle.HIGHEST_PROTOCOL)
+            elif doc_numbers:
+                # Only the encoded records are kept; _get_fields decodes them again if needed
+                doc_number = doc_numbers.pop()
+                records = self._doc_fields.pop(doc_number, None)
+                if records is not None:
+                    self._encoded_fields[doc_number] = self._encode_fields(records)
+            else:
+                self._encode_queues = None
+                return True
+        return False
+
+    def _encode_fields(self, records: Dict[str, _FieldRecord]) -> bytes:
+        # Terms are stored as their positions in the term table, which is only ever appended to
+        table_ordinals = self._term_table_ordinals
+        term_table = self._term_table
+
+        def table_ordinal(term: str) -> int:
+            ordinal = table_ordinals.get(term)
+            if ordinal is None:
+                ordinal = table_ordinals[term] = len(term_table)
+                term_table.append(term)
+            return ordinal
+
+        return pickle.dumps(tuple(
+            (self._field_ordinals[field_name], record.text_hash, record.length, tuple(map(table_ordinal, record.terms)))
+            for field_name, record in records.items()), pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> 'SearchIndex':
+        """
+        Returns the index serialized by to_payload. Postings and field
+        records are decoded when first used, or by warm_step.
+        """
+        with _gc_paused():
+            tables = pickle.loads(payload)
+        index = cls()
+        index._field_ordinals = tables["field_ordinals"]
+        index._next_doc_number = tables["next_doc_number"]
+        for doc_number, key, title, length in tables["documents"]:
+            index._doc_numbers[key] = doc_number
+            index._doc_keys[doc_number] = key
+            index._doc_titles[doc_number] = title
+            index._doc_lengths[doc_number] = length
+            index._total_length += length
+        index._encoded_postings = tables["postings"]
+        index._encoded_fields = tables["fields"]
+        index._term_table = tables["term_table"]
+        index._term_table_ordinals = {term: ordinal for ordinal, term in enumerate(index._term_table)}
+        index._sorted_terms = list(index._encoded_postings)
+        return index
+
+    def warm_step(self, max_bytes: int = 1 << 20) -> bool:
+        """
+        Decodes about max_bytes more of the postings not used since the index
+        was read, those of the most common terms first, so no query has to
+        wait for them. Returns True once every term is decoded.
+        """
+        if self._warm_queue is None:
+            self._warm_queue = sorted((term for term in self._encoded_postings if term not in self._postings),
+                                      key=lambda term: len(self._encoded_postings[term]))
+        queue = self._warm_queue
+        decoded = 0
+        with _gc_paused():
+            while queue and decoded < max_bytes:
+                term = queue.pop()
+                if term not in self._postings:
+                    decoded += len(self._encoded_postings.get(term, b""))
+                    self._get_postings(term)
+        return not queue
+
+    def _get_postings(self, term: str) -> Optional[Dict[int, List[int]]]:
+        """Returns {document: positions} for term, or None if it is not indexed."""
+        postings = self._postings.get(term)
+        if postings is None:
+            encoded = self._encoded_postings.get(term)
+            if encoded is not None:
+                postings = self._postings[term] = pickle.loads(encoded)
+        return postings
+
+    def _get_fields(self, doc_number: int) -> Dict[str, _FieldRecord]:
+        records = self._doc_fields.get(doc_number)
+        if records is None:
+            field_names = {ordinal: field_name for field_name, ordinal in self._field_ordinals.items()}
+            term_table = self._term_table
+            encoded = pickle.loads(self._encoded_fields.pop(doc_number))
+            records = self._doc_fields[doc_number] = {
+                field_names[field_ordinal]: _FieldRecord(text_hash, tuple(term_table[i] for i in term_ordinals), length)
+                for field_ordinal, text_hash, length, term_ordinals in encoded}
+        return records
+
+    def add_documents(self, documents: Iterable[Document]) -> None:
+        with _gc_paused():
+            for document in documents:
+                self.update_document(document)
+
+    def update_document(self, document: Document) -> None:
+        """
+        Indexes document. If a document with the same key is indexed, only
+        the fields whose text differs are tokenized again.
+        """
+        doc_number = self._doc_numbers.get(document.key)
+        if doc_number is None:
+            doc_number = self._next_doc_number
+            self._next_doc_number += 1
+            self._doc_numbers[document.key] = doc_number
+            self._doc_keys[doc_number] = document.key
+            self._doc_fields[doc_number] = {}
+            self._doc_lengths[doc_number] = 0
+        self._doc_titles[doc_number] = document.title
+        records = self._get_fields(doc_number)
+        length = self._doc_lengths[doc_number]
+        for field_name in [name for name in records if name not in document.fields]:
+            length -= self._unindex_field(doc_number, field_name, records.pop(field_name))
+        for field_name, text in document.fields.items():
+            text_hash = _text_hash(text)
+            record = records.get(field_name)
+            if record is not None:
+                if record.text_hash == text_hash:
+                    continue
+                length -= self._unindex_field(doc_number, field_name, record)
+            record = records[field_name] = self._index_field(doc_number, field_name, text, text_hash)
+            length += record.length
+        self._set_length(doc_number, length)
+
+    def refresh(self, campaign: Any) -> None:
+        """Brings the index up to date with all of campaign, tokenizing only the fields that changed."""
+        current = set()
+        for document in campaign_documents(campaign):
+            current.add(document.key)
+            self.update_document(document)
+        for key in [key for key in self._doc_numbers if key not in current]:
+            self.remove_document(key)
+
+    def update_entry(self, campaign: Any, collection: str, entry_id: str) -> None:
+        """Reindexes one entry, conflict or magic item list of campaign, or removes it if it was deleted."""
+        document = find_document(campaign, collection, entry_id)
+        if document is None:
+            self.remove_document((collection, entry_id))
+        else:
+            self.update_document(document)
+
+    def remove_document(self, key: DocKey) -> bool:
+        """Removes the document with key. Returns False if it is not indexed."""
+        doc_number = self._doc_numbers.pop(key, None)
+        if doc_number is None:
+            return False
+        for field_name, record in self._get_fields(doc_number).items():
+            self._unindex_field(doc_number, field_name, record)
+        del self._doc_fields[doc_number]
+        del self._doc_keys[doc_number]
+        del self._doc_titles[doc_number]
+        self._total_length -= self._doc_lengths.pop(doc_number)
+        self._norms.pop(doc_number, None)
+        return True
+
+    def _index_field(self, doc_number: int, field_name: str, text: str, text_hash: int) -> _FieldRecord:
+        tokens = tokenize(text)
+        term_positions: Dict[str, List[int]] = defaultdict(list)
+        for position, token in enumerate(tokens, self._field_ordinal(field_name) * _FIELD_SPAN):
+            term_positions[token].append(position)
+        postings = self._postings
+        encoded_postings = self._encoded_postings
+        for term, positions in term_positions.items():
+            term_postings = postings.get(term) or self._get_postings(term)
+            if term_postings is None:
+                term_postings = postings[term] = {}
+                if self._sorted_terms is not None:
+                    insort(self._sorted_terms, term)
+            elif encoded_postings:
+                encoded_postings.pop(term, None)
+            existing = term_postings.get(doc_number)
+            if existing is None:
+                term_postings[doc_number] = positions
+            else: # The term is also in another field of the document
+                existing.extend(positions)
+        return _FieldRecord(text_hash, tuple(term_positions), len(tokens))
+
+    def _unindex_field(self, doc_number: int, field_name: str, record: _FieldRecord) -> int:
+        """Removes the positions of one field of a document. Returns the field's length."""
+        start = self._field_ordinals[field_name] * _FIELD_SPAN
+        end = start + _FIELD_SPAN
+        for term in record.terms:
+            term_postings = self._get_postings(term)
+            self._encoded_postings.pop(term, None)
+            positions = [position for position in term_postings[doc_number] if not start <= position < end]
+            if positions:
+                term_postings[doc_number] = positions
+                continue
+            del term_postings[doc_number]
+            if not term_postings:
+                del self._postings[term]
+                if self._sorted_terms is not None:
+                    del self._sorted_terms[bisect_left(self._sorted_terms, term)]
+        return record.length
+
+    def _set_length(self, doc_number: int, length: int) -> None:
+        self._total_length += length - self._doc_lengths[doc_number]
+        self._doc_lengths[doc_number] = length
+        if self._norms:
+            # Normalized against the cached average; _length_norms recomputes all once it has drifted
+            self._norms[doc_number] = _length_norm(length, self._norms_average_length)
+
+    def _field_ordinal(self, field_name: str) -> int:
+        ordinal = self._field_ordinals.get(field_name)
+        if ordinal is None:
+            ordinal = self._field_ordinals[field_name] = len(self._field_ordinals)
+        return ordinal
+
+    def document_matches(self, document: Document) -> bool:
+        """
+        Returns whether the index holds exactly what indexing document into
+        an empty index would: the same title, fields, lengths and positions.
+        """
+        doc_number = self._doc_numbers.get(document.key)
+        if doc_number is None or self._doc_titles[doc_number] != document.title:
+            return False
+        records = self._get_fields(doc_number)
+        if records.keys() != document.fields.keys():
+            return False
+        expected: Dict[str, List[int]] = defaultdict(list)
+        length = 0
+        for field_name, text in document.fields.items():
+            tokens = tokenize(text)
+            length += len(tokens)
+            if records[field_name].length != len(tokens):
+                return False
+            for position, token in enumerate(tokens, self._field_ordinals[field_name] * _FIELD_SPAN):
+                expected[token].append(position)
+        if length != self._doc_lengths[doc_number]:
+            return False
+        actual_terms = {term for record in records.values() for term in record.terms}
+        if actual_terms != expected.keys():
+            return False
+        # Fields are numbered in the order the index first saw them, so a document's
+        # fields need not come in position order
+        return all(sorted((self._get_postings(term) or {}).get(doc_number, ())) == sorted(positions)
+                   for term, positions in expected.items())
+
+    def search(self, query: str, limit: int = 50) -> List[SearchHit]:
+        """
+        Returns up to limit documents matching query, best first. Each word,
+        "quoted phrase" or prefix* of the query must match.
+        """
+        clauses = _parse_query(query)
+        if not clauses or not self._doc_numbers:
+            return []
+        results = []
+        for terms, is_prefix in clauses:
+            scores = self._score(self._match_clause(terms, is_prefix))
+            if not scores:
+                return []
+            results.append(scores)
+        results.sort(key=len)
+        totals = results[0]
+        for scores in results[1:]:
+            totals = {doc: score + scores[doc] for doc, score in totals.items() if doc in scores}
+            if not totals:
+                return []
+        best = heapq.nlargest(limit, totals.items(), key=itemgetter(1))
+        return [SearchHit(*self._doc_keys[doc], self._doc_titles[doc], score) for doc, score in best]
+
+    def _match_clause(self, terms: List[str], is_prefix: bool) -> Dict[int, int]:
+        """Returns {document: term frequency} for the documents matching a clause."""
+        if is_prefix:
+            # The words with the prefix count as one term, so a short prefix
+            # costs one pass over their postings rather than a score for each word
+            frequencies: Dict[int, int] = defaultdict(int)
+            for term in self._expand_prefix(terms[0]):
+                for doc, positions in self._get_postings(term).items():
+                    frequencies[doc] += len(positions)
+            return frequencies
+        if len(terms) == 1:
+            return {doc: len(positions) for doc, positions in (self._get_postings(terms[0]) or {}).items()}
+        return {doc: len(starts) for doc, starts in self._phrase_postings(terms).items()}
+
+    def _expand_prefix(self, prefix: str) -> Iterator[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings.keys() | self._encoded_postings.keys())
+        terms = self._sorted_terms
+        i = bisect_left(terms, prefix)
+        while i < len(terms) and terms[i].startswith(prefix):
+            yield terms[i]
+            i += 1
+
+    def _phrase_postings(self, terms: List[str]) -> Dict[int, List[int]]:
+        """Returns {document: start positions} for the documents containing terms in sequence."""
+        term_postings = [self._get_postings(term) for term in terms]
+        if not all(term_postings):
+            return {}
+        rarest = min(term_postings, key=len)
+        matches = {}
+        for doc in rarest:
+            if not all(doc in postings for postings in term_postings):
+                continue
+            starts = term_postings[0][doc]
+            for i, postings in enumerate(term_postings[1:], 1):
+                following = set(postings[doc])
+                starts = [start for start in starts if start + i in following]
+                if not starts:
+                    break
+            if starts:
+                matches[doc] = starts
+        return matches
+
+    def _length_norms(self) -> Dict[int, float]:
+        """
+        Returns the BM25 length normalization of every document. It depends
+        on the average document length; edits keep the cached values, and
+        they are recomputed once the average has moved by more than 5%.
+        """
+        average_length = self._total_length / len(self._doc_numbers) or 1.0
+        if not self._norms or abs(average_length - self._norms_average_length) > 0.05 * self._norms_average_length:
+            self._norms = {doc: _length_norm(length, average_length) for doc, length in self._doc_lengths.items()}
+            self._norms_average_length = average_length
+        return self._norms
+
+    def _score(self, frequencies: Dict[int, int]) -> Dict[int, float]:
+        """Returns the BM25 score of each document in {document: term frequency}."""
+        if not frequencies:
+            return {}
+        doc_count = len(self._doc_numbers)
+        idf = math.log(1 + (doc_count - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+        scale = idf * (_K1 + 1)
+        norms = self._length_norms()
+        return {doc: scale * frequency / (frequency + norms[doc]) for doc, frequency in frequencies.items()}
+
+
+def _length_norm(length: int, average_length: float) -> float:
+    return _K1 * (1 - _B + _B * length / average_length)
+
+
+def _parse_query(query: str) -> List[Tuple[List[str], bool]]:
+    """Returns the clauses of query as (terms, is_prefix) pairs; a phrase has several terms."""
+    clauses = []
+    for phrase, word in _QUERY_RE.findall(query):
+        terms = tokenize(phrase or word)
+        if not terms:
+            continue
+        if word.endswith("*"):
+            # A prefix; any words before it in the same token (e.g. half-el*) must match exactly
+            clauses.extend(([term], False) for term in terms[:-1])
+            clauses.append(([terms[-1]], True))
+        else:
+            clauses.append((terms, False))
+    return clauses
+
+
+class IndexBuilder:
+    """
+    Builds the index of a campaign a few documents per step, so it can run
+    while the app is idle. index can be searched and updated meanwhile:
+    each step reads the campaign as it is then, and a document updated
+    before its step is simply indexed again (only changed fields are).
+    """
+
+    def __init__(self, campaign: Any):
+        self.index = SearchIndex()
+        self.campaign = campaign
+        self._keys = list(document_keys(campaign))
+        self._position = 0
+
+    @property
+    def done(self) -> bool:
+        return self._position >= len(self._keys)
+
+    def step(self, max_documents: int = 200) -> bool:
+        """Indexes up to max_documents more documents. Returns True once every document is indexed."""
+        end = min(self._position + max_documents, len(self._keys))
+        with _gc_paused():
+            for key in self._keys[self._position:end]:
+                self.index.update_entry(self.campaign, *key)
+        self._position = end
+        return self.done
+
+
+class ConsistencyCheck:
+    """
+    Compares an index, document by document, with what a full rebuild from
+    the campaign would hold. The work is split into steps so it can run
+    while the app is idle; each step reads the campaign as it is then, so
+    edits made between steps do not cause false mismatches. Documents
+    created after the check started are not checked.
+    """
+
+    def __init__(self, index: SearchIndex, campaign: Any):
+        self.index = index
+        self.campaign = campaign
+        # Keys in the campaign, then keys only the index has (e.g. a deletion it missed)
+        campaign_keys = list(document_keys(campaign))
+        known = set(campaign_keys)
+        self._keys = campaign_keys + [key for key in index.keys() if key not in known]
+        self._position = 0
+        self.mismatches: List[DocKey] = []
+
+    @property
+    def done(self) -> bool:
+        return self._position >= len(self._keys)
+
+    def step(self, max_documents: int = 200) -> bool:
+        """Checks up to max_documents more documents. Returns True once every document is checked."""
+        end = min(self._position + max_documents, len(self._keys))
+        for key in self._keys[self._position:end]:
+            document = find_document(self.campaign, *key)
+            if document is None:
+                consistent = key not in self.index
+            else:
+                consistent = self.index.document_matches(document)
+            if not consistent:
+                self.mismatches.append(key)
+        self._position = end
+        return self.done
+
+    def repair(self) -> None:
+        """Reindexes the documents found to differ."""
+        for key in self.mismatches:
+            self.index.update_entry(self.campaign, *key)
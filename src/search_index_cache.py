@@ -0,0 +1,157 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from dataclasses import is_dataclass
+from typing import Any, Optional, Tuple
+
+from src.data_models import Campaign
+from src.field_specs import field_specs
+from src.json_data_manager import campaign_fingerprint
+from src.load_cache import sign_cache, verify_cache
+from src.search_index import SearchIndex
+
+# The search index of each campaign is stored next to the data, so starting
+# the app does not have to tokenize every entry again. The file is tied to
+# the saved version of its campaign (see storage_fingerprint): once the
+# campaign changes outside the app, or the app saved changes to it the
+# stored index does not have, it no longer matches and the index is rebuilt.
+# Saves of other campaigns leave it valid.
+#
+# The index is pickled, so like the load cache the file is signed with the
+# user's cache key (see load_cache.sign_cache), and the signature is checked
+# before anything in it is unpickled.
+#
+# The payload is compressed with zlib's fastest level, which shrinks the
+# pickled postings to well under half. The file is read whole rather than
+# memory-mapped: a mapping would keep it locked on Windows, and writing the
+# next version with os.replace would fail.
+
+SEARCH_INDEX_FILE_SUFFIX = ".search"
+SEARCH_INDEX_FORMAT_VERSION = 3
+_SEARCH_INDEX_MAGIC = "campaign-manager-search-index"
+
+# Identifies the saved version of a campaign, see json_data_manager.campaign_fingerprint
+StorageFingerprint = Tuple[Any, ...]
+
+
+def _search_signature(data_class: type = Campaign) -> Tuple[Any, ...]:
+    """
+    Describes what gets indexed: the searchable fields, title columns and
+    labels of data_class and every dataclass it contains. An index stored by
+    a version of the app that indexed differently is not used.
+    """
+    signature = []
+    pending = [data_class]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        specs = field_specs(current)
+        signature.append((current.__qualname__, tuple(
+            (spec.name, spec.kind.value, spec.searchable, spec.label, spec.column) for spec in specs)))
+        for spec in specs:
+            for candidate in (spec.type, spec.item_type):
+                if is_dataclass(candidate):
+                    pending.append(candidate)
+    return tuple(sorted(signature))
+
+
+_SEARCH_SIGNATURE = _search_signature()
+
+
+def search_index_path(filepath: str, campaign_id: str) -> str:
+    """Returns the path of the stored index of a campaign of the data at filepath."""
+    # Campaign IDs from imported data may contain characters that are not safe in file names
+    campaign_hash = hashlib.sha1(campaign_id.encode('utf-8')).hexdigest()[:16]
+    return f"{os.path.normpath(filepath)}.{campaign_hash}{SEARCH_INDEX_FILE_SUFFIX}"
+
+
+def storage_fingerprint(filepath: str, campaign_id: str) -> Optional[StorageFingerprint]:
+    """
+    Returns the fingerprint of the saved version of a campaign, or None if it
+    is not saved. For a JSON file the file is only hashed if it changed since
+    load_data hashed it, so this is cheap right after loading and after saves
+    that appended to the journal.
+    """
+    return campaign_fingerprint(filepath, campaign_id)
+
+
+def _search_index_header(campaign_id: str, fingerprint: StorageFingerprint) -> Any:
+    # As it reads back from JSON, so headers compare equal
+    return json.loads(json.dumps([_SEARCH_INDEX_MAGIC, SEARCH_INDEX_FORMAT_VERSION, _SEARCH_SIGNATURE,
+                                  campaign_id, fingerprint]))
+
+
+def read_search_index(filepath: str, campaign_id: str,
+                      fingerprint: Optional[StorageFingerprint]) -> Optional[SearchIndex]:
+    """
+    Returns the stored index of a campaign, if it was written for exactly
+    the current version of the campaign's files. Postings are decoded as
+    they are used (see SearchIndex.from_payload).
+
+    A stored index that is stale, corrupt, from another version of the app
+    or not signed with this user's key is deleted and None is returned, so
+    the caller builds the index instead.
+
+    Args:
+        filepath: The path of the data, not of the stored index.
+        campaign_id: The campaign the index is of.
+        fingerprint: The current storage_fingerprint of the campaign.
+    """
+    path = search_index_path(filepath, campaign_id)
+    if fingerprint is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            header, payload = verify_cache(f.read())
+        if header != _search_index_header(campaign_id, fingerprint):
+            raise ValueError("written for different data or a different app version")
+        return SearchIndex.from_payload(zlib.decompress(payload))
+    except Exception as e: # Unpickling a corrupt file can raise almost anything
+        logging.info(f"Not using search index {path}: {e}")
+        remove_search_index(filepath, campaign_id)
+        return None
+
+
+def write_search_index(index: SearchIndex, filepath: str, campaign_id: str,
+                       fingerprint: Optional[StorageFingerprint]) -> bool:
+    """
+    Stores index, which must hold exactly the campaign as saved in its
+    files, for that version of the files. The index is written to a
+    temporary file and moved into place.
+
+    Returns:
+        True if the index was written.
+    """
+    if fingerprint is None:
+        return False
+    path = search_index_path(filepath, campaign_id)
+    temp_path = None
+    try:
+        contents = sign_cache(_search_index_header(campaign_id, fingerprint), zlib.compress(index.to_payload(), 1))
+        if contents is None:
+            return False
+
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)),
+                                         prefix=".tmp_", suffix=SEARCH_INDEX_FILE_SUFFIX)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contents)
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        logging.warning(f"Could not write search index {path}: {e}")
+        if temp_path is not None and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return False
+
+
+def remove_search_index(filepath: str, campaign_id: str) -> None:
+    try:
+        os.remove(search_index_path(filepath, campaign_id))
+    except OSError:
+        pass
@@ -0,0 +1,406 @@
+import json
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, get_args, get_origin, get_type_hints
+
+from src.data_models import ApplicationData, Campaign, CampaignConflictEntry, Conflict, MagicItemTrackerData
+from src.json_data_manager import ChangeSet, _from_dict
+from src.lazy_campaigns import LazyCampaigns, peek_campaign
+
+SQLITE_FORMAT_VERSION = 1
+
+# Campaign fields that hold a single tracker object rather than a dict of entries.
+CONFLICTS_COLLECTION = "campaign_conflicts"
+MAGIC_ITEMS_COLLECTION = "magic_item_tracker"
+
+_SQL_TYPES = {str: "TEXT", int: "INTEGER", bool: "INTEGER", float: "REAL"}
+
+
+class _TableSpec(NamedTuple):
+    """How one dataclass maps to a table: its columns and the child tables of its list fields."""
+    name: str
+    data_class: type
+    # (field name, kind) where kind is "value", "bool" or "json"
+    columns: Tuple[Tuple[str, str], ...]
+    # (field name, spec of the child table holding the list items)
+    children: Tuple[Tuple[str, '_TableSpec'], ...]
+
+
+def _build_table_spec(name: str, data_class: type) -> _TableSpec:
+    type_hints = get_type_hints(data_class)
+    columns = []
+    children = []
+    for f in fields(data_class):
+        field_type = type_hints[f.name]
+        args_type = get_args(field_type)
+        if get_origin(field_type) is list and args_type and is_dataclass(args_type[0]):
+            children.append((f.name, _build_table_spec(f"{name}_{f.name}", args_type[0])))
+        elif field_type is bool:
+            columns.append((f.name, "bool"))
+        elif field_type in _SQL_TYPES:
+            columns.append((f.name, "value"))
+        else:
+            # Lists of strings and other plain JSON values are stored as JSON text
+            columns.append((f.name, "json"))
+    return _TableSpec(name, data_class, tuple(columns), tuple(children))
+
+
+def _build_entry_table_specs() -> Dict[str, _TableSpec]:
+    """One table per Campaign field of type Dict[str, <entry dataclass>], named after the field."""
+    specs = {}
+    for field_name, field_type in get_type_hints(Campaign).items():
+        args_type = get_args(field_type)
+        if get_origin(field_type) is dict and len(args_type) == 2 and is_dataclass(args_type[1]):
+            specs[field_name] = _build_table_spec(field_name, args_type[1])
+    return specs
+
+
+# collection name (Campaign field) -> table spec, e.g. "npcs" -> table "npcs"
+ENTRY_TABLE_SPECS: Dict[str, _TableSpec] = _build_entry_table_specs()
+_CONFLICTS_SPEC = _build_table_spec("conflicts", Conflict)
+_CAMPAIGN_COLUMNS = tuple(
+    name for name, field_type in get_type_hints(Campaign).items()
+    if field_type in _SQL_TYPES and name != "campaign_id"
+)
+
+
+def _column_definitions(spec: _TableSpec) -> List[str]:
+    type_hints = get_type_hints(spec.data_class)
+    definitions = []
+    for field_name, kind in spec.columns:
+        sql_type = "TEXT" if kind == "json" else _SQL_TYPES[type_hints[field_name]]
+        definitions.append(f"{field_name} {sql_type}")
+    return definitions
+
+
+def _create_child_tables(conn: sqlite3.Connection, spec: _TableSpec):
+    for _, child_spec in spec.children:
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {child_spec.name} ("
+            "campaign_id TEXT NOT NULL, parent_id TEXT NOT NULL, position INTEGER NOT NULL, "
+            + ", ".join(_column_definitions(child_spec))
+            + ", PRIMARY KEY (campaign_id, parent_id, position))"
+        )
+        _create_child_tables(conn, child_spec)
+
+
+def _ensure_schema(conn: sqlite3.Connection):
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS campaigns (campaign_id TEXT PRIMARY KEY, position INTEGER NOT NULL, "
+        + ", ".join(f"{name} TEXT" for name in _CAMPAIGN_COLUMNS) + ")"
+    )
+    for spec in ENTRY_TABLE_SPECS.values():
+        # The entry's own entry_id column is the key inside its campaign.
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {spec.name} (campaign_id TEXT NOT NULL, position INTEGER NOT NULL, "
+            + ", ".join(_column_definitions(spec))
+            + ", PRIMARY KEY (campaign_id, entry_id))"
+        )
+        _create_child_tables(conn, spec)
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_CONFLICTS_SPEC.name} (campaign_id TEXT NOT NULL, position INTEGER NOT NULL, "
+        + ", ".join(_column_definitions(_CONFLICTS_SPEC))
+        + ", PRIMARY KEY (campaign_id, position))"
+    )
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS magic_items (campaign_id TEXT NOT NULL, tier TEXT NOT NULL, "
+        "rarity TEXT NOT NULL, position INTEGER NOT NULL, name TEXT, "
+        "PRIMARY KEY (campaign_id, tier, rarity, position))"
+    )
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('format_version', ?)", (str(SQLITE_FORMAT_VERSION),))
+
+
+def _connect(filepath: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(filepath)
+    conn.row_factory = sqlite3.Row
+    with conn:
+        _ensure_schema(conn)
+    return conn
+
+
+# --- Writing ---
+
+def _column_values(spec: _TableSpec, obj: Any) -> List[Any]:
+    values = []
+    for field_name, kind in spec.columns:
+        value = getattr(obj, field_name)
+        if kind == "json":
+            value = json.dumps(value, ensure_ascii=False)
+        elif kind == "bool":
+            value = int(bool(value))
+        values.append(value)
+    return values
+
+
+def _insert_children(conn: sqlite3.Connection, spec: _TableSpec, campaign_id: str, parent_id: str, obj: Any):
+    for field_name, child_spec in spec.children:
+        column_names = [name for name, _ in child_spec.columns]
+        placeholders = ", ".join("?" * (len(column_names) + 3))
+        items = getattr(obj, field_name) or []
+        conn.executemany(
+            f"INSERT INTO {child_spec.name} (campaign_id, parent_id, position, {', '.join(column_names)}) "
+            f"VALUES ({placeholders})",
+            [[campaign_id, parent_id, position] + _column_values(child_spec, item) for position, item in enumerate(items)]
+        )
+
+
+def _delete_children(conn: sqlite3.Connection, spec: _TableSpec, campaign_id: str, parent_id: Optional[str] = None):
+    for _, child_spec in spec.children:
+        if parent_id is None:
+            conn.execute(f"DELETE FROM {child_spec.name} WHERE campaign_id = ?", (campaign_id,))
+        else:
+            conn.execute(f"DELETE FROM {child_spec.name} WHERE campaign_id = ? AND parent_id = ?", (campaign_id, parent_id))
+
+
+def _upsert_entry(conn: sqlite3.Connection, spec: _TableSpec, campaign_id: str, entry: Any):
+    """Inserts or updates one entry row (appended after existing rows if new) and replaces its child rows."""
+    column_names = [name for name, _ in spec.columns]
+    updates = ", ".join(f"{name} = excluded.{name}" for name in column_names if name != "entry_id")
+    conn.execute(
+        f"INSERT INTO {spec.name} (campaign_id, position, {', '.join(column_names)}) "
+        f"VALUES (?, (SELECT COALESCE(MAX(position) + 1, 0) FROM {spec.name} WHERE campaign_id = ?), "
+        f"{', '.join('?' * len(column_names))}) "
+        f"ON CONFLICT (campaign_id, entry_id) DO UPDATE SET {updates}",
+        [campaign_id, campaign_id] + _column_values(spec, entry)
+    )
+    _delete_children(conn, spec, campaign_id, entry.entry_id)
+    _insert_children(conn, spec, campaign_id, entry.entry_id, entry)
+
+
+def _delete_entry(conn: sqlite3.Connection, spec: _TableSpec, campaign_id: str, entry_id: str):
+    conn.execute(f"DELETE FROM {spec.name} WHERE campaign_id = ? AND entry_id = ?", (campaign_id, entry_id))
+    _delete_children(conn, spec, campaign_id, entry_id)
+
+
+def _write_conflicts(conn: sqlite3.Connection, campaign_id: str, conflicts: CampaignConflictEntry):
+    conn.execute(f"DELETE FROM {_CONFLICTS_SPEC.name} WHERE campaign_id = ?", (campaign_id,))
+    column_names = [name for name, _ in _CONFLICTS_SPEC.columns]
+    conn.executemany(
+        f"INSERT INTO {_CONFLICTS_SPEC.name} (campaign_id, position, {', '.join(column_names)}) "
+        f"VALUES ({', '.join('?' * (len(column_names) + 2))})",
+        [[campaign_id, position] + _column_values(_CONFLICTS_SPEC, conflict)
+         for position, conflict in enumerate(conflicts.conflicts if conflicts else [])]
+    )
+
+
+def _write_magic_items(conn: sqlite3.Connection, campaign_id: str, tracker: MagicItemTrackerData):
+    conn.execute("DELETE FROM magic_items WHERE campaign_id = ?", (campaign_id,))
+    rows = []
+    if tracker:
+        for tier_field in fields(tracker):
+            tier_data = getattr(tracker, tier_field.name)
+            for rarity_field in fields(tier_data):
+                for position, name in enumerate(getattr(tier_data, rarity_field.name)):
+                    rows.append((campaign_id, tier_field.name, rarity_field.name, position, name))
+    conn.executemany("INSERT INTO magic_items (campaign_id, tier, rarity, position, name) VALUES (?, ?, ?, ?, ?)", rows)
+
+
+def _write_campaign_header(conn: sqlite3.Connection, campaign: Campaign, position: int):
+    conn.execute(
+        f"INSERT INTO campaigns (campaign_id, position, {', '.join(_CAMPAIGN_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * (len(_CAMPAIGN_COLUMNS) + 2))}) "
+        f"ON CONFLICT (campaign_id) DO UPDATE SET position = excluded.position, "
+        + ", ".join(f"{name} = excluded.{name}" for name in _CAMPAIGN_COLUMNS),
+        [campaign.campaign_id, position] + [getattr(campaign, name) for name in _CAMPAIGN_COLUMNS]
+    )
+
+
+def _delete_campaign_rows(conn: sqlite3.Connection, campaign_id: str):
+    for spec in ENTRY_TABLE_SPECS.values():
+        conn.execute(f"DELETE FROM {spec.name} WHERE campaign_id = ?", (campaign_id,))
+        _delete_children(conn, spec, campaign_id)
+    conn.execute(f"DELETE FROM {_CONFLICTS_SPEC.name} WHERE campaign_id = ?", (campaign_id,))
+    conn.execute("DELETE FROM magic_items WHERE campaign_id = ?", (campaign_id,))
+
+
+def _write_whole_campaign(conn: sqlite3.Connection, campaign_id: str, campaign: Campaign):
+    _delete_campaign_rows(conn, campaign_id)
+    for collection, spec in ENTRY_TABLE_SPECS.items():
+        column_names = [name for name, _ in spec.columns]
+        entries = list(getattr(campaign, collection).values())
+        conn.executemany(
+            f"INSERT INTO {spec.name} (campaign_id, position, {', '.join(column_names)}) "
+            f"VALUES ({', '.join('?' * (len(column_names) + 2))})",
+            [[campaign_id, position] + _column_values(spec, entry) for position, entry in enumerate(entries)]
+        )
+        for entry in entries:
+            _insert_children(conn, spec, campaign_id, entry.entry_id, entry)
+    _write_conflicts(conn, campaign_id, campaign.campaign_conflicts)
+    _write_magic_items(conn, campaign_id, campaign.magic_item_tracker)
+
+
+def _write_entry_changes(conn: sqlite3.Connection, campaign_id: str, campaign: Campaign, entry_changes):
+    for collection, entry_id in sorted(entry_changes):
+        if collection == CONFLICTS_COLLECTION:
+            _write_conflicts(conn, campaign_id, campaign.campaign_conflicts)
+        elif collection == MAGIC_ITEMS_COLLECTION:
+            _write_magic_items(conn, campaign_id, campaign.magic_item_tracker)
+        else:
+            spec = ENTRY_TABLE_SPECS[collection]
+            entry = getattr(campaign, collection).get(entry_id)
+            if entry is None:
+                _delete_entry(conn, spec, campaign_id, entry_id)
+            else:
+                _upsert_entry(conn, spec, campaign_id, entry)
+
+
+def save_sqlite_data(application_data: ApplicationData, filepath: str,
+                     changes: Optional[ChangeSet] = None) -> bool:
+    """
+    Saves ApplicationData to an SQLite database, in a single transaction.
+
+    Each tracker collection is a table keyed by (campaign_id, entry_id); list
+    fields of entries such as travel stages or bastion facilities live in
+    child tables. When changes records individual entries, only those rows
+    are upserted or deleted (an entry missing from its collection is deleted).
+
+    Args:
+        application_data: The ApplicationData object to save.
+        filepath: The path of the database file.
+        changes: Optional record of what changed since the last save. If None,
+            every campaign is rewritten.
+
+    Returns:
+        True if saving was successful, False otherwise.
+    """
+    try:
+        with closing(_connect(filepath)) as conn:
+            with conn:
+                stored_ids = {row["campaign_id"] for row in conn.execute("SELECT campaign_id FROM campaigns")}
+                for campaign_id in stored_ids - set(application_data.campaigns):
+                    _delete_campaign_rows(conn, campaign_id)
+                    conn.execute("DELETE FROM campaigns WHERE campaign_id = ?", (campaign_id,))
+
+                campaigns = application_data.campaigns
+                for position, campaign_id in enumerate(campaigns):
+                    campaign = peek_campaign(campaigns, campaign_id)
+                    if campaign is None:
+                        if changes is not None and not changes.is_campaign_dirty(campaign_id) and campaign_id in stored_ids:
+                            # Never loaded and not changed; only its position may have moved
+                            conn.execute("UPDATE campaigns SET position = ? WHERE campaign_id = ?", (position, campaign_id))
+                            continue
+                        campaign = campaigns[campaign_id]
+                    _write_campaign_header(conn, campaign, position)
+                    entry_changes = changes.get_entry_changes(campaign_id) if changes is not None else None
+                    if entry_changes is None:
+                        _write_whole_campaign(conn, campaign_id, campaign)
+                    else:
+                        _write_entry_changes(conn, campaign_id, campaign, entry_changes)
+
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('active_campaign_id', ?)",
+                             (application_data.active_campaign_id,))
+        logging.info(f"Data successfully saved to {filepath}")
+        return True
+    except sqlite3.Error as e: # pragma: no cover
+        logging.error(f"SQLite error saving data to {filepath}: {e}")
+    except Exception as e: # pragma: no cover
+        logging.error(f"An unexpected error occurred while saving data to {filepath}: {e}")
+    return False
+
+
+# --- Reading ---
+
+def _row_to_dict(spec: _TableSpec, row: sqlite3.Row) -> Dict[str, Any]:
+    data = {}
+    for field_name, kind in spec.columns:
+        value = row[field_name]
+        if value is not None:
+            if kind == "json":
+                value = json.loads(value)
+            elif kind == "bool":
+                value = bool(value)
+        data[field_name] = value
+    return data
+
+
+def _load_children(conn: sqlite3.Connection, spec: _TableSpec, campaign_id: str) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    """Returns {field name: {parent_id: [child dicts in order]}} for the list fields of spec."""
+    children = {}
+    for field_name, child_spec in spec.children:
+        by_parent: Dict[str, List[Dict[str, Any]]] = {}
+        for row in conn.execute(
+                f"SELECT * FROM {child_spec.name} WHERE campaign_id = ? ORDER BY parent_id, position", (campaign_id,)):
+            by_parent.setdefault(row["parent_id"], []).append(_row_to_dict(child_spec, row))
+        children[field_name] = by_parent
+    return children
+
+
+def _load_campaign(conn: sqlite3.Connection, header: sqlite3.Row) -> Campaign:
+    campaign_id = header["campaign_id"]
+    data: Dict[str, Any] = {"campaign_id": campaign_id}
+    for name in _CAMPAIGN_COLUMNS:
+        data[name] = header[name]
+
+    for collection, spec in ENTRY_TABLE_SPECS.items():
+        children = _load_children(conn, spec, campaign_id)
+        entries = {}
+        for row in conn.execute(f"SELECT * FROM {spec.name} WHERE campaign_id = ? ORDER BY position", (campaign_id,)):
+            entry = _row_to_dict(spec, row)
+            for field_name, by_parent in children.items():
+                entry[field_name] = by_parent.get(entry["entry_id"], [])
+            entries[entry["entry_id"]] = entry
+        data[collection] = entries
+
+    data[CONFLICTS_COLLECTION] = {"conflicts": [
+        _row_to_dict(_CONFLICTS_SPEC, row) for row in conn.execute(
+            f"SELECT * FROM {_CONFLICTS_SPEC.name} WHERE campaign_id = ? ORDER BY position", (campaign_id,))
+    ]}
+
+    tracker: Dict[str, Dict[str, List[str]]] = {}
+    for row in conn.execute(
+            "SELECT tier, rarity, name FROM magic_items WHERE campaign_id = ? ORDER BY tier, rarity, position",
+            (campaign_id,)):
+        tracker.setdefault(row["tier"], {}).setdefault(row["rarity"], []).append(row["name"])
+    data[MAGIC_ITEMS_COLLECTION] = tracker
+
+    return _from_dict(Campaign, data)
+
+
+def _load_campaign_by_id(filepath: str, campaign_id: str) -> Campaign:
+    with closing(_connect(filepath)) as conn:
+        header = conn.execute("SELECT * FROM campaigns WHERE campaign_id = ?", (campaign_id,)).fetchone()
+        if header is None:
+            raise KeyError(campaign_id)
+        return _load_campaign(conn, header)
+
+
+def load_sqlite_data(filepath: str, lazy: bool = False) -> ApplicationData:
+    """
+    Loads ApplicationData from an SQLite database written by save_sqlite_data.
+
+    Args:
+        filepath: The path of the database file.
+        lazy: If True, only the campaigns table is read; each campaign's rows
+            are read the first time it is accessed (see LazyCampaigns).
+
+    Returns:
+        An ApplicationData object. If the file doesn't exist or cannot be
+        read, a new ApplicationData instance is returned.
+    """
+    if not os.path.exists(filepath):
+        logging.info(f"File {filepath} not found. Returning new ApplicationData instance.")
+        return ApplicationData()
+
+    try:
+        with closing(_connect(filepath)) as conn:
+            application_data = ApplicationData()
+            headers = conn.execute("SELECT * FROM campaigns ORDER BY position").fetchall()
+            if lazy:
+                application_data.campaigns = LazyCampaigns(
+                    ((header["campaign_id"], header["name"] or "", None) for header in headers),
+                    lambda campaign_id, _: _load_campaign_by_id(filepath, campaign_id))
+            else:
+                for header in headers:
+                    application_data.campaigns[header["campaign_id"]] = _load_campaign(conn, header)
+            active_row = conn.execute("SELECT value FROM meta WHERE key = 'active_campaign_id'").fetchone()
+            application_data.active_campaign_id = active_row["value"] if active_row and active_row["value"] else ""
+            return application_data
+    except sqlite3.Error as e: # pragma: no cover
+        logging.error(f"SQLite error loading data from {filepath}: {e}. Returning new ApplicationData.")
+    except Exception as e: # pragma: no cover
+        logging.error(f"An unexpected error occurred while loading data from {filepath}: {e}. Returning new ApplicationData.")
+    return ApplicationData()
@@ -1,13 +1,218 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTableWidget, QAbstractItemView, QHeaderView, QMessageBox, QMenu, QDialog, QHBoxLayout, QLabel, QTableWidgetItem # Added QHBoxLayout, QLabel, QTableWidgetItem
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTableView, QAbstractItemView, QHeaderView, QMessageBox, QMenu, QDialog, QHBoxLayout, QLabel, QStyleOptionViewItem
 from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Slot
 from PySide6.QtGui import QAction
 from abc import ABC, ABCMeta, abstractmethod
-from typing import List, Any, Optional, TypeVar, Generic
+from bisect import bisect_left, bisect_right
+from typing import Callable, Dict, Iterable, List, Any, Optional, Sequence, Tuple, TypeVar, Generic
+
+from src.entity_ids import id_sort_key
+from src.field_specs import FieldKind, FieldSpec, NUMERIC_KINDS, display_text, table_columns
+from src.trackers.row_actions import RowAction, RowActionDelegate
 
 # Combine metaclasses to resolve conflict
 class CombinedMeta(type(QWidget), ABCMeta):
     pass
 
+
+def _column_sort_key(spec: FieldSpec) -> Callable[[Any], Any]:
+    '''Returns a key function ordering items by the column of spec, as its cells show it.'''
+    name = spec.name
+    if spec.kind in NUMERIC_KINDS:
+        return lambda item: getattr(item, name)
+    if spec.kind in (FieldKind.LIST, FieldKind.ENTRIES):
+        return lambda item: len(getattr(item, name))
+    if spec.kind is FieldKind.RICH_TEXT:
+        return lambda item: item.snippet(name).casefold()
+    return lambda item: display_text(spec, getattr(item, name)).casefold()
+
+
+class _Descending:
+    '''Wraps a sort key so that greater keys sort first.'''
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool: # So tuples holding it compare their later items
+        return isinstance(other, _Descending) and other.key == self.key
+
+    __hash__ = None
+
+
+class TrackerTableModel(QAbstractTableModel):
+    '''
+    The rows of a tracker table. Rows are the tracker's entities themselves
+    (not copies), and cells are computed when the view asks for them, so only
+    the visible cells cost anything. The columns are the table column specs
+    of the model class (see src.field_specs), followed by extra columns, such
+    as "Actions", without data of their own. Every cell of a row has the
+    item's ID as its UserRole data.
+
+    Next to the rows the model keeps their sort keys, in row order, and the
+    key each item was placed by. A single item is found, and added, moved or
+    removed after a change, by bisecting the keys; see update_item.
+    '''
+
+    def __init__(self, id_func: Callable[[Any], Optional[str]], parent=None):
+        super().__init__(parent)
+        self._id_func = id_func
+        self._items: List[Any] = []
+        self._keys: List[Any] = [] # Ascending; see _row_key
+        self._key_by_id: Dict[str, Any] = {}
+        self._next_position = 0 # The key of the next item added while the table is not sorted
+        self._specs: Tuple[FieldSpec, ...] = ()
+        self._extra_labels: List[str] = []
+        self._sort_column = -1 # Items stay in the order they were given
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    def set_columns(self, specs: Sequence[FieldSpec], extra_labels: Sequence[str] = ()):
+        self.beginResetModel()
+        self._specs = tuple(specs)
+        self._extra_labels = list(extra_labels)
+        self.endResetModel()
+
+    def set_items(self, items: Iterable[Any]):
+        '''Shows items, in the order of the column the table is sorted by, if any.'''
+        self.beginResetModel()
+        self._items = list(items)
+        self._sort_items()
+        self.endResetModel()
+
+    def item(self, row: int) -> Any:
+        return self._items[row]
+
+    def item_id(self, row: int) -> Optional[str]:
+        return self._id_func(self._items[row])
+
+    def row_of(self, item_id: str) -> int:
+        '''Returns the row of the item with item_id, or -1 if it is not shown.'''
+        if item_id not in self._key_by_id:
+            return -1
+        key = self._key_by_id[item_id]
+        for row in range(bisect_left(self._keys, key), bisect_right(self._keys, key)):
+            if self._id_func(self._items[row]) == item_id:
+                return row
+        return -1
+
+    def update_item(self, item: Any):
+        '''
+        Shows the current state of item after it was added or edited: its row
+        is updated in place, moved to where it now sorts, or inserted. Views
+        keep their selection and scroll position.
+        '''
+        item_id = self._id_func(item)
+        row = self.row_of(item_id)
+        key = self._row_key(item)
+        keys = self._keys
+        if row < 0:
+            row = bisect_right(keys, key)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._items.insert(row, item)
+            keys.insert(row, key)
+            self._key_by_id[item_id] = key
+            self.endInsertRows()
+            return
+        self._key_by_id[item_id] = key
+        if (row == 0 or not key < keys[row - 1]) and (row == len(keys) - 1 or not keys[row + 1] < key):
+            self._items[row] = item
+            keys[row] = key
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+            return
+        destination = bisect_right(keys, key) # Where the item goes with its old row still in place
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), destination)
+        del self._items[row], keys[row]
+        if destination > row:
+            destination -= 1
+        self._items.insert(destination, item)
+        keys.insert(destination, key)
+        self.endMoveRows()
+        # The moved row's cells may show new values too
+        self.dataChanged.emit(self.index(destination, 0), self.index(destination, self.columnCount() - 1))
+
+    def remove_item(self, item_id: str) -> bool:
+        '''Removes the row of the item with item_id. Returns False if it is not shown.'''
+        row = self.row_of(item_id)
+        if row < 0:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row], self._keys[row], self._key_by_id[item_id]
+        self.endRemoveRows()
+        return True
+
+    def spec_column_count(self) -> int:
+        return len(self._specs)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._specs) + len(self._extra_labels)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        item = self._items[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return self._id_func(item)
+        if index.column() >= len(self._specs):
+            return None
+        spec = self._specs[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if spec.kind is FieldKind.RICH_TEXT:
+                return item.snippet(spec.name) # Cached until the field changes
+            value = getattr(item, spec.name)
+            return value if spec.kind in NUMERIC_KINDS else display_text(spec, value)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if spec.kind in NUMERIC_KINDS or spec.kind in (FieldKind.LIST, FieldKind.ENTRIES):
+                return int(Qt.AlignmentFlag.AlignCenter) # Numbers and list lengths
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            labels = [spec.label for spec in self._specs] + self._extra_labels
+            return labels[section] if 0 <= section < len(labels) else None
+        return super().headerData(section, orientation, role)
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        self._sort_column, self._sort_order = column, order
+        self.layoutAboutToBeChanged.emit()
+        # Index widgets and the selection follow their items to the new rows
+        old_indexes = self.persistentIndexList()
+        old_items = [self._items[index.row()] for index in old_indexes]
+        self._sort_items()
+        new_rows = {id(item): row for row, item in enumerate(self._items)}
+        self.changePersistentIndexList(old_indexes, [self.index(new_rows[id(item)], index.column())
+                                                     for item, index in zip(old_items, old_indexes)])
+        self.layoutChanged.emit()
+
+    def _row_key(self, item: Any) -> Any:
+        item_id = self._id_func(item)
+        if 0 <= self._sort_column < len(self._specs):
+            key = _column_sort_key(self._specs[self._sort_column])(item)
+            if self._sort_order == Qt.SortOrder.DescendingOrder:
+                key = _Descending(key)
+            # Rows with equal cells stay in creation order
+            return key, id_sort_key(item_id or "")
+        if item_id in self._key_by_id: # Unsorted items keep their place
+            return self._key_by_id[item_id]
+        self._next_position += 1
+        return self._next_position
+
+    def _sort_items(self):
+        self._key_by_id = {}
+        if 0 <= self._sort_column < len(self._specs):
+            keys = [self._row_key(item) for item in self._items]
+            order = sorted(range(len(keys)), key=keys.__getitem__) # Stable, like sorting the items
+            self._items = [self._items[row] for row in order]
+            self._keys = [keys[row] for row in order]
+        else:
+            self._keys = list(range(len(self._items)))
+            self._next_position = len(self._items)
+        self._key_by_id = {self._id_func(item): key for item, key in zip(self._items, self._keys)}
+
 class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
     def __init__(self, main_window, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -23,20 +228,26 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         self._setup_action_bar()
 
         # Table for items
-        self.table_widget = QTableWidget() # Changed from QTableView to QTableWidget
-        self._configure_table_columns() # Call abstract method for column setup
-        self.table_widget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table_widget.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        self.table_widget.doubleClicked.connect(self._on_edit_item_triggered) # Default double-click action
-        self.main_layout.addWidget(self.table_widget)
+        self._shown_campaign_id: Optional[str] = None # The campaign the table was last filled from
+        self.table_model = TrackerTableModel(self._get_item_id, self)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self._configure_table_columns()
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        # Rows are one line high, so the view never has to measure the rows it does not show
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        if not self._get_row_actions(): # Trackers with row buttons edit through them
+            self.table_view.doubleClicked.connect(self._on_edit_item_triggered) # Default double-click action
+        self.main_layout.addWidget(self.table_view)
 
         # Placeholder label
         self.placeholder_label = QLabel(f"No {self._entity_name_plural.lower()} defined. Click '{self._get_add_button_text()}' to create one.")
         self.placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.placeholder_label.setVisible(False)
         self.main_layout.addWidget(self.placeholder_label)
-        self.table_widget.setVisible(True)
+        self.table_view.setVisible(True)
 
         # Initial state
         self.refresh_display()
@@ -64,6 +275,7 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         Handles campaign checks, data fetching, table population, and placeholder visibility.
         '''
         current_campaign_id = self.main_window.current_campaign_id
+        self._shown_campaign_id = current_campaign_id
         if not current_campaign_id:
             self._handle_no_campaign()
             return
@@ -83,15 +295,40 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
             return
 
         self.show_placeholder(False)
-        self.table_widget.setSortingEnabled(False) # Disable sorting during population
-        self.table_widget.setRowCount(len(item_data_list))
+        self.table_model.set_items(item_data_list) # Keeps the column order the user sorted by
+        self._set_buttons_enabled(True)
 
-        for row, item_data in enumerate(item_data_list):
-            self._populate_table_row(row, item_data)
+    def _refresh_item(self, item_id: Optional[str]):
+        '''
+        Updates the display after the item identified by item_id was added,
+        edited or deleted: only its row is inserted, updated, moved or removed,
+        and the selection and scroll position are kept. Without item_id, or if
+        the table shows another campaign, the whole display is refreshed.
+        '''
+        current_campaign_id = self.main_window.current_campaign_id
+        campaign = self.main_window.application_data.campaigns.get(current_campaign_id) if current_campaign_id else None
+        if item_id is None or campaign is None or current_campaign_id != self._shown_campaign_id:
+            self.refresh_display()
+            return
+        item = self._find_item(campaign, item_id)
+        if item is None:
+            self.table_model.remove_item(item_id)
+        else:
+            self.table_model.update_item(item)
+        if self.table_model.rowCount() == 0:
+            self._handle_no_data()
+        else:
+            self.show_placeholder(False)
+            self._set_buttons_enabled(True)
 
-        self.table_widget.resizeRowsToContents()
-        self.table_widget.setSortingEnabled(True) # Re-enable sorting
-        self._set_buttons_enabled(True)
+    def select_item(self, item_id: str) -> bool:
+        '''Selects and scrolls to the row of the item with item_id. Returns False if it is not shown.'''
+        row = self.table_model.row_of(item_id)
+        if row < 0:
+            return False
+        self.table_view.selectRow(row)
+        self.table_view.scrollTo(self.table_model.index(row, 0))
+        return True
 
 
     def show_placeholder(self, show: bool, text: Optional[str] = None):
@@ -99,10 +336,10 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         if show:
             if text:
                 self.placeholder_label.setText(text)
-            self.table_widget.setVisible(False)
+            self.table_view.setVisible(False)
             self.placeholder_label.setVisible(True)
         else:
-            self.table_widget.setVisible(True)
+            self.table_view.setVisible(True)
             self.placeholder_label.setVisible(False)
 
     def _set_buttons_enabled(self, enabled: bool):
@@ -125,19 +362,23 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         if dialog is None: # Subclass might not support adding this way
             return
 
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
+        try:
+            # Whatever the dialog and _perform_add_item change is saved once, or undone on an error.
+            with self.main_window.transaction() as transaction:
+                self._track_item(transaction, None)
+                if dialog.exec() != QDialog.DialogCode.Accepted:
+                    return
                 new_item_data = dialog.get_data() # Dialogs should have a get_data() method
-                if new_item_data:
-                    # Get campaign object and pass to _perform_add_item
-                    campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
-                    self._perform_add_item(new_item_data, campaign)
-                    self.main_window._save_app_data()
-                    self.refresh_display()
-                    self.main_window.statusBar().showMessage(f"New {self._entity_name.lower()} added.", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Error Adding Item", f"Could not add {self._entity_name.lower()}: {e}")
-                self.main_window.statusBar().showMessage(f"Failed to add {self._entity_name.lower()}.", 5000)
+                if not new_item_data:
+                    return
+                self._perform_add_item(new_item_data, transaction.campaign)
+                self._save_entry(self._get_item_id(new_item_data))
+            self._refresh_item(self._get_item_id(new_item_data))
+            self.main_window.statusBar().showMessage(f"New {self._entity_name.lower()} added.", 3000)
+        except Exception as e:
+            self.refresh_display()
+            QMessageBox.critical(self, "Error Adding Item", f"Could not add {self._entity_name.lower()}: {e}")
+            self.main_window.statusBar().showMessage(f"Failed to add {self._entity_name.lower()}.", 5000)
 
 
     @Slot()
@@ -150,6 +391,15 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         if item_id_to_edit is None:
             QMessageBox.information(self, "No Selection", f"Please select a {self._entity_name.lower()} to edit.")
             return
+        self._edit_item(item_id_to_edit)
+
+    def _edit_item(self, item_id_to_edit: str):
+        '''Opens the edit dialog for an item and saves the changes in one transaction.
+           Used by the edit button and by the rows' Edit buttons.
+        '''
+        if not self.main_window.current_campaign_id:
+            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
+            return
 
         campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
         if not campaign:
@@ -160,17 +410,21 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         if dialog is None: # Subclass might not support editing or item not found
             return
 
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            try:
+        try:
+            with self.main_window.transaction() as transaction:
+                self._track_item(transaction, item_id_to_edit)
+                if dialog.exec() != QDialog.DialogCode.Accepted:
+                    return
                 updated_item_data = dialog.get_data() # Dialog might update in place or return data
                 self._perform_edit_item(item_id_to_edit, updated_item_data, campaign)
-                self.main_window._save_app_data()
-                self.refresh_display()
-                item_name = self._get_item_name_for_confirmation(item_id_to_edit, campaign) or self._entity_name
-                self.main_window.statusBar().showMessage(f"{item_name} updated.", 3000)
-            except Exception as e:
-                QMessageBox.critical(self, "Error Editing Item", f"Could not update {self._entity_name.lower()}: {e}")
-                self.main_window.statusBar().showMessage(f"Failed to update {self._entity_name.lower()}.", 5000)
+                self._save_entry(item_id_to_edit)
+            self._refresh_item(item_id_to_edit)
+            item_name = self._get_item_name_for_confirmation(item_id_to_edit, campaign) or self._entity_name
+            self.main_window.statusBar().showMessage(f"{item_name} updated.", 3000)
+        except Exception as e:
+            self.refresh_display()
+            QMessageBox.critical(self, "Error Editing Item", f"Could not update {self._entity_name.lower()}: {e}")
+            self.main_window.statusBar().showMessage(f"Failed to update {self._entity_name.lower()}.", 5000)
 
     @Slot()
     def _on_delete_item_triggered(self):
@@ -182,6 +436,15 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         if item_id_to_delete is None:
             QMessageBox.information(self, "No Selection", f"Please select a {self._entity_name.lower()} to delete.")
             return
+        self._delete_item(item_id_to_delete)
+
+    def _delete_item(self, item_id_to_delete: str):
+        '''Asks for confirmation and deletes an item in one transaction.
+           Used by the delete button and by the rows' Delete buttons.
+        '''
+        if not self.main_window.current_campaign_id:
+            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
+            return
 
         campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
         if not campaign:
@@ -195,10 +458,13 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
                                      QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             try:
-                deleted = self._perform_delete_item(item_id_to_delete, campaign)
+                with self.main_window.transaction() as transaction:
+                    self._track_item(transaction, item_id_to_delete)
+                    deleted = self._perform_delete_item(item_id_to_delete, campaign)
+                    if deleted:
+                        self._save_entry(item_id_to_delete)
                 if deleted:
-                    self.main_window._save_app_data()
-                    self.refresh_display()
+                    self._refresh_item(item_id_to_delete)
                     self.main_window.statusBar().showMessage(f"{item_name} deleted.", 3000)
                 else:
                     QMessageBox.warning(self, "Delete Error", f"{self._entity_name} not found for deletion or already removed.")
@@ -231,22 +497,31 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         '''Return text for the delete button.'''
         return f"Delete Selected {self._get_entity_name()}"
 
-    @abstractmethod
     def _configure_table_columns(self):
-        '''Set up table column labels, widths, and other properties.'''
-        pass
+        '''Set up table columns: by default those declared for the model class,
+           plus an "Actions" column if the tracker has row actions.
+        '''
+        actions = self._get_row_actions()
+        self._configure_spec_columns(["Actions"] if actions else [])
+        if actions:
+            # The buttons are painted, so rows cost the same with or without them
+            column = self.table_model.spec_column_count()
+            delegate = RowActionDelegate(actions, self.table_view)
+            self.table_view.setItemDelegateForColumn(column, delegate)
+            size = delegate.sizeHint(QStyleOptionViewItem(), QModelIndex())
+            self.table_view.horizontalHeader().setSectionResizeMode(column, QHeaderView.ResizeMode.Fixed)
+            self.table_view.horizontalHeader().resizeSection(column, size.width())
+            vertical_header = self.table_view.verticalHeader()
+            vertical_header.setDefaultSectionSize(max(vertical_header.defaultSectionSize(), size.height()))
 
     @abstractmethod
     def _get_item_data_for_display(self, campaign) -> List[Any]:
         '''Fetch and return a list of items (e.g., model instances) to be displayed in the table.'''
         pass
 
-    @abstractmethod
-    def _populate_table_row(self, row: int, item_data: Any):
-        '''Populate a single row in the QTableWidget using the provided item_data.'''
-        # Remember to store unique ID for the item in the row, e.g., using:
-        # name_item.setData(Qt.ItemDataRole.UserRole, item_data.entry_id)
-        pass
+    def _get_row_actions(self) -> Sequence[RowAction]:
+        '''Return the buttons shown in each row, e.g. [("Edit", self._edit_item)].'''
+        return ()
 
     @abstractmethod
     def _get_dialog_for_add(self) -> Optional[QDialog]:
@@ -292,9 +567,44 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
         '''
         pass
 
+    def _get_collection_name(self) -> Optional[str]:
+        '''Return the Campaign field holding this tracker's items (e.g., "npcs").
+           Lets saves write only the changed item; None saves the whole campaign.
+        '''
+        return None
+
+    def _get_item_id(self, item_data: Any) -> Optional[str]:
+        '''Return the unique ID of an item returned by a dialog.'''
+        return getattr(item_data, "entry_id", None)
+
+    def _find_item(self, campaign, item_id: str) -> Optional[Any]:
+        '''Return the item with item_id in campaign, or None if there is none.
+           Items of a dict collection are looked up directly; others are searched for.
+        '''
+        collection = self._get_collection_name()
+        items = getattr(campaign, collection, None) if collection else None
+        if isinstance(items, dict):
+            return items.get(item_id)
+        return next((item for item in self._get_item_data_for_display(campaign)
+                     if self._get_item_id(item) == item_id), None)
+
+    def _track_item(self, transaction, item_id: Optional[str]):
+        '''Remembers the item (or, without item_id, which items exist) so the transaction can undo changes to it.'''
+        collection = self._get_collection_name()
+        if collection:
+            transaction.track(collection, item_id)
+
+    def _save_entry(self, item_id: Optional[str]):
+        '''Schedules a save after the item identified by item_id was added, edited or deleted.'''
+        collection = self._get_collection_name()
+        if collection and item_id:
+            self.main_window._save_app_data(collection, item_id)
+        else:
+            self.main_window._save_app_data()
+
     def _handle_no_campaign(self):
         '''Default behavior when no campaign is selected.'''
-        self.table_widget.setRowCount(0)
+        self.table_model.set_items([])
         self.show_placeholder(True, "No campaign selected. Please select or create one from the File menu.")
         self._set_buttons_enabled(False)
         if hasattr(self, 'add_button'): # Add button should also be disabled if no campaign
@@ -303,28 +613,42 @@ class BaseTrackerWidget(QWidget, ABC, metaclass=CombinedMeta):
 
     def _handle_no_data(self):
         '''Default behavior when campaign has no data for this tracker.'''
-        self.table_widget.setRowCount(0)
+        self.table_model.set_items([])
         self.show_placeholder(True, f"No {self._entity_name_plural.lower()} defined for this campaign. Click '{self._get_add_button_text()}' to create one.")
         self._set_buttons_enabled(False) # Edit/Delete disabled
         if hasattr(self, 'add_button'):
             self.add_button.setEnabled(True) # Add button can be enabled
 
     # --- Helper methods for subclasses (optional to use) ---
-    def _create_table_item(self, text: str, data_role_value: Optional[Any] = None, alignment: Optional[Qt.AlignmentFlag] = None) -> QTableWidgetItem:
-        item = QTableWidgetItem(text)
-        if data_role_value is not None:
-            item.setData(Qt.ItemDataRole.UserRole, data_role_value)
-        if alignment is not None:
-            item.setTextAlignment(alignment)
-        return item
-
-    def _get_id_from_selected_row(self, column_with_id: int = 0) -> Optional[str]:
-        '''Helper to get ID from a specific column in the selected row.'''
-        selected_items = self.table_widget.selectedItems()
-        if not selected_items:
-            return None
-        selected_row = self.table_widget.row(selected_items[0]) # Get row index from any selected item
-        id_item = self.table_widget.item(selected_row, column_with_id)
-        if id_item:
-            return id_item.data(Qt.ItemDataRole.UserRole)
+    def _get_model_class(self) -> Optional[type]:
+        '''Return the dataclass listed in the table. Its fields declared as table
+           columns (see src.field_specs) are shown by the _spec_columns helpers.
+        '''
         return None
+
+    def _configure_spec_columns(self, extra_labels: Sequence[str] = ()):
+        '''Sets up a column per table column spec of the model class, sized by the
+           spec's width, followed by extra_labels (e.g. "Actions") sized to their contents.
+           The table starts out sorted by the first sortable column.
+        '''
+        specs = table_columns(self._get_model_class())
+        self.table_model.set_columns(specs, extra_labels)
+        header = self.table_view.horizontalHeader()
+        for column, spec in enumerate(specs):
+            if spec.width is None:
+                header.setSectionResizeMode(column, QHeaderView.ResizeMode.Stretch)
+            else:
+                header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+                header.resizeSection(column, spec.width)
+        for column in range(len(specs), len(specs) + len(extra_labels)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        sort_column = next((column for column, spec in enumerate(specs) if spec.sortable), -1)
+        header.setSortIndicator(sort_column, Qt.SortOrder.AscendingOrder)
+        self.table_view.setSortingEnabled(True)
+
+    def _get_id_from_selected_row(self) -> Optional[str]:
+        '''Helper to get the ID of the item in the selected row.'''
+        selected_rows = self.table_view.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return self.table_model.item_id(selected_rows[0].row())
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Slot
 from src.data_models import BastionEntry, BastionFacility # Use existing models
+from src.rich_text import get_rich_text, set_rich_text
 
 class SpecialFacilityDialog(QDialog):
     def __init__(self, parent, facility_data: Optional[BastionFacility] = None):
@@ -56,8 +57,8 @@ class SpecialFacilityDialog(QDialog):
             self.name_edit.setText(self.facility_to_edit.facility_type_name)
             self.space_edit.setText(self.facility_to_edit.space)
             self.order_edit.setText(self.facility_to_edit.order_association)
-            self.hirelings_edit.setHtml(self.facility_to_edit.hirelings)
-            self.notes_edit.setHtml(self.facility_to_edit.notes)
+            set_rich_text(self.hirelings_edit, self.facility_to_edit.hirelings)
+            set_rich_text(self.notes_edit, self.facility_to_edit.notes)
 
     def _on_save(self):
         name = self.name_edit.text().strip()
@@ -71,8 +72,8 @@ class SpecialFacilityDialog(QDialog):
             name = self.name_edit.text().strip()
             space = self.space_edit.text().strip()
             order = self.order_edit.text().strip()
-            hirelings = self.hirelings_edit.toHtml().strip()
-            notes = self.notes_edit.toHtml().strip()
+            hirelings = get_rich_text(self.hirelings_edit)
+            notes = get_rich_text(self.notes_edit)
 
             if self.facility_to_edit:
                 self.facility_to_edit.facility_type_name = name
@@ -187,8 +188,8 @@ class BastionEntryDialog(QDialog):
             self.bastion_name_edit.setText(self.bastion_to_edit.bastion_name)
             self.character_name_edit.setText(self.bastion_to_edit.character_name)
             self.level_spinbox.setValue(self.bastion_to_edit.level)
-            self.basic_facilities_edit.setHtml(self.bastion_to_edit.basic_facilities_desc)
-            self.bastion_defenders_edit.setHtml(self.bastion_to_edit.bastion_defenders_desc)
+            set_rich_text(self.basic_facilities_edit, self.bastion_to_edit.basic_facilities_desc)
+            set_rich_text(self.bastion_defenders_edit, self.bastion_to_edit.bastion_defenders_desc)
             # self.current_facilities is loaded in __init__
             self._refresh_facilities_list()
 
@@ -250,6 +251,8 @@ class BastionEntryDialog(QDialog):
         if not bastion_name:
             QMessageBox.warning(self, "Validation Error", "Bastion Name cannot be empty.")
             return
+        if not self.bastion_to_edit and not self.parent_main_window.confirm_new_name("bastions", bastion_name, self):
+            return
         self.accept()
 
     def get_data(self) -> Optional[BastionEntry]:
@@ -257,8 +260,8 @@ class BastionEntryDialog(QDialog):
             bastion_name = self.bastion_name_edit.text().strip()
             character_name = self.character_name_edit.text().strip()
             level = self.level_spinbox.value()
-            basic_facilities = self.basic_facilities_edit.toHtml().strip()
-            bastion_defenders = self.bastion_defenders_edit.toHtml().strip()
+            basic_facilities = get_rich_text(self.basic_facilities_edit)
+            bastion_defenders = get_rich_text(self.bastion_defenders_edit)
 
             if self.bastion_to_edit:
                 self.bastion_to_edit.bastion_name = bastion_name
@@ -282,6 +285,7 @@ class BastionEntryDialog(QDialog):
 
 if __name__ == '__main__':
     from PySide6.QtWidgets import QApplication, QWidget
+    from src.trackers.demo_main_window import DemoMainWindowMixin
     # Mock main_window for dialog testing context
     class MockParentWidget(QWidget):
         def __init__(self):
@@ -289,7 +293,7 @@ if __name__ == '__main__':
             # Mimic main_window structure if dialogs need it (not directly for these dialogs)
             # For BastionEntryDialog, parent is BastionTrackerWidget, which has main_window
             # So, if testing BastionEntryDialog directly, its parent needs a main_window attribute.
-            class MockMainWindow: # noqa
+            class MockMainWindow(DemoMainWindowMixin): # noqa
                 pass
             self.main_window = MockMainWindow()
 
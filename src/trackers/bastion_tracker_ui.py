@@ -1,10 +1,11 @@
 from typing import Optional, List, Any
 from PySide6.QtWidgets import (
-    QTableWidgetItem, QHeaderView, QMessageBox, QDialog, QHBoxLayout
+   QHeaderView, QMessageBox, QDialog, QHBoxLayout
 )
 from PySide6.QtCore import Qt
 
 from src.data_models import BastionEntry, Campaign # For type hinting
+from src.entity_ids import insert_entry
 from src.trackers.bastion_tracker_dialog import BastionEntryDialog
 from src.trackers.base_tracker_ui import BaseTrackerWidget
 
@@ -15,25 +16,17 @@ class BastionTrackerWidget(BaseTrackerWidget):
     def _get_entity_name_plural(self) -> str:
         return "Bastions"
 
-    def _configure_table_columns(self):
-        self.table_widget.setColumnCount(3)
-        self.table_widget.setHorizontalHeaderLabels(["Bastion Name", "Character Name", "Level"])
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.table_widget.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)
+    def _get_collection_name(self) -> str:
+        return "bastions"
+
+    def _get_model_class(self) -> type:
+        return BastionEntry
 
     def _get_item_data_for_display(self, campaign: Campaign) -> List[BastionEntry]:
         if not campaign.bastions:
             return []
-        # Sort by bastion name for display consistency
-        return sorted(list(campaign.bastions.values()), key=lambda b: b.bastion_name.lower())
+        return list(campaign.bastions.values()) # The table model sorts them
 
-    def _populate_table_row(self, row: int, bastion_entry: BastionEntry):
-        name_item = self._create_table_item(bastion_entry.bastion_name, bastion_entry.entry_id)
-        self.table_widget.setItem(row, 0, name_item)
-        self.table_widget.setItem(row, 1, self._create_table_item(bastion_entry.character_name))
-        level_item = self._create_table_item(str(bastion_entry.level), alignment=Qt.AlignmentFlag.AlignCenter)
-        self.table_widget.setItem(row, 2, level_item)
 
     def _get_dialog_for_add(self) -> Optional[QDialog]:
         # The campaign object is implicitly handled by the base class calling _perform_add_item
@@ -49,7 +42,7 @@ class BastionTrackerWidget(BaseTrackerWidget):
 
     def _get_selected_item_id(self) -> Optional[str]:
         # ID is stored in the first column (index 0)
-        return self._get_id_from_selected_row(column_with_id=0)
+        return self._get_id_from_selected_row()
 
     def _get_item_name_for_confirmation(self, item_id: str, campaign: Campaign) -> Optional[str]:
         bastion = campaign.bastions.get(item_id)
@@ -59,7 +52,7 @@ class BastionTrackerWidget(BaseTrackerWidget):
         # dialog_data is a BastionEntry object from BastionEntryDialog.get_data()
         # The base class's _on_add_item_triggered method will pass the result of dialog.get_data()
         # which is new_item_data in that context.
-        campaign.bastions[dialog_data.entry_id] = dialog_data
+        insert_entry(campaign.bastions, dialog_data)
 
     def _perform_edit_item(self, item_id: str, dialog_data: BastionEntry, campaign: Campaign) -> None:
         # BastionEntryDialog updates the passed bastion_entry in place.
@@ -85,11 +78,12 @@ class BastionTrackerWidget(BaseTrackerWidget):
 if __name__ == '__main__':
     import sys
     from PySide6.QtWidgets import QApplication, QMainWindow, QStatusBar
+    from src.trackers.demo_main_window import DemoMainWindowMixin
     # Assuming ApplicationData and Campaign are correctly imported for type hinting
     # For the test block, explicit import if not found by the linter/runtime
     from src.data_models import ApplicationData #, Campaign # Campaign already imported
 
-    class MockMainWindow(QMainWindow): # Mock for testing the widget
+    class MockMainWindow(DemoMainWindowMixin, QMainWindow): # Mock for testing the widget
         def __init__(self):
             super().__init__()
             self.current_campaign_id = "bastion_test_camp"
@@ -105,7 +99,7 @@ if __name__ == '__main__':
             self.application_data.campaigns[self.current_campaign_id] = campaign
             self.setStatusBar(QStatusBar(self)) # Important for status messages
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             """Mock save method."""
             print(f"MockMainWindow: _save_app_data called for campaign: {self.current_campaign_id}")
             # In a real app, this would serialize self.application_data
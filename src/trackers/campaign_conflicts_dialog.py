@@ -5,6 +5,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt # Import Qt
 from src.data_models import Conflict # Use the existing Conflict model
+from src.rich_text import get_rich_text, set_rich_text
 
 class CampaignConflictEntryDialog(QDialog):
     def __init__(self, parent, conflict_entry: Optional[Conflict] = None):
@@ -53,7 +54,7 @@ class CampaignConflictEntryDialog(QDialog):
         if self.conflict_to_edit:
             self.title_edit.setText(self.conflict_to_edit.title_identifier)
             self.antagonist_edit.setText(self.conflict_to_edit.antagonist_situation)
-            self.notes_edit.setHtml(self.conflict_to_edit.notes)
+            set_rich_text(self.notes_edit, self.conflict_to_edit.notes)
 
     def _on_save(self):
         title = self.title_edit.text().strip()
@@ -70,7 +71,7 @@ class CampaignConflictEntryDialog(QDialog):
         if self.result() == QDialog.DialogCode.Accepted:
             title = self.title_edit.text().strip()
             antagonist = self.antagonist_edit.text().strip()
-            notes = self.notes_edit.toHtml().strip()
+            notes = get_rich_text(self.notes_edit)
 
             if self.conflict_to_edit: # Editing existing entry
                 # Update the existing conflict object directly
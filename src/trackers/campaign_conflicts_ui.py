@@ -2,10 +2,10 @@ from typing import Optional, List, Any
 from PySide6.QtWidgets import (
     QHeaderView, QMessageBox, QDialog, QHBoxLayout
 )
-# QTableWidgetItem is imported via BaseTrackerWidget's _create_table_item if needed directly
 # Qt is imported via BaseTrackerWidget if needed directly
 
 from src.data_models import Conflict, Campaign, CampaignConflictEntry as CampaignConflictDataContainer
+from src.entity_ids import id_prefix, unique_id
 from src.trackers.campaign_conflicts_dialog import CampaignConflictEntryDialog
 from src.trackers.base_tracker_ui import BaseTrackerWidget
 
@@ -16,11 +16,14 @@ class CampaignConflictsWidget(BaseTrackerWidget):
     def _get_entity_name_plural(self) -> str:
         return "Conflicts"
 
-    def _configure_table_columns(self):
-        self.table_widget.setColumnCount(2)
-        self.table_widget.setHorizontalHeaderLabels(["Conflict Title/Identifier", "Antagonist/Situation"])
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+    def _get_collection_name(self) -> str:
+        return "campaign_conflicts"
+
+    def _get_item_id(self, item_data: Conflict) -> str:
+        return item_data.conflict_id
+
+    def _get_model_class(self) -> type:
+        return Conflict
 
     def _get_item_data_for_display(self, campaign: Campaign) -> List[Conflict]:
         if not campaign.campaign_conflicts or not campaign.campaign_conflicts.conflicts:
@@ -28,12 +31,6 @@ class CampaignConflictsWidget(BaseTrackerWidget):
         # Conflicts are stored in a list, no specific sorting by default here, but can be added.
         return campaign.campaign_conflicts.conflicts
 
-    def _populate_table_row(self, row: int, conflict_entry: Conflict):
-        # Store the conflict_id in the item for later retrieval
-        title_item = self._create_table_item(conflict_entry.title_identifier, conflict_entry.conflict_id)
-        self.table_widget.setItem(row, 0, title_item)
-        self.table_widget.setItem(row, 1, self._create_table_item(conflict_entry.antagonist_situation))
-
     def _get_dialog_for_add(self) -> Optional[QDialog]:
         return CampaignConflictEntryDialog(self) # Parent is this widget
 
@@ -56,7 +53,7 @@ class CampaignConflictsWidget(BaseTrackerWidget):
 
     def _get_selected_item_id(self) -> Optional[str]:
         # ID is stored in the first column (index 0)
-        return self._get_id_from_selected_row(column_with_id=0)
+        return self._get_id_from_selected_row()
 
     def _get_item_name_for_confirmation(self, item_id: str, campaign: Campaign) -> Optional[str]:
         if not campaign.campaign_conflicts:
@@ -71,7 +68,11 @@ class CampaignConflictsWidget(BaseTrackerWidget):
         if campaign.campaign_conflicts is None:
             # Initialize the container if it's None
             campaign.campaign_conflicts = CampaignConflictDataContainer()
-        campaign.campaign_conflicts.conflicts.append(dialog_data)
+        conflicts = campaign.campaign_conflicts.conflicts
+        taken_ids = {conflict.conflict_id for conflict in conflicts}
+        if dialog_data.conflict_id in taken_ids:
+            dialog_data.conflict_id = unique_id(id_prefix(dialog_data.conflict_id), taken_ids)
+        conflicts.append(dialog_data)
 
     def _perform_edit_item(self, item_id: str, dialog_data: Conflict, campaign: Campaign) -> None:
         # CampaignConflictEntryDialog updates the passed conflict_entry in place.
@@ -100,9 +101,10 @@ class CampaignConflictsWidget(BaseTrackerWidget):
 if __name__ == '__main__':
     import sys
     from PySide6.QtWidgets import QApplication, QMainWindow, QStatusBar
+    from src.trackers.demo_main_window import DemoMainWindowMixin
     from src.data_models import ApplicationData # Campaign, Conflict, CampaignConflictDataContainer already imported
 
-    class MockMainWindow(QMainWindow):
+    class MockMainWindow(DemoMainWindowMixin, QMainWindow):
         def __init__(self):
             super().__init__()
             self.current_campaign_id = "conflict_test_camp"
@@ -118,7 +120,7 @@ if __name__ == '__main__':
             self.application_data.campaigns[self.current_campaign_id] = campaign
             self.setStatusBar(QStatusBar(self))
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"MockMainWindow: _save_app_data called for campaign {self.current_campaign_id}")
             current_campaign = self.application_data.campaigns.get(self.current_campaign_id)
             if current_campaign and current_campaign.campaign_conflicts:
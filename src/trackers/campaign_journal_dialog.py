@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextListFormat
 from PySide6.QtCore import QDate, Qt
 from src.data_models import CampaignJournalEntry
+from src.entity_ids import insert_entry
+from src.rich_text import get_rich_text, set_rich_text
 
 class CampaignJournalEntryDialog(QDialog):
     def __init__(self, parent_window, journal_entry: Optional[CampaignJournalEntry] = None):
@@ -182,9 +184,9 @@ class CampaignJournalEntryDialog(QDialog):
             else:
                 self.session_date_edit.setDate(QDate.currentDate())
             self.session_title_edit.setText(self.journal_entry_to_edit.session_title)
-            self.earlier_events_edit.setHtml(self.journal_entry_to_edit.earlier_events)
-            self.planned_summary_edit.setHtml(self.journal_entry_to_edit.planned_summary)
-            self.additional_notes_edit.setHtml(self.journal_entry_to_edit.additional_notes)
+            set_rich_text(self.earlier_events_edit, self.journal_entry_to_edit.earlier_events)
+            set_rich_text(self.planned_summary_edit, self.journal_entry_to_edit.planned_summary)
+            set_rich_text(self.additional_notes_edit, self.journal_entry_to_edit.additional_notes)
 
     def _on_save(self):
         session_number = self.session_number_edit.value()
@@ -198,9 +200,9 @@ class CampaignJournalEntryDialog(QDialog):
         # It's good practice to ensure session numbers are unique for a campaign if desired,
         # but the prompt doesn't explicitly ask for this validation. For now, we assume it's okay or handled by user.
 
-        earlier_events = self.earlier_events_edit.toHtml().strip()
-        planned_summary = self.planned_summary_edit.toHtml().strip()
-        additional_notes = self.additional_notes_edit.toHtml().strip()
+        earlier_events = get_rich_text(self.earlier_events_edit)
+        planned_summary = get_rich_text(self.planned_summary_edit)
+        additional_notes = get_rich_text(self.additional_notes_edit)
 
         active_campaign_id = self.parent_main_window.current_campaign_id
         if not active_campaign_id:
@@ -229,10 +231,10 @@ class CampaignJournalEntryDialog(QDialog):
                 additional_notes=additional_notes
             )
             # ID is auto-generated by CampaignJournalEntry dataclass
-            campaign_data.campaign_journal[new_journal_entry.entry_id] = new_journal_entry
+            insert_entry(campaign_data.campaign_journal, new_journal_entry)
             self.journal_entry_to_edit = new_journal_entry # Store for get_journal_entry_data
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("campaign_journal", self.journal_entry_to_edit.entry_id)
         super().accept()
 
     def get_journal_entry_data(self) -> Optional[CampaignJournalEntry]:
@@ -259,7 +261,7 @@ if __name__ == '__main__':
             self.sample_entry_id = sample_entry.entry_id
             self.application_data.campaigns[self.current_campaign_id] = campaign
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"Mock save_app_data called for campaign: {self.current_campaign_id}")
 
     app = QApplication([])
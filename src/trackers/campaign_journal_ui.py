@@ -1,12 +1,11 @@
 from typing import Optional, List, Any
 from PySide6.QtWidgets import (
-    QPushButton, QHeaderView, QMessageBox, QDialog, QWidget, QHBoxLayout, QTableWidgetItem
+    QPushButton, QHeaderView, QMessageBox, QDialog, QWidget, QHBoxLayout
 )
-from PySide6.QtCore import Qt, Slot
 
 from src.data_models import CampaignJournalEntry, Campaign # For type hinting
 from src.trackers.campaign_journal_dialog import CampaignJournalEntryDialog
-from src.trackers.base_tracker_ui import BaseTrackerWidget
+from src.trackers.base_tracker_ui import BaseTrackerWidget, RowAction
 
 class CampaignJournalWidget(BaseTrackerWidget):
     def _get_entity_name(self) -> str:
@@ -15,6 +14,9 @@ class CampaignJournalWidget(BaseTrackerWidget):
     def _get_entity_name_plural(self) -> str:
         return "Session Logs"
 
+    def _get_collection_name(self) -> str:
+        return "campaign_journal"
+
     def _get_add_button_text(self) -> str:
         return "Add New Session Log"
 
@@ -42,115 +44,16 @@ class CampaignJournalWidget(BaseTrackerWidget):
         # Edit/Delete buttons are per-row, not global, so base class logic for them is not needed here.
 
 
-    def _configure_table_columns(self):
-        self.table_widget.setColumnCount(4)
-        self.table_widget.setHorizontalHeaderLabels(["Session #", "Date", "Title", "Actions"])
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
-        self.table_widget.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        self.table_widget.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        self.table_widget.setSortingEnabled(True)
-        # Disable double-click to edit as actions are via buttons
-        # Check if connected before disconnecting to avoid errors if not connected by base.
-        try:
-            self.table_widget.itemDoubleClicked.disconnect(self._on_edit_item_triggered)
-        except RuntimeError: # Catches "signal itemDoubleClicked not connected to any slot"
-            pass
-
+    def _get_model_class(self) -> type:
+        return CampaignJournalEntry
 
     def _get_item_data_for_display(self, campaign: Campaign) -> List[CampaignJournalEntry]:
         if not campaign.campaign_journal:
             return []
-        # Sort entries by session number for display
-        return sorted(list(campaign.campaign_journal.values()), key=lambda entry: entry.session_number)
-
-    def _populate_table_row(self, row: int, journal_entry: CampaignJournalEntry):
-        # Session Number (as QTableWidgetItem for sorting)
-        session_num_item = QTableWidgetItem()
-        session_num_item.setData(Qt.ItemDataRole.EditRole, journal_entry.session_number) # For sorting as number
-        # Store unique ID (entry_id) in UserRole of the first item for potential reference, though not used by base selection
-        session_num_item.setData(Qt.ItemDataRole.UserRole, journal_entry.entry_id)
-        session_num_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-        self.table_widget.setItem(row, 0, session_num_item)
-
-        self.table_widget.setItem(row, 1, self._create_table_item(journal_entry.session_date))
-        self.table_widget.setItem(row, 2, self._create_table_item(journal_entry.session_title))
-
-        # Action buttons in the row
-        edit_btn = QPushButton("Edit")
-        delete_btn = QPushButton("Delete")
-
-        # Connect to new specific slots that will call base class logic or handle directly
-        edit_btn.clicked.connect(lambda checked=False, bound_id=journal_entry.entry_id: self._on_edit_entry_row(bound_id))
-        delete_btn.clicked.connect(lambda checked=False, bound_id=journal_entry.entry_id: self._on_delete_entry_row(bound_id))
-
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout(actions_widget)
-        actions_layout.addWidget(edit_btn)
-        actions_layout.addWidget(delete_btn)
-        actions_layout.setContentsMargins(0, 0, 0, 0)
-        self.table_widget.setCellWidget(row, 3, actions_widget)
-
-    # --- Row-specific action handlers ---
-    @Slot()
-    def _on_edit_entry_row(self, entry_id: str):
-        if not self.main_window.current_campaign_id:
-            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
-            return
-
-        campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
-        if not campaign:
-             QMessageBox.critical(self, "Error", "Campaign data not found.")
-             return
-
-        dialog = self._get_dialog_for_edit(entry_id, campaign)
-        if dialog is None: return
-
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # CampaignJournalEntryDialog handles its own saving.
-            # Base class _perform_edit_item is a no-op.
-            # We still call it to allow any future base class logic, though it expects dialog_data.
-            self._perform_edit_item(entry_id, None, campaign) # Pass None as dialog_data
-            self.main_window._save_app_data() # Dialog should save, but ensure consistency if not.
-            self.refresh_display()
-            item_name = self._get_item_name_for_confirmation(entry_id, campaign) or self._entity_name
-            self.main_window.statusBar().showMessage(f"{item_name} updated.", 3000)
-        else:
-            # Ensure UI reflects original state if edit is cancelled
-            self.refresh_display()
-
-
-    @Slot()
-    def _on_delete_entry_row(self, entry_id: str):
-        if not self.main_window.current_campaign_id:
-            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
-            return
-
-        campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
-        if not campaign:
-             QMessageBox.critical(self, "Error", "Campaign data not found.")
-             return
-
-        item_name = self._get_item_name_for_confirmation(entry_id, campaign) or f"the selected {self._entity_name.lower()}"
-
-        reply = QMessageBox.question(self, f"Delete {self._entity_name}",
-                                     f"Are you sure you want to delete {item_name}?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                deleted = self._perform_delete_item(entry_id, campaign)
-                if deleted:
-                    self.main_window._save_app_data() # Deletion is direct, so save here
-                    self.refresh_display()
-                    self.main_window.statusBar().showMessage(f"{item_name} deleted.", 3000)
-                else:
-                    QMessageBox.warning(self, "Delete Error", f"{self._entity_name} not found for deletion or already removed.")
-                    self.refresh_display()
-            except Exception as e: # Catch any errors from _perform_delete_item
-                QMessageBox.critical(self, "Error Deleting Item", f"Could not delete {self._entity_name.lower()}: {e}")
-                self.main_window.statusBar().showMessage(f"Failed to delete {self._entity_name.lower()}.", 5000)
-                self.refresh_display()
+        return list(campaign.campaign_journal.values()) # The table model sorts them
 
+    def _get_row_actions(self) -> List[RowAction]:
+        return [("Edit", self._edit_item), ("Delete", self._delete_item)]
 
     # --- Implementations for BaseTrackerWidget abstract methods ---
 
@@ -190,13 +93,13 @@ class CampaignJournalWidget(BaseTrackerWidget):
 
     def _perform_edit_item(self, item_id: str, dialog_data: Any, campaign: Campaign) -> None:
         # Editing is handled by CampaignJournalEntryDialog itself, including saving.
-        # _on_edit_entry_row calls this. No direct data model manipulation needed here.
+        # _edit_item calls this. No direct data model manipulation needed here.
         pass
 
     def _perform_delete_item(self, item_id: str, campaign: Campaign) -> bool:
         if campaign.campaign_journal and item_id in campaign.campaign_journal:
             del campaign.campaign_journal[item_id]
-            # Actual data saving (self.main_window._save_app_data()) is done by the calling slot (_on_delete_entry_row)
+            # Actual data saving (self.main_window._save_app_data()) is done by the calling slot (_delete_item)
             return True
         return False
 
@@ -204,9 +107,10 @@ class CampaignJournalWidget(BaseTrackerWidget):
 if __name__ == '__main__':
     import sys
     from PySide6.QtWidgets import QApplication, QMainWindow, QStatusBar
+    from src.trackers.demo_main_window import DemoMainWindowMixin
     from src.data_models import ApplicationData # Campaign, CampaignJournalEntry already imported
 
-    class MockMainWindow(QMainWindow):
+    class MockMainWindow(DemoMainWindowMixin, QMainWindow):
         def __init__(self):
             super().__init__()
             self.current_campaign_id = "journal_test_camp"
@@ -223,7 +127,7 @@ if __name__ == '__main__':
             self.application_data.campaigns[self.current_campaign_id] = campaign
             self.setStatusBar(QStatusBar(self))
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"MockMainWindow: _save_app_data called for campaign {self.current_campaign_id}")
             current_campaign = self.application_data.campaigns.get(self.current_campaign_id)
             if current_campaign and current_campaign.campaign_journal:
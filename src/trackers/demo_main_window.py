@@ -0,0 +1,18 @@
+from src.transactions import CampaignTransaction
+
+
+class DemoMainWindowMixin:
+    '''The parts of MainWindow that trackers and their dialogs call, for the
+       stand-in main windows of the trackers' __main__ demos. The stand-in
+       provides application_data, current_campaign_id and _save_app_data(),
+       which is also called once for each committed transaction that changed
+       anything.
+    '''
+
+    def transaction(self) -> CampaignTransaction:
+        campaign = self.application_data.campaigns[self.current_campaign_id]
+        return CampaignTransaction(campaign, self.current_campaign_id, lambda changes: self._save_app_data())
+
+    def confirm_new_name(self, collection: str, name: str, parent=None) -> bool:
+        '''Accepts every name; the demos do not check for similar names.'''
+        return True
@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextListFormat # Added imports
 from PySide6.QtCore import Qt
 from src.data_models import DMCharacterEntry
+from src.entity_ids import insert_entry
+from src.rich_text import get_rich_text, set_rich_text
 
 PLAYER_MOTIVATION_OPTIONS = [
     "Acting", "Exploring", "Fighting", "Instigating",
@@ -258,19 +260,19 @@ class DMCharacterEntryDialog(QDialog):
             for motivation, checkbox in self.motivation_checkboxes.items():
                 checkbox.setChecked(motivation in self.entry_to_edit.player_motivations)
 
-            self.notes_on_player_expectations_edit.setHtml(self.entry_to_edit.notes_on_player_expectations)
+            set_rich_text(self.notes_on_player_expectations_edit, self.entry_to_edit.notes_on_player_expectations)
             self.char_class_edit.setText(self.entry_to_edit.char_class)
             self.subclass_edit.setText(self.entry_to_edit.subclass)
             self.level_spinbox.setValue(self.entry_to_edit.level)
             self.background_edit.setText(self.entry_to_edit.background)
             self.species_race_edit.setText(self.entry_to_edit.species_race)
             self.alignment_edit.setText(self.entry_to_edit.alignment)
-            self.goals_ambitions_edit.setHtml(self.entry_to_edit.goals_ambitions)
-            self.quirks_whims_edit.setHtml(self.entry_to_edit.quirks_whims)
-            self.magic_items_owned_edit.setHtml(self.entry_to_edit.magic_items_owned)
-            self.character_details_edit.setHtml(self.entry_to_edit.character_details)
-            self.family_friends_foes_edit.setHtml(self.entry_to_edit.family_friends_foes)
-            self.adventure_ideas_edit.setHtml(self.entry_to_edit.adventure_ideas)
+            set_rich_text(self.goals_ambitions_edit, self.entry_to_edit.goals_ambitions)
+            set_rich_text(self.quirks_whims_edit, self.entry_to_edit.quirks_whims)
+            set_rich_text(self.magic_items_owned_edit, self.entry_to_edit.magic_items_owned)
+            set_rich_text(self.character_details_edit, self.entry_to_edit.character_details)
+            set_rich_text(self.family_friends_foes_edit, self.entry_to_edit.family_friends_foes)
+            set_rich_text(self.adventure_ideas_edit, self.entry_to_edit.adventure_ideas)
 
     def _on_save(self):
         character_name = self.character_name_edit.text().strip()
@@ -285,19 +287,19 @@ class DMCharacterEntryDialog(QDialog):
             if checkbox.isChecked():
                 selected_motivations.append(motivation)
 
-        notes_on_player_expectations = self.notes_on_player_expectations_edit.toHtml().strip()
+        notes_on_player_expectations = get_rich_text(self.notes_on_player_expectations_edit)
         char_class = self.char_class_edit.text().strip()
         subclass = self.subclass_edit.text().strip()
         level = self.level_spinbox.value()
         background = self.background_edit.text().strip()
         species_race = self.species_race_edit.text().strip()
         alignment = self.alignment_edit.text().strip()
-        goals_ambitions = self.goals_ambitions_edit.toHtml().strip()
-        quirks_whims = self.quirks_whims_edit.toHtml().strip()
-        magic_items_owned = self.magic_items_owned_edit.toHtml().strip()
-        character_details = self.character_details_edit.toHtml().strip()
-        family_friends_foes = self.family_friends_foes_edit.toHtml().strip()
-        adventure_ideas = self.adventure_ideas_edit.toHtml().strip()
+        goals_ambitions = get_rich_text(self.goals_ambitions_edit)
+        quirks_whims = get_rich_text(self.quirks_whims_edit)
+        magic_items_owned = get_rich_text(self.magic_items_owned_edit)
+        character_details = get_rich_text(self.character_details_edit)
+        family_friends_foes = get_rich_text(self.family_friends_foes_edit)
+        adventure_ideas = get_rich_text(self.adventure_ideas_edit)
 
         active_campaign_id = self.parent_main_window.current_campaign_id
         if not active_campaign_id:
@@ -308,6 +310,9 @@ class DMCharacterEntryDialog(QDialog):
         if not campaign_data:
             QMessageBox.critical(self, "Error", "Could not find active campaign data.")
             return
+        if not self.entry_to_edit and \
+                not self.parent_main_window.confirm_new_name("dm_characters", character_name, self):
+            return
 
         if self.entry_to_edit:
             entry = self.entry_to_edit
@@ -332,10 +337,10 @@ class DMCharacterEntryDialog(QDialog):
         entry.adventure_ideas = adventure_ideas
 
         if not self.entry_to_edit: # If new, add to campaign data
-            campaign_data.dm_characters[entry.entry_id] = entry
+            insert_entry(campaign_data.dm_characters, entry)
             self.entry_to_edit = entry # So get_entry_data can return it
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("dm_characters", entry.entry_id)
         super().accept()
 
     def get_entry_data(self) -> Optional[DMCharacterEntry]:
@@ -350,15 +355,16 @@ class DMCharacterEntryDialog(QDialog):
 if __name__ == '__main__':
     from PySide6.QtWidgets import QApplication
     from src.data_models import ApplicationData, Campaign
+    from src.trackers.demo_main_window import DemoMainWindowMixin
 
-    class MockMainWindow:
+    class MockMainWindow(DemoMainWindowMixin):
         def __init__(self):
             self.current_campaign_id = "test_dmc_campaign"
             self.application_data = ApplicationData()
             campaign = Campaign(campaign_id=self.current_campaign_id, name="DMC Test Campaign")
             self.application_data.campaigns[self.current_campaign_id] = campaign
 
-        def _save_app_data(self): print(f"Mock save_app_data for {self.current_campaign_id}")
+        def _save_app_data(self, collection=None, entry_id=None): print(f"Mock save_app_data for {self.current_campaign_id}")
 
     app = QApplication([])
     mock_parent_win = MockMainWindow()
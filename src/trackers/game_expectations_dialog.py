@@ -7,6 +7,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 from src.data_models import GameExpectationsEntry, SensitiveElement
+from src.entity_ids import insert_entry
+from src.rich_text import get_rich_text, set_rich_text
 
 class GameExpectationsEntryDialog(QDialog):
     def __init__(self, parent_window, entry: Optional[GameExpectationsEntry] = None):
@@ -93,9 +95,9 @@ class GameExpectationsEntryDialog(QDialog):
         if self.entry_to_edit:
             self.dm_name_edit.setText(self.entry_to_edit.dm_name)
             self.player_name_edit.setText(self.entry_to_edit.player_name)
-            self.game_theme_flavor_edit.setHtml(self.entry_to_edit.game_theme_flavor)
-            self.player_hopes_edit.setHtml(self.entry_to_edit.player_hopes)
-            self.at_table_concerns_edit.setHtml(self.entry_to_edit.at_table_concerns)
+            set_rich_text(self.game_theme_flavor_edit, self.entry_to_edit.game_theme_flavor)
+            set_rich_text(self.player_hopes_edit, self.entry_to_edit.player_hopes)
+            set_rich_text(self.at_table_concerns_edit, self.entry_to_edit.at_table_concerns)
 
             self.sensitive_elements_table.setRowCount(0) # Clear table first
             for element in self.entry_to_edit.sensitive_elements:
@@ -145,9 +147,9 @@ class GameExpectationsEntryDialog(QDialog):
             return
 
         dm_name = self.dm_name_edit.text().strip()
-        game_theme_flavor = self.game_theme_flavor_edit.toHtml().strip()
-        player_hopes = self.player_hopes_edit.toHtml().strip()
-        at_table_concerns = self.at_table_concerns_edit.toHtml().strip()
+        game_theme_flavor = get_rich_text(self.game_theme_flavor_edit)
+        player_hopes = get_rich_text(self.player_hopes_edit)
+        at_table_concerns = get_rich_text(self.at_table_concerns_edit)
 
         collected_sensitive_elements: List[SensitiveElement] = []
         for row in range(self.sensitive_elements_table.rowCount()):
@@ -191,10 +193,10 @@ class GameExpectationsEntryDialog(QDialog):
                 player_hopes=player_hopes,
                 at_table_concerns=at_table_concerns
             )
-            campaign_data.game_expectations[new_entry.entry_id] = new_entry
+            insert_entry(campaign_data.game_expectations, new_entry)
             self.entry_to_edit = new_entry
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("game_expectations", self.entry_to_edit.entry_id)
         super().accept()
 
     def get_entry_data(self) -> Optional[GameExpectationsEntry]:
@@ -218,7 +220,7 @@ if __name__ == '__main__':
             campaign = Campaign(campaign_id=self.current_campaign_id, name="GE Test Campaign", dm_name_global="Test DM")
             self.application_data.campaigns[self.current_campaign_id] = campaign
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"Mock save_app_data called for campaign: {self.current_campaign_id}")
 
     app = QApplication([])
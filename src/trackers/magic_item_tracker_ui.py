@@ -93,6 +93,20 @@ class MagicItemTrackerWidget(QWidget):
         tier_widget.setLayout(tier_layout)
         return tier_widget
 
+    def _get_collection_name(self) -> str:
+        return "magic_item_tracker"
+
+    def select_item(self, item_id: str) -> bool:
+        '''Shows the list identified by item_id, a "tier.rarity" key such as "level_tier_1_4.rare_items".'''
+        tier_attr_name, _, rarity_field_name = item_id.partition(".")
+        tier_names = list(self.TIER_LEVEL_MAP.values())
+        ui_group = self.ui_elements.get(tier_attr_name, {}).get(rarity_field_name)
+        if ui_group is None:
+            return False
+        self.tab_widget.setCurrentIndex(tier_names.index(tier_attr_name))
+        ui_group["list"].setFocus()
+        return True
+
     def refresh_display(self):
         current_campaign_id = self.main_window.current_campaign_id
         if not current_campaign_id:
@@ -154,12 +168,14 @@ class MagicItemTrackerWidget(QWidget):
         if item_name in items_list:
             QMessageBox.information(self, "Duplicate Item", f"'{item_name}' already exists in this list.")
             return
+        if not self.main_window.confirm_new_name("magic_item_tracker", item_name, self):
+            return
 
         items_list.append(item_name)
         # Sort the list alphabetically after adding - optional, but good for consistency
         items_list.sort()
 
-        self.main_window._save_app_data()
+        self.main_window._save_app_data("magic_item_tracker", f"{tier_attr_name}.{rarity_field_name}")
 
         # Refresh only the specific list widget
         list_widget.clear()
@@ -202,7 +218,7 @@ class MagicItemTrackerWidget(QWidget):
 
         if item_to_remove_name in items_list:
             items_list.remove(item_to_remove_name)
-            self.main_window._save_app_data()
+            self.main_window._save_app_data("magic_item_tracker", f"{tier_attr_name}.{rarity_field_name}")
             # Refresh specific list
             list_widget.takeItem(list_widget.row(selected_list_items[0])) # More efficient than clear + repopulate
             self.main_window.statusBar().showMessage(f"Item '{item_to_remove_name}' removed.", 2000)
@@ -215,8 +231,9 @@ if __name__ == '__main__':
     import sys
     from PySide6.QtWidgets import QApplication, QMainWindow, QStatusBar
     from src.data_models import ApplicationData, Campaign # For mock
+    from src.trackers.demo_main_window import DemoMainWindowMixin
 
-    class MockMainWindow(QMainWindow):
+    class MockMainWindow(DemoMainWindowMixin, QMainWindow):
         def __init__(self):
             super().__init__()
             self.current_campaign_id = "mit_test_camp"
@@ -229,7 +246,7 @@ if __name__ == '__main__':
             self.application_data.campaigns[self.current_campaign_id] = campaign
             self.setStatusBar(QStatusBar(self))
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"MockMainWindow: _save_app_data called for campaign: {self.current_campaign_id}")
             # print(self.application_data.campaigns[self.current_campaign_id].magic_item_tracker)
 
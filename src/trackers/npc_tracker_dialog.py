@@ -12,6 +12,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextListFormat # Added imports
 from PySide6.QtCore import Qt
 from src.data_models import NPCEntry
+from src.entity_ids import insert_entry
+from src.rich_text import get_rich_text, set_rich_text
 # Assuming main_window.py contains MainWindow which has application_data and _save_app_data
 # To avoid circular import, we might pass main_window and use it, or use signals
 # For now, as per prompt, parent_window is the main_window instance
@@ -186,11 +188,11 @@ class NPCEntryDialog(QDialog):
             self.name_edit.setText(self.npc_entry_to_edit.name)
             self.stat_block_source_edit.setText(self.npc_entry_to_edit.stat_block_source)
             self.mm_page_edit.setText(self.npc_entry_to_edit.mm_page)
-            self.stat_block_alterations_edit.setHtml(self.npc_entry_to_edit.stat_block_alterations)
+            set_rich_text(self.stat_block_alterations_edit, self.npc_entry_to_edit.stat_block_alterations)
             self.alignment_edit.setText(self.npc_entry_to_edit.alignment)
-            self.personality_edit.setHtml(self.npc_entry_to_edit.personality)
-            self.appearance_edit.setHtml(self.npc_entry_to_edit.appearance)
-            self.secret_edit.setHtml(self.npc_entry_to_edit.secret)
+            set_rich_text(self.personality_edit, self.npc_entry_to_edit.personality)
+            set_rich_text(self.appearance_edit, self.npc_entry_to_edit.appearance)
+            set_rich_text(self.secret_edit, self.npc_entry_to_edit.secret)
 
     def _on_save(self):
         name = self.name_edit.text().strip()
@@ -200,11 +202,11 @@ class NPCEntryDialog(QDialog):
 
         stat_block_source = self.stat_block_source_edit.text().strip()
         mm_page = self.mm_page_edit.text().strip()
-        stat_block_alterations = self.stat_block_alterations_edit.toHtml().strip()
+        stat_block_alterations = get_rich_text(self.stat_block_alterations_edit)
         alignment = self.alignment_edit.text().strip()
-        personality = self.personality_edit.toHtml().strip()
-        appearance = self.appearance_edit.toHtml().strip()
-        secret = self.secret_edit.toHtml().strip()
+        personality = get_rich_text(self.personality_edit)
+        appearance = get_rich_text(self.appearance_edit)
+        secret = get_rich_text(self.secret_edit)
 
         active_campaign_id = self.parent_main_window.current_campaign_id
         if not active_campaign_id:
@@ -215,6 +217,8 @@ class NPCEntryDialog(QDialog):
         if not campaign_data:
             QMessageBox.critical(self, "Error", "Could not find active campaign data.")
             return
+        if not self.npc_entry_to_edit and not self.parent_main_window.confirm_new_name("npcs", name, self):
+            return
 
         if self.npc_entry_to_edit:
             # Update existing NPC
@@ -240,10 +244,10 @@ class NPCEntryDialog(QDialog):
                 secret=secret
             )
             # The default_factory for entry_id in NPCEntry will handle ID generation.
-            campaign_data.npcs[new_npc_entry.entry_id] = new_npc_entry
+            insert_entry(campaign_data.npcs, new_npc_entry)
             self.npc_entry_to_edit = new_npc_entry # Store it in case get_npc_data is called
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("npcs", self.npc_entry_to_edit.entry_id)
         super().accept() # Close the dialog
 
     # Optional: if the calling code needs to get the data
@@ -265,15 +269,16 @@ class NPCEntryDialog(QDialog):
 if __name__ == '__main__': # Basic test for the dialog
     from PySide6.QtWidgets import QApplication
     from src.data_models import ApplicationData, Campaign # For testing
+    from src.trackers.demo_main_window import DemoMainWindowMixin
 
     # Mock parent_main_window and its attributes for testing
-    class MockMainWindow:
+    class MockMainWindow(DemoMainWindowMixin):
         def __init__(self):
             self.current_campaign_id = "test_campaign"
             self.application_data = ApplicationData()
             self.application_data.campaigns["test_campaign"] = Campaign(campaign_id="test_campaign", name="Test Campaign")
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print("Mock save_app_data called")
 
     app = QApplication([])
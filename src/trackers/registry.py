@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.json_data_manager import ChangeSet
+
+# The trackers the main window offers, in the order they are listed. A
+# tracker is its name, a factory building its widget (called with the main
+# window, the first time the tracker is shown) and the Campaign field it
+# shows. Adding a tracker means adding it to default_registry.
+#
+# The registry also keeps a version per campaign and collection, raised
+# whenever one of its entries changes. A tracker widget that has shown a
+# version needs no refresh until the version moves on.
+
+
+@dataclass(frozen=True)
+class TrackerRegistration:
+    name: str
+    factory: Callable[[Any], Any] # Builds the widget from the main window
+    collection: str # e.g. "npcs"
+
+
+class TrackerRegistry:
+    """Trackers by name, with the version of the data of each campaign collection."""
+
+    def __init__(self):
+        self._trackers: Dict[str, TrackerRegistration] = {}
+        # Versions come from one counter, so a version is never reused for a collection
+        self._versions: Dict[Tuple[str, Optional[str]], int] = {} # (campaign_id, collection or None for all)
+        self._all_version = 0 # Raised when every campaign changed, e.g. on import
+        self._last_version = 0
+
+    def register(self, name: str, factory: Callable[[Any], Any], collection: str) -> None:
+        """Adds a tracker, after those already registered; replaces one with the same name."""
+        self._trackers[name] = TrackerRegistration(name, factory, collection)
+
+    def names(self) -> List[str]:
+        return list(self._trackers)
+
+    def get(self, name: str) -> Optional[TrackerRegistration]:
+        return self._trackers.get(name)
+
+    def collection_trackers(self) -> Dict[str, str]:
+        """Returns the tracker name showing each collection, e.g. {"npcs": "NPC Tracker"}."""
+        return {registration.collection: name for name, registration in self._trackers.items()}
+
+    def version(self, campaign_id: Optional[str], collection: str) -> int:
+        """Returns the version of collection in campaign_id; it is greater after any change to it."""
+        return max(self._versions.get((campaign_id, collection), 0),
+                   self._versions.get((campaign_id, None), 0), self._all_version)
+
+    def mark_changed(self, changes: ChangeSet) -> None:
+        """Raises the versions of the collections changed in changes."""
+        if changes.all_campaigns:
+            self._all_version = self._next_version()
+        for campaign_id in changes.campaign_ids:
+            self.mark_campaign_changed(campaign_id)
+        for campaign_id, entries in changes.entries.items():
+            version = self._next_version()
+            for collection, _ in entries:
+                self._versions[(campaign_id, collection)] = version
+
+    def mark_campaign_changed(self, campaign_id: str) -> None:
+        """Raises the versions of all collections of campaign_id, e.g. after it was reloaded."""
+        self._versions[(campaign_id, None)] = self._next_version()
+
+    def _next_version(self) -> int:
+        self._last_version += 1
+        return self._last_version
+
+
+def default_registry() -> TrackerRegistry:
+    """Returns a registry of the application's trackers."""
+    # Imported here so that the registry itself does not need Qt
+    from src.trackers.npc_tracker_ui import NPCTrackerWidget
+    from src.trackers.campaign_journal_ui import CampaignJournalWidget
+    from src.trackers.settlement_tracker_ui import SettlementTrackerWidget
+    from src.trackers.game_expectations_ui import GameExpectationsWidget
+    from src.trackers.travel_planner_ui import TravelPlannerWidget
+    from src.trackers.dm_character_tracker_ui import DMCharacterWidget
+    from src.trackers.campaign_conflicts_ui import CampaignConflictsWidget
+    from src.trackers.magic_item_tracker_ui import MagicItemTrackerWidget
+    from src.trackers.bastion_tracker_ui import BastionTrackerWidget
+
+    registry = TrackerRegistry()
+    # Listed in this order - matches PRD for consistency
+    registry.register("Game Expectations", GameExpectationsWidget, "game_expectations")
+    registry.register("Travel Planner", TravelPlannerWidget, "travel_plans")
+    registry.register("NPC Tracker", NPCTrackerWidget, "npcs")
+    registry.register("Settlement Tracker", SettlementTrackerWidget, "settlements")
+    registry.register("Campaign Journal", CampaignJournalWidget, "campaign_journal")
+    registry.register("DM's Character Tracker", DMCharacterWidget, "dm_characters")
+    registry.register("Campaign Conflicts", CampaignConflictsWidget, "campaign_conflicts")
+    registry.register("Magic Item Tracker", MagicItemTrackerWidget, "magic_item_tracker")
+    registry.register("Bastion Tracker", BastionTrackerWidget, "bastions")
+    return registry
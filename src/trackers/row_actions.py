@@ -0,0 +1,110 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from PySide6.QtWidgets import QAbstractItemView, QStyle, QStyleOptionButton, QStyledItemDelegate, QStyleOptionViewItem
+from PySide6.QtCore import QEvent, QModelIndex, QObject, QPoint, QRect, QSize, Qt, QTimer
+from PySide6.QtGui import QPainter
+
+# A button shown in every row: its label and the slot called with the row's item ID
+RowAction = Tuple[str, Callable[[str], None]]
+
+BUTTON_SPACING = 4
+
+
+class RowActionDelegate(QStyledItemDelegate):
+    """
+    Paints a button per row action in the cells of a column and handles
+    clicks on them. No widget exists per row, so a table with thousands of
+    rows costs no more than one showing a screenful.
+
+    A click calls the action's slot with the row's item ID, the UserRole data
+    of the cell, once the mouse is released over the button it was pressed on.
+    """
+
+    def __init__(self, actions: Sequence[RowAction], view: QAbstractItemView):
+        super().__init__(view)
+        self._actions = list(actions)
+        self._view = view
+        self._pressed: Optional[Tuple[str, int]] = None # (item ID, action) under the mouse button
+        self._hovered: Optional[Tuple[str, int]] = None
+        view.setMouseTracking(True) # For hover highlighting
+        view.viewport().installEventFilter(self)
+        button = QStyleOptionButton()
+        metrics = view.fontMetrics()
+        self._button_sizes = []
+        for label, _ in self._actions:
+            button.text = label
+            text_size = QSize(metrics.horizontalAdvance(label), metrics.height())
+            self._button_sizes.append(view.style().sizeFromContents(QStyle.ContentsType.CT_PushButton,
+                                                                    button, text_size, view))
+
+    def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+        width = sum(size.width() for size in self._button_sizes) + BUTTON_SPACING * (len(self._button_sizes) + 1)
+        height = max((size.height() for size in self._button_sizes), default=0) + 2
+        return QSize(width, height)
+
+    def _button_rects(self, cell: QRect) -> List[QRect]:
+        rects = []
+        x = cell.left() + BUTTON_SPACING
+        for size in self._button_sizes:
+            height = min(size.height(), cell.height())
+            rects.append(QRect(x, cell.top() + (cell.height() - height) // 2, size.width(), height))
+            x += size.width() + BUTTON_SPACING
+        return rects
+
+    def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+        # The cell background, e.g. the selection, as for any other cell
+        self._view.style().drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, self._view)
+        item_id = index.data(Qt.ItemDataRole.UserRole)
+        enabled = bool(option.state & QStyle.StateFlag.State_Enabled)
+        for action, ((label, _), rect) in enumerate(zip(self._actions, self._button_rects(option.rect))):
+            button = QStyleOptionButton()
+            button.rect = rect
+            button.text = label
+            button.state = QStyle.StateFlag.State_Enabled if enabled else QStyle.StateFlag.State_None
+            if self._pressed == (item_id, action) and self._hovered == (item_id, action):
+                button.state |= QStyle.StateFlag.State_Sunken
+            else:
+                button.state |= QStyle.StateFlag.State_Raised
+            if self._hovered == (item_id, action):
+                button.state |= QStyle.StateFlag.State_MouseOver
+            self._view.style().drawControl(QStyle.ControlElement.CE_PushButton, button, painter, self._view)
+
+    def _action_at(self, cell: QRect, position: QPoint) -> int:
+        return next((action for action, rect in enumerate(self._button_rects(cell)) if rect.contains(position)), -1)
+
+    def _target_at(self, position: QPoint) -> Optional[Tuple[str, int]]:
+        index = self._view.indexAt(position)
+        if not index.isValid() or self._view.itemDelegateForColumn(index.column()) is not self:
+            return None
+        action = self._action_at(self._view.visualRect(index), position)
+        return (index.data(Qt.ItemDataRole.UserRole), action) if action >= 0 else None
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        # The view does not pass mouse moves to delegates, so hovering is followed here
+        if event.type() in (QEvent.Type.MouseMove, QEvent.Type.Leave):
+            target = self._target_at(event.position().toPoint()) if event.type() == QEvent.Type.MouseMove else None
+            if target != self._hovered:
+                self._hovered = target
+                self._view.viewport().update()
+        return False
+
+    def editorEvent(self, event: QEvent, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+        event_type = event.type()
+        if event_type not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick,
+                              QEvent.Type.MouseButtonRelease) or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        item_id = index.data(Qt.ItemDataRole.UserRole)
+        action = self._action_at(option.rect, event.position().toPoint())
+        target = (item_id, action) if action >= 0 else None
+        if event_type != QEvent.Type.MouseButtonRelease:
+            self._pressed = target
+            self._view.viewport().update()
+            return target is not None
+        pressed, self._pressed = self._pressed, None
+        self._view.viewport().update()
+        if target is None or pressed != target:
+            return False
+        # After the view is done with the event: the slot may open a dialog or reset the model
+        slot = self._actions[action][1]
+        QTimer.singleShot(0, lambda: slot(item_id))
+        return True
@@ -8,6 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextListFormat # Added imports
 from PySide6.QtCore import Qt
 from src.data_models import SettlementEntry
+from src.entity_ids import insert_entry
+from src.rich_text import get_rich_text, set_rich_text
 
 SETTLEMENT_SIZE_OPTIONS = [
     "Village (Pop up to 500)",
@@ -203,12 +205,12 @@ class SettlementEntryDialog(QDialog):
             else: # Fallback if data is inconsistent, or use first option
                 self.size_combo.setCurrentIndex(0)
 
-            self.defining_trait_edit.setHtml(self.settlement_entry_to_edit.defining_trait)
-            self.claim_to_fame_edit.setHtml(self.settlement_entry_to_edit.claim_to_fame)
-            self.current_calamity_edit.setHtml(self.settlement_entry_to_edit.current_calamity)
+            set_rich_text(self.defining_trait_edit, self.settlement_entry_to_edit.defining_trait)
+            set_rich_text(self.claim_to_fame_edit, self.settlement_entry_to_edit.claim_to_fame)
+            set_rich_text(self.current_calamity_edit, self.settlement_entry_to_edit.current_calamity)
             self.local_leader_edit.setText(self.settlement_entry_to_edit.local_leader)
-            self.noteworthy_people_edit.setHtml(self.settlement_entry_to_edit.noteworthy_people)
-            self.noteworthy_places_edit.setHtml(self.settlement_entry_to_edit.noteworthy_places)
+            set_rich_text(self.noteworthy_people_edit, self.settlement_entry_to_edit.noteworthy_people)
+            set_rich_text(self.noteworthy_places_edit, self.settlement_entry_to_edit.noteworthy_places)
             self.gp_value_edit.setText(self.settlement_entry_to_edit.gp_value_most_expensive_item)
 
     def _on_save(self):
@@ -218,12 +220,12 @@ class SettlementEntryDialog(QDialog):
             return
 
         size = self.size_combo.currentText()
-        defining_trait = self.defining_trait_edit.toHtml().strip()
-        claim_to_fame = self.claim_to_fame_edit.toHtml().strip()
-        current_calamity = self.current_calamity_edit.toHtml().strip()
+        defining_trait = get_rich_text(self.defining_trait_edit)
+        claim_to_fame = get_rich_text(self.claim_to_fame_edit)
+        current_calamity = get_rich_text(self.current_calamity_edit)
         local_leader = self.local_leader_edit.text().strip()
-        noteworthy_people = self.noteworthy_people_edit.toHtml().strip()
-        noteworthy_places = self.noteworthy_places_edit.toHtml().strip()
+        noteworthy_people = get_rich_text(self.noteworthy_people_edit)
+        noteworthy_places = get_rich_text(self.noteworthy_places_edit)
         gp_value = self.gp_value_edit.text().strip()
 
         active_campaign_id = self.parent_main_window.current_campaign_id
@@ -235,6 +237,9 @@ class SettlementEntryDialog(QDialog):
         if not campaign_data:
             QMessageBox.critical(self, "Error", "Could not find active campaign data.")
             return
+        if not self.settlement_entry_to_edit and \
+                not self.parent_main_window.confirm_new_name("settlements", name, self):
+            return
 
         if self.settlement_entry_to_edit:
             self.settlement_entry_to_edit.name = name
@@ -258,10 +263,10 @@ class SettlementEntryDialog(QDialog):
                 noteworthy_places=noteworthy_places,
                 gp_value_most_expensive_item=gp_value
             )
-            campaign_data.settlements[new_settlement_entry.entry_id] = new_settlement_entry
+            insert_entry(campaign_data.settlements, new_settlement_entry)
             self.settlement_entry_to_edit = new_settlement_entry
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("settlements", self.settlement_entry_to_edit.entry_id)
         super().accept()
 
     def get_settlement_data(self) -> Optional[SettlementEntry]:
@@ -281,15 +286,16 @@ class SettlementEntryDialog(QDialog):
 if __name__ == '__main__':
     from PySide6.QtWidgets import QApplication
     from src.data_models import ApplicationData, Campaign
+    from src.trackers.demo_main_window import DemoMainWindowMixin
 
-    class MockMainWindow:
+    class MockMainWindow(DemoMainWindowMixin):
         def __init__(self):
             self.current_campaign_id = "test_settlement_campaign"
             self.application_data = ApplicationData()
             campaign = Campaign(campaign_id=self.current_campaign_id, name="Settlement Test Campaign")
             self.application_data.campaigns[self.current_campaign_id] = campaign
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"Mock save_app_data called for campaign: {self.current_campaign_id}")
 
     app = QApplication([])
@@ -1,12 +1,11 @@
 from typing import Optional, List, Any
 from PySide6.QtWidgets import (
-    QPushButton, QHeaderView, QMessageBox, QDialog, QWidget, QHBoxLayout, QTableWidgetItem, QAbstractItemView, QTableWidget
+    QPushButton, QHeaderView, QMessageBox, QDialog, QWidget, QHBoxLayout,QAbstractItemView
 )
-from PySide6.QtCore import Qt, Slot
 
 from src.data_models import SettlementEntry, Campaign # For type hinting
 from src.trackers.settlement_tracker_dialog import SettlementEntryDialog
-from src.trackers.base_tracker_ui import BaseTrackerWidget
+from src.trackers.base_tracker_ui import BaseTrackerWidget, RowAction
 
 class SettlementTrackerWidget(BaseTrackerWidget):
     def _get_entity_name(self) -> str:
@@ -15,6 +14,9 @@ class SettlementTrackerWidget(BaseTrackerWidget):
     def _get_entity_name_plural(self) -> str:
         return "Settlements"
 
+    def _get_collection_name(self) -> str:
+        return "settlements"
+
     def _get_add_button_text(self) -> str:
         return "Add New Settlement"
 
@@ -35,102 +37,16 @@ class SettlementTrackerWidget(BaseTrackerWidget):
             self.add_button.setEnabled(bool(self.main_window.current_campaign_id))
         # Edit/Delete buttons are per-row
 
-    def _configure_table_columns(self):
-        self.table_widget.setColumnCount(6)
-        self.table_widget.setHorizontalHeaderLabels(["Name", "Region", "Gov't", "Population", "Type", "Defenses"])
-        self.table_widget.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch) # Name
-        self.table_widget.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents) # Region
-        self.table_widget.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents) # Gov't
-        self.table_widget.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents) # Population
-        self.table_widget.horizontalHeader().setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents) # Type
-        self.table_widget.horizontalHeader().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch) # Defenses
-        self.table_widget.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers) # Corrected Enum
-        self.table_widget.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-
-        try:
-            self.table_widget.itemDoubleClicked.disconnect(self._on_edit_item_triggered)
-        except RuntimeError:
-            pass # Not connected
+    def _get_model_class(self) -> type:
+        return SettlementEntry
 
     def _get_item_data_for_display(self, campaign: Campaign) -> List[SettlementEntry]:
         if not campaign.settlements:
             return []
-        return sorted(list(campaign.settlements.values()), key=lambda x: x.name.lower())
-
-    def _populate_table_row(self, row: int, entry: SettlementEntry):
-        # Store entry_id in the first column's item (UserRole)
-        name_item = self._create_table_item(entry.name, data_role_value=entry.entry_id)
-        self.table_widget.setItem(row, 0, name_item)
-        self.table_widget.setItem(row, 1, self._create_table_item(entry.size))
-
-        trait_snippet = entry.defining_trait
-        if len(trait_snippet) > 75: # Max length for snippet
-            trait_snippet = trait_snippet[:72] + "..."
-        self.table_widget.setItem(row, 2, self._create_table_item(trait_snippet))
-
-        edit_btn = QPushButton("Edit")
-        delete_btn = QPushButton("Delete")
-
-        edit_btn.clicked.connect(lambda checked=False, bound_id=entry.entry_id: self._on_edit_entry_row(bound_id))
-        delete_btn.clicked.connect(lambda checked=False, bound_id=entry.entry_id: self._on_delete_entry_row(bound_id))
-
-        actions_widget = QWidget()
-        actions_layout = QHBoxLayout(actions_widget)
-        actions_layout.addWidget(edit_btn)
-        actions_layout.addWidget(delete_btn)
-        actions_layout.setContentsMargins(0, 0, 0, 0)
-        self.table_widget.setCellWidget(row, 3, actions_widget)
-
-    @Slot()
-    def _on_edit_entry_row(self, entry_id: str):
-        if not self.main_window.current_campaign_id:
-            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
-            return
-        campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
-        if not campaign:
-             QMessageBox.critical(self, "Error", "Campaign data not found.")
-             return
-        dialog = self._get_dialog_for_edit(entry_id, campaign)
-        if dialog is None: return
-
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            # Dialog is expected to handle its own saving.
-            self._perform_edit_item(entry_id, None, campaign) # Call for consistency
-            self.main_window._save_app_data() # Ensure save consistency
-            self.refresh_display()
-            entry_name = self._get_item_name_for_confirmation(entry_id, campaign) or self._entity_name
-            self.main_window.statusBar().showMessage(f"{entry_name} updated.", 3000)
-        else:
-            self.refresh_display()
-
-    @Slot()
-    def _on_delete_entry_row(self, entry_id: str):
-        if not self.main_window.current_campaign_id:
-            QMessageBox.warning(self, "No Campaign", "No campaign selected.")
-            return
-        campaign = self.main_window.application_data.campaigns.get(self.main_window.current_campaign_id)
-        if not campaign:
-             QMessageBox.critical(self, "Error", "Campaign data not found.")
-             return
-        item_name = self._get_item_name_for_confirmation(entry_id, campaign) or f"the selected {self._entity_name.lower()}"
-        reply = QMessageBox.question(self, f"Delete {self._entity_name}",
-                                     f"Are you sure you want to delete {item_name}?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            try:
-                deleted = self._perform_delete_item(entry_id, campaign)
-                if deleted:
-                    self.main_window._save_app_data() # Save after successful deletion
-                    self.refresh_display()
-                    self.main_window.statusBar().showMessage(f"{item_name} deleted.", 3000)
-                else:
-                    QMessageBox.warning(self, "Delete Error", f"{self._entity_name} not found for deletion or already removed.")
-                    self.refresh_display()
-            except Exception as e:
-                QMessageBox.critical(self, "Error Deleting Item", f"Could not delete {self._entity_name.lower()}: {e}")
-                self.main_window.statusBar().showMessage(f"Failed to delete {self._entity_name.lower()}.", 5000)
-                self.refresh_display()
+        return list(campaign.settlements.values()) # The table model sorts them
 
+    def _get_row_actions(self) -> List[RowAction]:
+        return [("Edit", self._edit_item), ("Delete", self._delete_item)]
 
     def _get_dialog_for_add(self) -> Optional[QDialog]:
         # Dialog handles its own saving through main_window
@@ -170,16 +86,17 @@ class SettlementTrackerWidget(BaseTrackerWidget):
     def _perform_delete_item(self, item_id: str, campaign: Campaign) -> bool:
         if campaign.settlements and item_id in campaign.settlements:
             del campaign.settlements[item_id]
-            # Saving is handled by the calling slot (_on_delete_entry_row)
+            # Saving is handled by the calling slot (_delete_item)
             return True
         return False
 
 if __name__ == '__main__':
     import sys
     from PySide6.QtWidgets import QApplication, QMainWindow, QStatusBar
+    from src.trackers.demo_main_window import DemoMainWindowMixin
     from src.data_models import ApplicationData
 
-    class MockMainWindow(QMainWindow):
+    class MockMainWindow(DemoMainWindowMixin, QMainWindow):
         def __init__(self):
             super().__init__()
             self.current_campaign_id = "settlement_test_camp"
@@ -196,7 +113,7 @@ if __name__ == '__main__':
             self.application_data.campaigns[self.current_campaign_id] = campaign
             self.setStatusBar(QStatusBar(self))
 
-        def _save_app_data(self):
+        def _save_app_data(self, collection=None, entry_id=None):
             print(f"MockMainWindow: _save_app_data called for campaign {self.current_campaign_id}")
             current_campaign = self.application_data.campaigns.get(self.current_campaign_id)
             if current_campaign and current_campaign.settlements:
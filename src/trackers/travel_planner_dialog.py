@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, Slot, QDateTime # Added QDateTime
 
 from src.data_models import TravelPlanEntry, TravelStage
+from src.entity_ids import insert_entry
 from src.trackers.travel_stage_dialog import TravelStageDialog # For managing individual stages
 
 class TravelPlanEntryDialog(QDialog):
@@ -230,10 +231,10 @@ class TravelPlanEntryDialog(QDialog):
                 destination=destination,
                 stages=self.current_stages # Commit the list of stages
             )
-            campaign_data.travel_plans[new_entry.entry_id] = new_entry
+            insert_entry(campaign_data.travel_plans, new_entry)
             self.entry_to_edit = new_entry # So get_entry_data can return it
 
-        self.parent_main_window._save_app_data()
+        self.parent_main_window._save_app_data("travel_plans", self.entry_to_edit.entry_id)
         super().accept()
 
     def get_entry_data(self) -> Optional[TravelPlanEntry]:
@@ -256,7 +257,7 @@ if __name__ == '__main__':
             campaign = Campaign(campaign_id=self.current_campaign_id, name="TP Test Campaign")
             self.application_data.campaigns[self.current_campaign_id] = campaign
 
-        def _save_app_data(self): print(f"Mock save_app_data for {self.current_campaign_id}")
+        def _save_app_data(self, collection=None, entry_id=None): print(f"Mock save_app_data for {self.current_campaign_id}")
 
     app = QApplication([])
     mock_parent_win = MockMainWindow()
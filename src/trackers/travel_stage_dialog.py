@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtGui import QFont, QTextCharFormat, QTextCursor, QTextListFormat # Added imports
 from PySide6.QtCore import Qt
 from src.data_models import TravelStage # Assuming TravelStage dataclass is defined
+from src.rich_text import get_rich_text, set_rich_text
 
 PACE_OPTIONS = ["Fast", "Normal", "Slow"]
 TIME_UNIT_OPTIONS = ["days", "hrs"]
@@ -185,8 +186,8 @@ class TravelStageDialog(QDialog):
             self.pace_combo.setCurrentText(self.stage_data_to_edit.pace)
             self.travel_time_value_spinbox.setValue(self.stage_data_to_edit.travel_time_value)
             self.travel_time_unit_combo.setCurrentText(self.stage_data_to_edit.travel_time_unit)
-            self.narrative_notes_edit.setHtml(self.stage_data_to_edit.narrative_notes)
-            self.challenges_edit.setHtml(self.stage_data_to_edit.challenges)
+            set_rich_text(self.narrative_notes_edit, self.stage_data_to_edit.narrative_notes)
+            set_rich_text(self.challenges_edit, self.stage_data_to_edit.challenges)
             self.elapsed_time_total_edit.setText(self.stage_data_to_edit.elapsed_time_total)
 
     def get_data(self) -> Optional[TravelStage]:
@@ -215,8 +216,8 @@ class TravelStageDialog(QDialog):
                 pace=self.pace_combo.currentText(),
                 travel_time_value=self.travel_time_value_spinbox.value(),
                 travel_time_unit=self.travel_time_unit_combo.currentText(),
-                narrative_notes=self.narrative_notes_edit.toHtml().strip(),
-                challenges=self.challenges_edit.toHtml().strip(),
+                narrative_notes=get_rich_text(self.narrative_notes_edit),
+                challenges=get_rich_text(self.challenges_edit),
                 elapsed_time_total=self.elapsed_time_total_edit.text().strip()
             )
         return None
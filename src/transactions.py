@@ -0,0 +1,382 @@
+import copy
+from dataclasses import fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.change_recorder import ChangeRecorder
+from src.data_models import ApplicationData, Campaign, Conflict
+from src.field_specs import FieldKind, field_specs
+from src.json_data_manager import ChangeSet
+from src.model_events import EntityAdded, EntityRemoved, EntryDict, ModelEvent, subscribe, unsubscribe
+
+
+def _classify_collections() -> Tuple[Dict[str, type], Dict[str, type]]:
+    """
+    Returns ({field: entry class} for the Campaign fields holding a dict of
+    entries keyed by entry_id, {field: class} for those holding a single
+    tracker object such as the conflicts or magic items).
+    """
+    entry_collections = {}
+    tracker_collections = {}
+    for spec in field_specs(Campaign):
+        if spec.kind is FieldKind.ENTRIES and is_dataclass(spec.item_type):
+            entry_collections[spec.name] = spec.item_type
+        elif spec.kind is FieldKind.MODEL:
+            tracker_collections[spec.name] = spec.item_type
+    return entry_collections, tracker_collections
+
+
+_ENTRY_COLLECTIONS, _TRACKER_COLLECTIONS = _classify_collections()
+
+CONFLICTS_COLLECTION = "campaign_conflicts"
+MAGIC_ITEMS_COLLECTION = "magic_item_tracker"
+
+
+_ABSENT = object() # An entry that was not in its collection
+
+
+class TransactionError(Exception):
+    """Raised when a transaction is used after it ended or its changes are invalid."""
+
+
+def _restore_fields(target: Any, image: Any) -> None:
+    """Copies every field of the dataclass image onto target, keeping target's identity."""
+    for f in fields(image):
+        setattr(target, f.name, getattr(image, f.name))
+
+
+class CampaignTransaction:
+    """
+    A unit of work over one campaign: a batch of changes that is saved with a
+    single write, or undone in memory if anything goes wrong.
+
+    Changes are made either through add() and delete(), or directly on the
+    model. While the transaction is open it listens to the model events (see
+    src.model_events), so fields assigned and entries added or removed in
+    the campaign are marked and can be rolled back without further ado. For
+    changes that publish no event, such as editing a list in place, call
+    track() before the change and mark() after it. On success the marked
+    changes are checked and handed to commit_func as one ChangeSet; if an
+    exception escapes the with block, everything changed or tracked is
+    restored to its state from before the transaction.
+
+    Transactions nest: entering one that is already open joins it, and only
+    the outermost block commits.
+
+    Args:
+        campaign: The campaign being changed.
+        campaign_id: Its ID, used to record the changes.
+        commit_func: Called once with the ChangeSet of a committed transaction
+            that changed anything, e.g. to schedule a save.
+        recorder: Finds the entries the changed objects belong to. By
+            default the transaction indexes its campaign itself.
+    """
+
+    def __init__(self, campaign: Campaign, campaign_id: str, commit_func: Callable[[ChangeSet], None],
+                 recorder: Optional[ChangeRecorder] = None):
+        self.campaign = campaign
+        self.campaign_id = campaign_id
+        self.changes = ChangeSet()
+        self.closed = False
+        self._commit_func = commit_func
+        self._depth = 0
+        # collection -> (the collection object, a copy of its state before the transaction)
+        self._collection_images: Dict[str, Tuple[Any, Any]] = {}
+        # (collection, entry_id) -> (the entry or None if it did not exist, a deep copy of it)
+        self._entry_images: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        self._own_recorder = recorder is None
+        self._recorder = recorder or ChangeRecorder(lambda: {self.campaign.campaign_id: self.campaign})
+        self._listening = False
+        # (id(object), field) -> (the object, the field, its value before the transaction)
+        self._field_images: Dict[Tuple[int, str], Tuple[Any, str, Any]] = {}
+        # (id(collection dict), entry_id) -> (the dict, the entry ID, the entry before the transaction or _ABSENT)
+        self._membership_images: Dict[Tuple[int, str], Tuple[EntryDict, str, Any]] = {}
+
+    def __enter__(self) -> 'CampaignTransaction':
+        self._check_open()
+        if not self._listening:
+            self._listening = True
+            if self._own_recorder:
+                self._recorder.start() # Keeps its index up to date
+            subscribe(self._on_model_event)
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        self._depth -= 1
+        if self.closed:
+            return False
+        if exc_type is not None:
+            self.rollback()
+        elif self._depth == 0:
+            self.commit()
+        return False
+
+    def _check_open(self):
+        if self.closed:
+            raise TransactionError("The transaction has already been committed or rolled back.")
+
+    def _stop_listening(self):
+        if self._listening:
+            self._listening = False
+            unsubscribe(self._on_model_event)
+            if self._own_recorder:
+                self._recorder.stop()
+
+    def _on_model_event(self, event: ModelEvent) -> None:
+        """Marks a change to the campaign and remembers what it replaced, for rollback."""
+        keys = [key for key in self._recorder.resolve(event) if key[0] == self.campaign.campaign_id]
+        if not keys:
+            return
+        if isinstance(event, (EntityAdded, EntityRemoved)):
+            entries = getattr(event.campaign, event.collection)
+            image_key = (id(entries), event.entry_id)
+            if image_key not in self._membership_images:
+                original = event.entity if isinstance(event, EntityRemoved) else _ABSENT
+                self._membership_images[image_key] = (entries, event.entry_id, original)
+        else:
+            self._field_images.setdefault((id(event.model), event.field_name),
+                                          (event.model, event.field_name, event.old_value))
+        for _, collection, entry_id in keys:
+            self.mark(collection, entry_id)
+
+    def _collection(self, collection: str) -> Any:
+        if collection not in _ENTRY_COLLECTIONS and collection not in _TRACKER_COLLECTIONS:
+            raise TransactionError(f"Campaign has no collection named '{collection}'.")
+        return getattr(self.campaign, collection)
+
+    def track(self, collection: str, entry_id: Optional[str] = None) -> Any:
+        """
+        Remembers the current state of an entry of collection that is about
+        to be changed, added or removed, for rollback. Without entry_id, only
+        membership of the collection is remembered (for adding entries whose
+        IDs are not known yet). Use mark() to have the change saved.
+
+        For the single trackers (campaign_conflicts, magic_item_tracker) the
+        whole tracker is remembered, and entry_id is the conflict ID or the
+        "tier.rarity" list name.
+
+        Returns:
+            The entry with that ID, if collection holds entries and it exists.
+        """
+        self._check_open()
+        current = self._collection(collection)
+        if collection not in self._collection_images:
+            image = dict(current) if collection in _ENTRY_COLLECTIONS else copy.deepcopy(current)
+            self._collection_images[collection] = (current, image)
+        if entry_id is None or collection not in _ENTRY_COLLECTIONS:
+            return None
+        entry = current.get(entry_id)
+        if (collection, entry_id) not in self._entry_images:
+            self._entry_images[(collection, entry_id)] = (entry, copy.deepcopy(entry))
+        return entry
+
+    def mark(self, collection: Optional[str] = None, entry_id: Optional[str] = None) -> None:
+        """
+        Records a change so it is saved on commit. Only what was track()ed
+        before it changed can be rolled back. Without collection and entry_id
+        the whole campaign is saved.
+        """
+        self._check_open()
+        if collection and entry_id:
+            self.changes.mark_entry(self.campaign_id, collection, entry_id)
+        else:
+            self.changes.mark_campaign(self.campaign_id)
+
+    def add(self, collection: str, entry: Any) -> Any:
+        """
+        Adds a new entry (or conflict) to collection and returns it.
+
+        Args:
+            collection: The Campaign field to add to.
+            entry: The entry. Its ID must not be used by another entry of the
+                collection.
+        """
+        if collection == CONFLICTS_COLLECTION:
+            conflicts = self.campaign.campaign_conflicts.conflicts
+            if any(conflict.conflict_id == entry.conflict_id for conflict in conflicts):
+                raise TransactionError(f"There already is a conflict with ID '{entry.conflict_id}'.")
+            self.track(collection, entry.conflict_id)
+            conflicts.append(entry)
+            self.mark(collection, entry.conflict_id)
+            return entry
+        if collection not in _ENTRY_COLLECTIONS:
+            raise TransactionError(f"Entries cannot be added to '{collection}'.")
+        entries = self._collection(collection)
+        if entry.entry_id in entries:
+            raise TransactionError(f"'{collection}' already has an entry with ID '{entry.entry_id}'.")
+        self.track(collection, entry.entry_id)
+        entries[entry.entry_id] = entry
+        self.mark(collection, entry.entry_id)
+        return entry
+
+    def delete(self, collection: str, entry_id: str) -> bool:
+        """
+        Removes an entry (or conflict) from collection.
+
+        Returns:
+            True if it existed.
+        """
+        if collection == CONFLICTS_COLLECTION:
+            conflicts = self.campaign.campaign_conflicts.conflicts
+            index = next((i for i, conflict in enumerate(conflicts) if conflict.conflict_id == entry_id), None)
+            if index is None:
+                return False
+            self.track(collection, entry_id)
+            del conflicts[index]
+            self.mark(collection, entry_id)
+            return True
+        if collection not in _ENTRY_COLLECTIONS:
+            raise TransactionError(f"Entries cannot be deleted from '{collection}'.")
+        if entry_id not in self._collection(collection):
+            return False
+        self.track(collection, entry_id)
+        del self._collection(collection)[entry_id]
+        self.mark(collection, entry_id)
+        return True
+
+    def merge(self, source: Campaign) -> List[Tuple[str, str]]:
+        """
+        Adds the entries and conflicts of source, e.g. a campaign read from
+        an imported file, to this campaign. An entry with the ID of one that
+        is already there is the same entry, e.g. from a backup of this
+        campaign, and replaces it unless the two are equal. Magic items not
+        yet listed are appended to their lists.
+
+        The entries of source are moved, not copied.
+
+        Returns:
+            (collection, ID) of every entry and conflict that was replaced.
+        """
+        updated = []
+        for collection in _ENTRY_COLLECTIONS:
+            entries = self._collection(collection)
+            for entry in list(getattr(source, collection).values()):
+                existing = entries.get(entry.entry_id)
+                if existing is None:
+                    self.add(collection, entry)
+                elif existing != entry:
+                    self.track(collection, entry.entry_id)
+                    entries[entry.entry_id] = entry
+                    self.mark(collection, entry.entry_id)
+                    updated.append((collection, entry.entry_id))
+
+        conflicts = self.campaign.campaign_conflicts.conflicts
+        for conflict in list(source.campaign_conflicts.conflicts):
+            index = next((i for i, existing in enumerate(conflicts) if existing.conflict_id == conflict.conflict_id), None)
+            if index is None:
+                self.add(CONFLICTS_COLLECTION, conflict)
+            elif conflicts[index] != conflict:
+                self.track(CONFLICTS_COLLECTION, conflict.conflict_id)
+                conflicts[index] = conflict
+                self.mark(CONFLICTS_COLLECTION, conflict.conflict_id)
+                updated.append((CONFLICTS_COLLECTION, conflict.conflict_id))
+
+        for tier in fields(source.magic_item_tracker):
+            source_tier = getattr(source.magic_item_tracker, tier.name)
+            for rarity in fields(source_tier):
+                items = getattr(getattr(self.campaign.magic_item_tracker, tier.name), rarity.name)
+                new_items = [item for item in getattr(source_tier, rarity.name) if item not in items]
+                if new_items:
+                    self.track(MAGIC_ITEMS_COLLECTION)
+                    items.extend(new_items)
+                    self.mark(MAGIC_ITEMS_COLLECTION, f"{tier.name}.{rarity.name}")
+        return updated
+
+    def _validate(self):
+        """Checks that every changed entry is stored under its own ID with the right type."""
+        for collection, entry_id in self.changes.entries.get(self.campaign_id, ()):
+            if collection in _ENTRY_COLLECTIONS:
+                entry = self._collection(collection).get(entry_id)
+                if entry is None:
+                    continue # Deleted
+                if not isinstance(entry, _ENTRY_COLLECTIONS[collection]):
+                    raise TransactionError(f"'{collection}' entry '{entry_id}' is a {type(entry).__name__}.")
+                if entry.entry_id != entry_id:
+                    raise TransactionError(f"'{collection}' entry '{entry_id}' has entry_id '{entry.entry_id}'.")
+            elif collection == CONFLICTS_COLLECTION:
+                conflicts = self.campaign.campaign_conflicts.conflicts
+                if any(not isinstance(conflict, Conflict) for conflict in conflicts):
+                    raise TransactionError("Campaign conflicts may only hold Conflict objects.")
+                if len({conflict.conflict_id for conflict in conflicts}) != len(conflicts):
+                    raise TransactionError("Two campaign conflicts share a conflict_id.")
+            else:
+                self._collection(collection)
+
+    def commit(self) -> None:
+        """
+        Checks the recorded changes and hands them to commit_func. Called
+        automatically when the outermost with block ends without an error.
+
+        Raises:
+            TransactionError: If a change is invalid; the transaction has then
+                been rolled back.
+        """
+        self._check_open()
+        try:
+            self._validate()
+        except TransactionError:
+            self.rollback()
+            raise
+        self._stop_listening()
+        self.closed = True
+        if self.changes:
+            self._commit_func(self.changes)
+
+    def rollback(self) -> None:
+        """Restores everything changed or tracked to its state before the transaction and discards the changes."""
+        self._check_open()
+        self.closed = True
+        self._stop_listening() # Restoring is not a change of the transaction
+        for collection, (current, image) in self._collection_images.items():
+            if collection in _ENTRY_COLLECTIONS:
+                # Only the entries that differ, so the restore reports just those
+                for entry_id in [entry_id for entry_id in current if entry_id not in image]:
+                    del current[entry_id]
+                for entry_id, entry in image.items():
+                    if current.get(entry_id, _ABSENT) is not entry:
+                        current[entry_id] = entry
+            else:
+                _restore_fields(current, image)
+            setattr(self.campaign, collection, current)
+        for entry, image in self._entry_images.values():
+            if entry is not None:
+                _restore_fields(entry, image)
+        # Then what the events showed, as it was before the transaction. Entries go back into
+        # the dict they were in before the fields restore the collections replaced meanwhile.
+        for entries, entry_id, original in self._membership_images.values():
+            if original is _ABSENT:
+                entries.pop(entry_id, None)
+            elif entries.get(entry_id) is not original:
+                entries[entry_id] = original
+        for model, field_name, old_value in self._field_images.values():
+            setattr(model, field_name, old_value)
+        self.changes = ChangeSet()
+
+
+def merge_application_data(target: ApplicationData, imported: ApplicationData,
+                           changes: ChangeSet) -> List[Tuple[str, str, str]]:
+    """
+    Merges the campaigns of imported into target. Campaigns target does not
+    have are added as they are; the entries of the others are merged with
+    CampaignTransaction.merge(), so an imported entry replaces the one with
+    its ID, and importing the same file twice changes nothing the second time.
+
+    Args:
+        target: The application data to merge into.
+        imported: The data to merge, e.g. read from another data file.
+        changes: Records the added and changed campaigns and entries.
+
+    Returns:
+        (campaign_id, collection, ID) of every entry of target that was
+        replaced by a different imported one.
+    """
+    updated = []
+    for campaign_id, campaign in imported.campaigns.items():
+        existing = target.campaigns.get(campaign_id)
+        if existing is None:
+            target.campaigns[campaign_id] = campaign
+            changes.mark_campaign(campaign_id)
+            continue
+        with CampaignTransaction(existing, campaign_id, changes.update) as transaction:
+            updated.extend((campaign_id, collection, entry_id) for collection, entry_id in transaction.merge(campaign))
+    return updated
@@ -0,0 +1,82 @@
+import copy
+import threading
+import unittest
+
+from src.change_recorder import ChangeRecorder
+from src.data_models import Campaign, Conflict, MagicItemTierData, NPCEntry, TravelPlanEntry, TravelStage
+
+
+class TestChangeRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Barovia")
+        self.npc = NPCEntry(name="Ireena")
+        self.campaign.npcs[self.npc.entry_id] = self.npc
+        self.plan = TravelPlanEntry(stages=[TravelStage(), TravelStage()])
+        self.campaign.travel_plans[self.plan.entry_id] = self.plan
+        self.conflict = Conflict(title_identifier="Coup")
+        self.campaign.campaign_conflicts.conflicts.append(self.conflict)
+        self.campaigns = {"c1": self.campaign}
+        self.calls = []
+        self.recorder = ChangeRecorder(lambda: self.campaigns, lambda: self.calls.append(1))
+        self.recorder.start()
+        self.addCleanup(self.recorder.stop)
+
+    def test_in_place_changes_mark_their_entries(self):
+        """Test that fields assigned on entries, nested models and trackers mark what they belong to."""
+        self.npc.name = "Ireena Kolyana"
+        self.plan.stages[1].end_location = "Vallaki"
+        self.conflict.title_identifier = "Uprising"
+        self.campaign.magic_item_tracker.level_tier_1_4.rare_items = ["Flame Tongue"]
+        changes = self.recorder.take()
+        self.assertEqual(changes.get_entry_changes("c1"), {
+            ("npcs", self.npc.entry_id),
+            ("travel_plans", self.plan.entry_id),
+            ("campaign_conflicts", self.conflict.conflict_id),
+            ("magic_item_tracker", "level_tier_1_4.rare_items"),
+        })
+        self.assertEqual(len(self.calls), 4)
+        self.assertFalse(self.recorder.take())
+
+        self.campaign.magic_item_tracker.level_tier_1_4 = MagicItemTierData(common_items=["Candle"])
+        self.assertEqual(len(self.recorder.take().get_entry_changes("c1")), 5) # Each list of the tier
+        self.campaign.dm_name_global = "Alex"
+        self.assertIsNone(self.recorder.take().get_entry_changes("c1"))
+
+    def test_index_follows_added_and_replaced_models(self):
+        """Test that models added or assigned after the index was built are found."""
+        self.npc.name = "Ireena Kolyana" # Builds the index
+        plan = TravelPlanEntry(stages=[TravelStage()])
+        self.campaign.travel_plans[plan.entry_id] = plan
+        plan.stages[0].end_location = "Krezk"
+        new_stage = TravelStage()
+        self.plan.stages = [new_stage]
+        new_stage.end_location = "Argynvostholt"
+        self.recorder.take()
+
+        new_stage.end_location = "Berez"
+        del self.campaign.travel_plans[plan.entry_id]
+        plan.stages[0].end_location = "Gone" # No longer part of the campaign
+        self.assertEqual(self.recorder.take().get_entry_changes("c1"), {
+            ("travel_plans", self.plan.entry_id), ("travel_plans", plan.entry_id),
+        })
+
+    def test_ignores_other_objects_and_threads(self):
+        """Test that copies, unstored entries, unloaded campaigns and other threads record nothing."""
+        copy.deepcopy(self.campaign).npcs[self.npc.entry_id].name = "Copy"
+        NPCEntry(name="Draft").name = "Edited draft"
+        other = Campaign(campaign_id="c2", name="Not loaded")
+        other.npcs[self.npc.entry_id] = NPCEntry()
+        worker = threading.Thread(target=setattr, args=(self.npc, "name", "From a worker"))
+        worker.start()
+        worker.join()
+        self.assertFalse(self.recorder.take())
+        self.assertEqual(self.calls, [])
+
+        del self.campaigns["c1"] # E.g. deleted
+        self.npc.name = "Orphan"
+        self.assertFalse(self.recorder.take())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,9 @@
+import copy
+import pickle
+import sys
 import unittest
 import uuid
+from dataclasses import asdict
 from src.data_models import (
     ApplicationData, Campaign, NPCEntry, GameExpectationsEntry, SensitiveElement,
     TravelPlanEntry, TravelStage, SettlementEntry, CampaignJournalEntry,
@@ -137,6 +141,23 @@ class TestDataModels(unittest.TestCase):
         self.assertIn(bastion.entry_id, campaign.bastions)
         self.assertEqual(campaign.bastions[bastion.entry_id].character_name, "")
 
+    @unittest.skipIf(sys.version_info < (3, 10), "dataclass slots need Python 3.10")
+    def test_entries_are_slotted(self):
+        """Test that entries have no __dict__ but construct, copy and pickle as before."""
+        npc = NPCEntry(name="Goblin", personality="<p>Sly</p>")
+        self.assertFalse(hasattr(npc, "__dict__"))
+        with self.assertRaises(AttributeError):
+            npc.nickname = "Gob" # Unknown attributes are rejected
+        self.assertEqual(asdict(npc)["name"], "Goblin")
+        self.assertEqual(list(asdict(npc)), ["entry_id", "name", "stat_block_source", "mm_page",
+                                             "stat_block_alterations", "alignment", "personality",
+                                             "appearance", "secret"])
+
+        bastion = BastionEntry(bastion_name="North Keep")
+        bastion.special_facilities.append(BastionFacility(facility_type_name="Library"))
+        for clone in (copy.deepcopy(bastion), pickle.loads(pickle.dumps(bastion))):
+            self.assertEqual(clone, bastion)
+            self.assertIsNot(clone.special_facilities, bastion.special_facilities)
 
     def test_application_data(self):
         """Test ApplicationData creation."""
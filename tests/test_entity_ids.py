@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+
+from src.data_models import NPCEntry
+from src.entity_ids import IdAllocator, id_prefix, id_sort_key, insert_entry
+
+
+class TestEntityIds(unittest.TestCase):
+
+    def test_ids_sort_in_creation_order(self):
+        """Test that IDs are unique and sort by creation, even within a millisecond or if the clock goes back."""
+        allocator = IdAllocator()
+        clock = iter([5_000_000_000] * 3 + [4_000_000_000] * 2 + [6_000_000_000])
+        with mock.patch("src.entity_ids.time.time_ns", lambda: next(clock)):
+            ids = [allocator.new_id("npc") for _ in range(6)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), 6)
+        self.assertTrue(all(len(entity_id) == len("npc_") + 24 for entity_id in ids))
+        self.assertEqual(id_prefix(ids[0]), "npc")
+
+    def test_legacy_ids_sort_before_new_ones(self):
+        """Test that id_sort_key orders the 8-digit IDs of older versions before any new ID."""
+        new = IdAllocator().new_id("npc")
+        ids = ["npc_ffffffff", new, "cj_00000001", "npc_00000001"]
+        self.assertEqual(sorted(ids, key=id_sort_key), ["cj_00000001", "npc_00000001", "npc_ffffffff", new])
+
+    def test_unique_id_skips_taken_ids(self):
+        """Test that unique_id never returns an ID that is already used."""
+        allocator = IdAllocator()
+        with mock.patch.object(allocator, "_random") as random:
+            random.getrandbits.return_value = 0
+            first = allocator.new_id("cj")
+            taken = {first, allocator.new_id("cj")}
+            # Restart the sequence so the same IDs come up again
+            allocator._last_millis -= 1
+            allocator._sequence = 0
+            self.assertNotIn(allocator.unique_id("cj", taken), taken)
+
+    def test_insert_entry_remaps_collisions(self):
+        """Test that an entry with a taken ID gets a new one and old-style IDs stay valid."""
+        npcs = {}
+        old = NPCEntry(entry_id="npc_1a2b3c4d", name="Old")
+        self.assertEqual(insert_entry(npcs, old), "npc_1a2b3c4d")
+        self.assertEqual(insert_entry(npcs, old), "npc_1a2b3c4d") # Same entry again
+
+        clash = NPCEntry(entry_id="npc_1a2b3c4d", name="Clash")
+        new_id = insert_entry(npcs, clash)
+        self.assertNotEqual(new_id, "npc_1a2b3c4d")
+        self.assertTrue(new_id.startswith("npc_"))
+        self.assertEqual(clash.entry_id, new_id)
+        self.assertEqual(npcs, {"npc_1a2b3c4d": old, new_id: clash})
+
+
+if __name__ == '__main__':
+    unittest.main()
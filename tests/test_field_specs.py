@@ -0,0 +1,55 @@
+import unittest
+from dataclasses import fields
+
+from src.data_models import (
+    Campaign, CampaignJournalEntry, GameExpectationsEntry, NPCEntry, SettlementEntry, TravelPlanEntry, TravelStage
+)
+from src.field_specs import (
+    FieldKind, describe, display_text, field_spec, field_specs, search_fields, sort_key, table_columns
+)
+
+
+class TestFieldSpecs(unittest.TestCase):
+
+    def test_kinds_are_declared_or_inferred(self):
+        """Test that every field gets a spec with the declared or inferred kind."""
+        self.assertEqual([spec.name for spec in field_specs(NPCEntry)], [f.name for f in fields(NPCEntry)])
+        self.assertIs(field_spec(NPCEntry, "entry_id").kind, FieldKind.ID)
+        self.assertIs(field_spec(NPCEntry, "personality").kind, FieldKind.RICH_TEXT)
+        self.assertIs(field_spec(NPCEntry, "name").kind, FieldKind.PLAIN_TEXT)
+        self.assertIs(field_spec(TravelStage, "travel_time_value").kind, FieldKind.INT)
+        self.assertEqual(field_spec(TravelStage, "pace").choices, ("Fast", "Normal", "Slow"))
+        stages = field_spec(TravelPlanEntry, "stages")
+        self.assertEqual((stages.kind, stages.item_type), (FieldKind.LIST, TravelStage))
+        npcs = field_spec(Campaign, "npcs")
+        self.assertEqual((npcs.kind, npcs.item_type), (FieldKind.ENTRIES, NPCEntry))
+        self.assertIs(field_specs(NPCEntry), field_specs(NPCEntry)) # Built once
+
+    def test_search_fields(self):
+        """Test that text is searchable by default and IDs and numbers are not."""
+        names = [spec.name for spec in search_fields(CampaignJournalEntry)]
+        self.assertNotIn("entry_id", names)
+        self.assertNotIn("session_number", names)
+        self.assertIn("session_title", names)
+        self.assertIn("additional_notes", names)
+
+    def test_table_columns_and_sorting(self):
+        """Test column order, labels and the default sort order from the sortable column."""
+        self.assertEqual([spec.label for spec in table_columns(GameExpectationsEntry)], ["Player Name", "DM Name"])
+        self.assertEqual([spec.label for spec in table_columns(SettlementEntry)], ["Name", "Size", "Defining Trait"])
+
+        npcs = [NPCEntry(name="bob"), NPCEntry(name="Alice")]
+        self.assertEqual([npc.name for npc in sorted(npcs, key=sort_key(NPCEntry))], ["Alice", "bob"])
+        entries = [CampaignJournalEntry(session_number=10), CampaignJournalEntry(session_number=9)]
+        self.assertEqual([e.session_number for e in sorted(entries, key=sort_key(CampaignJournalEntry))], [9, 10])
+
+        self.assertEqual(display_text(field_spec(TravelPlanEntry, "stages"), [TravelStage()]), "1")
+        self.assertEqual(len(display_text(field_spec(SettlementEntry, "defining_trait"), "x" * 100)), 75)
+
+    def test_unknown_options_are_rejected(self):
+        with self.assertRaises(TypeError):
+            describe(colum=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
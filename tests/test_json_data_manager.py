@@ -1,14 +1,25 @@
 import unittest
+import unittest.mock
+import codecs
+import io
+import json
 import os
+import shutil
 import tempfile
 import uuid
+from dataclasses import asdict
 from src.data_models import (
     ApplicationData, Campaign, NPCEntry, GameExpectationsEntry, SensitiveElement,
     TravelPlanEntry, TravelStage, SettlementEntry, CampaignJournalEntry,
     DMCharacterEntry, Conflict, CampaignConflictEntry, MagicItemTierData,
     MagicItemTrackerData, BastionFacility, BastionEntry
 )
-from src.json_data_manager import save_data, load_data
+from src.json_data_manager import (
+    save_data, load_data, read_json_data, snapshot_application_data, ChangeSet, SHARD_INDEX_FILE_NAME,
+    JOURNAL_FILE_SUFFIX, _from_dict, _JsonStreamReader, needs_load_cache, write_json, write_missing_load_cache
+)
+from src.lazy_campaigns import LazyCampaigns
+from src.load_cache import cache_path
 
 class TestJsonDataManager(unittest.TestCase):
 
@@ -16,11 +27,19 @@ class TestJsonDataManager(unittest.TestCase):
         # Create a temporary file for saving/loading
         self.temp_fd, self.temp_filepath = tempfile.mkstemp(suffix=".json")
         os.close(self.temp_fd) # Close the file descriptor
+        # Sign load caches with a key of this test, not the user's
+        self.key_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.key_dir)
+        key_patch = unittest.mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(self.key_dir, "cache.key"))
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
 
     def tearDown(self):
-        # Clean up the temporary file
-        if os.path.exists(self.temp_filepath):
-            os.remove(self.temp_filepath)
+        # Clean up the temporary file, its journal and its load cache
+        journal_path = self.temp_filepath + JOURNAL_FILE_SUFFIX
+        for path in (self.temp_filepath, journal_path, journal_path + ".stale", cache_path(self.temp_filepath)):
+            if os.path.exists(path):
+                os.remove(path)
 
     def _create_sample_application_data(self) -> ApplicationData:
         """Helper method to create a complex ApplicationData object for testing."""
@@ -142,5 +161,421 @@ class TestJsonDataManager(unittest.TestCase):
         self.assertIsInstance(loaded_app_data, ApplicationData)
         self.assertEqual(len(loaded_app_data.campaigns), 0) # Should return default on parse error
 
+    def test_load_with_raise_errors_reports_unreadable_files(self):
+        """Test that raise_errors makes a missing or invalid file raise instead of loading as empty data."""
+        with self.assertRaises(FileNotFoundError):
+            load_data(os.path.join(os.path.dirname(self.temp_filepath), "does_not_exist.json"), raise_errors=True)
+        with open(self.temp_filepath, 'w') as f:
+            f.write("{invalid_json_")
+        with self.assertRaises(ValueError):
+            load_data(self.temp_filepath, use_cache=False, raise_errors=True)
+
+    def test_write_json_matches_json_dump(self):
+        """Test that the streaming encoder writes the same text as json.dump over asdict()."""
+        app_data = self._create_sample_application_data()
+        app_data.campaigns["campaign1"].npcs["npc_quote"] = NPCEntry(entry_id="npc_quote", name='Ms. "Ünïcode" \\ Tab\t')
+
+        streamed = io.StringIO()
+        write_json(app_data, streamed)
+        self.assertEqual(streamed.getvalue(), json.dumps(asdict(app_data), indent=4, ensure_ascii=False))
+
+        compact = io.StringIO()
+        write_json(app_data, compact, compact=True)
+        self.assertNotIn("\n", compact.getvalue())
+        self.assertEqual(json.loads(compact.getvalue()), asdict(app_data))
+
+    def test_write_json_encodes_keys_like_json_dump(self):
+        """Test that dict keys which are not strings are written as json.dump writes them."""
+        value = {"name": 1, 2: "two", 1.5: None, True: [], None: {}}
+        streamed = io.StringIO()
+        write_json(value, streamed)
+        self.assertEqual(streamed.getvalue(), json.dumps(value, indent=4, ensure_ascii=False))
+        with self.assertRaises(TypeError):
+            write_json({("a", "b"): 1}, io.StringIO())
+
+    def test_save_and_load_compact_data(self):
+        """Test that compact files load back identically."""
+        original_app_data = self._create_sample_application_data()
+        self.assertTrue(save_data(original_app_data, self.temp_filepath, compact=True))
+
+        loaded_app_data = load_data(self.temp_filepath)
+        for campaign_id, original_campaign in original_app_data.campaigns.items():
+            self.assertEqual(original_campaign.__dict__, loaded_app_data.campaigns[campaign_id].__dict__)
+
+    def test_from_dict_handles_missing_and_none_fields(self):
+        """Test that missing or None fields fall back to defaults and bad nested items are skipped."""
+        data = {
+            "entry_id": "tp_x",
+            "journey_name": None,
+            "stages": [{"stage_id": "s1", "travel_time_value": 3}, "not a stage", {"pace": None}],
+        }
+        plan = _from_dict(TravelPlanEntry, data)
+
+        self.assertEqual(plan.entry_id, "tp_x")
+        self.assertEqual(plan.journey_name, "")
+        self.assertEqual(plan.origin, "")
+        self.assertEqual(len(plan.stages), 2)
+        self.assertEqual(plan.stages[0].travel_time_value, 3)
+        self.assertEqual(plan.stages[0].pace, "Normal")
+        self.assertEqual(plan.stages[1].pace, "Normal")
+        self.assertTrue(plan.stages[1].stage_id.startswith("ts_"))
+
+        campaign = _from_dict(Campaign, {"campaign_id": "c", "campaign_conflicts": None, "magic_item_tracker": "bad"})
+        self.assertIsInstance(campaign.campaign_conflicts, CampaignConflictEntry)
+        self.assertIsInstance(campaign.magic_item_tracker, MagicItemTrackerData)
+        self.assertEqual(campaign.npcs, {})
+
+    def test_streaming_reader_matches_json_load(self):
+        """Test that the streaming reader builds the same data as json.load, whatever the chunk size."""
+        original_app_data = self._create_sample_application_data()
+        save_data(original_app_data, self.temp_filepath)
+        expected = asdict(original_app_data)
+
+        for chunk_size in (1, 7, 1 << 16):
+            with self.subTest(chunk_size=chunk_size):
+                with unittest.mock.patch.object(_JsonStreamReader, "_CHUNK_SIZE", chunk_size):
+                    progress = []
+                    loaded_app_data = read_json_data(self.temp_filepath,
+                                                     progress_callback=lambda done, total: progress.append((done, total)))
+                self.assertEqual(asdict(loaded_app_data), expected)
+                file_size = os.path.getsize(self.temp_filepath)
+                self.assertEqual(progress[-1], (file_size, file_size))
+
+    def test_streaming_reader_rejects_invalid_json(self):
+        """Test that truncated or trailing data is reported like json.load would."""
+        for text in ('{"campaigns": {"c1": {"name": "A"', '{"campaigns": {}} extra', '{"campaigns" {}}'):
+            with self.subTest(text=text):
+                with open(self.temp_filepath, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                with self.assertRaises(json.JSONDecodeError):
+                    read_json_data(self.temp_filepath)
+
+    def _save_journaled(self, app_data: ApplicationData, changes: ChangeSet) -> bool:
+        snapshot = snapshot_application_data(app_data, self.temp_filepath, changes)
+        return save_data(snapshot, self.temp_filepath, changes)
+
+    def test_journaled_changes_are_replayed_on_load(self):
+        """Test that saves with a ChangeSet append to the journal and loading replays it."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        with open(self.temp_filepath, 'r', encoding='utf-8') as f:
+            data_file_text = f.read()
+        campaign = app_data.campaigns["campaign1"]
+        npc_id = next(iter(campaign.npcs))
+        journal_id = next(iter(campaign.campaign_journal))
+
+        changes = ChangeSet()
+        campaign.npcs[npc_id].name = "Grog the Mighty"
+        changes.mark_entry("campaign1", "npcs", npc_id)
+        del campaign.campaign_journal[journal_id]
+        changes.mark_entry("campaign1", "campaign_journal", journal_id)
+        campaign.magic_item_tracker.level_tier_1_4.rare_items.append("Flame Tongue")
+        changes.mark_entry("campaign1", "magic_item_tracker", "level_tier_1_4.rare_items")
+        app_data.campaigns["campaign3"] = Campaign(campaign_id="campaign3", name="New Campaign")
+        changes.mark_campaign("campaign3")
+        del app_data.campaigns["campaign2"]
+        changes.mark_campaign("campaign2")
+        app_data.active_campaign_id = "campaign3"
+        self.assertTrue(self._save_journaled(app_data, changes))
+
+        with open(self.temp_filepath, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), data_file_text) # Only the journal was written
+        self.assertEqual(asdict(load_data(self.temp_filepath)), asdict(app_data))
+
+        lazy_app_data = load_data(self.temp_filepath, lazy=True)
+        self.assertEqual(list(lazy_app_data.campaigns), ["campaign1", "campaign3"])
+        self.assertEqual(asdict(lazy_app_data.campaigns["campaign1"]), asdict(campaign))
+
+    def test_torn_journal_line_is_ignored(self):
+        """Test that a line cut off by a crash during an append does not prevent loading."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        npc_id = next(iter(app_data.campaigns["campaign1"].npcs))
+        app_data.campaigns["campaign1"].npcs[npc_id].name = "Grog the Mighty"
+        changes = ChangeSet()
+        changes.mark_entry("campaign1", "npcs", npc_id)
+        self._save_journaled(app_data, changes)
+        with open(self.temp_filepath + JOURNAL_FILE_SUFFIX, 'a', encoding='utf-8') as f:
+            f.write('{"op": "upsert", "campaign_id": "campa')
+
+        loaded_app_data = load_data(self.temp_filepath)
+        self.assertEqual(loaded_app_data.campaigns["campaign1"].npcs[npc_id].name, "Grog the Mighty")
+
+    def test_journal_is_compacted_past_threshold(self):
+        """Test that a large journal is folded into the data file and removed."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        journal_path = self.temp_filepath + JOURNAL_FILE_SUFFIX
+        npc_id = next(iter(app_data.campaigns["campaign1"].npcs))
+        changes = ChangeSet()
+        changes.mark_entry("campaign1", "npcs", npc_id)
+
+        app_data.campaigns["campaign1"].npcs[npc_id].name = "First"
+        self._save_journaled(app_data, changes)
+        self.assertTrue(os.path.exists(journal_path))
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            stale_journal = f.read()
+
+        with unittest.mock.patch("src.json_data_manager.JOURNAL_COMPACTION_THRESHOLD_BYTES", 1):
+            app_data.campaigns["campaign1"].npcs[npc_id].name = "Second"
+            # Compaction reads the file and journal from disk; the snapshot holds just the changed NPC
+            snapshot = snapshot_application_data(app_data, self.temp_filepath, changes)
+            self.assertEqual(list(snapshot.campaigns["campaign1"].npcs), [npc_id])
+            self.assertTrue(save_data(snapshot, self.temp_filepath, changes))
+            self.assertFalse(os.path.exists(journal_path))
+
+        self.assertEqual(load_data(self.temp_filepath).campaigns["campaign1"].npcs[npc_id].name, "Second")
+        # A journal left behind by a crash during compaction belongs to the old data file and is set aside.
+        with open(journal_path, 'w', encoding='utf-8') as f:
+            f.write(stale_journal)
+        self.assertEqual(load_data(self.temp_filepath).campaigns["campaign1"].npcs[npc_id].name, "Second")
+        self.assertFalse(os.path.exists(journal_path))
+        self.assertTrue(os.path.exists(journal_path + ".stale"))
+
+    def test_load_cache_is_used_while_file_is_unchanged(self):
+        """Test that a save writes the load cache and loading uses it instead of parsing."""
+        original_app_data = self._create_sample_application_data()
+        save_data(original_app_data, self.temp_filepath)
+        self.assertTrue(os.path.exists(cache_path(self.temp_filepath)))
+
+        with unittest.mock.patch("src.json_data_manager.read_json_data") as read_json:
+            self.assertEqual(asdict(load_data(self.temp_filepath)), asdict(original_app_data))
+            lazy_app_data = load_data(self.temp_filepath, lazy=True)
+            self.assertIsInstance(lazy_app_data.campaigns, LazyCampaigns)
+            self.assertFalse(lazy_app_data.campaigns.is_loaded("campaign1"))
+            self.assertEqual(asdict(lazy_app_data.campaigns["campaign1"]),
+                             asdict(original_app_data.campaigns["campaign1"]))
+        read_json.assert_not_called()
+
+    def test_stale_or_corrupt_load_cache_is_ignored(self):
+        """Test that the cache is rebuilt when the file changes and discarded when it is damaged."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+
+        # Edited outside the app: the cache no longer matches the file
+        app_data.campaigns["campaign1"].name = "Edited by hand"
+        with open(self.temp_filepath, 'w', encoding='utf-8') as f:
+            write_json(app_data, f)
+        self.assertEqual(load_data(self.temp_filepath).campaigns["campaign1"].name, "Edited by hand")
+        with unittest.mock.patch("src.json_data_manager.read_json_data") as read_json:
+            self.assertEqual(load_data(self.temp_filepath).campaigns["campaign1"].name, "Edited by hand")
+        read_json.assert_not_called() # The load above rebuilt the cache
+
+        with open(cache_path(self.temp_filepath), 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b"garbage!")
+        self.assertEqual(asdict(load_data(self.temp_filepath)), asdict(app_data))
+
+    def test_load_cache_of_another_user_is_never_unpickled(self):
+        """Test that a cache not signed with this user's key is discarded before anything is unpickled."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        with unittest.mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(self.key_dir, "other.key")), \
+                unittest.mock.patch("src.load_cache.pickle.loads") as unpickle:
+            self.assertEqual(asdict(load_data(self.temp_filepath)), asdict(app_data))
+        unpickle.assert_not_called()
+
+    def test_load_without_cache_leaves_no_cache_behind(self):
+        """Test that loading with use_cache=False, as imports do, neither reads nor writes a cache."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        os.remove(cache_path(self.temp_filepath))
+        self.assertEqual(asdict(load_data(self.temp_filepath, use_cache=False)), asdict(app_data))
+        self.assertFalse(os.path.exists(cache_path(self.temp_filepath)))
+
+    def test_missing_load_cache_is_written_from_the_file(self):
+        """Test that a data file a lazy load found no cache for gets one built from the file on disk."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.temp_filepath)
+        os.remove(cache_path(self.temp_filepath))
+
+        lazy_app_data = load_data(self.temp_filepath, lazy=True)
+        self.assertTrue(needs_load_cache(self.temp_filepath)) # A lazy load does not write it
+        self.assertTrue(write_missing_load_cache(self.temp_filepath))
+        self.assertFalse(lazy_app_data.campaigns.is_loaded("campaign1")) # Read from disk, not from the data
+        self.assertFalse(needs_load_cache(self.temp_filepath))
+        self.assertFalse(write_missing_load_cache(self.temp_filepath))
+        with unittest.mock.patch("src.json_data_manager.read_json_data") as read_json:
+            self.assertEqual(asdict(load_data(self.temp_filepath)), asdict(app_data))
+        read_json.assert_not_called()
+
+    def test_save_without_cache_leaves_no_cache_behind(self):
+        """Test that a save with write_cache=False, as exports do, writes no cache and loads no campaign to keep."""
+        save_data(self._create_sample_application_data(), self.temp_filepath)
+        lazy_app_data = load_data(self.temp_filepath, lazy=True)
+        export_fd, export_path = tempfile.mkstemp(suffix=".json")
+        os.close(export_fd)
+        self.addCleanup(os.remove, export_path)
+
+        self.assertTrue(save_data(lazy_app_data, export_path, write_cache=False))
+        self.assertFalse(os.path.exists(cache_path(export_path)))
+        self.assertFalse(lazy_app_data.campaigns.is_loaded("campaign1"))
+        self.assertEqual(asdict(load_data(export_path, use_cache=False)), asdict(load_data(self.temp_filepath)))
+
+    def test_save_and_load_sharded_data(self):
+        """Test the per-campaign layout round-trips the same data as the single file."""
+        shard_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shard_dir)
+        original_app_data = self._create_sample_application_data()
+
+        self.assertTrue(save_data(original_app_data, shard_dir))
+        self.assertTrue(os.path.exists(os.path.join(shard_dir, SHARD_INDEX_FILE_NAME)))
+
+        loaded_app_data = load_data(shard_dir)
+        self.assertEqual(original_app_data.active_campaign_id, loaded_app_data.active_campaign_id)
+        self.assertEqual(list(original_app_data.campaigns), list(loaded_app_data.campaigns))
+        for campaign_id, original_campaign in original_app_data.campaigns.items():
+            self.assertEqual(original_campaign.__dict__, loaded_app_data.campaigns[campaign_id].__dict__)
+
+    def test_only_directories_select_the_sharded_layout(self):
+        """Test that a data file without an extension is a JSON file and a new directory needs a trailing separator."""
+        base_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base_dir)
+        app_data = self._create_sample_application_data()
+        plain_path = os.path.join(base_dir, "campaign_data")
+        self.assertTrue(save_data(app_data, plain_path))
+        self.assertTrue(os.path.isfile(plain_path))
+        self.assertEqual(list(load_data(plain_path).campaigns), list(app_data.campaigns))
+
+        shard_dir = os.path.join(base_dir, "shards") + os.sep
+        self.assertTrue(save_data(app_data, shard_dir))
+        self.assertTrue(os.path.exists(os.path.join(shard_dir, SHARD_INDEX_FILE_NAME)))
+        self.assertEqual(list(load_data(shard_dir.rstrip(os.sep)).campaigns), list(app_data.campaigns))
+
+    def test_snapshot_copies_only_changed_campaigns(self):
+        """Test that a save snapshot shares no live campaign with the saving thread."""
+        shard_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shard_dir)
+        app_data = self._create_sample_application_data()
+        self.assertTrue(save_data(app_data, shard_dir))
+        changes = ChangeSet()
+        changes.mark_campaign("campaign2")
+        snapshot = snapshot_application_data(app_data, shard_dir, changes)
+        self.assertFalse(snapshot.campaigns.is_loaded("campaign1")) # Left to its file
+        self.assertIsNot(snapshot.campaigns["campaign2"], app_data.campaigns["campaign2"])
+
+        app_data.campaigns["campaign1"].name = "Renamed after the snapshot"
+        self.assertTrue(save_data(snapshot, shard_dir, changes))
+        self.assertEqual([campaign.name for campaign in load_data(shard_dir).campaigns.values()],
+                         ["The Dragon's Hoard", "The Lost Mine"])
+
+    def test_sharded_save_writes_only_dirty_campaigns(self):
+        """Test that only campaigns marked in the ChangeSet are rewritten."""
+        shard_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shard_dir)
+        app_data = self._create_sample_application_data()
+        self.assertTrue(save_data(app_data, shard_dir))
+
+        shard_paths = {
+            campaign_id: os.path.join(shard_dir, "campaigns", f"{campaign_id}.json")
+            for campaign_id in app_data.campaigns
+        }
+        # Backdate both files so a rewrite is visible in the modification time.
+        for path in shard_paths.values():
+            os.utime(path, (0, 0))
+
+        app_data.campaigns["campaign2"].name = "The Lost Mine of Phandelver"
+        changes = ChangeSet()
+        changes.mark_campaign("campaign2")
+        self.assertTrue(save_data(app_data, shard_dir, changes))
+
+        self.assertEqual(os.path.getmtime(shard_paths["campaign1"]), 0)
+        self.assertNotEqual(os.path.getmtime(shard_paths["campaign2"]), 0)
+        self.assertEqual(load_data(shard_dir).campaigns["campaign2"].name, "The Lost Mine of Phandelver")
+
+        # Deleted campaigns disappear from the index and their file is removed.
+        del app_data.campaigns["campaign1"]
+        self.assertTrue(save_data(app_data, shard_dir, ChangeSet()))
+        self.assertFalse(os.path.exists(shard_paths["campaign1"]))
+        self.assertEqual(list(load_data(shard_dir).campaigns), ["campaign2"])
+
+    def test_sharded_save_keeps_campaign_with_missing_file(self):
+        """Test that a never-loaded campaign whose file was removed does not stop the save."""
+        shard_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shard_dir)
+        self.assertTrue(save_data(self._create_sample_application_data(), shard_dir))
+        app_data = load_data(shard_dir, lazy=True)
+        os.remove(os.path.join(shard_dir, "campaigns", "campaign1.json"))
+
+        app_data.campaigns["campaign2"].name = "The Lost Mine of Phandelver"
+        changes = ChangeSet()
+        changes.mark_campaign("campaign2")
+        with self.assertLogs(level="ERROR"):
+            self.assertTrue(save_data(snapshot_application_data(app_data, shard_dir, changes), shard_dir, changes))
+
+        with open(os.path.join(shard_dir, SHARD_INDEX_FILE_NAME), encoding="utf-8") as f:
+            self.assertEqual([entry["campaign_id"] for entry in json.load(f)["campaigns"]], ["campaign1", "campaign2"])
+        self.assertEqual(load_data(shard_dir).campaigns["campaign2"].name, "The Lost Mine of Phandelver")
+
+    def test_lazy_load_json_builds_campaigns_on_access(self):
+        """Test that a lazy JSON load only builds campaigns when accessed and saves unchanged ones as-is."""
+        original_app_data = self._create_sample_application_data()
+        save_data(original_app_data, self.temp_filepath)
+        with open(self.temp_filepath, 'r', encoding='utf-8') as f:
+            original_text = f.read()
+
+        lazy_app_data = load_data(self.temp_filepath, lazy=True)
+        campaigns = lazy_app_data.campaigns
+        self.assertIsInstance(campaigns, LazyCampaigns)
+        self.assertEqual(list(campaigns), ["campaign1", "campaign2"])
+        self.assertEqual(campaigns.campaign_name("campaign2"), "The Lost Mine")
+        self.assertFalse(campaigns.is_loaded("campaign1"))
+        self.assertFalse(campaigns.evict("campaign1")) # A JSON file cannot reload one campaign
+
+        self.assertEqual(campaigns["campaign1"].__dict__, original_app_data.campaigns["campaign1"].__dict__)
+        self.assertTrue(campaigns.is_loaded("campaign1"))
+        self.assertFalse(campaigns.is_loaded("campaign2"))
+
+        snapshot = snapshot_application_data(lazy_app_data, self.temp_filepath, ChangeSet())
+        self.assertTrue(save_data(snapshot, self.temp_filepath))
+        with open(self.temp_filepath, 'r', encoding='utf-8') as f:
+            self.assertEqual(f.read(), original_text)
+        self.assertFalse(campaigns.is_loaded("campaign2"))
+
+    def test_lazy_read_streams_each_campaign_from_the_file(self):
+        """Test that a lazy read only finds the campaigns, and reads each from the file even after it is rewritten."""
+        app_data = self._create_sample_application_data()
+        app_data.campaigns["campaign1"].npcs["npc_quote"] = NPCEntry(entry_id="npc_quote", name='Ms. "{Ünïcode}" \\ [')
+        save_data(app_data, self.temp_filepath)
+        with open(self.temp_filepath, 'rb') as f:
+            text = f.read()
+        with open(self.temp_filepath, 'wb') as f: # Offsets count the byte order mark and non-ASCII characters
+            f.write(codecs.BOM_UTF8 + text.replace(b'"campaigns": {', b'"campaigns": {"broken": [1, "]"],', 1))
+
+        campaigns = read_json_data(self.temp_filepath, lazy=True).campaigns
+        self.assertIsInstance(campaigns, LazyCampaigns)
+        self.assertEqual([campaigns.campaign_name(campaign_id) for campaign_id in campaigns],
+                         ["The Dragon's Hoard", "The Lost Mine"])
+        self.assertFalse(any(campaigns.is_loaded(campaign_id) for campaign_id in campaigns))
+        self.assertEqual(campaigns["campaign2"], app_data.campaigns["campaign2"])
+
+        save_data(app_data, self.temp_filepath, compact=True) # Moves every campaign
+        self.assertEqual(campaigns["campaign1"], app_data.campaigns["campaign1"])
+
+    def test_lazy_load_sharded_reads_campaign_files_on_access(self):
+        """Test that a lazy per-campaign load reads only the index until a campaign is accessed."""
+        shard_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shard_dir)
+        save_data(self._create_sample_application_data(), shard_dir)
+        # A corrupt file is harmless until its campaign is opened
+        with open(os.path.join(shard_dir, "campaigns", "campaign1.json"), 'w', encoding='utf-8') as f:
+            f.write("{not json")
+
+        lazy_app_data = load_data(shard_dir, lazy=True)
+        campaigns = lazy_app_data.campaigns
+        self.assertEqual(campaigns.campaign_name("campaign1"), "The Dragon's Hoard")
+        self.assertIsNone(campaigns.get("campaign1"))
+        self.assertEqual(campaigns["campaign2"].name, "The Lost Mine")
+
+        campaigns["campaign2"].name = "Renamed"
+        changes = ChangeSet()
+        changes.mark_campaign("campaign2")
+        self.assertTrue(save_data(snapshot_application_data(lazy_app_data, shard_dir, changes), shard_dir, changes))
+        self.assertIn("campaign1", load_data(shard_dir, lazy=True).campaigns) # Still in the index
+
+        self.assertTrue(campaigns.evict("campaign2"))
+        self.assertFalse(campaigns.is_loaded("campaign2"))
+        self.assertEqual(campaigns["campaign2"].name, "Renamed") # Read back from its file
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import copy
+import pickle
+import unittest
+
+from src.data_models import Campaign, NPCEntry, MagicItemTrackerData
+from src.model_events import (
+    EntityAdded, EntityRemoved, EntryDict, FieldChanged, ObservableModel, subscribe, subscribed, unsubscribe
+)
+
+
+class TestModelEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Events")
+        self.npc = NPCEntry(name="Goblin")
+        self.campaign.npcs[self.npc.entry_id] = self.npc
+        self.events = []
+
+    def test_entry_changes_publish_events(self):
+        """Test that adding, replacing, editing and removing entries and assigning fields publishes matching events."""
+        replacement = NPCEntry(entry_id=self.npc.entry_id, name="Hobgoblin")
+        with subscribed(self.events.append):
+            self.npc.name = "Goblin" # Unchanged
+            self.npc.name = "Goblin Boss"
+            self.campaign.npcs[self.npc.entry_id] = replacement
+            self.campaign.npcs.pop(self.npc.entry_id)
+            self.campaign.dm_name_global = "Alex"
+            old_settlements = self.campaign.settlements
+            self.campaign.settlements = {}
+            self.campaign.settlements = self.campaign.settlements # The same collection
+            NPCEntry(name="Constructed") # Construction is not a change
+
+        self.assertEqual(self.events, [
+            FieldChanged(self.npc, "name", "Goblin", "Goblin Boss"),
+            EntityRemoved(self.campaign, "npcs", self.npc.entry_id, self.npc),
+            EntityAdded(self.campaign, "npcs", self.npc.entry_id, replacement),
+            EntityRemoved(self.campaign, "npcs", self.npc.entry_id, replacement),
+            FieldChanged(self.campaign, "dm_name_global", "", "Alex"),
+            FieldChanged(self.campaign, "settlements", old_settlements, self.campaign.settlements),
+        ])
+        self.assertIs(self.events[-1].old_value, old_settlements)
+
+    def test_no_hooks_without_subscribers(self):
+        """Test that the notifying methods are only installed while someone listens."""
+        subscribe(self.events.append)
+        subscribe(self.events.append)
+        unsubscribe(self.events.append)
+        self.assertIn("__setattr__", vars(ObservableModel))
+        unsubscribe(self.events.append)
+        self.assertNotIn("__setattr__", vars(ObservableModel))
+        self.assertNotIn("__setitem__", vars(EntryDict))
+
+        self.npc.name = "Quiet"
+        del self.campaign.npcs[self.npc.entry_id]
+        self.assertEqual(self.events, [])
+
+    def test_collections_stay_owned_by_their_campaign(self):
+        """Test that assigned, copied and pickled collections still report their campaign."""
+        self.campaign.settlements = {}
+        self.assertIsInstance(self.campaign.settlements, EntryDict)
+        for clone in (copy.deepcopy(self.campaign), pickle.loads(pickle.dumps(self.campaign))):
+            self.assertEqual(clone, self.campaign)
+            self.assertIs(clone.npcs.campaign, clone)
+            self.assertEqual(clone.npcs.collection, "npcs")
+
+        with subscribed(self.events.append):
+            copied = copy.deepcopy(self.campaign) # Copying is not a change
+            copied_npc = copied.npcs[self.npc.entry_id]
+            copied.npcs.clear()
+            self.campaign.magic_item_tracker = MagicItemTrackerData() # Equal to the current one
+        self.assertEqual(self.events, [EntityRemoved(copied, "npcs", self.npc.entry_id, copied_npc)])
+
+
+if __name__ == '__main__':
+    unittest.main()
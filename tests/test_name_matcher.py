@@ -0,0 +1,69 @@
+import unittest
+
+from src.data_models import BastionEntry, Campaign, DMCharacterEntry, NPCEntry, SettlementEntry
+from src.name_matcher import NameMatcher, campaign_names, name_trigrams
+
+
+class TestNameMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Barovia")
+        self.campaign.npcs["npc_1"] = NPCEntry(entry_id="npc_1", name="Ismark Kolyanovich",
+                                               personality="<p>Guards Ireena</p>")
+        self.campaign.npcs["npc_2"] = NPCEntry(entry_id="npc_2", name="Ireena Kolyana")
+        self.campaign.settlements["set_1"] = SettlementEntry(entry_id="set_1", name="Vallaki")
+        self.campaign.dm_characters["dmc_1"] = DMCharacterEntry(entry_id="dmc_1", character_name="Ismay")
+        self.campaign.bastions["bas_1"] = BastionEntry(entry_id="bas_1", bastion_name="Castle Ravenloft")
+        self.campaign.magic_item_tracker.level_tier_1_4.rare_items.extend(["Sunsword", "Holy Symbol"])
+        self.matcher = NameMatcher.for_campaign(self.campaign)
+
+    def _keys(self, query, **options):
+        return [(match.collection, match.entry_id) for match in self.matcher.match(query, **options)]
+
+    def test_names_come_from_the_name_fields(self):
+        """Test that only the declared name fields are matched, keyed like search results."""
+        self.assertEqual(dict(campaign_names(self.campaign)), {
+            ("npcs", "npc_1"): ["Ismark Kolyanovich"], ("npcs", "npc_2"): ["Ireena Kolyana"],
+            ("settlements", "set_1"): ["Vallaki"], ("dm_characters", "dmc_1"): ["Ismay"],
+            ("bastions", "bas_1"): ["Castle Ravenloft"],
+            ("magic_item_tracker", "level_tier_1_4.rare_items"): ["Sunsword", "Holy Symbol"]})
+        self.assertEqual(len(self.matcher), 7)
+        self.assertEqual(self._keys("guards"), []) # Personality is not a name
+        self.assertEqual(name_trigrams("Al"), {"  a", " al", "al "})
+
+    def test_misspellings_rank_by_similarity(self):
+        """Test that misspelt names find the intended one first, and partial names match while typing."""
+        self.assertEqual(self._keys("Ismarck Kolyanovich")[0], ("npcs", "npc_1"))
+        self.assertEqual(self._keys("Ismarck", partial=True)[0], ("npcs", "npc_1"))
+        self.assertEqual(self._keys("valaki"), [("settlements", "set_1")])
+        self.assertEqual(self._keys("sun sword")[0], ("magic_item_tracker", "level_tier_1_4.rare_items"))
+        self.assertEqual(self._keys("castle ravenloft"), [("bastions", "bas_1")])
+        self.assertEqual(self.matcher.match("castle ravenloft")[0].score, 1.0)
+        self.assertEqual(self._keys("kolya", partial=True, collections=["npcs"], limit=1), [("npcs", "npc_2")])
+        self.assertEqual(self._keys("ism", partial=True, collections=["dm_characters"]), [("dm_characters", "dmc_1")])
+        self.assertEqual(self._keys("zzz"), [])
+        self.assertEqual(self._keys("  "), [])
+
+    def test_names_follow_changes(self):
+        """Test that renamed, deleted and added names are matched like a rebuild."""
+        self.campaign.npcs["npc_1"].name = "Baron Vargas Vallakovich"
+        del self.campaign.settlements["set_1"]
+        self.campaign.magic_item_tracker.level_tier_1_4.rare_items.remove("Sunsword")
+        self.matcher.update_entry(self.campaign, "npcs", "npc_1")
+        self.matcher.update_entry(self.campaign, "settlements", "set_1")
+        self.matcher.update_entry(self.campaign, "magic_item_tracker", "level_tier_1_4.rare_items")
+        self.matcher.update_entry(self.campaign, "magic_item_tracker", "level_tier_1_4.no_such_items")
+        self.assertEqual(self._keys("ismark", collections=["npcs"]), [])
+        self.assertEqual(self._keys("vallakovich"), [("npcs", "npc_1")])
+        self.assertEqual(self._keys("sunsword"), [])
+
+        self.campaign.npcs["npc_3"] = NPCEntry(entry_id="npc_3", name="Izek Strazni")
+        self.matcher.refresh(self.campaign)
+        rebuilt = NameMatcher.for_campaign(self.campaign)
+        self.assertEqual(len(self.matcher), len(rebuilt))
+        for query in ("izek", "vallaki", "holy symbol", "ireena"):
+            self.assertEqual(self.matcher.match(query), rebuilt.match(query), query)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import copy
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src import data_models
+from src.data_models import ApplicationData, Campaign, NPCEntry
+from src.json_data_manager import load_data, save_data
+from src.load_cache import remove_load_cache
+from src.rich_text import compact_rich_text, expand_rich_text, html_to_text, text_snippet, RICH_TEXT_PREAMBLE
+
+try:
+    from PySide6.QtWidgets import QApplication, QTextEdit
+    from src.rich_text import get_rich_text, set_rich_text
+except ImportError: # pragma: no cover
+    QApplication = None
+
+# As written by QTextEdit.toHtml() on Windows
+QT_HTML_HEAD = (
+    '<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">\n'
+    '<html><head><meta name="qrichtext" content="1" /><meta charset="utf-8" /><style type="text/css">\n'
+    'p, li { white-space: pre-wrap; }\nhr { height: 1px; border-width: 0; }\n'
+    'li.unchecked::marker { content: "\\2610"; }\nli.checked::marker { content: "\\2612"; }\n'
+    '</style></head><body style=" font-family:\'Segoe UI\'; font-size:9pt; font-weight:400; font-style:normal;">\n'
+)
+QT_EMPTY_HTML = QT_HTML_HEAD + (
+    '<p style="-qt-paragraph-type:empty; margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px;'
+    ' -qt-block-indent:0; text-indent:0px;"><br /></p></body></html>')
+QT_TEXT_HTML = QT_HTML_HEAD + (
+    '<p style=" margin-top:0px; margin-bottom:0px; margin-left:0px; margin-right:0px; -qt-block-indent:0;'
+    ' text-indent:0px;"><span style=" font-weight:700;">Secret</span>   door</p></body></html>')
+
+
+class TestRichText(unittest.TestCase):
+
+    def test_compact_drops_boilerplate(self):
+        """Test that the preamble is removed and empty documents become empty strings."""
+        self.assertEqual(compact_rich_text(QT_EMPTY_HTML), "")
+        self.assertEqual(compact_rich_text(QT_TEXT_HTML),
+                         '<p><span style=" font-weight:700;">Secret</span>   door</p>')
+
+    def test_compact_leaves_other_text_alone(self):
+        """Test that plain text, foreign HTML and compact text are returned unchanged."""
+        compact = compact_rich_text(QT_TEXT_HTML)
+        for value in ("", "Just words", "<b>Hand written</b>", compact, None):
+            self.assertEqual(compact_rich_text(value), value)
+
+    def test_expand_rebuilds_document(self):
+        """Test that compact text expands to a Qt document and other text is untouched."""
+        expanded = expand_rich_text(compact_rich_text(QT_TEXT_HTML))
+        self.assertTrue(expanded.startswith(RICH_TEXT_PREAMBLE))
+        self.assertIn('<p style=" margin-top:0px;', expanded)
+        self.assertEqual(compact_rich_text(expanded), compact_rich_text(QT_TEXT_HTML))
+        for value in ("", "Just words", QT_TEXT_HTML):
+            self.assertEqual(expand_rich_text(value), value)
+
+    def test_html_to_text(self):
+        """Test that stored and full rich text convert to one line per paragraph, without Qt."""
+        compact = ('<p>a &amp; b</p>\n<p style="-qt-paragraph-type:empty;"><br /></p>\n'
+                   '<ul>\n<li>one</li>\n<li>two</li></ul>\n<p>x<br />y &lt;tag&gt;</p>')
+        self.assertEqual(html_to_text(compact), "a & b\n\none\ntwo\nx\ny <tag>")
+        self.assertEqual(html_to_text(QT_TEXT_HTML), "Secret   door")
+        self.assertEqual(html_to_text(QT_EMPTY_HTML), "")
+        for value in ("", "Just words"):
+            self.assertEqual(html_to_text(value), value)
+        self.assertEqual(text_snippet("Secret\n  door", 75), "Secret door")
+        self.assertEqual(text_snippet("word " * 30, 20), "word word word wo...")
+
+    def test_plain_text_is_cached_until_the_field_changes(self):
+        """Test that an entry converts a rich text field once per value."""
+        npc = NPCEntry(personality=compact_rich_text(QT_TEXT_HTML))
+        with mock.patch.object(data_models, "html_to_text", wraps=html_to_text) as convert:
+            self.assertEqual(npc.plain_text("personality"), "Secret   door")
+            self.assertEqual(npc.snippet("personality"), "Secret door")
+            self.assertEqual(npc.snippet("personality", 8), "Secre...")
+            self.assertEqual(convert.call_count, 1)
+            npc.personality = "<p>Gruff</p>"
+            self.assertEqual(npc.snippet("personality"), "Gruff")
+            self.assertEqual(convert.call_count, 2)
+        self.assertEqual(npc, NPCEntry(entry_id=npc.entry_id, personality="<p>Gruff</p>"))
+
+    def test_copies_and_pickles_leave_out_the_plain_text_cache(self):
+        """Test that the cached plain text is neither copied nor pickled."""
+        npc = NPCEntry(personality="<p>Gruff</p>")
+        self.assertEqual(npc.plain_text("personality"), "Gruff")
+        for clone in (copy.copy(npc), copy.deepcopy(npc), pickle.loads(pickle.dumps(npc))):
+            self.assertFalse(hasattr(clone, "_plain_text_cache"))
+            self.assertEqual(clone, npc)
+            self.assertEqual(clone.plain_text("personality"), "Gruff")
+
+    def test_loading_old_data_compacts_rich_text(self):
+        """Test that full HTML in a data file is compacted on load and saved compact."""
+        app_data = ApplicationData()
+        campaign = Campaign(campaign_id="c1", name="Old Data")
+        npc = NPCEntry(name=QT_TEXT_HTML, personality=QT_TEXT_HTML, secret=QT_EMPTY_HTML)
+        campaign.npcs[npc.entry_id] = npc
+        app_data.campaigns["c1"] = campaign
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, "data.json")
+        with mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(temp_dir, "cache.key")):
+            save_data(app_data, path)
+            remove_load_cache(path) # Parse the file, as after an upgrade from an older version
+            loaded_npc = load_data(path).campaigns["c1"].npcs[npc.entry_id]
+            self.assertEqual(loaded_npc.personality, compact_rich_text(QT_TEXT_HTML))
+            self.assertEqual(loaded_npc.secret, "")
+            self.assertEqual(loaded_npc.name, QT_TEXT_HTML) # Not a rich text field
+
+
+@unittest.skipIf(QApplication is None, "PySide6 is not installed")
+class TestRichTextEditors(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_editor_round_trip(self):
+        """Test that text stored compactly shows the same document in a fresh editor."""
+        editor = QTextEdit()
+        editor.setHtml(QT_TEXT_HTML)
+        stored = get_rich_text(editor)
+
+        reloaded = QTextEdit()
+        set_rich_text(reloaded, stored)
+        self.assertEqual(reloaded.toHtml(), editor.toHtml())
+        self.assertEqual(get_rich_text(QTextEdit()), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+try:
+    from PySide6.QtWidgets import QApplication
+    from src.save_scheduler import SaveScheduler
+except ImportError: # pragma: no cover
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PySide6 is not installed")
+class TestSaveScheduler(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.snapshots_taken = 0
+        self.saved = []
+        self.save_threads = []
+
+    def _snapshot(self):
+        self.snapshots_taken += 1
+        return (self.snapshots_taken,)
+
+    def _save(self, snapshot_number):
+        self.save_threads.append(threading.current_thread())
+        self.saved.append(snapshot_number)
+        return True
+
+    def _process_events_until(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+
+    def test_burst_of_requests_is_saved_once_in_background(self):
+        """Test that many requests within the delay result in one background write."""
+        scheduler = SaveScheduler(self._snapshot, self._save, delay_ms=20)
+        for _ in range(10):
+            scheduler.request_save()
+
+        self._process_events_until(lambda: scheduler.is_idle)
+
+        self.assertEqual(self.saved, [1])
+        self.assertIsNot(self.save_threads[0], threading.main_thread())
+
+    def test_flush_saves_pending_request_synchronously(self):
+        """Test that flush() writes a pending save without waiting for the timer."""
+        scheduler = SaveScheduler(self._snapshot, self._save, delay_ms=10000)
+        scheduler.request_save()
+
+        self.assertTrue(scheduler.flush())
+        self.assertEqual(self.saved, [1])
+        self.assertTrue(scheduler.is_idle)
+        self.assertTrue(scheduler.flush()) # Nothing left to save
+        self.assertEqual(self.saved, [1])
+
+    def test_failed_save_is_restored(self):
+        """Test that the snapshot of a failed write is handed to restore_func."""
+        restored = []
+        scheduler = SaveScheduler(self._snapshot, lambda snapshot_number: False,
+                                  restore_func=restored.append, delay_ms=10000)
+        scheduler.request_save()
+
+        self.assertFalse(scheduler.flush())
+        self.assertEqual(restored, [(1,)])
+
+
+    def test_failed_background_save_is_retried(self):
+        """Test that a failed write is retried without another request, and the failure is reported."""
+        results = [False, True]
+        failures = []
+        scheduler = SaveScheduler(self._snapshot, lambda snapshot_number: results.pop(0),
+                                  delay_ms=10, retry_delay_ms=10)
+        scheduler.save_failed.connect(lambda: failures.append(scheduler.failed))
+        scheduler.request_save()
+        self._process_events_until(lambda: not results and scheduler.is_idle)
+
+        self.assertEqual(failures, [True])
+        self.assertFalse(scheduler.failed)
+        self.assertEqual(self.snapshots_taken, 2)
+
+    def test_held_scheduler_saves_after_release(self):
+        """Test that saves requested during a hold wait for release()."""
+        scheduler = SaveScheduler(self._snapshot, self._save, delay_ms=10)
+        scheduler.hold()
+        scheduler.request_save()
+        self._process_events_until(lambda: False, timeout=0.1)
+        self.assertEqual(self.saved, [])
+
+        scheduler.release()
+        self._process_events_until(lambda: scheduler.is_idle)
+        self.assertEqual(self.saved, [1])
+
+if __name__ == '__main__':
+    unittest.main()
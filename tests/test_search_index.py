@@ -0,0 +1,191 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src.data_models import ApplicationData, BastionEntry, Campaign, Conflict, DMCharacterEntry, NPCEntry, SettlementEntry, TravelPlanEntry, TravelStage
+from src.json_data_manager import ChangeSet, load_data, save_data
+from src import search_index
+from src.search_index import ConsistencyCheck, IndexBuilder, SearchIndex, campaign_documents, tokenize
+from src.search_index_cache import read_search_index, search_index_path, storage_fingerprint, write_search_index
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Barovia")
+        self.ismark = NPCEntry(entry_id="npc_1", name="Ismark Kolyanovich",
+                               personality="<p>Guards his sister near the <b>Black</b> Tower</p>")
+        self.strahd = NPCEntry(entry_id="npc_2", name="Strahd", secret="<p>Built the tower; the tower is black</p>")
+        self.vallaki = SettlementEntry(entry_id="set_1", name="Vallaki", defining_trait="<p>Festivals</p>")
+        plan = TravelPlanEntry(entry_id="tp_1", journey_name="Old Svalich Road",
+                               stages=[TravelStage(narrative_notes="<p>Wolves near the Black&nbsp;Tower</p>")])
+        for collection, entry in (("npcs", self.ismark), ("npcs", self.strahd),
+                                  ("settlements", self.vallaki), ("travel_plans", plan)):
+            getattr(self.campaign, collection)[entry.entry_id] = entry
+        self.campaign.campaign_conflicts.conflicts.append(Conflict(conflict_id="conf_1", title_identifier="Tower coup"))
+        self.campaign.magic_item_tracker.level_tier_1_4.rare_items.append("Sunsword")
+        self.index = SearchIndex.for_campaign(self.campaign)
+        # Sign stored indexes with a key of this test, not the user's
+        self.key_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.key_dir)
+        key_patch = mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(self.key_dir, "cache.key"))
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
+
+    def _keys(self, query):
+        return [(hit.collection, hit.entry_id) for hit in self.index.search(query)]
+
+    def test_documents_cover_every_tracker(self):
+        """Test that entries, conflicts and magic item lists are indexed under the keys saves use."""
+        keys = {document.key for document in campaign_documents(self.campaign)}
+        self.assertTrue({("npcs", "npc_1"), ("settlements", "set_1"), ("travel_plans", "tp_1"),
+                         ("campaign_conflicts", "conf_1"), ("magic_item_tracker", "level_tier_1_4.rare_items")} <= keys)
+        self.assertEqual(self.index.search("sunsword")[0].title, "Levels 1-4: Rare")
+        self.assertEqual(self._keys("wolves"), [("travel_plans", "tp_1")]) # Nested stage text
+        self.assertEqual(tokenize("Black&Tower's"), ["black", "tower", "s"])
+
+    def test_ranking_phrases_and_prefixes(self):
+        """Test that all terms must match, phrases need adjacent words and prefixes expand."""
+        keys = self._keys("tower")
+        self.assertLess(keys.index(("npcs", "npc_2")), keys.index(("npcs", "npc_1"))) # Mentions the tower twice
+        self.assertEqual(set(self._keys('"black tower"')), {("npcs", "npc_1"), ("travel_plans", "tp_1")})
+        self.assertEqual(set(self._keys("black tower")),
+                         {("npcs", "npc_1"), ("npcs", "npc_2"), ("travel_plans", "tp_1")})
+        self.assertEqual(self._keys("kolya*"), [("npcs", "npc_1")])
+        self.assertEqual(self._keys("ismark festivals"), [])
+        self.assertEqual(self._keys('"  "'), [])
+        self.assertEqual(self._keys('"ismark strahd"'), []) # Different documents
+
+    def test_documents_are_replaced_and_removed(self):
+        """Test that re-adding a document replaces its terms and removing it drops them."""
+        documents = {document.key: document for document in campaign_documents(self.campaign)}
+        self.vallaki.defining_trait = "<p>Burgomaster</p>"
+        self.index.add_documents(document for document in campaign_documents(self.campaign)
+                                 if document.key == ("settlements", "set_1"))
+        self.assertEqual(self._keys("festivals"), [])
+        self.assertEqual(self._keys("burgo*"), [("settlements", "set_1")])
+        self.assertEqual(len(self.index), len(documents))
+
+        self.assertTrue(self.index.remove_document(("npcs", "npc_1")))
+        self.assertFalse(self.index.remove_document(("npcs", "npc_1")))
+        self.assertEqual(self._keys("ismark"), [])
+        self.assertNotIn(("npcs", "npc_1"), self.index)
+
+    def test_updates_retokenize_only_changed_fields(self):
+        """Test that updating an entry matches a rebuild and tokenizes just the edited field."""
+        self.ismark.appearance = "<p>Tall, with a <i>black</i> cloak</p>"
+        with mock.patch.object(search_index, "tokenize", wraps=tokenize) as tokenize_mock:
+            self.index.update_entry(self.campaign, "npcs", "npc_1")
+        self.assertEqual(tokenize_mock.call_count, 1)
+        self.index.update_entry(self.campaign, "npcs", "missing") # Deleted elsewhere: nothing to do
+        del self.campaign.settlements["set_1"]
+        self.index.update_entry(self.campaign, "settlements", "set_1")
+
+        rebuilt = SearchIndex.for_campaign(self.campaign)
+        for query in ("black", "cloak", '"black tower"', "t*", "festivals"):
+            self.assertEqual(self.index.search(query), rebuilt.search(query), query)
+        self.assertTrue(all(self.index.document_matches(document) for document in campaign_documents(self.campaign)))
+
+    def test_document_matches_a_token_in_fields_numbered_out_of_order(self):
+        """Test that a token in two fields matches even if the later field was numbered first."""
+        character = DMCharacterEntry(character_name="Ireena Kolyana") # Numbers character_name first
+        bastion = BastionEntry(bastion_name="Ireena Keep", character_name="Ireena")
+        self.campaign.dm_characters[character.entry_id] = character
+        self.campaign.bastions[bastion.entry_id] = bastion
+        index = SearchIndex.for_campaign(self.campaign)
+        self.assertTrue(all(index.document_matches(document) for document in campaign_documents(self.campaign)))
+
+    def test_consistency_check_finds_and_repairs_drift(self):
+        """Test that changes the index was not told about are found and reindexed."""
+        self.strahd.secret = "<p>Sleeps in the crypt</p>"
+        del self.campaign.npcs["npc_1"]
+        self.campaign.magic_item_tracker.level_tier_1_4.rare_items.append("Holy Symbol")
+        check = ConsistencyCheck(self.index, self.campaign)
+        while not check.step(max_documents=3):
+            pass
+        self.assertEqual(set(check.mismatches), {("npcs", "npc_2"), ("npcs", "npc_1"),
+                                                 ("magic_item_tracker", "level_tier_1_4.rare_items")})
+        check.repair()
+        self.assertEqual(self._keys("crypt"), [("npcs", "npc_2")])
+        self.assertEqual(self._keys("ismark"), [])
+        self.assertEqual(self._keys("holy"), [("magic_item_tracker", "level_tier_1_4.rare_items")])
+
+    def test_stored_index_decodes_postings_as_they_are_used(self):
+        """Test that a stored index answers like the original, decoding only the terms queried."""
+        builder = IndexBuilder(self.campaign)
+        while not builder.step(max_documents=2):
+            pass
+        queries = ("tower", '"black tower"', "t*", "sunsword", "kolya* black")
+        self.assertEqual([builder.index.search(q) for q in queries], [self.index.search(q) for q in queries])
+
+        with mock.patch.object(search_index.pickle, "loads", wraps=search_index.pickle.loads) as loads_mock:
+            index = SearchIndex.from_payload(self.index.to_payload())
+            self.assertEqual(index.search("sunsword"), self.index.search("sunsword"))
+        self.assertEqual(loads_mock.call_count, 2) # The tables, then the postings of one term
+        for query in queries:
+            self.assertEqual(index.search(query), self.index.search(query), query)
+
+        self.ismark.personality = "<p>Wary of the Vistani</p>"
+        index.update_entry(self.campaign, "npcs", "npc_1")
+        while not index.warm_step(max_bytes=64):
+            pass
+        stored_again = SearchIndex.from_payload(index.to_payload())
+        self.assertEqual(self._keys("vistani"), [])
+        self.assertEqual([(hit.collection, hit.entry_id) for hit in stored_again.search("vistani")],
+                         [("npcs", "npc_1")])
+        self.assertEqual(stored_again.search('"black tower"'), index.search('"black tower"'))
+        self.assertTrue(all(stored_again.document_matches(document)
+                            for document in campaign_documents(self.campaign)))
+
+    def test_stored_index_is_tied_to_the_saved_campaign(self):
+        """Test that a stored index is only read back while its campaign is saved unchanged."""
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        data_path = os.path.join(data_dir, "data.json")
+        other = Campaign(campaign_id="c2", name="Mists")
+        app_data = ApplicationData(campaigns={"c1": self.campaign, "c2": other})
+        self.assertTrue(save_data(app_data, data_path))
+        fingerprint = storage_fingerprint(data_path, "c1")
+        self.assertTrue(write_search_index(self.index, data_path, "c1", fingerprint))
+
+        load_data(data_path, lazy=True)
+        with mock.patch("src.json_data_manager.file_fingerprint") as hash_file:
+            index = read_search_index(data_path, "c1", storage_fingerprint(data_path, "c1"))
+        hash_file.assert_not_called() # Reuses the hash of the load
+        self.assertEqual(index.search("tower"), self.index.search("tower"))
+        self.assertIsNone(read_search_index(data_path, "c2", fingerprint)) # Another campaign
+
+        other.name = "Mists of Ravenloft"
+        changes = ChangeSet()
+        changes.mark_campaign("c2")
+        self.assertTrue(save_data(app_data, data_path, changes)) # Only changes the other campaign
+        self.assertEqual(storage_fingerprint(data_path, "c1"), fingerprint)
+        self.assertIsNotNone(read_search_index(data_path, "c1", storage_fingerprint(data_path, "c1")))
+
+        self.strahd.name = "Count Strahd"
+        changes = ChangeSet()
+        changes.mark_entry("c1", "npcs", "npc_2")
+        self.assertTrue(save_data(app_data, data_path, changes)) # Appended to the journal
+        self.assertIsNone(read_search_index(data_path, "c1", storage_fingerprint(data_path, "c1")))
+        self.assertFalse(os.path.exists(search_index_path(data_path, "c1"))) # Stale, so deleted
+
+        fingerprint = storage_fingerprint(data_path, "c1")
+        self.assertTrue(write_search_index(self.index, data_path, "c1", fingerprint))
+        with open(search_index_path(data_path, "c1"), 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b"garbage!")
+        self.assertIsNone(read_search_index(data_path, "c1", fingerprint))
+
+        # An index not signed with this user's key, e.g. one that came with a backup, is never unpickled
+        self.assertTrue(write_search_index(self.index, data_path, "c1", fingerprint))
+        with mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(self.key_dir, "other.key")), \
+                mock.patch.object(search_index.pickle, "loads") as unpickle:
+            self.assertIsNone(read_search_index(data_path, "c1", fingerprint))
+        unpickle.assert_not_called()
+        self.assertFalse(os.path.exists(search_index_path(data_path, "c1")))
+
+
+if __name__ == '__main__':
+    unittest.main()
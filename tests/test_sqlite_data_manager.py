@@ -0,0 +1,155 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+from dataclasses import asdict
+
+from src.data_models import (
+    ApplicationData, Campaign, NPCEntry, GameExpectationsEntry, SensitiveElement,
+    TravelPlanEntry, TravelStage, CampaignJournalEntry, DMCharacterEntry, Conflict,
+    BastionFacility, BastionEntry
+)
+from src.json_data_manager import save_data, load_data, convert_data, snapshot_application_data, ChangeSet
+
+
+class TestSqliteDataManager(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "campaigns.db")
+        # Sign load caches with a key of this test, not the user's
+        key_patch = mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(self.temp_dir, "cache.key"))
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_sample_application_data(self) -> ApplicationData:
+        app_data = ApplicationData(active_campaign_id="campaign1")
+        campaign1 = Campaign(campaign_id="campaign1", name="The Dragon's Hoard", dm_name_global="DM")
+
+        for name in ("Grog", "Pike", "Vex"):
+            npc = NPCEntry(name=name, alignment="CN")
+            campaign1.npcs[npc.entry_id] = npc
+
+        ge1 = GameExpectationsEntry(player_name="Alice")
+        ge1.sensitive_elements.append(SensitiveElement(name="Heights", soft_limit=True))
+        campaign1.game_expectations[ge1.entry_id] = ge1
+
+        tp1 = TravelPlanEntry(journey_name="Journey to the Peak")
+        tp1.stages.append(TravelStage(start_location="Base Camp", end_location="Ridge"))
+        tp1.stages.append(TravelStage(start_location="Ridge", end_location="Summit"))
+        campaign1.travel_plans[tp1.entry_id] = tp1
+
+        cj1 = CampaignJournalEntry(session_number=3, session_title="The Plot Thickens")
+        campaign1.campaign_journal[cj1.entry_id] = cj1
+
+        dmc1 = DMCharacterEntry(character_name="Elara", level=5, player_motivations=["Exploring", "Loot"])
+        campaign1.dm_characters[dmc1.entry_id] = dmc1
+
+        campaign1.campaign_conflicts.conflicts.append(Conflict(title_identifier="Orc Raids"))
+        campaign1.magic_item_tracker.level_tier_1_4.common_items.extend(["Potion of Healing", "Rope"])
+
+        bas1 = BastionEntry(bastion_name="Eagle's Peak", level=5)
+        bas1.special_facilities.append(BastionFacility(facility_type_name="Watchtower", notes="Good view"))
+        campaign1.bastions[bas1.entry_id] = bas1
+
+        app_data.campaigns["campaign1"] = campaign1
+        app_data.campaigns["campaign2"] = Campaign(campaign_id="campaign2", name="Side Quest")
+        return app_data
+
+    def test_save_and_load_round_trip(self):
+        """Test that every field, including nested lists and booleans, survives the database."""
+        original_data = self._create_sample_application_data()
+        self.assertTrue(save_data(original_data, self.db_path))
+
+        loaded_data = load_data(self.db_path)
+
+        self.assertEqual(asdict(loaded_data), asdict(original_data))
+        self.assertEqual(list(loaded_data.campaigns), ["campaign1", "campaign2"])
+        self.assertEqual(list(loaded_data.campaigns["campaign1"].npcs), list(original_data.campaigns["campaign1"].npcs))
+        self.assertIs(loaded_data.campaigns["campaign1"].game_expectations[
+            next(iter(original_data.campaigns["campaign1"].game_expectations))].sensitive_elements[0].soft_limit, True)
+
+    def test_entry_changes_only_touch_their_rows(self):
+        """Test that an entry-level save upserts and deletes single rows and keeps the rest."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.db_path)
+        campaign = app_data.campaigns["campaign1"]
+        npc_ids = list(campaign.npcs)
+
+        campaign.npcs[npc_ids[0]].name = "Grog the Great"
+        del campaign.npcs[npc_ids[1]]
+        new_npc = NPCEntry(name="Scanlan")
+        campaign.npcs[new_npc.entry_id] = new_npc
+        # A change that is not recorded must not be written by an entry-level save
+        campaign.name = "Renamed"
+        campaign.travel_plans[next(iter(campaign.travel_plans))].journey_name = "Not saved"
+
+        changes = ChangeSet()
+        for entry_id in (npc_ids[0], npc_ids[1], new_npc.entry_id):
+            changes.mark_entry("campaign1", "npcs", entry_id)
+        snapshot = snapshot_application_data(app_data, self.db_path, changes)
+        self.assertEqual(len(snapshot.campaigns["campaign1"].npcs), 2) # Only the changed entries are copied
+        self.assertTrue(save_data(snapshot, self.db_path, changes))
+
+        loaded_campaign = load_data(self.db_path).campaigns["campaign1"]
+        self.assertEqual([npc.name for npc in loaded_campaign.npcs.values()], ["Grog the Great", "Vex", "Scanlan"])
+        self.assertEqual(loaded_campaign.name, "Renamed") # Campaign headers are always written
+        self.assertEqual(next(iter(loaded_campaign.travel_plans.values())).journey_name, "Journey to the Peak")
+        self.assertEqual(len(next(iter(loaded_campaign.travel_plans.values())).stages), 2)
+
+    def test_deleted_campaign_is_removed(self):
+        """Test that campaigns missing from the data are deleted from the database."""
+        app_data = self._create_sample_application_data()
+        save_data(app_data, self.db_path)
+
+        del app_data.campaigns["campaign1"]
+        self.assertTrue(save_data(app_data, self.db_path))
+
+        self.assertEqual(list(load_data(self.db_path).campaigns), ["campaign2"])
+        with sqlite3.connect(self.db_path) as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM npcs").fetchone()[0], 0)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM travel_plans_stages").fetchone()[0], 0)
+
+    def test_lazy_load_reads_campaign_rows_on_access(self):
+        """Test that a lazy load reads only campaign headers and saves without loading the rest."""
+        save_data(self._create_sample_application_data(), self.db_path)
+
+        lazy_app_data = load_data(self.db_path, lazy=True)
+        campaigns = lazy_app_data.campaigns
+        self.assertEqual(campaigns.campaign_name("campaign1"), "The Dragon's Hoard")
+        self.assertFalse(campaigns.is_loaded("campaign1"))
+
+        new_npc = NPCEntry(name="Scanlan")
+        campaigns["campaign2"].npcs[new_npc.entry_id] = new_npc
+        changes = ChangeSet()
+        changes.mark_entry("campaign2", "npcs", new_npc.entry_id)
+        self.assertTrue(save_data(snapshot_application_data(lazy_app_data, self.db_path, changes), self.db_path, changes))
+        self.assertFalse(campaigns.is_loaded("campaign1"))
+
+        reloaded = load_data(self.db_path)
+        self.assertEqual(len(reloaded.campaigns["campaign1"].npcs), 3)
+        self.assertEqual([npc.name for npc in reloaded.campaigns["campaign2"].npcs.values()], ["Scanlan"])
+        self.assertTrue(campaigns.evict("campaign2"))
+        self.assertEqual(len(campaigns["campaign2"].npcs), 1)
+
+    def test_convert_between_json_and_sqlite(self):
+        """Test that converting JSON to SQLite and back loses nothing."""
+        original_data = self._create_sample_application_data()
+        json_path = os.path.join(self.temp_dir, "data.json")
+        round_trip_path = os.path.join(self.temp_dir, "round_trip.json")
+        save_data(original_data, json_path)
+
+        self.assertTrue(convert_data(json_path, self.db_path))
+        self.assertTrue(convert_data(self.db_path, round_trip_path))
+
+        self.assertEqual(asdict(load_data(round_trip_path)), asdict(original_data))
+        self.assertFalse(convert_data(os.path.join(self.temp_dir, "missing.json"), self.db_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
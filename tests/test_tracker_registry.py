@@ -0,0 +1,51 @@
+import unittest
+
+from src.json_data_manager import ChangeSet
+from src.trackers.registry import TrackerRegistry
+
+
+class TestTrackerRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = TrackerRegistry()
+        self.registry.register("NPC Tracker", object, "npcs")
+        self.registry.register("Bastion Tracker", object, "bastions")
+
+    def test_trackers_keep_their_order(self):
+        """Test that trackers are listed in registration order and found by name and collection."""
+        self.registry.register("Campaign Journal", object, "campaign_journal")
+        self.assertEqual(self.registry.names(), ["NPC Tracker", "Bastion Tracker", "Campaign Journal"])
+        self.assertEqual(self.registry.get("Bastion Tracker").collection, "bastions")
+        self.assertIsNone(self.registry.get("Travel Planner"))
+        self.assertEqual(self.registry.collection_trackers()["npcs"], "NPC Tracker")
+
+    def test_versions_rise_with_changes(self):
+        """Test that only the changed collections of the changed campaign get a new version."""
+        versions = lambda: [self.registry.version(campaign_id, collection)
+                            for campaign_id in ("c1", "c2") for collection in ("npcs", "bastions")]
+        before = versions()
+        self.registry.mark_changed(ChangeSet())
+        self.assertEqual(versions(), before)
+
+        changes = ChangeSet()
+        changes.mark_entry("c1", "npcs", "npc_1")
+        self.registry.mark_changed(changes)
+        after_entry = versions()
+        self.assertGreater(after_entry[0], before[0])
+        self.assertEqual(after_entry[1:], before[1:])
+
+        changes = ChangeSet()
+        changes.mark_campaign("c2")
+        self.registry.mark_changed(changes)
+        after_campaign = versions()
+        self.assertEqual(after_campaign[:2], after_entry[:2])
+        self.assertTrue(all(new > old for new, old in zip(after_campaign[2:], after_entry[2:])))
+
+        changes = ChangeSet()
+        changes.mark_all()
+        self.registry.mark_changed(changes)
+        self.assertTrue(all(new > old for new, old in zip(versions(), after_campaign)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import random
+import unittest
+
+try:
+    from PySide6.QtCore import QPersistentModelIndex, Qt
+    from PySide6.QtWidgets import QApplication
+    from src.data_models import CampaignJournalEntry, NPCEntry, SettlementEntry, TravelPlanEntry, TravelStage
+    from src.field_specs import table_columns
+    from src.trackers.base_tracker_ui import TrackerTableModel
+except ImportError: # pragma: no cover
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PySide6 is not installed")
+class TestTrackerTableModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.model = TrackerTableModel(lambda npc: npc.entry_id)
+        self.model.set_columns(table_columns(NPCEntry), ["Actions"])
+        self.npcs = {name: NPCEntry(entry_id=f"npc_{name}", name=name) for name in ("Ireena", "Ismark", "Donavich")}
+        self.model.set_items(self.npcs.values())
+        self.model.sort(0)
+        self.moves = []
+        self.model.rowsMoved.connect(lambda *args: self.moves.append(args))
+
+    def _names(self):
+        return [self.model.item(row).name for row in range(self.model.rowCount())]
+
+    def test_cells_headers_and_roles(self):
+        """Test what the cells show: column text, rich text snippets, centred numbers and the item ID."""
+        self.assertEqual([self.model.headerData(column, Qt.Orientation.Horizontal) for column in range(4)],
+                         ["Name", "Stat Block", "Alignment", "Actions"])
+        self.assertEqual(self.model.columnCount(), 4)
+        ireena_row = self.model.row_of("npc_Ireena")
+        self.assertEqual(self.model.data(self.model.index(ireena_row, 0)), "Ireena")
+        self.assertEqual(self.model.data(self.model.index(ireena_row, 3)), None) # Actions are painted
+        self.assertEqual(self.model.data(self.model.index(ireena_row, 3), Qt.ItemDataRole.UserRole), "npc_Ireena")
+
+        settlements = TrackerTableModel(lambda settlement: settlement.entry_id)
+        settlements.set_columns(table_columns(SettlementEntry))
+        settlements.set_items([SettlementEntry(name="Vallaki", size="Town", defining_trait="<p>Festivals</p><p>Fear</p>")])
+        self.assertEqual([settlements.data(settlements.index(0, column)) for column in range(3)],
+                         ["Vallaki", "Town", "Festivals Fear"])
+
+        journal = TrackerTableModel(lambda entry: entry.entry_id)
+        journal.set_columns(table_columns(CampaignJournalEntry))
+        journal.set_items([CampaignJournalEntry(session_number=3)])
+        self.assertEqual(journal.data(journal.index(0, 0)), 3)
+        self.assertEqual(journal.data(journal.index(0, 0), Qt.ItemDataRole.TextAlignmentRole),
+                         int(Qt.AlignmentFlag.AlignCenter))
+        self.assertIsNone(journal.data(journal.index(0, 2), Qt.ItemDataRole.TextAlignmentRole))
+
+    def test_sorting_by_any_column(self):
+        """Test that numbers sort as numbers, lists by length, and the selection follows its item."""
+        journal = TrackerTableModel(lambda entry: entry.entry_id)
+        journal.set_columns(table_columns(CampaignJournalEntry))
+        journal.set_items([CampaignJournalEntry(entry_id=f"cj_{number}", session_number=number) for number in (10, 9, 2)])
+        journal.sort(0)
+        self.assertEqual([journal.item(row).session_number for row in range(3)], [2, 9, 10])
+        selected = QPersistentModelIndex(journal.index(journal.row_of("cj_9"), 1))
+        journal.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual([journal.item(row).session_number for row in range(3)], [10, 9, 2])
+        self.assertEqual(selected.row(), journal.row_of("cj_9"))
+        self.assertEqual(selected.column(), 1)
+
+        plans = TrackerTableModel(lambda plan: plan.entry_id)
+        plans.set_columns(table_columns(TravelPlanEntry))
+        plans.set_items([TravelPlanEntry(journey_name="Long", stages=[TravelStage(), TravelStage()]),
+                         TravelPlanEntry(journey_name="Short", stages=[TravelStage()])])
+        stages_column = next(column for column, spec in enumerate(table_columns(TravelPlanEntry)) if spec.name == "stages")
+        plans.sort(stages_column)
+        self.assertEqual([plans.item(row).journey_name for row in range(2)], ["Short", "Long"])
+        self.assertEqual(plans.data(plans.index(0, stages_column)), "1")
+
+    def test_changed_items_keep_the_sort_order(self):
+        """Test that added, edited and removed items are placed where a fresh sort would put them."""
+        self.assertEqual(self._names(), ["Donavich", "Ireena", "Ismark"])
+        self.npcs["Ireena"].alignment = "Lawful Good" # Same place
+        self.model.update_item(self.npcs["Ireena"])
+        self.assertEqual(self.moves, [])
+        self.npcs["Donavich"].name = "Vasili"
+        self.model.update_item(self.npcs["Donavich"])
+        self.assertEqual(self._names(), ["Ireena", "Ismark", "Vasili"])
+        self.assertEqual(len(self.moves), 1)
+        self.model.update_item(NPCEntry(entry_id="npc_izek", name="Izek"))
+        self.assertEqual(self._names(), ["Ireena", "Ismark", "Izek", "Vasili"])
+        self.assertTrue(self.model.remove_item("npc_Ismark"))
+        self.assertFalse(self.model.remove_item("npc_Ismark"))
+        self.assertEqual(self._names(), ["Ireena", "Izek", "Vasili"])
+        self.assertEqual([self.model.row_of(f"npc_{name}") for name in ("Ireena", "izek", "Donavich", "Ismark")],
+                         [0, 1, 2, -1])
+
+        self.model.sort(0, Qt.SortOrder.DescendingOrder)
+        self.npcs["Ireena"].name = "Zarovich"
+        self.model.update_item(self.npcs["Ireena"])
+        self.model.update_item(NPCEntry(entry_id="npc_arrigal", name="Arrigal"))
+        self.assertEqual(self._names(), ["Zarovich", "Vasili", "Izek", "Arrigal"])
+
+    def test_unsorted_items_keep_their_place(self):
+        """Test that without a sort column edited items stay put and added ones go last."""
+        self.model.sort(-1)
+        self.model.set_items(self.npcs.values())
+        self.npcs["Ireena"].name = "Zarovich"
+        self.model.update_item(self.npcs["Ireena"])
+        self.model.update_item(NPCEntry(entry_id="npc_arrigal", name="Arrigal"))
+        self.assertEqual(self._names(), ["Zarovich", "Ismark", "Donavich", "Arrigal"])
+        self.assertEqual(self.model.row_of("npc_arrigal"), 3)
+
+    def test_equal_cells_keep_creation_order(self):
+        """Test that rows with equal cells are ordered by ID, with legacy IDs before new ones."""
+        new = NPCEntry(name="Anna")
+        legacy = NPCEntry(entry_id="npc_ffffffff", name="Anna")
+        self.model.set_items([new, legacy])
+        self.assertEqual([self.model.item_id(row) for row in range(2)], ["npc_ffffffff", new.entry_id])
+        self.model.sort(0, Qt.SortOrder.DescendingOrder)
+        self.assertEqual([self.model.item_id(row) for row in range(2)], ["npc_ffffffff", new.entry_id])
+
+    def test_many_changes_match_a_fresh_sort(self):
+        """Test that rows stay in order and findable through many random changes, including equal names."""
+        rng = random.Random(7)
+        names = ["Anna", "Boris", "anna", "Clara", "Dmitri"]
+        npcs = [NPCEntry(entry_id=f"npc_{number}", name=rng.choice(names)) for number in range(20)]
+        self.model.set_items(npcs)
+        for number in range(50):
+            npc = rng.choice(npcs)
+            if rng.random() < 0.2 and self.model.remove_item(npc.entry_id):
+                continue
+            npc.name = rng.choice(names) + rng.choice(["", " the Elder"])
+            self.model.update_item(npc)
+        shown = [self.model.item(row) for row in range(self.model.rowCount())]
+        self.assertEqual([npc.name.casefold() for npc in shown], sorted(npc.name.casefold() for npc in shown))
+        for row, npc in enumerate(shown):
+            self.assertEqual(self.model.row_of(npc.entry_id), row)
+
+
+if __name__ == '__main__':
+    unittest.main()
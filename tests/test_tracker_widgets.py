@@ -0,0 +1,168 @@
+import gc
+import os
+import shutil
+import tempfile
+import unittest
+import unittest.mock
+
+try:
+    from PySide6.QtCore import QPoint, Qt
+    from PySide6.QtTest import QTest
+    from PySide6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStatusBar, QTableView
+    from src.data_models import ApplicationData, Campaign, NPCEntry
+    from src.field_specs import table_columns
+    from src.json_data_manager import save_data
+    from src.main_window import MainWindow
+    from src.trackers.base_tracker_ui import TrackerTableModel
+    from src.trackers.demo_main_window import DemoMainWindowMixin
+    from src.trackers.magic_item_tracker_ui import MagicItemTrackerWidget
+    from src.trackers.npc_tracker_ui import NPCTrackerWidget
+    from src.trackers.row_actions import RowActionDelegate
+
+    class _MainWindow(DemoMainWindowMixin, QMainWindow):
+        def __init__(self, campaign: Campaign):
+            super().__init__()
+            self.current_campaign_id = campaign.campaign_id
+            self.application_data = ApplicationData(campaigns={campaign.campaign_id: campaign})
+            self.saves = 0
+            self.setStatusBar(QStatusBar(self))
+
+        def _save_app_data(self, collection=None, entry_id=None):
+            self.saves += 1
+except ImportError: # pragma: no cover
+    QApplication = None
+
+
+@unittest.skipIf(QApplication is None, "PySide6 is not installed")
+class TestTrackerWidgets(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Barovia")
+        for name in ("Ireena", "Ismark"):
+            npc = NPCEntry(name=name)
+            self.campaign.npcs[npc.entry_id] = npc
+        self.main_window = _MainWindow(self.campaign)
+        self.widget = NPCTrackerWidget(self.main_window)
+        self.addCleanup(self.main_window.deleteLater)
+        self.addCleanup(gc.collect) # Before the next test, not in the middle of one of Qt's calls into Python
+
+    def _row_action(self, label: str):
+        return dict(self.widget._get_row_actions())[label]
+
+    def test_row_delete_is_saved_in_one_transaction(self):
+        """Test that a row's Delete button deletes through a transaction, and undoes a failed delete."""
+        ireena_id, ismark_id = list(self.campaign.npcs)
+        with unittest.mock.patch.object(QMessageBox, "question", return_value=QMessageBox.StandardButton.Yes):
+            self._row_action("Delete")(ireena_id)
+        self.assertEqual(list(self.campaign.npcs), [ismark_id])
+        # The widget's save and the committed transaction's; MainWindow merges the two into one write
+        self.assertEqual(self.main_window.saves, 2)
+
+        def delete_then_fail(item_id, campaign):
+            del campaign.npcs[item_id]
+            raise ValueError("disk full")
+        with unittest.mock.patch.object(QMessageBox, "question", return_value=QMessageBox.StandardButton.Yes), \
+                unittest.mock.patch.object(QMessageBox, "critical") as critical, \
+                unittest.mock.patch.object(self.widget, "_perform_delete_item", side_effect=delete_then_fail):
+            self._row_action("Delete")(ismark_id)
+        critical.assert_called_once()
+        self.assertEqual(list(self.campaign.npcs), [ismark_id]) # Rolled back
+        self.assertEqual(self.main_window.saves, 2)
+
+
+    def test_demo_main_window_accepts_new_names(self):
+        """Test that the demos' stand-in main window answers the name check trackers make when adding."""
+        widget = MagicItemTrackerWidget(self.main_window)
+        widget.refresh_display()
+        widget.ui_elements["level_tier_1_4"]["rare_items"]["line_edit"].setText("Flame Tongue")
+        widget._on_add_item("level_tier_1_4", "rare_items")
+        self.assertEqual(self.campaign.magic_item_tracker.level_tier_1_4.rare_items, ["Flame Tongue"])
+        self.assertEqual(self.main_window.saves, 1)
+
+    def test_row_buttons_are_hit_tested_and_dispatched(self):
+        """Test that a click calls the action of the button it was pressed and released on, with the row's ID."""
+        calls = []
+        view = QTableView()
+        self.addCleanup(view.deleteLater)
+        model = TrackerTableModel(lambda npc: npc.entry_id, view)
+        model.set_columns(table_columns(NPCEntry), ["Actions"])
+        model.set_items(self.campaign.npcs.values())
+        view.setModel(model)
+        column = model.columnCount() - 1
+        delegate = RowActionDelegate([("Edit", lambda item_id: calls.append(("Edit", item_id))),
+                                      ("Delete", lambda item_id: calls.append(("Delete", item_id)))], view)
+        view.setItemDelegateForColumn(column, delegate)
+        view.resize(800, 300)
+        view.setColumnWidth(column, 300)
+
+        cell = view.visualRect(model.index(1, column))
+        edit_rect, delete_rect = delegate._button_rects(cell)
+        self.assertEqual(delegate._action_at(cell, edit_rect.center()), 0)
+        self.assertEqual(delegate._action_at(cell, delete_rect.center()), 1)
+        self.assertEqual(delegate._action_at(cell, QPoint(cell.left() + 1, cell.center().y())), -1) # Spacing
+        self.assertEqual(delegate._target_at(delete_rect.center()), (model.item_id(1), 1))
+        self.assertIsNone(delegate._target_at(view.visualRect(model.index(1, 0)).center())) # Another column
+
+        viewport = view.viewport()
+        QTest.mouseClick(viewport, Qt.MouseButton.LeftButton, pos=delete_rect.center())
+        QTest.mousePress(viewport, Qt.MouseButton.LeftButton, pos=edit_rect.center())
+        QTest.mouseRelease(viewport, Qt.MouseButton.LeftButton, pos=delete_rect.center()) # Dragged off: no click
+        self.assertEqual(calls, []) # Called once the view is done with the event
+        QApplication.processEvents()
+        self.assertEqual(calls, [("Delete", model.item_id(1))])
+
+    def _main_window(self) -> 'MainWindow':
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        key_patch = unittest.mock.patch("src.load_cache.CACHE_KEY_FILE", os.path.join(data_dir, "cache.key"))
+        key_patch.start()
+        self.addCleanup(key_patch.stop)
+        data_path = os.path.join(data_dir, "data.json")
+        save_data(ApplicationData(campaigns={"c1": self.campaign}), data_path)
+
+        window = MainWindow(data_path)
+        self.addCleanup(window.deleteLater)
+        self.addCleanup(window.close) # Saves and stops listening to model changes
+        return window
+
+    def test_tracker_widget_is_built_when_first_selected(self):
+        """Test that the main window builds a tracker's widget only once the tracker is selected."""
+        window = self._main_window()
+        self.assertEqual(window.tracker_widgets, {})
+        item = window.tracker_nav_list.findItems("NPC Tracker", Qt.MatchFlag.MatchExactly)[0]
+        window.tracker_nav_list.setCurrentItem(item)
+        widget = window.tracker_widgets["NPC Tracker"]
+        self.assertIsInstance(widget, NPCTrackerWidget)
+        self.assertEqual(list(window.tracker_widgets), ["NPC Tracker"])
+        self.assertIs(window.tracker_display_area.currentWidget(), widget)
+        self.assertEqual(widget.table_model.rowCount(), 2)
+
+    def test_duplicate_campaign_names_are_rejected(self):
+        """Test that a new campaign may not repeat a name, even one the similar-name match cannot score."""
+        self.campaign.name = "???"
+        window = self._main_window()
+        with unittest.mock.patch("PySide6.QtWidgets.QInputDialog.getText", return_value=("???", True)), \
+                unittest.mock.patch.object(QMessageBox, "warning") as warning:
+            window._on_create_campaign()
+        warning.assert_called_once()
+        self.assertEqual(list(window.application_data.campaigns), ["c1"])
+
+    def test_in_place_edits_are_saved_and_shown(self):
+        """Test that the main window picks up an entry edited directly on the model."""
+        window = self._main_window()
+        item = window.tracker_nav_list.findItems("NPC Tracker", Qt.MatchFlag.MatchExactly)[0]
+        window.tracker_nav_list.setCurrentItem(item)
+        widget = window.tracker_widgets["NPC Tracker"]
+        npc = next(iter(window.application_data.campaigns["c1"].npcs.values()))
+        npc.name = "Strahd"
+        QApplication.processEvents()
+        self.assertEqual(window.pending_changes.get_entry_changes("c1"), {("npcs", npc.entry_id)})
+        names = {widget.table_model.index(row, 0).data() for row in range(widget.table_model.rowCount())}
+        self.assertIn("Strahd", names)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import copy
+import unittest
+from dataclasses import asdict
+
+from src.data_models import ApplicationData, Campaign, NPCEntry, CampaignJournalEntry, Conflict
+from src.json_data_manager import ChangeSet
+from src.transactions import CampaignTransaction, TransactionError, merge_application_data
+
+
+class TestCampaignTransaction(unittest.TestCase):
+
+    def setUp(self):
+        self.campaign = Campaign(campaign_id="c1", name="Transactions")
+        for session_number in (1, 2, 3):
+            entry = CampaignJournalEntry(session_number=session_number, session_title=f"Session {session_number}")
+            self.campaign.campaign_journal[entry.entry_id] = entry
+        self.commits = []
+
+    def _transaction(self) -> CampaignTransaction:
+        return CampaignTransaction(self.campaign, "c1", self.commits.append)
+
+    def test_bulk_changes_are_committed_once(self):
+        """Test that many adds, edits and deletes produce a single ChangeSet."""
+        journal_ids = list(self.campaign.campaign_journal)
+        with self._transaction() as transaction:
+            npcs = [transaction.add("npcs", NPCEntry(name=f"Villager {i}")) for i in range(500)]
+            for session_number, entry_id in enumerate(reversed(journal_ids), 1):
+                entry = transaction.track("campaign_journal", entry_id)
+                entry.session_number = session_number
+                transaction.mark("campaign_journal", entry_id)
+            self.assertTrue(transaction.delete("campaign_journal", journal_ids[0]))
+            self.assertFalse(transaction.delete("npcs", "missing"))
+
+        self.assertEqual(len(self.commits), 1)
+        changes = self.commits[0].get_entry_changes("c1")
+        self.assertEqual(len(changes), 503)
+        self.assertIn(("npcs", npcs[0].entry_id), changes)
+        self.assertEqual(len(self.campaign.npcs), 500)
+        self.assertEqual(sorted(e.session_number for e in self.campaign.campaign_journal.values()), [1, 2])
+
+    def test_error_rolls_back_tracked_changes(self):
+        """Test that an exception restores entries, membership and trackers and commits nothing."""
+        before = asdict(self.campaign)
+        entry_id = next(iter(self.campaign.campaign_journal))
+        entry = self.campaign.campaign_journal[entry_id]
+
+        with self.assertRaises(RuntimeError):
+            with self._transaction() as transaction:
+                transaction.add("npcs", NPCEntry(name="Temporary"))
+                transaction.track("campaign_journal", entry_id).session_title = "Rewritten"
+                transaction.delete("campaign_journal", entry_id)
+                transaction.add("campaign_conflicts", Conflict(title_identifier="Coup"))
+                transaction.track("magic_item_tracker")
+                self.campaign.magic_item_tracker.level_tier_1_4.rare_items.append("Flame Tongue")
+                raise RuntimeError("import failed halfway")
+
+        self.assertEqual(asdict(self.campaign), before)
+        self.assertIs(self.campaign.campaign_journal[entry_id], entry) # Restored in place
+        self.assertEqual(self.commits, [])
+        self.assertTrue(transaction.closed)
+        with self.assertRaises(TransactionError):
+            transaction.mark()
+
+    def test_untracked_changes_are_marked_and_rolled_back(self):
+        """Test that fields and entries changed directly on the model are saved, or undone on an error."""
+        entry_id, entry = next(iter(self.campaign.campaign_journal.items()))
+        npc = NPCEntry(name="Direct")
+        with self._transaction():
+            entry.session_title = "Renamed"
+            self.campaign.npcs[npc.entry_id] = npc
+        self.assertEqual(self.commits[0].get_entry_changes("c1"),
+                         {("campaign_journal", entry_id), ("npcs", npc.entry_id)})
+
+        before = asdict(self.campaign)
+        journal = self.campaign.campaign_journal
+        with self.assertRaises(RuntimeError):
+            with self._transaction():
+                entry.session_title = "Rewritten"
+                entry.session_title = "Rewritten twice"
+                del self.campaign.npcs[npc.entry_id]
+                self.campaign.campaign_journal = {}
+                self.campaign.campaign_journal[entry_id] = NPCEntry(entry_id=entry_id)
+                raise RuntimeError("dialog failed halfway")
+        self.assertEqual(asdict(self.campaign), before)
+        self.assertIs(self.campaign.campaign_journal, journal)
+        self.assertIs(self.campaign.npcs[npc.entry_id], npc)
+        self.assertEqual(len(self.commits), 1)
+
+    def test_nested_transactions_commit_with_the_outermost(self):
+        """Test that entering an open transaction joins it."""
+        transaction = self._transaction()
+        with transaction:
+            with transaction:
+                transaction.add("npcs", NPCEntry(name="Inner"))
+            self.assertEqual(self.commits, [])
+            transaction.mark()
+        self.assertEqual(len(self.commits), 1)
+        self.assertIsNone(self.commits[0].get_entry_changes("c1")) # Whole campaign
+
+    def test_invalid_changes_are_rejected_at_commit(self):
+        """Test that an entry stored under another ID fails the commit and is rolled back."""
+        npc = NPCEntry(name="Misfiled")
+        with self.assertRaises(TransactionError):
+            with self._transaction() as transaction:
+                transaction.track("npcs")
+                self.campaign.npcs["wrong_id"] = npc
+                transaction.mark("npcs", "wrong_id")
+        self.assertEqual(self.campaign.npcs, {})
+        self.assertEqual(self.commits, [])
+
+        with self.assertRaises(TransactionError):
+            self._transaction().add("not_a_collection", npc)
+
+    def test_transaction_without_changes_does_not_commit(self):
+        """Test that only tracking, e.g. for a cancelled dialog, schedules no save."""
+        with self._transaction() as transaction:
+            transaction.track("campaign_journal", next(iter(self.campaign.campaign_journal)))
+        self.assertEqual(self.commits, [])
+
+
+    def test_merge_updates_entries_with_the_same_id(self):
+        """Test that merging adds new entries, skips identical ones and replaces those with the same ID."""
+        journal_id, journal_entry = next(iter(self.campaign.campaign_journal.items()))
+        self.campaign.campaign_conflicts.conflicts.append(Conflict(conflict_id="conf_1", title_identifier="Coup"))
+        imported = Campaign(campaign_id="c1", name="Transactions")
+        imported.campaign_journal[journal_id] = CampaignJournalEntry(
+            entry_id=journal_id, session_number=journal_entry.session_number,
+            session_title=journal_entry.session_title) # Identical
+        edited_npc = NPCEntry(entry_id="npc_1", name="Edited")
+        imported.npcs["npc_1"] = edited_npc
+        new_npc = NPCEntry(entry_id="npc_2", name="New")
+        imported.npcs["npc_2"] = new_npc
+        imported.campaign_conflicts.conflicts.append(Conflict(conflict_id="conf_1", title_identifier="Coup d'etat"))
+        imported.magic_item_tracker.level_tier_1_4.rare_items.append("Flame Tongue")
+        self.campaign.npcs["npc_1"] = NPCEntry(entry_id="npc_1", name="Local")
+
+        target = ApplicationData(campaigns={"c1": self.campaign})
+        new_campaign = Campaign(campaign_id="c2", name="New")
+        changes = ChangeSet()
+        updated = merge_application_data(
+            target, ApplicationData(campaigns={"c1": imported, "c2": new_campaign}), changes)
+
+        self.assertEqual(updated, [("c1", "npcs", "npc_1"), ("c1", "campaign_conflicts", "conf_1")])
+        self.assertEqual(self.campaign.npcs, {"npc_1": edited_npc, "npc_2": new_npc})
+        self.assertEqual(len(self.campaign.campaign_journal), 3)
+        self.assertEqual([c.title_identifier for c in self.campaign.campaign_conflicts.conflicts], ["Coup d'etat"])
+        self.assertEqual(self.campaign.magic_item_tracker.level_tier_1_4.rare_items, ["Flame Tongue"])
+        self.assertIs(target.campaigns["c2"], new_campaign)
+        self.assertEqual(changes.campaign_ids, {"c2"})
+        self.assertEqual(changes.get_entry_changes("c1"), {
+            ("npcs", "npc_1"), ("npcs", "npc_2"), ("campaign_conflicts", "conf_1"),
+            ("magic_item_tracker", "level_tier_1_4.rare_items")})
+
+        # Importing the same backup again changes nothing
+        again = copy.deepcopy(imported)
+        changes = ChangeSet()
+        self.assertEqual(merge_application_data(target, ApplicationData(campaigns={"c1": again}), changes), [])
+        self.assertFalse(changes)
+        self.assertEqual(len(self.campaign.npcs), 2)
+
+if __name__ == '__main__':
+    unittest.main()